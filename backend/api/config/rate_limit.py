@@ -42,15 +42,18 @@ def configure_rate_limiting(app: FastAPI) -> None:
     # Add global fallback middleware (Redis-backed, IP-based) if limits are enabled
     if not RL_DISABLED:
         try:
-            from api.core.rate_limiter import RateLimitingMiddleware
+            from api.core.rate_limiter import RateLimitingMiddleware, parse_route_limits
 
             limit = int(os.getenv("RATE_LIMIT_MIDDLEWARE_LIMIT", "100"))
             window = int(os.getenv("RATE_LIMIT_MIDDLEWARE_WINDOW", "60"))
+            user_limit = int(os.getenv("RATE_LIMIT_MIDDLEWARE_USER_LIMIT", "0")) or None
 
             app.add_middleware(
                 RateLimitingMiddleware,
                 limit=limit,
                 window=window,
+                user_limit=user_limit,
+                routes=parse_route_limits(os.getenv("RATE_LIMIT_ROUTE_LIMITS")),
             )
         except Exception:  # pragma: no cover
             pass
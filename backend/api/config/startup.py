@@ -88,3 +88,9 @@ def register_startup(app: FastAPI) -> None:
     @app.on_event("startup")
     async def _kickoff_background_startup():  # type: ignore
         _launch_startup_tasks()
+
+    @app.on_event("shutdown")
+    async def _close_playback_proxy():  # type: ignore
+        from api.services.episodes import playback_proxy
+
+        await playback_proxy.aclose_client()
@@ -1,62 +1,349 @@
+"""Global request rate limiter (ASGI middleware in front of every API call).
+
+Limits are enforced with GCRA (generic cell rate algorithm): each client key
+stores one "theoretical arrival time" that advances by ``window / limit`` per
+request, and a request is admitted while it is at most one window ahead of now.
+A client can burst ``limit`` requests and is then held to the steady rate; there
+is no boundary at which the whole allowance resets, so the 2x burst across the
+edge of a fixed window is gone. It costs one key and one round trip per check.
+
+Two tiers keep Redis off the hot path:
+
+1. A per-process token bucket. When Redis reports plenty of headroom, the Lua
+   script grants a *batch* of tokens (up to ``RATE_LIMIT_LOCAL_BATCH``, at most
+   half of what is left) that this process spends without further round trips.
+   A batch expires after the time it represents at the allowed rate, so unused
+   tokens are never banked. Denials are cached locally until their retry time.
+2. The shared GCRA state in Redis (``rate_limit:v2:*``), via ``redis.asyncio``
+   so the event loop never blocks.
+
+If Redis is not configured or fails, the same algorithm runs in-process (per
+instance) instead of letting everything through.
+
+Limits are resolved per request: the longest matching route prefix from
+``RATE_LIMIT_ROUTE_LIMITS`` (``"/api/ai/=30/60;/api/auth/=20/60"``, i.e.
+``prefix=limit/window_seconds``) wins, otherwise the global limit applies.
+Requests carrying a bearer token whose JWT signature verifies are keyed per user
+(a hash of the token's subject, with the optional
+``RATE_LIMIT_MIDDLEWARE_USER_LIMIT``); anonymous requests and unverifiable tokens
+fall back to the per-IP bucket, so rotating made-up tokens buys nothing.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import threading
 import time
-from typing import Callable, Optional
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
-# Use the shared Redis client helper (sync client; fail-open if unavailable)
-from api.core.redis_client import get_redis_client
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class RateLimitingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp, limit: int = 100, window: int = 60) -> None:
-        super().__init__(app)
-        self.limit = limit  # Max requests
-        self.window = window  # Time window in seconds
+from api.core.config import settings
+from api.core.redis_client import get_async_redis_client, mark_async_redis_down
+
+try:  # pragma: no cover - optional in some builds
+    from jose import JWTError, jwt
+except ModuleNotFoundError:  # pragma: no cover
+    JWTError = Exception  # type: ignore[assignment]
+    jwt = None  # type: ignore[assignment]
+
+log = logging.getLogger("api.core.rate_limiter")
+
+KEY_PREFIX = "rate_limit:v2"
+DEFAULT_LOCAL_BATCH = 10
+_MAX_LOCAL_KEYS = 50_000
+
+# KEYS[1] = client key; ARGV = emission interval (ms), burst tolerance (ms),
+# max tokens to grant. Returns {granted, retry_after_ms, remaining}.
+_GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_batch = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local available = math.floor((now + burst - tat) / emission)
+if available < 1 then
+  return {0, math.ceil(tat + emission - burst - now), 0}
+end
+local grant = 1
+if max_batch > 1 then
+  grant = math.max(1, math.min(max_batch, math.floor(available / 2)))
+end
+local new_tat = tat + grant * emission
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now) + 1)
+return {grant, 0, available - grant}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window: int  # seconds
+
+    @property
+    def emission_ms(self) -> float:
+        return self.window * 1000.0 / self.limit
+
+    @property
+    def burst_ms(self) -> float:
+        return self.window * 1000.0
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after_s: int = 0
+
+
+def parse_route_limits(spec: Optional[str]) -> Dict[str, RateLimit]:
+    """Parse ``"prefix=limit/window;..."``; malformed entries are skipped."""
+    rules: Dict[str, RateLimit] = {}
+    for part in (spec or "").replace(",", ";").split(";"):
+        prefix, sep, value = part.strip().partition("=")
+        if not sep:
+            continue
+        try:
+            limit_s, _, window_s = value.partition("/")
+            rule = RateLimit(int(limit_s), int(window_s or "60"))
+        except ValueError:
+            log.warning("rate_limiter: ignoring route limit %r", part)
+            continue
+        if rule.limit > 0 and rule.window > 0 and prefix.strip():
+            rules[prefix.strip()] = rule
+    return rules
+
+
+def gcra_take(tat_ms: float, now_ms: float, rule: RateLimit, max_batch: int = 1) -> Tuple[int, int, int, float]:
+    """The script's arithmetic: returns (granted, retry_after_ms, remaining, new_tat_ms)."""
+    tat = max(tat_ms, now_ms)
+    available = math.floor((now_ms + rule.burst_ms - tat) / rule.emission_ms)
+    if available < 1:
+        return 0, math.ceil(tat + rule.emission_ms - rule.burst_ms - now_ms), 0, tat
+    grant = 1 if max_batch <= 1 else max(1, min(max_batch, available // 2))
+    return grant, 0, available - grant, tat + grant * rule.emission_ms
+
+
+class _LocalState:
+    """Per-process tier: leased token batches, cached denials, and the no-Redis fallback."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> [tokens, expires_at, tokens left in Redis when leased]
+        self.leases: Dict[str, List[float]] = {}
+        # key -> monotonic time until which requests are denied
+        self.denied_until: Dict[str, float] = {}
+        # key -> theoretical arrival time (ms) when Redis is unavailable
+        self.tats: Dict[str, float] = {}
+
+    def take_lease(self, key: str, now: float) -> Optional[int]:
+        with self._lock:
+            lease = self.leases.get(key)
+            if lease is None:
+                return None
+            if lease[0] < 1 or now >= lease[1]:
+                del self.leases[key]
+                return None
+            lease[0] -= 1
+            return int(lease[0] + lease[2])
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # 1. Get identifier (using client IP for simplicity in a public API context)
-        # NOTE: In a production environment behind a reverse proxy (Nginx, Cloudflare), 
-        # use the 'X-Forwarded-For' or similar header.
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # 2. Define the Redis key
-        # Use a combination of IP and the current time window's starting time
-        current_time_window = int(time.time() // self.window) * self.window
-        key = f"rate_limit:{client_ip}:{current_time_window}"
-        
-        # 3. Access Redis (fail-open if missing or connection fails)
-        redis = get_redis_client()
-        if redis is None:
-            return await call_next(request)
-
-        # Use Redis pipelining for atomic INCR + EXPIRE
-        pipe = redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, self.window)
-
-        # Execute the pipeline (synchronous client; block briefly)
+    def store_lease(self, key: str, tokens: int, expires_at: float, remaining: int) -> None:
+        with self._lock:
+            if len(self.leases) >= _MAX_LOCAL_KEYS:
+                self.leases.clear()
+            self.leases[key] = [float(tokens), expires_at, float(remaining)]
+
+    def denied(self, key: str, now: float) -> float:
+        with self._lock:
+            until = self.denied_until.get(key, 0.0)
+            if until and now >= until:
+                del self.denied_until[key]
+                return 0.0
+            return max(0.0, until - now)
+
+    def deny(self, key: str, until: float) -> None:
+        with self._lock:
+            if len(self.denied_until) >= _MAX_LOCAL_KEYS:
+                self.denied_until.clear()
+            self.denied_until[key] = until
+
+    def fallback_take(self, key: str, rule: RateLimit) -> Tuple[int, int, int]:
+        now_ms = time.time() * 1000.0
+        with self._lock:
+            if len(self.tats) >= _MAX_LOCAL_KEYS:
+                self.tats = {k: v for k, v in self.tats.items() if v > now_ms}
+            granted, retry_ms, remaining, new_tat = gcra_take(self.tats.get(key, 0.0), now_ms, rule)
+            if granted:
+                self.tats[key] = new_tat
+            return granted, retry_ms, remaining
+
+    def clear(self) -> None:
+        with self._lock:
+            self.leases.clear()
+            self.denied_until.clear()
+            self.tats.clear()
+
+
+class RateLimiter:
+    """Two-tier GCRA limiter; see the module docstring."""
+
+    def __init__(self, local_batch: Optional[int] = None) -> None:
+        if local_batch is None:
+            try:
+                local_batch = int(os.getenv("RATE_LIMIT_LOCAL_BATCH", str(DEFAULT_LOCAL_BATCH)))
+            except ValueError:
+                local_batch = DEFAULT_LOCAL_BATCH
+        self.local_batch = max(1, local_batch)
+        self.local = _LocalState()
+        self._scripts: Dict[int, object] = {}
+
+    def _script(self, client):
+        # One registered script per client (clients are per event loop).
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = client.register_script(_GCRA_LUA)
+            self._scripts = {id(client): script}
+        return script
+
+    async def _redis_take(self, key: str, rule: RateLimit) -> Optional[Tuple[int, int, int]]:
+        client = get_async_redis_client()
+        if client is None:
+            return None
+        batch = min(self.local_batch, rule.limit)
         try:
-            results = pipe.execute()
-            count: Optional[int] = results[0] if results else None
-        except Exception:
-            # Log error but allow request to pass if Redis is down (fail-open)
-            return await call_next(request)
-        if count is None:
-            return await call_next(request)
-            
-        # 4. Check the limit
-        if count > self.limit:
-            # HTTP 429 Too Many Requests
-            raise HTTPException(
-                status_code=429,
-                detail=f"Rate limit exceeded. Try again in {self.window} seconds."
+            reply = await self._script(client)(
+                keys=[key],
+                args=[f"{rule.emission_ms:.3f}", f"{rule.burst_ms:.0f}", batch],
             )
+            granted, retry_ms, remaining = (int(x) for x in reply)
+        except Exception as exc:
+            mark_async_redis_down(exc)
+            return None
+        return granted, retry_ms, remaining
+
+    async def check(self, key: str, rule: RateLimit) -> Decision:
+        now = time.monotonic()
+        remaining = self.local.take_lease(key, now)
+        if remaining is not None:
+            return Decision(True, remaining)
+        wait = self.local.denied(key, now)
+        if wait:
+            return Decision(False, 0, max(1, math.ceil(wait)))
+
+        result = await self._redis_take(key, rule)
+        if result is None:
+            result = self.local.fallback_take(key, rule)
+        granted, retry_ms, remaining = result
+        if granted < 1:
+            self.local.deny(key, now + retry_ms / 1000.0)
+            return Decision(False, 0, max(1, math.ceil(retry_ms / 1000.0)))
+        if granted > 1:
+            # The batch represents (granted * emission) of allowed time.
+            self.local.store_lease(key, granted - 1, now + granted * rule.emission_ms / 1000.0, remaining)
+        return Decision(True, remaining + granted - 1)
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope.get("headers") or ():
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token.strip():
+                return token.strip()
+            return None
+    return None
+
+
+def _verified_subject(token: str) -> Optional[str]:
+    """Subject of a bearer JWT signed with our key, or None if it does not verify."""
+    if jwt is None:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    return sub if isinstance(sub, str) and sub else None
+
+
+class RateLimitingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        limit: int = 100,
+        window: int = 60,
+        *,
+        user_limit: Optional[int] = None,
+        routes: Optional[Dict[str, RateLimit]] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self.app = app
+        self.limit = limit  # Max requests
+        self.window = window  # Time window in seconds
+        self.default = RateLimit(limit, window)
+        self.user_default = RateLimit(user_limit, window) if user_limit else self.default
+        # Longest prefix first so the most specific rule wins.
+        self.routes = sorted((routes or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.limiter = limiter or RateLimiter()
+
+    def _resolve(self, scope: Scope) -> Tuple[str, RateLimit]:
+        path = scope.get("path") or "/"
+        token = _bearer_token(scope)
+        subject = _verified_subject(token) if token else None
+        if subject:
+            identity = "user:" + hashlib.sha256(subject.encode("utf-8")).hexdigest()[:24]
+        else:
+            identity = "ip:" + _client_ip(scope)
+        for prefix, rule in self.routes:
+            if path.startswith(prefix):
+                return f"{KEY_PREFIX}:{prefix}:{identity}", rule
+        rule = self.user_default if subject else self.default
+        return f"{KEY_PREFIX}:*:{identity}", rule
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # CORS preflights are not counted.
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        key, rule = self._resolve(scope)
+        decision = await self.limiter.check(key, rule)
+        if not decision.allowed:
+            await self._reject(scope, receive, send, decision, rule)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-ratelimit-limit", str(rule.limit).encode()))
+                headers.append((b"x-ratelimit-remaining", str(max(0, decision.remaining)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, decision: Decision, rule: RateLimit) -> None:
+        from starlette.requests import Request
+        from fastapi.responses import JSONResponse
+        from api.core.cors import add_cors_headers_to_response
 
-        # 5. Allow the request to proceed
-        response = await call_next(request)
-        
-        # Optionally add headers for client feedback
-        response.headers["X-RateLimit-Limit"] = str(self.limit)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, self.limit - count))
-        
-        return response
\ No newline at end of file
+        response = JSONResponse(
+            status_code=429,
+            content={"detail": "Rate limit exceeded"},
+            headers={
+                "Retry-After": str(decision.retry_after_s),
+                "X-RateLimit-Limit": str(rule.limit),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+        response = add_cors_headers_to_response(response, Request(scope, receive))
+        await response(scope, receive, send)
@@ -1,12 +1,20 @@
+import asyncio
 import logging
+import time
 from typing import Optional, Any
 
 import redis
+import redis.asyncio as redis_async
 from api.core.config import settings
 
 log = logging.getLogger("api.core.redis_client")
 
 _redis_client: Optional[redis.Redis] = None
+_async_client: Optional[redis_async.Redis] = None
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_down_until = 0.0
+# After an async command fails, callers skip Redis for this long.
+ASYNC_RETRY_S = 30.0
 
 
 def get_redis_client() -> Optional[redis.Redis]:
@@ -43,6 +51,44 @@ def get_redis_client() -> Optional[redis.Redis]:
         return None
 
 
+def get_async_redis_client() -> Optional[redis_async.Redis]:
+    """
+    Returns an asyncio Redis client for the running event loop, or None when
+    Redis is not configured or was marked down by mark_async_redis_down().
+    Creation does not connect; the first command does.
+    """
+    global _async_client, _async_loop
+
+    if time.monotonic() < _async_down_until:
+        return None
+    host = getattr(settings, "REDIS_HOST", None)
+    port = getattr(settings, "REDIS_PORT", None)
+    if not host or not port:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _async_client is not None and _async_loop is loop:
+        return _async_client
+    # Connections are bound to the loop that opened them.
+    _async_client = redis_async.Redis(
+        host=host,
+        port=port,
+        socket_timeout=1.0,
+        socket_connect_timeout=1.0,
+        decode_responses=True,
+    )
+    _async_loop = loop
+    return _async_client
+
+
+def mark_async_redis_down(exc: Exception) -> None:
+    """Fail open: stop using the async client for ASYNC_RETRY_S after an error."""
+    global _async_down_until
+    if time.monotonic() >= _async_down_until:
+        log.warning(f"Async Redis command failed: {exc}. Skipping Redis for {ASYNC_RETRY_S:.0f}s.")
+    _async_down_until = time.monotonic() + ASYNC_RETRY_S
+
+
 def redis_get(key: str) -> Optional[str]:
     """
     Fail-open Redis GET wrapper.
@@ -83,3 +129,31 @@ def redis_set(key: str, value: Any) -> bool:
     except Exception as e:
         log.warning(f"Redis SET failed for {key}: {e}")
         return False
+
+
+def redis_incr(key: str) -> Optional[int]:
+    """
+    Fail-open Redis INCR wrapper. Returns the new value, or None on failure.
+    """
+    try:
+        client = get_redis_client()
+        if not client:
+            return None
+        return int(client.incr(key))
+    except Exception as e:
+        log.warning(f"Redis INCR failed for {key}: {e}")
+        return None
+
+
+def redis_delete(key: str) -> bool:
+    """
+    Fail-open Redis DEL wrapper.
+    """
+    try:
+        client = get_redis_client()
+        if not client:
+            return False
+        return bool(client.delete(key))
+    except Exception as e:
+        log.warning(f"Redis DEL failed for {key}: {e}")
+        return False
@@ -1,8 +1,20 @@
+import logging
 import uuid
 from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 # Import Episode directly from its module to avoid relying on pkg __init__ exports.
-from api.models.podcast import Episode  # type: ignore
+from api.models.podcast import Episode, Podcast  # type: ignore
+from api.models.website import PodcastWebsite  # type: ignore
+from api.models.website_page import WebsitePage  # type: ignore
+from api.services.rss_feed_cache import invalidate_feed
+from api.services.website_snapshot import forget_site, invalidate_site
+
+log = logging.getLogger("api.db_listeners")
+
+_FEED_INVALIDATIONS_KEY = "rss_feed_invalidations"
+_SITE_INVALIDATIONS_KEY = "site_snapshot_invalidations"
+_SITE_FORGET_KEY = "site_snapshot_forget"
 
 def _to_uuid(val):
     if val is None:
@@ -34,3 +46,103 @@ def episode_before_insert(mapper, connection, target):
     except Exception:
         # Let the normal exception handler surface any issues
         pass
+
+
+# ---------------------------------------------------------------------------
+# RSS feed cache and public website snapshot invalidation
+#
+# Mapper events fire during flush, before the transaction is visible to other
+# connections. Podcast ids are collected on the session and the cached feeds
+# and site snapshots are invalidated only once the commit succeeds, so a
+# concurrent request can't re-cache the pre-commit rows under the new version.
+# ---------------------------------------------------------------------------
+
+def _queue(target, key, value, apply):
+    session = object_session(target)
+    if session is None:
+        apply(value)
+        return
+    session.info.setdefault(key, set()).add(value)
+
+
+def _queue_feed_invalidation(target, podcast_id):
+    if podcast_id is None:
+        return
+    _queue(target, _FEED_INVALIDATIONS_KEY, str(podcast_id), _invalidate_podcast)
+
+
+@event.listens_for(Episode, "after_insert")
+@event.listens_for(Episode, "after_update")
+@event.listens_for(Episode, "after_delete")
+def episode_changed(mapper, connection, target):
+    _queue_feed_invalidation(target, getattr(target, "podcast_id", None))
+
+
+@event.listens_for(Podcast, "after_update")
+@event.listens_for(Podcast, "after_delete")
+def podcast_changed(mapper, connection, target):
+    _queue_feed_invalidation(target, getattr(target, "id", None))
+
+
+@event.listens_for(PodcastWebsite, "after_insert")
+@event.listens_for(PodcastWebsite, "after_update")
+@event.listens_for(PodcastWebsite, "after_delete")
+def website_changed(mapper, connection, target):
+    # The channel <link> points at the published website.
+    _queue_feed_invalidation(target, getattr(target, "podcast_id", None))
+
+
+# Unpublished or deleted sites must stop being served at once, not after a re-render.
+@event.listens_for(PodcastWebsite, "after_update")
+def website_updated(mapper, connection, target):
+    if getattr(target, "status", None) != "published":
+        _queue_site_removal(target)
+
+
+@event.listens_for(PodcastWebsite, "after_delete")
+def website_deleted(mapper, connection, target):
+    _queue_site_removal(target)
+
+
+def _queue_site_removal(target):
+    subdomain = getattr(target, "subdomain", None)
+    if subdomain:
+        _queue(target, _SITE_FORGET_KEY, str(subdomain), forget_site)
+
+
+@event.listens_for(WebsitePage, "after_insert")
+@event.listens_for(WebsitePage, "after_update")
+@event.listens_for(WebsitePage, "after_delete")
+def website_page_changed(mapper, connection, target):
+    website_id = getattr(target, "website_id", None)
+    if website_id is not None:
+        _queue(target, _SITE_INVALIDATIONS_KEY, str(website_id), _invalidate_website)
+
+
+def _invalidate_podcast(podcast_id):
+    invalidate_feed(podcast_id)
+    invalidate_site(podcast_id=podcast_id)
+
+
+def _invalidate_website(website_id):
+    invalidate_site(website_id=website_id)
+
+
+@event.listens_for(Session, "after_commit")
+def flush_feed_invalidations(session):
+    for key, apply in (
+        (_FEED_INVALIDATIONS_KEY, _invalidate_podcast),
+        (_SITE_INVALIDATIONS_KEY, _invalidate_website),
+        (_SITE_FORGET_KEY, forget_site),
+    ):
+        for value in session.info.pop(key, None) or ():
+            try:
+                apply(value)
+            except Exception as exc:  # never let cache bookkeeping break a commit
+                log.warning("Cache invalidation %s failed for %s: %s", key, value, exc)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_feed_invalidations(session):
+    for key in (_FEED_INVALIDATIONS_KEY, _SITE_INVALIDATIONS_KEY, _SITE_FORGET_KEY):
+        session.info.pop(key, None)
@@ -1,7 +1,27 @@
-"""Performance metrics middleware for request tracking."""
+"""Per-route request metrics (pure ASGI middleware) and their exposition.
+
+``MetricsMiddleware`` wraps ``send`` instead of subclassing
+``BaseHTTPMiddleware``, so it adds no extra task per request and does not buffer
+streaming responses. For every request it records, in-process:
+
+- ``http_request_duration_seconds`` -- histogram by method, route template
+  (``/api/episodes/{episode_id}``, not the raw path) and status code;
+- ``http_response_size_bytes`` -- histogram of body bytes by method and route;
+- ``http_requests_in_flight`` -- gauge of requests currently being served.
+
+Unmatched paths are folded into one ``<unmatched>`` route so scanners cannot
+blow up label cardinality. :func:`render_prometheus` produces the text format
+served on ``/metrics``; :func:`latency_summary` estimates p50/p95/p99 per route
+for the admin system-health view. Slow requests are still logged (and the
+``X-Response-Time`` header, time to first byte, is still set).
+"""
+import bisect
+import threading
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from api.core.logging import get_logger
 
 log = get_logger("api.middleware.metrics")
@@ -14,79 +34,250 @@ VERY_SLOW_REQUEST_THRESHOLD = float(
     __import__("os").getenv("VERY_SLOW_REQUEST_THRESHOLD_SECONDS", "5.0")
 )
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+UNMATCHED_ROUTE = "<unmatched>"
+# Requests for these paths are not recorded (scrapes and probes would dominate).
+EXCLUDED_PATHS = frozenset({"/metrics", "/health"})
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "_Histogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Linear interpolation within the bucket, like PromQL ``histogram_quantile``."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class RequestMetrics:
+    """Thread-safe in-process registry behind the middleware."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], _Histogram] = {}
+        self.in_flight = 0
+        self.started_at = time.time()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, duration: float, size: int) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status))
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = _Histogram(LATENCY_BUCKETS)
+            hist.observe(duration)
+            size_hist = self.sizes.get((method, route))
+            if size_hist is None:
+                size_hist = self.sizes[(method, route)] = _Histogram(SIZE_BUCKETS)
+            size_hist.observe(size)
+
+    def snapshot(self) -> Tuple[Dict, Dict, int]:
+        with self._lock:
+            latency = {k: _copy(h) for k, h in self.latency.items()}
+            sizes = {k: _copy(h) for k, h in self.sizes.items()}
+            return latency, sizes, self.in_flight
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.sizes.clear()
+            self.in_flight = 0
+            self.started_at = time.time()
+
+
+def _copy(hist: _Histogram) -> _Histogram:
+    out = _Histogram(hist.buckets)
+    out.merge(hist)
+    return out
+
+
+metrics = RequestMetrics()
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _render_histogram(lines: List[str], name: str, labels: Sequence[Tuple[str, str]], hist: _Histogram) -> None:
+    base = _labels(labels)
+    cumulative = 0
+    for bound, n in zip(list(hist.buckets) + [float("inf")], hist.counts):
+        cumulative += n
+        le = "+Inf" if bound == float("inf") else repr(float(bound))
+        lines.append(f'{name}_bucket{{{base},le="{le}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{base}}} {hist.sum!r}")
+    lines.append(f"{name}_count{{{base}}} {hist.count}")
+
+
+def render_prometheus(registry: RequestMetrics = metrics) -> str:
+    """Prometheus text exposition (format 0.0.4) of the registry."""
+    latency, sizes, in_flight = registry.snapshot()
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route, status), hist in sorted(latency.items()):
+        _render_histogram(
+            lines, "http_request_duration_seconds",
+            (("method", method), ("route", route), ("status", status)), hist,
+        )
+    lines += [
+        "# HELP http_response_size_bytes Response body size by route template.",
+        "# TYPE http_response_size_bytes histogram",
+    ]
+    for (method, route), hist in sorted(sizes.items()):
+        _render_histogram(lines, "http_response_size_bytes", (("method", method), ("route", route)), hist)
+    lines += [
+        "# HELP http_requests_in_flight Requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def latency_summary(limit: int = 10, registry: RequestMetrics = metrics) -> Dict[str, Any]:
+    """Estimated p50/p95/p99 (ms) per route since this instance started, busiest first."""
+    latency, _sizes, in_flight = registry.snapshot()
+    per_route: Dict[Tuple[str, str], _Histogram] = {}
+    errors: Dict[Tuple[str, str], int] = {}
+    for (method, route, status), hist in latency.items():
+        merged = per_route.get((method, route))
+        if merged is None:
+            merged = per_route[(method, route)] = _Histogram(LATENCY_BUCKETS)
+        merged.merge(hist)
+        if status.startswith("5"):
+            errors[(method, route)] = errors.get((method, route), 0) + hist.count
+
+    def _ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000.0, 1) if value is not None else None
+
+    routes = []
+    for (method, route), hist in sorted(per_route.items(), key=lambda item: item[1].count, reverse=True)[:limit]:
+        routes.append({
+            "method": method,
+            "route": route,
+            "count": hist.count,
+            "errors_5xx": errors.get((method, route), 0),
+            "p50_ms": _ms(hist.quantile(0.50)),
+            "p95_ms": _ms(hist.quantile(0.95)),
+            "p99_ms": _ms(hist.quantile(0.99)),
+        })
+    return {
+        "since": registry.started_at,
+        "in_flight": in_flight,
+        "routes": routes,
+    }
+
+
+def _route_template(scope: Scope) -> str:
+    # The router stores the matched route in the (shared) scope.
+    path = getattr(scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
     """Middleware to track request performance metrics.
-    
-    Logs slow requests and adds timing headers to responses.
+
+    Records per-route latency and size histograms, logs slow requests and adds
+    timing headers to responses.
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        """Track request duration and log slow requests."""
-        start_time = time.time()
-        
+
+    def __init__(self, app: ASGIApp, registry: Optional[RequestMetrics] = None) -> None:
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = int(message["status"])
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-response-time", f"{time.perf_counter() - start:.3f}".encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body") or b"")
+            await send(message)
+
+        self.registry.request_started()
+        error: Optional[BaseException] = None
         try:
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            # Add timing header
-            response.headers["X-Response-Time"] = f"{duration:.3f}"
-            
-            # Log slow requests
-            if duration >= VERY_SLOW_REQUEST_THRESHOLD:
-                log.error(
-                    "Very slow request: %s %s took %.2fs (threshold: %.2fs)",
-                    request.method,
-                    request.url.path,
-                    duration,
-                    VERY_SLOW_REQUEST_THRESHOLD,
-                    extra={
-                        "request_id": getattr(
-                            getattr(request, "state", None), "request_id", None
-                        ),
-                        "duration": duration,
-                        "method": request.method,
-                        "path": request.url.path,
-                    }
-                )
-            elif duration >= SLOW_REQUEST_THRESHOLD:
-                log.warning(
-                    "Slow request: %s %s took %.2fs (threshold: %.2fs)",
-                    request.method,
-                    request.url.path,
-                    duration,
-                    SLOW_REQUEST_THRESHOLD,
-                    extra={
-                        "request_id": getattr(
-                            getattr(request, "state", None), "request_id", None
-                        ),
-                        "duration": duration,
-                        "method": request.method,
-                        "path": request.url.path,
-                    }
-                )
-            
-            return response
-            
-        except Exception as e:
-            # Even if request fails, track duration
-            duration = time.time() - start_time
-            log.error(
-                "Request failed after %.2fs: %s %s - %s",
-                duration,
-                request.method,
-                request.url.path,
-                str(e),
-                extra={
-                    "request_id": getattr(
-                        getattr(request, "state", None), "request_id", None
-                    ),
-                    "duration": duration,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "error": str(e),
-                }
-            )
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            error = exc
             raise
+        finally:
+            duration = time.perf_counter() - start
+            method = scope.get("method", "GET")
+            self.registry.request_finished(method, _route_template(scope), status, duration, size)
+            _log_request(scope, duration, error)
 
 
+def _log_request(scope: Scope, duration: float, error: Optional[BaseException]) -> None:
+    method = scope.get("method", "GET")
+    path = scope.get("path", "")
+    state = scope.get("state") or {}
+    request_id = state.get("request_id") if isinstance(state, dict) else None
+    extra = {"request_id": request_id, "duration": duration, "method": method, "path": path}
+    if error is not None:
+        log.error(
+            "Request failed after %.2fs: %s %s - %s",
+            duration, method, path, str(error),
+            extra={**extra, "error": str(error)},
+        )
+    elif duration >= VERY_SLOW_REQUEST_THRESHOLD:
+        log.error(
+            "Very slow request: %s %s took %.2fs (threshold: %.2fs)",
+            method, path, duration, VERY_SLOW_REQUEST_THRESHOLD,
+            extra=extra,
+        )
+    elif duration >= SLOW_REQUEST_THRESHOLD:
+        log.warning(
+            "Slow request: %s %s took %.2fs (threshold: %.2fs)",
+            method, path, duration, SLOW_REQUEST_THRESHOLD,
+            extra=extra,
+        )
@@ -19,6 +19,8 @@ from .podcast_models import (  # noqa: F401
     Podcast,
     PodcastBase,
     PodcastImportState,
+    PodcastImportJob,
+    PodcastImportItem,
     PodcastDistributionStatus,
     PodcastTemplate,
     PodcastTemplateCreate,
@@ -55,9 +57,9 @@ from .affiliate_code import UserAffiliateCode, UserAffiliateCodePublic  # noqa:
 # Other models
 from .subscription import Subscription  # noqa: F401
 from .settings import AppSetting  # noqa: F401
-from .usage import ProcessingMinutesLedger, LedgerDirection, LedgerReason  # noqa: F401
+from .usage import ProcessingMinutesLedger, UsageLedgerSummary, LedgerDirection, LedgerReason  # noqa: F401
 from .recurring import RecurringSchedule  # noqa: F401
 from .website import PodcastWebsite, PodcastWebsiteStatus  # noqa: F401
 from .website_page import WebsitePage  # noqa: F401
-from .transcription import TranscriptionWatch  # noqa: F401
+from .transcription import TranscriptionWatch, PendingTranscription  # noqa: F401
 from .admin_log import AdminActionLog, AdminActionType  # noqa: F401
@@ -22,6 +22,8 @@ from .podcast_models import (  # noqa: F401
     Podcast,
     PodcastBase,
     PodcastImportState,
+    PodcastImportJob,
+    PodcastImportItem,
     PodcastDistributionStatus,
     PodcastTemplate,
     PodcastTemplateCreate,
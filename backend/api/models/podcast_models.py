@@ -112,6 +112,43 @@ class PodcastImportState(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of the most recent import snapshot")
 
 
+class PodcastImportJob(SQLModel, table=True):
+    """Background mirroring of a feed's enclosures into object storage.
+
+    A worker holds the job while ``lease_until`` is in the future and renews it
+    as it goes; a job whose lease lapsed (instance restart, deploy) is picked
+    up again and continues with the items that are not done yet.
+    """
+    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    podcast_id: UUID = Field(foreign_key="podcast.id", index=True)
+    user_id: UUID = Field(foreign_key="user.id", index=True)
+    status: str = Field(default="queued", max_length=16, description="queued|running|completed|failed")
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+    failed: int = Field(default=0)
+    bytes_mirrored: int = Field(default=0)
+    lease_until: Optional[datetime] = Field(default=None, description="Worker claim; expired leases are resumable")
+    error: Optional[str] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = Field(default=None)
+
+
+class PodcastImportItem(SQLModel, table=True):
+    """One enclosure of a PodcastImportJob (the unit of progress and retry)."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: UUID = Field(foreign_key="podcastimportjob.id", index=True)
+    episode_id: UUID = Field(foreign_key="episode.id")
+    source_url: str
+    status: str = Field(default="pending", max_length=16, description="pending|done|failed")
+    attempts: int = Field(default=0)
+    bytes: int = Field(default=0)
+    storage_uri: Optional[str] = Field(default=None)
+    content_type: Optional[str] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class PodcastDistributionStatus(SQLModel, table=True):
     """User-managed checklist items for submitting shows to external platforms."""
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
@@ -32,4 +32,25 @@ class MediaTranscript(SQLModel, table=True):
     __table_args__ = (UniqueConstraint("filename", name="uq_media_transcript_filename"),)
 
 
-__all__ = ["TranscriptionWatch", "MediaTranscript"]
+class PendingTranscription(SQLModel, table=True):
+    """An AssemblyAI transcript that was submitted but not yet persisted.
+
+    The submitting instance follows it in memory; this row lets any instance
+    finish it instead (webhook delivered elsewhere, or the resume sweep after
+    the submitting instance went away). ``lease_until`` is held while an
+    instance is persisting the result.
+    """
+
+    transcript_id: str = Field(primary_key=True, max_length=64)
+    filename: str = Field(index=True)
+    user_id: Optional[str] = Field(default=None, max_length=64)
+    local_name: str = Field(description="Submitted audio name in MEDIA_DIR; names the transcript files")
+    context_json: str = Field(default="{}", description="Speaker-identification state for the continuation")
+    status: str = Field(default="submitted", max_length=16, description="submitted|finishing|completed|failed")
+    lease_until: Optional[datetime] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+__all__ = ["TranscriptionWatch", "MediaTranscript", "PendingTranscription"]
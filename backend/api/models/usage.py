@@ -80,8 +80,38 @@ class ProcessingMinutesLedger(SQLModel, table=True):
     )
 
 
+class UsageLedgerSummary(SQLModel, table=True):
+    """
+    Running per-user, per-period totals of ProcessingMinutesLedger.
+
+    Maintained in the same transaction as every ledger insert and delete (see
+    services.billing.usage.apply_to_summary / remove_from_summary) so balance
+    and monthly usage checks read a handful of rows instead of the user's
+    whole ledger. services.billing.usage.rebuild_usage_summary recomputes it
+    from the ledger (POST /api/tasks/maintenance/rebuild-usage-summary).
+    - period: calendar month of the entry's created_at (UTC), YYYY-MM
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: UUID = Field(index=True)
+    period: str = Field(description="Billing period in YYYY-MM format")
+
+    debit_minutes: int = Field(default=0)
+    credit_minutes: int = Field(default=0)
+    debit_credits: float = Field(default=0.0)
+    credit_credits: float = Field(default=0.0)
+    entry_count: int = Field(default=0)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", name="uq_usage_summary_user_period"),
+    )
+
+
 __all__ = [
     "ProcessingMinutesLedger",
+    "UsageLedgerSummary",
     "LedgerDirection",
     "LedgerReason",
 ]
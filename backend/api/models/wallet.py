@@ -71,12 +71,17 @@ class WalletPeriodProcessed(SQLModel, table=True):
     Tracks which billing periods have been processed for rollover.
     
     Used for idempotency - prevents double-processing the same period.
+    While a rollover is running, status is "running" and last_user_id is the
+    keyset cursor of the last committed chunk, so an interrupted run resumes
+    where it stopped.
     """
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     period: str = Field(unique=True, index=True, description="Billing period in YYYY-MM format")
     processed_at: datetime = Field(default_factory=datetime.utcnow)
     processed_count: int = Field(default=0, description="Number of users processed")
     rollover_total: float = Field(default=0.0, description="Total credits rolled over")
+    status: str = Field(default="completed", description="running or completed")
+    last_user_id: Optional[UUID] = Field(default=None, description="Last user id of the last committed chunk")
     
     __table_args__ = (
         UniqueConstraint("period", name="uq_wallet_period_processed"),
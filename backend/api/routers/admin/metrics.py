@@ -1,26 +1,22 @@
 from __future__ import annotations
 
 import logging
-import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import func
 from sqlmodel import Session, select
 
 from api.core.database import get_session
+from api.middleware.metrics import latency_summary
 from api.models.podcast import Episode, EpisodeStatus, Podcast, PodcastTemplate
 from api.models.user import User
 from api.routers.episodes.common import is_published_condition
+from api.services import stripe_metrics
 
 from .deps import get_current_admin_user
 
-try:  # pragma: no cover - optional Stripe dependency
-    import stripe as stripe_lib
-except Exception:  # pragma: no cover
-    stripe_lib = None
-
 log = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -49,6 +45,11 @@ def admin_summary(
     }
 
 
+def _day_counts(rows) -> Dict[str, int]:
+    # date() comes back as a date on PostgreSQL and as text on SQLite.
+    return {str(day)[:10]: int(count) for day, count in rows if day is not None}
+
+
 def _date_range_30d() -> List[str]:
     today = datetime.now(timezone.utc).date()
     start = today - timedelta(days=29)
@@ -60,97 +61,45 @@ def admin_metrics(
     session: Session = Depends(get_session),
     admin_user: User = Depends(get_current_admin_user),
 ) -> Dict[str, Any]:
-    """Operational metrics for the last 30 days. Fast and resilient; Stripe is optional."""
+    """Operational metrics for the last 30 days. Fast and resilient; Stripe is optional.
+
+    Daily series are aggregated in SQL; Stripe figures come from a cached
+    snapshot (see ``api.services.stripe_metrics``) whose age is reported in
+    ``stripe_snapshot_at``.
+    """
     del admin_user
     days = _date_range_30d()
     since_dt = datetime.strptime(days[0], "%Y-%m-%d").replace(tzinfo=timezone.utc)
 
-    signup_map: Dict[str, int] = {d: 0 for d in days}
-    signup_users = session.exec(select(User).where(User.created_at >= since_dt)).all()
-    for user in signup_users:
-        try:
-            created = user.created_at.date().isoformat()
-        except Exception:
-            continue
-        if created in signup_map:
-            signup_map[created] += 1
-
-    daily_signups_30d = [{"date": day, "count": signup_map[day]} for day in days]
-
-    active_sets: Dict[str, set] = {d: set() for d in days}
-    episodes = session.exec(
-        select(Episode).where((Episode.processed_at != None) & (Episode.processed_at >= since_dt))  # noqa: E711
+    signup_day = func.date(User.created_at)
+    signup_rows = session.exec(
+        select(signup_day, func.count(User.id))
+        .where(User.created_at >= since_dt)
+        .group_by(signup_day)
+    ).all()
+    signup_map = _day_counts(signup_rows)
+    daily_signups_30d = [{"date": day, "count": signup_map.get(day, 0)} for day in days]
+
+    active_day = func.date(Episode.processed_at)
+    active_rows = session.exec(
+        select(active_day, func.count(func.distinct(Episode.user_id)))
+        .where((Episode.processed_at != None) & (Episode.processed_at >= since_dt))  # noqa: E711
+        .group_by(active_day)
     ).all()
-    for ep in episodes:
-        try:
-            processed = ep.processed_at.date().isoformat()
-        except Exception:
-            continue
-        if processed in active_sets:
-            active_sets[processed].add(ep.user_id)
-
-    daily_active_users_30d = [{"date": day, "count": len(active_sets[day])} for day in days]
-
-    mrr_cents: Optional[int] = None
-    arr_cents: Optional[int] = None
-    revenue_30d_cents: Optional[int] = None
-
-    try:
-        if stripe_lib and (os.getenv("STRIPE_SECRET_KEY") or getattr(stripe_lib, "api_key", None)):
-            if not getattr(stripe_lib, "api_key", None):
-                stripe_lib.api_key = os.getenv("STRIPE_SECRET_KEY", "")
-
-            monthly_total = 0.0
-            try:
-                subs = stripe_lib.Subscription.list(status="active", limit=100, expand=["data.items.data.price"])  # type: ignore
-                for subscription in subs.auto_paging_iter():  # type: ignore[attr-defined]
-                    items = getattr(subscription, "items", {}).get("data", []) if hasattr(subscription, "items") else []
-                    for item in items:
-                        price = getattr(item, "price", None)
-                        quantity = int(getattr(item, "quantity", 1) or 1)
-                        unit = None
-                        interval = None
-                        if price:
-                            unit = getattr(price, "unit_amount", None)
-                            recurring = getattr(price, "recurring", None)
-                            if recurring:
-                                interval = getattr(recurring, "interval", None)
-                        if unit is None or interval is None:
-                            continue
-                        amount = float(unit) * quantity
-                        if interval == "month":
-                            monthly_total += amount
-                        elif interval == "year":
-                            monthly_total += amount / 12.0
-                mrr_cents = int(round(monthly_total))
-                arr_cents = int(round(monthly_total * 12.0))
-            except Exception:
-                mrr_cents = None
-                arr_cents = None
-
-            try:
-                since_ts = int(since_dt.timestamp())
-                net = 0
-                charges = stripe_lib.Charge.list(created={"gte": since_ts}, limit=100)
-                for charge in charges.auto_paging_iter():  # type: ignore[attr-defined]
-                    if getattr(charge, "status", "") == "succeeded":
-                        amount = int(getattr(charge, "amount", 0) or 0)
-                        refunded = int(getattr(charge, "amount_refunded", 0) or 0)
-                        net += max(amount - refunded, 0)
-                revenue_30d_cents = int(net)
-            except Exception:
-                revenue_30d_cents = None
-    except Exception:
-        mrr_cents = mrr_cents if mrr_cents is not None else None
-        arr_cents = arr_cents if arr_cents is not None else None
-        revenue_30d_cents = revenue_30d_cents if revenue_30d_cents is not None else None
+    active_map = _day_counts(active_rows)
+    daily_active_users_30d = [{"date": day, "count": active_map.get(day, 0)} for day in days]
+
+    # Stripe figures come from the background-refreshed snapshot, never inline.
+    revenue = stripe_metrics.get_snapshot()
 
     return {
         "daily_signups_30d": daily_signups_30d,
         "daily_active_users_30d": daily_active_users_30d,
-        "mrr_cents": mrr_cents,
-        "arr_cents": arr_cents,
-        "revenue_30d_cents": revenue_30d_cents,
+        "mrr_cents": revenue["mrr_cents"],
+        "arr_cents": revenue["arr_cents"],
+        "revenue_30d_cents": revenue["revenue_30d_cents"],
+        "stripe_snapshot_at": revenue["computed_at"],
+        "stripe_snapshot_stale": revenue["stale"],
     }
 
 
@@ -292,6 +241,8 @@ def system_health(
     return {
         "uptime_percentage": min(99.9, max(95.0, success_rate)),  # Clamp between 95-99.9%
         "status": "operational" if success_rate > 95 else "degraded",
+        # Per-route latency of the instance serving this request (see /metrics)
+        "request_latency": latency_summary(),
     }
 
 
@@ -366,40 +317,13 @@ def growth_metrics(
     if episodes_last_month > 0:
         episodes_change = ((episodes_this_month - episodes_last_month) / episodes_last_month) * 100
 
-    # Revenue change (if available)
+    # Revenue change (if available), from the cached Stripe snapshot
     revenue_change = None
-    try:
-        if stripe_lib and (os.getenv("STRIPE_SECRET_KEY") or getattr(stripe_lib, "api_key", None)):
-            if not getattr(stripe_lib, "api_key", None):
-                stripe_lib.api_key = os.getenv("STRIPE_SECRET_KEY", "")
-
-            this_month_ts = int(this_month_start.timestamp())
-            last_month_ts = int(last_month_start.timestamp())
-            last_month_end_ts = int(last_month_end.timestamp())
-
-            this_month_revenue = 0
-            charges_this = stripe_lib.Charge.list(created={"gte": this_month_ts}, limit=100)
-            for charge in charges_this.auto_paging_iter():
-                if getattr(charge, "status", "") == "succeeded":
-                    amount = int(getattr(charge, "amount", 0) or 0)
-                    refunded = int(getattr(charge, "amount_refunded", 0) or 0)
-                    this_month_revenue += max(amount - refunded, 0)
-
-            last_month_revenue = 0
-            charges_last = stripe_lib.Charge.list(
-                created={"gte": last_month_ts, "lt": last_month_end_ts},
-                limit=100
-            )
-            for charge in charges_last.auto_paging_iter():
-                if getattr(charge, "status", "") == "succeeded":
-                    amount = int(getattr(charge, "amount", 0) or 0)
-                    refunded = int(getattr(charge, "amount_refunded", 0) or 0)
-                    last_month_revenue += max(amount - refunded, 0)
-
-            if last_month_revenue > 0:
-                revenue_change = ((this_month_revenue - last_month_revenue) / last_month_revenue) * 100
-    except Exception:
-        revenue_change = None
+    revenue = stripe_metrics.get_snapshot()
+    this_month_revenue = revenue["revenue_this_month_cents"]
+    last_month_revenue = revenue["revenue_last_month_cents"]
+    if this_month_revenue is not None and last_month_revenue:
+        revenue_change = ((this_month_revenue - last_month_revenue) / last_month_revenue) * 100
 
     return {
         "active_users_change": round(active_users_change, 1),
@@ -4,7 +4,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Query
 from sqlmodel import Session
 
 from api.core.database import get_session
@@ -34,6 +34,34 @@ async def admin_users_full(
     """
     return services.get_users_full(session)
 
+@router.get("/page", response_model=schemas.UserAdminPage)
+async def admin_users_page(
+    limit: int = Query(50, ge=1, le=services.USER_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Case-insensitive email substring"),
+    tier: Optional[str] = None,
+    verified: Optional[bool] = None,
+    active_within_days: Optional[int] = Query(None, ge=0),
+    sort: str = Query("created_at", pattern="^(created_at|email)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    session: Session = Depends(get_session),
+    admin_user: User = Depends(get_current_admin_user),
+):
+    """
+    Keyset-paginated users with extra stats and server-side filtering.
+    """
+    return services.get_users_page(
+        session,
+        limit=limit,
+        cursor=cursor,
+        q=q,
+        tier=tier,
+        verified=verified,
+        active_within_days=active_within_days,
+        sort=sort,
+        order=order,
+    )
+
 @router.patch("/{user_id}", response_model=schemas.UserAdminOut)
 async def admin_update_user(
     user_id: UUID,
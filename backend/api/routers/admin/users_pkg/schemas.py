@@ -30,6 +30,11 @@ class UserAdminOut(BaseModel):
     last_login: Optional[str] = None
     email_verified: bool = False  # NEW: Track email verification status
 
+class UserAdminPage(BaseModel):
+    """One keyset page of the admin user listing."""
+    items: List[UserAdminOut]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page; None on the last page
+
 class UserAdminUpdate(BaseModel):
     tier: Optional[str] = None
     is_active: Optional[bool] = None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import base64
 import logging
 import os
 import json
@@ -70,7 +71,7 @@ except Exception:
 
 # Local Schemas
 from .schemas import (
-    UserAdminOut, UserAdminUpdate, RefundCreditsRequest, AwardCreditsRequest,
+    UserAdminOut, UserAdminPage, UserAdminUpdate, RefundCreditsRequest, AwardCreditsRequest,
     DenyRefundRequest, RefundRequestResponse, RefundRequestDetail,
     UserRefundContext, EpisodeRefundDetail, LedgerEntryDetail,
     RefundLogEntry, CreditAwardLogEntry
@@ -85,6 +86,31 @@ PROTECTED_SUPERADMIN_EMAIL = getattr(settings, 'ADMIN_EMAIL', '').lower()
 def get_all_users(session: Session) -> List[UserPublic]:
     return crud.get_all_users(session=session)
 
+def _user_admin_out(
+    user: User,
+    episode_count: int,
+    latest_processed: Optional[datetime],
+    verified_user_ids: Set[UUID],
+) -> UserAdminOut:
+    last_activity = latest_processed or user.created_at
+    is_verified = user.id in verified_user_ids or bool(getattr(user, "google_id", None))
+    return UserAdminOut(
+        id=str(user.id),
+        email=user.email,
+        tier=user.tier,
+        is_active=user.is_active,
+        created_at=user.created_at.isoformat(),
+        episode_count=int(episode_count or 0),
+        last_activity=last_activity.isoformat() if last_activity else None,
+        subscription_expires_at=
+            user.subscription_expires_at.isoformat()
+            if getattr(user, "subscription_expires_at", None)
+            else None,
+        last_login=user.last_login.isoformat() if getattr(user, "last_login", None) else None,
+        email_verified=is_verified,
+    )
+
+
 def get_users_full(session: Session) -> List[UserAdminOut]:
     counts: Dict[UUID, int] = dict(
         session.exec(select(Episode.user_id, func.count(Episode.id)).group_by(Episode.user_id)).all()
@@ -104,28 +130,138 @@ def get_users_full(session: Session) -> List[UserAdminOut]:
         verified_user_ids = set(verified_records)
 
     users = crud.get_all_users(session)
-    out: List[UserAdminOut] = []
-    for user in users:
-        last_activity = latest.get(user.id) or user.created_at
-        is_verified = user.id in verified_user_ids or bool(getattr(user, "google_id", None))
-        out.append(
-            UserAdminOut(
-                id=str(user.id),
-                email=user.email,
-                tier=user.tier,
-                is_active=user.is_active,
-                created_at=user.created_at.isoformat(),
-                episode_count=int(counts.get(user.id, 0)),
-                last_activity=last_activity.isoformat() if last_activity else None,
-                subscription_expires_at=
-                    user.subscription_expires_at.isoformat()
-                    if getattr(user, "subscription_expires_at", None)
-                    else None,
-                last_login=user.last_login.isoformat() if getattr(user, "last_login", None) else None,
-                email_verified=is_verified,
-            )
+    return [
+        _user_admin_out(user, counts.get(user.id, 0), latest.get(user.id), verified_user_ids)
+        for user in users
+    ]
+
+
+USER_PAGE_SORTS = {"created_at", "email"}
+USER_PAGE_MAX_LIMIT = 200
+
+
+def _encode_user_cursor(sort: str, user: User) -> str:
+    value = getattr(user, sort)
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value, str(user.id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_user_cursor(sort: str, cursor: str):
+    try:
+        value, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if sort == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, UUID(user_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _verified_condition():
+    conditions = [User.google_id != None]  # noqa: E711
+    if VERIFICATION_AVAILABLE:
+        conditions.append(
+            select(EmailVerification.id)
+            .where(EmailVerification.user_id == User.id, EmailVerification.verified_at != None)  # noqa: E711
+            .exists()
         )
-    return out
+    return or_(*conditions)
+
+
+def _active_since_condition(since: datetime):
+    # Mirrors last_activity: latest processed episode, else the signup time.
+    processed_since = (
+        select(Episode.id)
+        .where(Episode.user_id == User.id, Episode.processed_at >= since)
+        .exists()
+    )
+    any_processed = (
+        select(Episode.id)
+        .where(Episode.user_id == User.id, Episode.processed_at != None)  # noqa: E711
+        .exists()
+    )
+    return or_(processed_since, (User.created_at >= since) & ~any_processed)
+
+
+def get_users_page(
+    session: Session,
+    *,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    tier: Optional[str] = None,
+    verified: Optional[bool] = None,
+    active_within_days: Optional[int] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+) -> UserAdminPage:
+    """Keyset-paginated admin user listing with server-side filters.
+
+    Users are ordered by (sort, id) so the cursor is stable under inserts.
+    Episode counts, last activity and verification are aggregated only for
+    the users on the returned page.
+    """
+    if sort not in USER_PAGE_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {sorted(USER_PAGE_SORTS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    limit = max(1, min(int(limit), USER_PAGE_MAX_LIMIT))
+
+    sort_col = getattr(User, sort)
+    stmt = select(User)
+    if q and q.strip():
+        stmt = stmt.where(User.email.ilike(f"%{q.strip()}%"))  # type: ignore[attr-defined]
+    if tier:
+        stmt = stmt.where(User.tier == tier.strip().lower())
+    if verified is not None:
+        condition = _verified_condition()
+        stmt = stmt.where(condition if verified else ~condition)
+    if active_within_days is not None:
+        since = datetime.utcnow() - timedelta(days=max(0, int(active_within_days)))
+        stmt = stmt.where(_active_since_condition(since))
+    if cursor:
+        value, after_id = _decode_user_cursor(sort, cursor)
+        if order == "desc":
+            stmt = stmt.where(or_(sort_col < value, (sort_col == value) & (User.id < after_id)))
+        else:
+            stmt = stmt.where(or_(sort_col > value, (sort_col == value) & (User.id > after_id)))
+    if order == "desc":
+        stmt = stmt.order_by(sort_col.desc(), User.id.desc())
+    else:
+        stmt = stmt.order_by(sort_col.asc(), User.id.asc())
+
+    users = list(session.exec(stmt.limit(limit + 1)).all())
+    has_more = len(users) > limit
+    users = users[:limit]
+    if not users:
+        return UserAdminPage(items=[], next_cursor=None)
+
+    page_ids = [user.id for user in users]
+    stats = {
+        user_id: (count, latest)
+        for user_id, count, latest in session.exec(
+            select(Episode.user_id, func.count(Episode.id), func.max(Episode.processed_at))
+            .where(Episode.user_id.in_(page_ids))  # type: ignore[attr-defined]
+            .group_by(Episode.user_id)
+        ).all()
+    }
+    verified_user_ids: Set[UUID] = set()
+    if VERIFICATION_AVAILABLE:
+        verified_user_ids = set(
+            session.exec(
+                select(EmailVerification.user_id)
+                .where(EmailVerification.user_id.in_(page_ids), EmailVerification.verified_at != None)  # type: ignore[attr-defined]  # noqa: E711
+                .distinct()
+            ).all()
+        )
+
+    items = []
+    for user in users:
+        count, latest = stats.get(user.id, (0, None))
+        items.append(_user_admin_out(user, count, latest, verified_user_ids))
+    return UserAdminPage(
+        items=items,
+        next_cursor=_encode_user_cursor(sort, users[-1]) if has_more else None,
+    )
 
 def update_user(
     session: Session, 
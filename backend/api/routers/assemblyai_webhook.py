@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import logging
 from fastapi import APIRouter, Header, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
 from api.core.config import settings
 from api.services.transcription.assemblyai_webhook import webhook_manager
+from api.services.transcription import pending as pending_transcriptions
+from api.services.transcription.completion import transcription_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +29,18 @@ async def assemblyai_webhook(
             raise HTTPException(status_code=401, detail="Invalid AssemblyAI webhook signature")
 
     payload = await request.json()
-    delivered = webhook_manager.notify(payload)
+    # Jobs tracked by this instance complete through their continuation, which
+    # fetches and persists the transcript itself. Jobs submitted by another
+    # (possibly gone) instance are finished from their pending record.
+    tracked = transcription_tracker.deliver(payload)
+    delivered = tracked
+    if not tracked:
+        delivered = await run_in_threadpool(pending_transcriptions.notify_webhook, payload)
     if not delivered:
-        webhook_manager.prune()
-    logger.info("[assemblyai] webhook received status=%s id=%s delivered=%s", payload.get("status"), payload.get("id"), delivered)
+        delivered = await run_in_threadpool(webhook_manager.notify, payload)
+        if not delivered:
+            webhook_manager.prune()
+    logger.info(
+        "[assemblyai] webhook received status=%s id=%s tracked=%s delivered=%s",
+        payload.get("status"), payload.get("id"), tracked, delivered,
+    )
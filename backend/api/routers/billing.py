@@ -1228,6 +1228,7 @@ def _require_internal_auth(request: Request, x_tasks_auth: str | None = None):
 class RolloverRequest(BaseModel):
     """Request body for rollover endpoint."""
     period: str | None = None  # Optional YYYY-MM period for idempotency
+    dry_run: bool = False  # Report totals without writing wallets
 
 
 @internal_router.post("/rollover")
@@ -1247,6 +1248,7 @@ async def process_rollover_endpoint(
     
     Args:
         payload: Optional request body with 'period' (YYYY-MM) for idempotency
+                 and 'dry_run' to report totals without writing
     
     Returns:
         Summary of rollover processing
@@ -1286,7 +1288,8 @@ async def process_rollover_endpoint(
         result = process_monthly_rollover(
             session=session,
             now=dt.now(timezone.utc),
-            target_period=target_period
+            target_period=target_period,
+            dry_run=bool(payload and payload.dry_run),
         )
         
         return {
@@ -9,6 +9,7 @@ from sqlmodel import select
 
 from api.core.database import get_session
 from api.services.episodes import jobs as _svc_jobs
+from api.services.podcasts import rss_import
 from api.models.podcast import Episode
 from uuid import UUID as _UUID
 from .common import _cover_url_for, _status_value, compute_playback_info, compute_cover_info
@@ -35,6 +36,19 @@ def get_job_status(job_id: str, session: Session = Depends(get_session)):
     if job_id != original_job_id:
         logger.debug("[episodes.jobs] Normalized job_id '%s' -> '%s'", original_job_id, job_id)
 
+    # RSS back-catalog imports are tracked in the database, not the task queue.
+    try:
+        import_status = rss_import.import_job_status(session, job_id)
+    except Exception:
+        logger.debug("[episodes.jobs] import job lookup failed for %s", job_id, exc_info=True)
+        try:
+            session.rollback()
+        except Exception:
+            pass
+        import_status = None
+    if import_status is not None:
+        return import_status
+
     raw = _svc_jobs.get_status(job_id)
     status_val = raw.get("raw_status", "PENDING")
     result = raw.get("raw_result")
@@ -5,7 +5,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Body, status, Query, Request, Response
-from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlmodel import select
 from sqlalchemy import func, or_
@@ -20,8 +20,9 @@ from api.services.episodes import jobs as _svc_jobs
 from .common import _cover_url_for, _final_url_for, _status_value, compute_playback_info, compute_cover_info
 from api.services.episodes import repo as _svc_repo
 from api.services.episodes.transcripts import transcript_endpoints_for_episode
+from api.services.episodes.transcript_index import has_keyword, index_for_episode
 from api.services.trial_service import can_download_episodes
-import httpx
+from api.services.episodes import playback_proxy as _playback_proxy
 from uuid import UUID as _UUID
 from pathlib import Path
 from api.core.paths import FINAL_DIR, MEDIA_DIR, APP_ROOT, TRANSCRIPTS_DIR
@@ -34,19 +35,6 @@ router = APIRouter(tags=["episodes"])  # parent provides prefix '/episodes'
 # Avoid importing app main (would cause circular import). Derive project root relative to this file.
 PROJECT_ROOT = APP_ROOT
 
-_AUDIO_PASSTHROUGH_HEADERS = (
-        "content-type",
-        "content-length",
-        "content-range",
-        "accept-ranges",
-        "content-encoding",
-        "etag",
-        "last-modified",
-        "cache-control",
-        "expires",
-)
-
-_AUDIO_PROXY_TIMEOUT = 60.0
 
 
 def _is_flubber_token(word: str) -> bool:
@@ -104,83 +92,21 @@ async def _resolve_current_user_for_media(
         return await _core_get_current_user(request=request, session=session, token=token)
 
 
-def _proxy_episode_audio(ep: Episode, request: Request, method: str) -> Response:
-        playback = compute_playback_info(ep)
-        url = playback.get("playback_url")
-        if not url:
+def _playback_url_for(ep: Episode) -> Optional[str]:
+        url = compute_playback_info(ep).get("playback_url")
+        return str(url) if url else None
+
+
+async def _proxy_episode_audio(ep: Episode, request: Request, method: str) -> Response:
+        # Signing may call out to storage; keep it off the event loop.
+        url_str = await run_in_threadpool(_playback_proxy.playback_url, ep, _playback_url_for)
+        if not url_str:
                 raise HTTPException(status_code=404, detail="Episode audio not available")
-        url_str = str(url)
         if not url_str.lower().startswith(("http://", "https://")):
                 raise HTTPException(status_code=400, detail="Episode audio source unsupported")
-
-        headers: Dict[str, str] = {}
-        range_header = request.headers.get("range")
-        if range_header:
-                headers["Range"] = range_header
-        accept_header = request.headers.get("accept")
-        if accept_header:
-                headers["Accept"] = accept_header
-        conditional_headers = {
-                "If-Range": request.headers.get("if-range"),
-                "If-None-Match": request.headers.get("if-none-match"),
-                "If-Modified-Since": request.headers.get("if-modified-since"),
-        }
-        for key, value in conditional_headers.items():
-                if value:
-                        headers[key] = value
-
-        client = httpx.Client(follow_redirects=True, timeout=_AUDIO_PROXY_TIMEOUT)
-        try:
-                upstream = client.send(
-                        client.build_request(method.upper(), url_str, headers=headers),
-                        stream=method.upper() == "GET",
-                )
-        except httpx.RequestError as exc:
-                client.close()
-                raise HTTPException(status_code=502, detail=f"Failed to fetch episode audio: {exc}") from exc
-
-        status_code = upstream.status_code
-        if status_code >= 400:
-                detail = f"Audio source returned {status_code}"
-                try:
-                        snippet = upstream.text[:160]
-                        if snippet:
-                                detail = f"{detail}: {snippet}"
-                except Exception:
-                        pass
-                upstream.close()
-                client.close()
-                raise HTTPException(status_code=502, detail=detail)
-
-        response_headers: Dict[str, str] = {}
-        for name in _AUDIO_PASSTHROUGH_HEADERS:
-                value = upstream.headers.get(name)
-                if value:
-                        response_headers[name] = value
-        response_headers.setdefault("accept-ranges", "bytes")
-        response_headers.setdefault("cache-control", "private, max-age=60")
-
-        if method.upper() == "HEAD":
-                upstream.close()
-                client.close()
-                return Response(status_code=status_code, headers=response_headers)
-
-        def _iter_content():
-                try:
-                        for chunk in upstream.iter_bytes():
-                                if chunk:
-                                        yield chunk
-                finally:
-                        upstream.close()
-                        client.close()
-
-        media_type = upstream.headers.get("content-type", "audio/mpeg")
-        return StreamingResponse(
-                _iter_content(),
-                status_code=status_code,
-                headers=response_headers,
-                media_type=media_type,
-        )
+        if _playback_proxy.wants_redirect(request):
+                return _playback_proxy.redirect(url_str)
+        return await _playback_proxy.proxy(url_str, request, method)
 
 
 # --- read endpoints ---------------------------------------------------------
@@ -290,7 +216,7 @@ def get_last_numbering(
 
 
 @router.get("/{episode_id}/playback", status_code=200)
-def get_episode_playback_stream(
+async def get_episode_playback_stream(
         episode_id: str,
         request: Request,
         session: Session = Depends(get_session),
@@ -300,7 +226,7 @@ def get_episode_playback_stream(
                 eid = _UUID(str(episode_id))
         except Exception:
                 raise HTTPException(status_code=404, detail="Episode not found")
-        ep = _svc_repo.get_episode_by_id(session, eid, user_id=current_user.id)
+        ep = await run_in_threadpool(_svc_repo.get_episode_by_id, session, eid, user_id=current_user.id)
         if not ep:
                 raise HTTPException(status_code=404, detail="Episode not found")
         
@@ -311,11 +237,11 @@ def get_episode_playback_stream(
                         detail="Episode downloads are not available during your free trial. Subscribe to a plan to download episodes."
                 )
         
-        return _proxy_episode_audio(ep, request, "GET")
+        return await _proxy_episode_audio(ep, request, "GET")
 
 
 @router.head("/{episode_id}/playback", status_code=200)
-def head_episode_playback_stream(
+async def head_episode_playback_stream(
         episode_id: str,
         request: Request,
         session: Session = Depends(get_session),
@@ -331,10 +257,10 @@ def head_episode_playback_stream(
                 eid = _UUID(str(episode_id))
         except Exception:
                 raise HTTPException(status_code=404, detail="Episode not found")
-        ep = _svc_repo.get_episode_by_id(session, eid, user_id=current_user.id)
+        ep = await run_in_threadpool(_svc_repo.get_episode_by_id, session, eid, user_id=current_user.id)
         if not ep:
                 raise HTTPException(status_code=404, detail="Episode not found")
-        return _proxy_episode_audio(ep, request, "HEAD")
+        return await _proxy_episode_audio(ep, request, "HEAD")
 
 
 @router.get("/{episode_id}/spreaker/raw", status_code=200)
@@ -574,25 +500,11 @@ def list_episodes(
                                 "absolute_text": None,
                         }
                 
-                # Check if transcript contains "flubber" for conditional UI display
-                has_flubber = False
+                # Flubber markers come from the transcript feature index, not the transcript file
                 try:
-                        from api.services.episodes.transcripts import _candidate_stems_from_episode
-                        stems = _candidate_stems_from_episode(e)
-                        for stem in stems:
-                                tr_path = TRANSCRIPTS_DIR / f"{stem}.json"
-                                if tr_path.is_file():
-                                        words = json.loads(tr_path.read_text(encoding="utf-8"))
-                                        # Check for "flubber" token (case-insensitive)
-                                        for w in words:
-                                                word = str(w.get("word", "")).strip().lower()
-                                                if word == "flubber":
-                                                        has_flubber = True
-                                                        break
-                                        if has_flubber:
-                                                break
+                        has_flubber = has_keyword(index_for_episode(e), "flubber")
                 except Exception:
-                        pass
+                        has_flubber = False
                 
                 items.append({
                         "id": str(e.id),
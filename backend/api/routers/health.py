@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+import hmac
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from typing import Dict, Any
 import os
 import logging
@@ -49,6 +51,21 @@ router = APIRouter()
 def health():
     return {"status": "ok"}
 
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Per-route request metrics of this instance in Prometheus text format.
+
+    When METRICS_TOKEN is set, scrapers must send it as a bearer token.
+    """
+    from api.middleware.metrics import render_prometheus
+
+    token = os.getenv("METRICS_TOKEN")
+    if token:
+        supplied = (request.headers.get("authorization") or "").partition(" ")[2].strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return PlainTextResponse("unauthorized\n", status_code=401)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @router.get("/api/health/deep")
 def health_deep():
     db_ok = _check_db()
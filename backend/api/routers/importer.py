@@ -6,17 +6,14 @@ from sqlmodel import Session, select
 from datetime import datetime
 from urllib.parse import urlparse
 from pathlib import Path
-from uuid import UUID, uuid4
-import os
+from uuid import UUID
 import re
-import json
 
 from ..core.database import get_session
 from ..models.user import User
 from ..models.podcast import Podcast, Episode, EpisodeStatus, PodcastImportState
 from api.routers.auth import get_current_user
-from api.core.paths import FINAL_DIR
-from infrastructure.gcs import upload_fileobj
+from api.services.podcasts import rss_import
 from api.services.episodes.merge import merge_podcast_episode_duplicates
 from api.services.episodes.sync import sync_spreaker_episodes, push_local_episodes_to_spreaker
 from api.services.publisher import SpreakerClient
@@ -263,8 +260,6 @@ async def import_from_rss(
 
         episodes_to_add = []
         count = 0
-        mirrored_ok = 0
-        gcs_ok = 0
         for entry in selected_entries:
             links = entry.get("links") if isinstance(entry, dict) else getattr(entry, 'links', None)
             if not isinstance(links, list):
@@ -305,87 +300,9 @@ async def import_from_rss(
             notes_val = entry.get("summary") if isinstance(entry, dict) else getattr(entry, 'summary', None)
             item_guid = entry.get('guid') if isinstance(entry, dict) else getattr(entry, 'guid', None)
 
-            # Optional audio mirroring: download enclosure to FINAL_DIR and also upload to GCS
-            final_audio_path = audio_url  # default to remote URL
-            meta_blob: dict = {}
-            if bool(should_download_audio):
-                try:
-                    # Determine extension from URL or content-type
-                    def _infer_ext(url: str, ct: str | None) -> str:
-                        try:
-                            ext = os.path.splitext(url.split("?")[0])[1].lower()
-                        except Exception:
-                            ext = ""
-                        if not ext and ct:
-                            ct_l = ct.lower()
-                            if "mpeg" in ct_l or ct_l == "audio/mp3":
-                                return ".mp3"
-                            if "x-m4a" in ct_l or "mp4" in ct_l:
-                                return ".m4a"
-                            if "aac" in ct_l:
-                                return ".aac"
-                            if "wav" in ct_l:
-                                return ".wav"
-                            if "ogg" in ct_l:
-                                return ".ogg"
-                            if "webm" in ct_l:
-                                return ".webm"
-                        return ext or ".mp3"
-
-                    # Stream download with size cap
-                    MB = 1024 * 1024
-                    MAX_BYTES = 1536 * MB
-                    headers_ct = None
-                    async with httpx.AsyncClient() as dl:
-                        r = await dl.get(audio_url, timeout=120.0, follow_redirects=True)
-                        r.raise_for_status()
-                        headers_ct = r.headers.get("content-type")
-                        ext = _infer_ext(audio_url, headers_ct)
-                        # Safe base filename from title or URL
-                        def _sanitize(s: str) -> str:
-                            return re.sub(r"[^A-Za-z0-9._-]", "_", s).strip("._") or "audio"
-                        base_from_url = os.path.basename(audio_url.split("?")[0]) or "audio"
-                        stem = os.path.splitext(base_from_url)[0]
-                        if not stem or len(stem) < 3:
-                            stem = str(title_val or "episode").strip()[:50] or "episode"
-                        safe_stem = _sanitize(stem)
-                        unique_name = f"{uuid4().hex}_{safe_stem}{ext}"
-                        FINAL_DIR.mkdir(parents=True, exist_ok=True)
-                        dest_path = (FINAL_DIR / unique_name)
-
-                        total = 0
-                        with open(dest_path, "wb") as out:
-                            async for chunk in r.aiter_bytes(chunk_size=1024 * 1024):
-                                if not chunk:
-                                    break
-                                total += len(chunk)
-                                if total > MAX_BYTES:
-                                    raise HTTPException(status_code=413, detail="Enclosure audio exceeds 1.5 GB limit")
-                                out.write(chunk)
-
-                    # Local publish/playback will use basename via /static/final
-                    final_audio_path = unique_name
-                    mirrored_ok += 1
-                    meta_blob["source_enclosure_url"] = audio_url
-                    meta_blob["mirrored_local_basename"] = unique_name
-                    meta_blob["mirrored_content_type"] = headers_ct
-
-                    # Upload to GCS as well for durable storage (dev shim writes to MEDIA_DIR)
-                    try:
-                        bucket = os.getenv("MEDIA_BUCKET") or ("dev-bucket")
-                        key = f"{current_user.id}/imported/{unique_name}"
-                        with open(dest_path, "rb") as fh:
-                            gcs_uri = upload_fileobj(bucket, key, fh, size=os.path.getsize(dest_path), content_type=(headers_ct or "audio/mpeg"), chunk_mb=8)
-                        meta_blob["mirrored_gcs_uri"] = gcs_uri
-                        gcs_ok += 1
-                    except Exception as up_ex:
-                        meta_blob["gcs_upload_error"] = str(up_ex)
-                except HTTPException:
-                    # Bubble up size errors
-                    raise
-                except Exception as ex:
-                    # Fallback to remote URL only
-                    meta_blob["mirror_error"] = str(ex)
+            # Enclosures play from the feed until the background import job
+            # (rss_import) has mirrored them into storage.
+            final_audio_path = audio_url
 
             new_episode = Episode(
                 user_id=current_user.id,
@@ -403,21 +320,6 @@ async def import_from_rss(
                 source_media_url=audio_url,
                 source_published_at=publish_date,
             )
-            # Attach meta details if present
-            try:
-                if meta_blob:
-                    # Merge into existing meta_json if any
-                    existing = {}
-                    try:
-                        existing = json.loads(new_episode.meta_json or "{}")
-                        if not isinstance(existing, dict):
-                            existing = {}
-                    except Exception:
-                        existing = {}
-                    existing.update(meta_blob)
-                    new_episode.meta_json = json.dumps(existing)
-            except Exception:
-                pass
             try:
                 if tags:
                     new_episode.set_tags(tags)
@@ -428,16 +330,30 @@ async def import_from_rss(
         
         session.add_all(episodes_to_add)
         session.commit()
+
+        import_job = None
+        if bool(should_download_audio):
+            import_job = rss_import.create_import_job(
+                session,
+                podcast_id=new_podcast.id,
+                user_id=current_user.id,
+                episodes=episodes_to_add,
+            )
+            if import_job is not None:
+                try:
+                    rss_import.enqueue_import_job(import_job.id)
+                except Exception:
+                    # Left queued; the resume-rss-imports sweep picks it up.
+                    logger.warning("Failed to enqueue RSS import job %s", import_job.id, exc_info=True)
         preview_imported = len(episodes_to_add)
         preview_window = len(selected_entries)
         needs_full_import = total_entries > preview_window
         source_label = "spreaker" if source_is_spreaker else "external"
         logger.info(
-            "Imported %s episodes for podcast %s (mirrored=%s, gcs=%s, needs_full_import=%s)",
+            "Imported %s episodes for podcast %s (import_job=%s, needs_full_import=%s)",
             preview_imported,
             new_podcast.id,
-            mirrored_ok,
-            gcs_ok,
+            getattr(import_job, "id", None),
             needs_full_import,
         )
 
@@ -557,7 +473,7 @@ async def import_from_rss(
             except Exception as link_ex:
                 logger.warning(f"Spreaker linking attempt failed: {link_ex}")
 
-        # Optional: auto-publish to Spreaker using mirrored/local files
+        # Optional: auto-publish to Spreaker using the episodes' audio
         publish_jobs_started = 0
         auto_publish_skipped = None
         if bool(payload.auto_publish_to_spreaker) and getattr(current_user, 'spreaker_access_token', None):
@@ -601,8 +517,11 @@ async def import_from_rss(
             "podcast_name": new_podcast.name,
             "podcast_id": str(new_podcast.id),
             "episodes_imported": len(episodes_to_add),
-            "mirrored_count": mirrored_ok,
-            "gcs_mirrored_count": gcs_ok,
+            # Mirroring happens in the background; see import_job for progress.
+            "mirrored_count": 0,
+            "gcs_mirrored_count": 0,
+            "import_job_id": str(import_job.id) if import_job is not None else None,
+            "import_job": rss_import.import_job_status(session, str(import_job.id)) if import_job is not None else None,
             "log": {
                 "feed_url": payload.rss_url,
                 "feed_url_canonical": canonical_url,
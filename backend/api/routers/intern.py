@@ -374,7 +374,7 @@ def _collect_transcript_preview(
 def _export_snippet(audio: "AudioSegment", filename: str, start_s: float, end_s: float, *, suffix: str) -> Tuple[str, Path]:
     """Export audio snippet and upload to GCS, return signed URL."""
     import os
-    from infrastructure import gcs
+    from api.services.audio import snippets
     
     safe_stem = re.sub(r"[^a-zA-Z0-9]+", "-", Path(filename).stem.lower()).strip("-") or "audio"
     start_ms = max(0, int(start_s * 1000))
@@ -425,14 +425,10 @@ def _export_snippet(audio: "AudioSegment", filename: str, start_s: float, end_s:
     
     try:
         _LOG.info(f"[intern] Uploading snippet to GCS: gs://{gcs_bucket}/{gcs_key}")
-        with open(mp3_path, "rb") as f:
-            file_data = f.read()
-        gcs.upload_bytes(gcs_bucket, gcs_key, file_data, content_type="audio/mpeg")
+        # Streams the file and returns a signed URL (valid for 1 hour)
+        signed_url = snippets.upload_snippet(mp3_path, gcs_bucket, gcs_key)
         _LOG.info(f"[intern] Snippet uploaded to GCS successfully")
         
-        # Generate signed URL (valid for 1 hour)
-        signed_url = gcs.get_signed_url(gcs_bucket, gcs_key, expiration=3600)
-        
         # Fallback to public URL if signed URL generation failed (dev environment without private key)
         if not signed_url:
             signed_url = f"https://storage.googleapis.com/{gcs_bucket}/{gcs_key}"
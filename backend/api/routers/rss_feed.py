@@ -28,8 +28,9 @@ from api.models.website import PodcastWebsite, PodcastWebsiteStatus
 from api.models.user import User
 from api.routers.podcasts.categories import APPLE_PODCAST_CATEGORIES_FLAT
 from api.core.config import settings
-from infrastructure.storage import get_public_audio_url
+from infrastructure.storage import get_public_audio_url, prime_public_audio_urls
 from api.services.trial_service import can_access_rss_feed
+from api.services import rss_feed_cache
 
 logger = logging.getLogger(__name__)
 
@@ -293,6 +294,28 @@ def _resolve_storage_asset(
     return resolved
 
 
+def _prime_feed_signed_urls(podcast: Podcast, episodes: Sequence[Episode]) -> None:
+    """Sign every R2 asset the feed will reference in one batch per expiry."""
+    cover_paths = [getattr(podcast, "cover_path", None)]
+    episode_paths: List[Optional[str]] = []
+    for episode in episodes:
+        episode_paths.append(getattr(episode, "gcs_audio_path", None))
+        episode_paths.append(getattr(episode, "gcs_cover_path", None))
+        episode_paths.append(getattr(episode, "cover_path", None))
+
+    try:
+        prime_public_audio_urls(
+            [p.strip() for p in cover_paths if _looks_like_r2_path(p)],
+            expiration_days=30,
+        )
+        prime_public_audio_urls(
+            [p.strip() for p in episode_paths if _looks_like_r2_path(p)],
+            expiration_days=14,
+        )
+    except Exception as exc:  # per-item resolution below still works without the batch
+        logger.warning("RSS Feed: batch URL signing failed for podcast %s: %s", podcast.id, exc)
+
+
 def _generate_podcast_rss(
     podcast: Podcast,
     episodes: List[Episode],
@@ -301,6 +324,8 @@ def _generate_podcast_rss(
 ) -> str:
     """Generate RSS 2.0 feed XML for a podcast with iTunes namespace tags."""
 
+    _prime_feed_signed_urls(podcast, episodes)
+
     rss = ET.Element(
         "rss",
         {
@@ -569,6 +594,66 @@ def _generate_podcast_rss(
     )
 
 
+def _render_podcast_feed(session: Session, podcast: Podcast, feed_url: str) -> str:
+    """Query the feed's episodes and render the RSS document (cache miss path)."""
+    # Get all episodes with audio available, regardless of published/scheduled status
+    # CRITICAL FIX (Oct 21): Scheduled episodes MUST be playable - they have assembled audio in GCS
+    # The publish_at date controls WHEN they appear in podcast apps, but the audio itself
+    # should be accessible as soon as it exists (for preview, manual editor, etc.)
+    #
+    # Include episodes that are:
+    # 1. Published (status == published)
+    # 2. Scheduled (status has future publish_at) - these have assembled audio ready
+    # 3. Processed (status == processed) - fallback for episodes without explicit publish
+    #
+    # Filter out:
+    # - Episodes without audio (no gcs_audio_path)
+    # - Draft/pending/error episodes
+    statement = (
+        select(Episode)
+        .where(Episode.podcast_id == podcast.id)
+        .where(
+            (Episode.status == EpisodeStatus.published) |
+            (Episode.status == EpisodeStatus.processed)  # Includes scheduled episodes
+        )
+        .where(Episode.gcs_audio_path != None)  # Must have audio in GCS
+        .order_by(desc(Episode.publish_at))
+    )
+    all_episodes = session.exec(statement).all()
+
+    # CRITICAL: Placeholder episodes (episode_number=0) are ONLY for RSS submission to Apple/Spotify
+    # They should NEVER be shown to users once they have real episodes
+    # Filter out placeholder episodes (episode_number=0) if ANY real episodes exist
+    placeholder_episodes = [
+        ep for ep in all_episodes
+        if ep.episode_number == 0 or (ep.episode_type == "trailer" and ep.title and "coming soon" in ep.title.lower())
+    ]
+
+    real_episodes = [
+        ep for ep in all_episodes
+        if ep.episode_number != 0 and not (ep.episode_type == "trailer" and ep.title and "coming soon" in ep.title.lower())
+    ]
+
+    # If we have real episodes, ALWAYS exclude placeholder episodes completely
+    # Only include placeholder episodes if NO real episodes exist (for RSS submission purposes)
+    if real_episodes:
+        episodes = real_episodes
+        logger.info(
+            f"RSS Feed: Excluding {len(placeholder_episodes)} placeholder episode(s) - "
+            f"user has {len(real_episodes)} real episode(s)"
+        )
+    else:
+        # No real episodes yet - include placeholder for RSS submission only
+        episodes = all_episodes
+        logger.info(
+            f"RSS Feed: Including placeholder episode(s) - no real episodes yet "
+            f"(for RSS submission to Apple/Spotify)"
+        )
+
+    site_url = _resolve_site_url(session, podcast)
+    return _generate_podcast_rss(podcast, list(episodes), site_url, feed_url)
+
+
 @router.get("/{podcast_identifier}/feed.xml", response_class=Response)
 def get_podcast_feed(
     podcast_identifier: str,
@@ -622,70 +707,33 @@ def get_podcast_feed(
             }
         )
     
-    # Get all episodes with audio available, regardless of published/scheduled status
-    # CRITICAL FIX (Oct 21): Scheduled episodes MUST be playable - they have assembled audio in GCS
-    # The publish_at date controls WHEN they appear in podcast apps, but the audio itself
-    # should be accessible as soon as it exists (for preview, manual editor, etc.)
-    #
-    # Include episodes that are:
-    # 1. Published (status == published)
-    # 2. Scheduled (status has future publish_at) - these have assembled audio ready
-    # 3. Processed (status == processed) - fallback for episodes without explicit publish
-    #
-    # Filter out:
-    # - Episodes without audio (no gcs_audio_path)
-    # - Draft/pending/error episodes
-    statement = (
-        select(Episode)
-        .where(Episode.podcast_id == podcast.id)
-        .where(
-            (Episode.status == EpisodeStatus.published) |
-            (Episode.status == EpisodeStatus.processed)  # Includes scheduled episodes
-        )
-        .where(Episode.gcs_audio_path != None)  # Must have audio in GCS
-        .order_by(desc(Episode.publish_at))
+    # The feed reads no query parameters; dropping them keeps ``?x=N`` out of
+    # both the cache key and the atom self link.
+    feed_url = str(request.url.replace(query=""))
+    feed = rss_feed_cache.get_or_build_feed(
+        podcast.id,
+        feed_url,
+        lambda: _render_podcast_feed(session, podcast, feed_url),
     )
-    all_episodes = session.exec(statement).all()
-    
-    # CRITICAL: Placeholder episodes (episode_number=0) are ONLY for RSS submission to Apple/Spotify
-    # They should NEVER be shown to users once they have real episodes
-    # Filter out placeholder episodes (episode_number=0) if ANY real episodes exist
-    placeholder_episodes = [
-        ep for ep in all_episodes
-        if ep.episode_number == 0 or (ep.episode_type == "trailer" and ep.title and "coming soon" in ep.title.lower())
-    ]
-    
-    real_episodes = [
-        ep for ep in all_episodes
-        if ep.episode_number != 0 and not (ep.episode_type == "trailer" and ep.title and "coming soon" in ep.title.lower())
-    ]
-    
-    # If we have real episodes, ALWAYS exclude placeholder episodes completely
-    # Only include placeholder episodes if NO real episodes exist (for RSS submission purposes)
-    if real_episodes:
-        episodes = real_episodes
-        logger.info(
-            f"RSS Feed: Excluding {len(placeholder_episodes)} placeholder episode(s) - "
-            f"user has {len(real_episodes)} real episode(s)"
-        )
-    else:
-        # No real episodes yet - include placeholder for RSS submission only
-        episodes = all_episodes
-        logger.info(
-            f"RSS Feed: Including placeholder episode(s) - no real episodes yet "
-            f"(for RSS submission to Apple/Spotify)"
-        )
-    
-    site_url = _resolve_site_url(session, podcast)
-    feed_xml = _generate_podcast_rss(podcast, list(episodes), site_url, str(request.url))
-    
+
+    headers = {
+        "Cache-Control": "public, max-age=300",  # Cache for 5 minutes
+        "Content-Disposition": f'inline; filename="feed.xml"',
+        "ETag": feed.etag,
+        "Last-Modified": feed.last_modified_header,
+    }
+    if rss_feed_cache.is_not_modified(
+        feed,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    ):
+        headers.pop("Content-Disposition")
+        return Response(status_code=304, headers=headers)
+
     return Response(
-        content=feed_xml,
+        content=feed.xml,
         media_type="application/rss+xml",
-        headers={
-            "Cache-Control": "public, max-age=300",  # Cache for 5 minutes
-            "Content-Disposition": f'inline; filename="feed.xml"',
-        }
+        headers=headers,
     )
 
 
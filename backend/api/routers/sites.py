@@ -9,7 +9,7 @@ import os
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlmodel import Session, select
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,7 @@ from api.core.database import get_session
 from api.models.website import PodcastWebsite
 from api.models.website_page import WebsitePage
 from api.models.podcast import Podcast, Episode, EpisodeStatus
+from api.services import rss_feed_cache, website_snapshot
 from api.services.website_sections import get_section_definition
 from api.routers.episodes.common import compute_playback_info, is_published_condition
 
@@ -205,20 +206,51 @@ def get_website_by_host(
     
     # Log and delegate to existing get_public_website logic
     log.info(f"[sites] Extracted subdomain from host: {subdomain}")
-    return get_public_website(subdomain, session)
+    return get_public_website(subdomain, request, session)
 
 
 @router.get("/{subdomain}", response_model=PublicWebsiteResponse)
 def get_public_website(
     subdomain: str,
+    request: Request,
     session: Session = Depends(get_session),
 ):
     """
     Get public website data by subdomain.
     
     This endpoint is called when someone visits {subdomain}.podcastplusplus.com
-    Returns all section data needed to render the public website.
+    Returns all section data needed to render the public website, served from
+    a rendered snapshot (see api.services.website_snapshot) with an ETag.
     """
+    try:
+        snapshot = website_snapshot.get_snapshot(
+            subdomain,
+            lambda s: _render_public_website(s, subdomain),
+            session,
+        )
+    except website_snapshot.SiteUnavailable as exc:
+        raise HTTPException(status_code=404, detail=exc.detail)
+
+    ttl = website_snapshot.ttl_seconds()
+    headers = {
+        "Cache-Control": f"public, max-age=60, stale-while-revalidate={website_snapshot.stale_seconds()}"
+        if ttl > 0
+        else "no-cache",
+        "ETag": snapshot.etag,
+        "Last-Modified": snapshot.last_modified_header,
+    }
+    if rss_feed_cache.is_not_modified(
+        snapshot,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    ):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def _render_public_website(session: Session, subdomain: str) -> website_snapshot.RenderedSite:
+    """Render the public website for ``subdomain`` from the database into a snapshot body."""
     from api.core.logging import get_logger
     log = get_logger(__name__)
     
@@ -230,18 +262,15 @@ def get_public_website(
         
         if website is None:
             log.warning(f"[sites] Website not found for subdomain: {subdomain}")
-            raise HTTPException(
-                status_code=404,
-                detail=f"No website found for subdomain: {subdomain}"
-            )
+            raise website_snapshot.SiteUnavailable(f"No website found for subdomain: {subdomain}")
         
         # Only show published websites publicly
         if website.status != "published":
             log.info(f"[sites] Website {website.id} status is '{website.status}', not published")
-            raise HTTPException(
-                status_code=404,
-                detail="Website is not published yet"
-            )
+            raise website_snapshot.SiteUnavailable("Website is not published yet")
+        
+        # Read before the rows below so an edit that races this render leaves it stale.
+        version = website_snapshot.current_version(website.podcast_id, website.id)
         
         # Get podcast details
         podcast = session.exec(
@@ -249,7 +278,7 @@ def get_public_website(
         ).first()
         
         if podcast is None:
-            raise HTTPException(status_code=404, detail="Podcast not found")
+            raise website_snapshot.SiteUnavailable("Podcast not found")
         
         # Helper function to resolve R2 URLs to signed URLs
         def resolve_r2_url_to_signed(url_str: str) -> str:
@@ -480,7 +509,7 @@ def get_public_website(
             for page in pages
         ]
         
-        return PublicWebsiteResponse(
+        response = PublicWebsiteResponse(
             subdomain=website.subdomain,
             podcast_id=str(website.podcast_id),
             podcast_title=podcast.name,
@@ -494,8 +523,14 @@ def get_public_website(
             status=website.status,
             custom_domain=website.custom_domain,
         )
-    except HTTPException:
-        # Re-raise HTTP exceptions (404, etc.)
+        return website_snapshot.RenderedSite(
+            podcast_id=str(website.podcast_id),
+            website_id=str(website.id),
+            version=version,
+            body=response.model_dump_json(),
+        )
+    except (HTTPException, website_snapshot.SiteUnavailable):
+        # Re-raise HTTP exceptions and missing/unpublished sites (404)
         raise
     except Exception as e:
         # Log unexpected errors and return 500
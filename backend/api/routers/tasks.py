@@ -17,6 +17,7 @@ import logging
 import os
 from typing import Any, Dict
 from urllib.parse import parse_qsl
+from uuid import UUID
 
 from fastapi import APIRouter, Header, HTTPException, Request
 from pydantic import BaseModel, ValidationError
@@ -64,15 +65,36 @@ async def _dispatch_transcription(
     suppress_errors: bool,
     guest_ids: list[str] | None = None
 ) -> None:
-    """Execute transcription in a worker thread, optionally suppressing exceptions."""
+    """Start transcription in a worker thread, optionally suppressing exceptions.
+
+    AssemblyAI jobs return as soon as they are submitted; persistence, watcher
+    notification and failure reporting then run as continuations when the
+    transcript completes (see ``api.services.transcription.completion``). The
+    submission is also recorded in the database, so ``/transcription/finish``
+    can complete it on another instance if this one is gone by then.
+    """
     import asyncio
+    from functools import partial
     from api.services.transcription import transcribe_media_file  # type: ignore
     
+    def _completed(words: list) -> None:
+        log.info("event=tasks.transcribe.done filename=%s request_id=%s words=%d", filename, request_id, len(words))
+
+    def _failed(exc: BaseException) -> None:
+        log.error("event=tasks.transcribe.error filename=%s err=%s", filename, exc)
+        _report_transcription_error(filename, user_id, request_id, use_auphonic, exc)
+
     loop = asyncio.get_running_loop()
     log.info("event=tasks.transcribe.start filename=%s user_id=%s request_id=%s guest_ids=%s", filename, user_id, request_id, guest_ids)
     try:
-        await loop.run_in_executor(None, transcribe_media_file, filename, user_id, guest_ids)
-        log.info("event=tasks.transcribe.done filename=%s request_id=%s", filename, request_id)
+        words = await loop.run_in_executor(
+            None,
+            partial(transcribe_media_file, filename, user_id, guest_ids, on_complete=_completed, on_error=_failed),
+        )
+        if words is None:
+            log.info("event=tasks.transcribe.submitted filename=%s request_id=%s", filename, request_id)
+        else:
+            log.info("event=tasks.transcribe.done filename=%s request_id=%s", filename, request_id)
     except FileNotFoundError as err:
         log.warning("event=tasks.transcribe.not_found filename=%s request_id=%s", filename, request_id)
         
@@ -104,45 +126,56 @@ async def _dispatch_transcription(
     except Exception as exc:  # pragma: no cover - defensive
         log.exception("event=tasks.transcribe.error filename=%s err=%s", filename, exc)
         
-        # Report as bug - ALWAYS report transcription failures
-        if user_id:
-            try:
-                from api.core.database import get_session
-                from api.models.user import User
-                from api.services.bug_reporter import report_transcription_failure
-                from api.services.upload_completion_mailer import send_upload_failure_email
-                from sqlmodel import select
-                
-                session = next(get_session())
-                user = session.exec(select(User).where(User.id == user_id)).first()
+        _report_transcription_error(filename, user_id, request_id, use_auphonic, exc)
+
+        if not suppress_errors:
+            raise exc
+
+
+def _report_transcription_error(
+    filename: str,
+    user_id: str | None,
+    request_id: str | None,
+    use_auphonic: bool | None,
+    exc: BaseException,
+) -> None:
+    """Report a transcription failure as a bug and email the user."""
+    # Report as bug - ALWAYS report transcription failures
+    if user_id:
+        try:
+            from api.core.database import get_session
+            from api.models.user import User
+            from api.services.bug_reporter import report_transcription_failure
+            from api.services.upload_completion_mailer import send_upload_failure_email
+            from sqlmodel import select
+            
+            session = next(get_session())
+            user = session.exec(select(User).where(User.id == user_id)).first()
+            
+            if user:
+                # Report bug to tracking system
+                report_transcription_failure(
+                    session=session,
+                    user=user,
+                    media_filename=filename,
+                    transcription_service="AssemblyAI" if not use_auphonic else "Auphonic",
+                    error_message=str(exc),
+                    request_id=request_id,
+                )
                 
-                if user:
-                    # Report bug to tracking system
-                    report_transcription_failure(
-                        session=session,
+                # Send user notification email
+                try:
+                    send_upload_failure_email(
                         user=user,
-                        media_filename=filename,
-                        transcription_service="AssemblyAI" if not use_auphonic else "Auphonic",
-                        error_message=str(exc),
+                        filename=filename,
+                        error_message="Failed to transcribe your audio. This has been reported to our support team.",
+                        error_code="TRANSCRIPTION_FAILED",
                         request_id=request_id,
                     )
-                    
-                    # Send user notification email
-                    try:
-                        send_upload_failure_email(
-                            user=user,
-                            filename=filename,
-                            error_message="Failed to transcribe your audio. This has been reported to our support team.",
-                            error_code="TRANSCRIPTION_FAILED",
-                            request_id=request_id,
-                        )
-                    except Exception as email_err:
-                        log.warning("Failed to send transcription failure email: %s", email_err)
-            except Exception as report_err:
-                log.warning("Failed to report transcription error as bug: %s", report_err)
-        
-        if not suppress_errors:
-            raise exc
+                except Exception as email_err:
+                    log.warning("Failed to send transcription failure email: %s", email_err)
+        except Exception as report_err:
+            log.warning("Failed to report transcription error as bug: %s", report_err)
 
 
 def _ensure_local_media_present(filename: str) -> None:
@@ -239,6 +272,50 @@ async def transcribe_endpoint(request: Request, x_tasks_auth: str | None = Heade
 
 __all__ = ["router"]
 
+@router.post("/transcription/finish")
+async def transcription_finish_task(request: Request, x_tasks_auth: str | None = Header(default=None)):
+    """Persist a submitted AssemblyAI transcript on this instance (Cloud Tasks target).
+
+    Enqueued when the webhook lands on an instance that does not track the job,
+    and by the resume-transcriptions sweep. The pending record is claimed first,
+    so a transcript the submitting instance already finished is skipped.
+    """
+    if not _IS_DEV:
+        if not x_tasks_auth or x_tasks_auth != _TASKS_AUTH:
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        data = json.loads((await request.body()) or b"{}")
+        transcript_id = str(data["transcript_id"]).strip()
+    except ClientDisconnect:
+        raise HTTPException(status_code=499, detail="client disconnected")
+    except Exception:
+        raise HTTPException(status_code=400, detail="body must be JSON with transcript_id")
+    if not transcript_id:
+        raise HTTPException(status_code=400, detail="body must be JSON with transcript_id")
+
+    import asyncio
+    from api.services.transcription import finish_pending_transcription
+
+    loop = asyncio.get_running_loop()
+    try:
+        summary = await loop.run_in_executor(None, finish_pending_transcription, transcript_id)
+    except Exception as exc:
+        log.exception("event=tasks.transcription_finish.error transcript_id=%s err=%s", transcript_id, exc)
+        raise HTTPException(status_code=500, detail=f"Failed to finish transcription: {exc}")
+
+    log.info(
+        "event=tasks.transcription_finish.done transcript_id=%s status=%s filename=%s",
+        transcript_id, summary.get("status"), summary.get("filename"),
+    )
+    if summary.get("status") == "failed":
+        _report_transcription_error(
+            summary["filename"], summary.get("user_id"), request.headers.get("x-request-id"), False,
+            RuntimeError(summary.get("error") or "transcription failed"),
+        )
+    return {"ok": True, **summary}
+
+
 # -------------------- Assemble Episode (Cloud Tasks) --------------------
 
 class AssembleIn(BaseModel):
@@ -1003,3 +1080,185 @@ async def maintenance_check_stuck_episodes(
         log.exception("event=check_stuck_episodes.error err=%s", exc)
         raise HTTPException(status_code=500, detail=f"Failed to check stuck episodes: {exc}")
 
+
+
+@router.post("/maintenance/rebuild-usage-summary")
+async def maintenance_rebuild_usage_summary(
+    request: Request,
+    x_tasks_auth: str | None = Header(default=None),
+):
+    """Recompute UsageLedgerSummary from the minutes ledger.
+
+    Idempotent. Run after a rollout so entries posted by revisions that did not
+    maintain the summary are counted. Optional JSON body ``{"user_id": ...}``
+    limits the rebuild to one user.
+    """
+    if not _IS_DEV:
+        # Accept either Cloud Scheduler OIDC token OR legacy TASKS_AUTH header
+        auth_header = request.headers.get("Authorization", "")
+        has_oidc = auth_header.startswith("Bearer ")
+        has_tasks_auth = x_tasks_auth and x_tasks_auth == _TASKS_AUTH
+
+        if not (has_oidc or has_tasks_auth):
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        data = json.loads((await request.body()) or b"{}")
+        user_id = UUID(str(data["user_id"])) if data.get("user_id") else None
+    except ClientDisconnect:
+        raise HTTPException(status_code=499, detail="client disconnected")
+    except Exception:
+        raise HTTPException(status_code=400, detail="body must be empty or JSON with a valid user_id")
+
+    try:
+        from api.services.billing.usage import rebuild_usage_summary
+        session_gen = get_session()
+        session = next(session_gen)
+        try:
+            rows = rebuild_usage_summary(session, user_id)
+            log.info("event=rebuild_usage_summary.completed user_id=%s rows=%d", user_id, rows)
+            return {"ok": True, "rows": rows}
+        finally:
+            session.close()
+    except Exception as exc:
+        log.exception("event=rebuild_usage_summary.error err=%s", exc)
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild usage summary: {exc}")
+
+
+@router.post("/maintenance/refresh-stripe-metrics")
+async def maintenance_refresh_stripe_metrics(
+    request: Request,
+    x_tasks_auth: str | None = Header(default=None),
+):
+    """Recompute the admin dashboard's Stripe revenue snapshot.
+
+    Called by Cloud Scheduler and by the Cloud Task that a stale dashboard read
+    enqueues, so the Stripe paging runs inside a request of its own.
+    """
+    if not _IS_DEV:
+        # Accept either Cloud Scheduler OIDC token OR legacy TASKS_AUTH header
+        auth_header = request.headers.get("Authorization", "")
+        has_oidc = auth_header.startswith("Bearer ")
+        has_tasks_auth = x_tasks_auth and x_tasks_auth == _TASKS_AUTH
+
+        if not (has_oidc or has_tasks_auth):
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    import asyncio
+    from api.services.stripe_metrics import refresh_snapshot
+
+    loop = asyncio.get_running_loop()
+    snapshot = await loop.run_in_executor(None, refresh_snapshot)
+    log.info("event=refresh_stripe_metrics.completed refreshed=%s", snapshot is not None)
+    return {"ok": True, "refreshed": snapshot is not None, "computed_at": (snapshot or {}).get("computed_at")}
+
+
+@router.post("/maintenance/resume-transcriptions")
+async def maintenance_resume_transcriptions(
+    request: Request,
+    x_tasks_auth: str | None = Header(default=None),
+):
+    """Finish AssemblyAI transcripts whose submitting instance went away.
+
+    Enqueues ``/transcription/finish`` for pending records nobody has touched
+    recently. Can be called by Cloud Scheduler or a background task.
+    """
+    if not _IS_DEV:
+        # Accept either Cloud Scheduler OIDC token OR legacy TASKS_AUTH header
+        auth_header = request.headers.get("Authorization", "")
+        has_oidc = auth_header.startswith("Bearer ")
+        has_tasks_auth = x_tasks_auth and x_tasks_auth == _TASKS_AUTH
+
+        if not (has_oidc or has_tasks_auth):
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        from api.services.transcription import pending
+        session_gen = get_session()
+        session = next(session_gen)
+        try:
+            resumed = pending.resume_stale(session)
+            log.info("event=resume_transcriptions.completed resumed=%d", len(resumed))
+            return {"ok": True, "resumed": resumed}
+        finally:
+            session.close()
+    except Exception as exc:
+        log.exception("event=resume_transcriptions.error err=%s", exc)
+        raise HTTPException(status_code=500, detail=f"Failed to resume transcriptions: {exc}")
+
+
+# -------------------- RSS Back-Catalog Import --------------------
+
+@router.post("/rss-import")
+async def rss_import_task(request: Request, x_tasks_auth: str | None = Header(default=None)):
+    """Mirror the pending enclosures of an RSS import job (Cloud Tasks target).
+
+    Runs up to the job's run budget, then re-enqueues itself if items remain.
+    Returns 503 while another worker holds the job's lease so Cloud Tasks
+    retries later instead of dropping the task.
+    """
+    if not _IS_DEV:
+        if not x_tasks_auth or x_tasks_auth != _TASKS_AUTH:
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        data = json.loads((await request.body()) or b"{}")
+        job_id = str(data["job_id"])
+    except ClientDisconnect:
+        raise HTTPException(status_code=499, detail="client disconnected")
+    except Exception:
+        raise HTTPException(status_code=400, detail="body must be JSON with job_id")
+
+    from api.services.podcasts import rss_import
+
+    try:
+        summary = await rss_import.run_import_job(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid job_id")
+    except Exception as exc:
+        log.exception("event=rss_import.task_error job_id=%s err=%s", job_id, exc)
+        raise HTTPException(status_code=500, detail=f"RSS import failed: {exc}")
+
+    if not summary.get("claimed") and summary.get("status") in rss_import.OPEN_STATUSES:
+        raise HTTPException(status_code=503, detail="import job is leased by another worker")
+    if summary.get("requeue"):
+        try:
+            rss_import.enqueue_import_job(job_id)
+        except Exception as exc:
+            # The resume-rss-imports sweep will pick it up.
+            log.warning("event=rss_import.requeue_failed job_id=%s err=%s", job_id, exc)
+    return {"ok": True, **summary}
+
+
+@router.post("/maintenance/resume-rss-imports")
+async def maintenance_resume_rss_imports(
+    request: Request,
+    x_tasks_auth: str | None = Header(default=None),
+):
+    """Re-enqueue RSS import jobs whose worker died (lease lapsed) or never started.
+
+    Can be called by Cloud Scheduler or a background task.
+    """
+    if not _IS_DEV:
+        # Accept either Cloud Scheduler OIDC token OR legacy TASKS_AUTH header
+        auth_header = request.headers.get("Authorization", "")
+        has_oidc = auth_header.startswith("Bearer ")
+        has_tasks_auth = x_tasks_auth and x_tasks_auth == _TASKS_AUTH
+
+        if not (has_oidc or has_tasks_auth):
+            raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        from api.services.podcasts.rss_import import resume_stale_import_jobs
+        session_gen = get_session()
+        session = next(session_gen)
+        try:
+            resumed = resume_stale_import_jobs(session)
+            log.info("event=resume_rss_imports.completed resumed=%d", len(resumed))
+            return {"ok": True, "resumed": resumed}
+        finally:
+            session.close()
+    except Exception as exc:
+        log.exception("event=resume_rss_imports.error err=%s", exc)
+        raise HTTPException(status_code=500, detail=f"Failed to resume RSS imports: {exc}")
+
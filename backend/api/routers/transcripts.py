@@ -10,6 +10,7 @@ from uuid import UUID as _UUID
 
 from api.core.database import get_session
 from api.services.audio.transcript_io import load_transcript_json
+from api.services.audio.transcript_pack import PACK_SUFFIX, TranscriptPack
 from api.models.podcast import Episode
 from api.services.episodes import repo as _ep_repo
 from api.core.paths import TRANSCRIPTS_DIR
@@ -138,14 +139,23 @@ def _resolve_from_gcs(session: Session, episode_id: str) -> Optional[tuple[str,
     if not bucket:
         return None
     from api.infrastructure.gcs import download_bytes  # type: ignore
-    # Try user-specific path first, then a shared transcripts/<stem>.json
+    # Try user-specific path first, then the shared transcripts/<stem> copy. The
+    # shared copy's compressed word pack is a fraction of the JSON's size, so it
+    # is preferred over the shared JSON and expanded here.
     for stem in stems:
-        for key in (f"transcripts/{user_id}/{stem}.json", f"transcripts/{stem}.json"):
-            try:
-                data = download_bytes(bucket, key)
-                return (f"{stem}.json", data)
-            except Exception:
-                continue
+        try:
+            return (f"{stem}.json", download_bytes(bucket, f"transcripts/{user_id}/{stem}.json"))
+        except Exception:
+            pass
+        try:
+            data = download_bytes(bucket, f"transcripts/{stem}{PACK_SUFFIX}")
+            return (f"{stem}.json", TranscriptPack.from_bytes(data).to_json_bytes())
+        except Exception:
+            pass
+        try:
+            return (f"{stem}.json", download_bytes(bucket, f"transcripts/{stem}.json"))
+        except Exception:
+            continue
     return None
 
 
@@ -126,6 +126,8 @@ def audio_process_and_assemble_episode(
 			tts_provider=(episode_details or {}).get("tts_provider") or "elevenlabs",
 			mix_only=False,
 			words_json_path=str(words_json_path) if words_json_path else None,
+			episode_id=str(getattr(episode, "id", "") or "") or None,
+			user_id=str(getattr(user, "id", "") or "") or None,
 		)
 		logging.info("%s Final mix complete for episode=%s → %s", log_prefix, episode_id, final_path)
 		return Path(final_path)
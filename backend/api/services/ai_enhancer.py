@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import io
 import logging
+import os
 import re
+import threading
 from textwrap import dedent
 from typing import Dict, Optional
 
@@ -18,11 +20,20 @@ except ImportError:  # pragma: no cover - optional dependency at runtime
 from api.core.config import settings
 from api.models.user import User
 from api.services.ai_content import client_router as ai_client
+from api.services.audio import tts_cache
 
 
 _DEFAULT_ELEVENLABS_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel
 _ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
 
+# Process-wide cap on simultaneous ElevenLabs requests; parallel chunk synthesis
+# from several assemblies shares it. Cache hits never take a slot.
+try:
+    _ELEVENLABS_MAX_CONCURRENCY = max(1, int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "4")))
+except ValueError:
+    _ELEVENLABS_MAX_CONCURRENCY = 4
+_ELEVENLABS_SLOTS = threading.BoundedSemaphore(_ELEVENLABS_MAX_CONCURRENCY)
+
 
 _LOG = logging.getLogger(__name__)
 
@@ -42,20 +53,48 @@ def generate_speech_from_text(
 ) -> AudioSegment:
     """Generate speech from text using the requested provider."""
 
+    audio_bytes = synthesize_speech_bytes(
+        text,
+        voice_id=voice_id,
+        provider=provider,
+        google_voice=google_voice,
+        speaking_rate=speaking_rate,
+        user=user,
+        api_key=api_key,
+    )
+    return AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
+
+
+def synthesize_speech_bytes(
+    text: str,
+    voice_id: str | None = None,
+    provider: str = "elevenlabs",
+    google_voice: str | None = None,
+    speaking_rate: float = 1.0,
+    user: Optional[User] = None,
+    api_key: str | None = None,
+) -> bytes:
+    """Return MP3 bytes for ``text``, from the TTS cache when this script was voiced before."""
+
     if provider == "elevenlabs":
-        return _generate_with_elevenlabs(text, voice_id=voice_id, user=user, api_key_override=api_key)
+        resolved_key = _elevenlabs_api_key(user, api_key)
+        resolved_voice_id = voice_id or _DEFAULT_ELEVENLABS_VOICE_ID
+        key = tts_cache.cache_key(
+            provider=provider,
+            model=_ELEVENLABS_MODEL_ID,
+            voice=resolved_voice_id,
+            text=text,
+            speaking_rate=speaking_rate,
+        )
+        return tts_cache.get_or_synthesize(
+            key, lambda: _generate_with_elevenlabs(text, voice_id=resolved_voice_id, api_key=resolved_key)
+        )
     if provider == "google":
         raise AIEnhancerError("Google TTS provider is not yet implemented.")
     raise AIEnhancerError(f"Unsupported TTS provider: {provider}")
 
 
-def _generate_with_elevenlabs(
-    text: str,
-    *,
-    voice_id: str | None,
-    user: Optional[User],
-    api_key_override: str | None,
-) -> AudioSegment:
+def _elevenlabs_api_key(user: Optional[User], api_key_override: str | None) -> str:
     api_key = (
         api_key_override
         or (user and user.elevenlabs_api_key)
@@ -63,8 +102,16 @@ def _generate_with_elevenlabs(
     )
     if not api_key or api_key == "dummy":
         raise AIEnhancerError("ElevenLabs API key is not configured on the server or for your user account.")
+    return api_key
+
+
+def _generate_with_elevenlabs(text: str, *, voice_id: str, api_key: str) -> bytes:
+    with _ELEVENLABS_SLOTS:
+        return _request_elevenlabs(text, voice_id=voice_id, api_key=api_key)
 
-    resolved_voice_id = voice_id or _DEFAULT_ELEVENLABS_VOICE_ID
+
+def _request_elevenlabs(text: str, *, voice_id: str, api_key: str) -> bytes:
+    resolved_voice_id = voice_id
     try:
         from elevenlabs.client import ElevenLabs  # type: ignore
     except ImportError:
@@ -109,7 +156,7 @@ def _generate_with_elevenlabs(
     if not isinstance(audio_bytes, bytes) or not audio_bytes:
         raise AIEnhancerError("ElevenLabs returned no audio data.")
 
-    return AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
+    return audio_bytes
 
 
 def _translate_elevenlabs_error(exc: Exception, voice_id: str) -> AIEnhancerError:
@@ -254,6 +301,7 @@ def get_answer_for_topic(
 __all__ = [
     "AIEnhancerError",
     "generate_speech_from_text",
+    "synthesize_speech_bytes",
     "interpret_intern_command",
     "get_answer_for_topic",
 ]
@@ -12,12 +12,14 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from api.models.podcast import Podcast
+from api.services import cover_palette
 from api.services.ai_content import client_router as ai_client
 from api.services.podcast_websites import (
   _get_readable_text_color,
   _get_contrast_ratio,
   _hex_to_rgb_tuple,
   _ensure_readable_text_color,
+  _rgb_to_hex,
 )
 
 log = logging.getLogger(__name__)
@@ -71,6 +73,7 @@ def analyze_podcast_for_theme(
     # Try to fetch and encode the cover image for vision analysis
     image_data = None
     image_mime = None
+    measured_colors = []
     if cover_url:
         # Ensure cover_url is a full URL (not a relative path)
         resolved_url = cover_url
@@ -109,6 +112,8 @@ def analyze_podcast_for_theme(
                         else:
                             image_mime = 'image/jpeg'  # Default fallback
                     log.info("Successfully loaded cover image for vision analysis (%d bytes)", len(response.content))
+                    # Same cover as site generation, so this is normally a cache hit.
+                    measured_colors = cover_palette.dominant_colors(response.content)[:6]
             except Exception as e:
                 log.warning("Failed to fetch cover image for vision analysis (URL: %s): %s", resolved_url[:100] if resolved_url else 'None', e)
     
@@ -120,7 +125,13 @@ Description: {description}
 Tagline: {tagline or 'Not provided'}
 
 {"I'm providing the podcast cover image - analyze it carefully." if image_data else "Cover art is not available - base your analysis on the title and description."}
-
+"""
+    if measured_colors:
+        total = sum(count for _, count in measured_colors) or 1
+        swatches = ", ".join(f"{_rgb_to_hex(color)} ({count * 100 // total}%)" for color, count in measured_colors)
+        prompt += f"""Measured dominant cover colors (share of the top colors): {swatches}
+"""
+    prompt += f"""
 **Your Task:**
 1. Analyze the visual elements in the cover image (if provided):
    - Identify specific objects, symbols, and visual motifs (e.g., marquee lights, popcorn, chainsaws, theater seats, dinosaurs, retro signs, etc.)
@@ -0,0 +1,269 @@
+"""Content-addressed cache for audio analysis.
+
+Upload routing (``quality.analyze_audio_file``) and loudness normalization
+(``normalizer.run_loudnorm_two_pass``) both need the same measurements of the
+same bytes, and retries or re-assemblies of an upload repeat them. Here one
+ffmpeg decode runs ``ebur128``, ``volumedetect``, ``silencedetect`` and a
+``loudnorm`` first pass together, and the result is cached under the SHA-256 of
+the media in two tiers:
+
+- an in-process LRU (``AUDIO_ANALYSIS_CACHE_MAX_ENTRIES``, default 256), and
+- Redis (``audio:analysis:*``), shared by the API and worker instances.
+
+``AUDIO_ANALYSIS_CACHE_TTL_S`` (default 30 days, ``0`` disables the cache)
+bounds the age of an entry. Loudnorm pass-1 stats depend on the loudness target,
+so the target is part of the key.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from api.core.redis_client import redis_get, redis_setex
+from api.services.audio.normalizer import _parse_loudnorm_json
+
+log = logging.getLogger("api.services.audio.analysis_cache")
+
+DEFAULT_TTL_S = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TARGET_LUFS = -16.0
+DEFAULT_TP_CEIL = -1.0
+SILENCE_NOISE_DB = -50
+SILENCE_MIN_S = 0.5
+ANALYSIS_TIMEOUT_S = 600
+
+# Bump when the stored fields or how they are measured change.
+_SCHEMA = 1
+_KEY = "audio:analysis:v{schema}:{sha256}:{target_lufs}:{tp_ceil}"
+
+_HASH_BLOCK = 1 << 20
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_MEAN_RE = re.compile(r"mean_volume:\s*(-?[\d.]+|-?inf) dB")
+_MAX_RE = re.compile(r"max_volume:\s*(-?[\d.]+|-?inf) dB")
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_EBUR_I_RE = re.compile(r"^\s*I:\s*(-?[\d.]+|-?inf) LUFS", re.MULTILINE)
+_EBUR_LRA_RE = re.compile(r"^\s*LRA:\s*(-?[\d.]+) LU", re.MULTILINE)
+_EBUR_PEAK_RE = re.compile(r"^\s*Peak:\s*(-?[\d.]+|-?inf) dBFS", re.MULTILINE)
+
+_LOCK = threading.Lock()
+_LOCAL: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _ttl_s() -> int:
+    try:
+        return max(0, int(os.getenv("AUDIO_ANALYSIS_CACHE_TTL_S", str(DEFAULT_TTL_S))))
+    except ValueError:
+        return DEFAULT_TTL_S
+
+
+def _max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("AUDIO_ANALYSIS_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def sha256_file(path: Path) -> str:
+    """Hex SHA-256 of the file at ``path``, read in 1 MiB blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        f = float(value)
+    except ValueError:
+        return None
+    return f if f == f and f not in (float("inf"), float("-inf")) else None
+
+
+def _last(pattern: re.Pattern, text: str) -> Optional[float]:
+    matches = pattern.findall(text)
+    return _float(matches[-1]) if matches else None
+
+
+def _parse_silences(text: str, duration: Optional[float]) -> List[List[float]]:
+    spans: List[List[float]] = []
+    start: Optional[float] = None
+    for line in text.splitlines():
+        m = _SILENCE_START_RE.search(line)
+        if m:
+            start = max(0.0, float(m.group(1)))
+            continue
+        m = _SILENCE_END_RE.search(line)
+        if m and start is not None:
+            spans.append([start, float(m.group(1))])
+            start = None
+    if start is not None and duration is not None and duration > start:
+        spans.append([start, duration])
+    return spans
+
+
+def _parse_loudnorm(text: str) -> Optional[Dict[str, float]]:
+    marker = text.rfind("Parsed_loudnorm")
+    try:
+        return _parse_loudnorm_json(text[marker:] if marker != -1 else text)
+    except ValueError:
+        return None
+
+
+def parse_analysis(stderr: str) -> Dict[str, Any]:
+    """Build the analysis dict from the stderr of :func:`_analysis_cmd`."""
+    duration = None
+    dur = _DURATION_RE.search(stderr)
+    if dur:
+        h, m, s = dur.groups()
+        duration = int(h) * 3600 + int(m) * 60 + float(s)
+
+    summary = stderr[stderr.rfind("Summary:"):] if "Summary:" in stderr else ""
+    return {
+        "duration_seconds": duration,
+        "integrated_lufs": _last(_EBUR_I_RE, summary),
+        "loudness_range_lu": _last(_EBUR_LRA_RE, summary),
+        "true_peak_dbfs": _last(_EBUR_PEAK_RE, summary),
+        "mean_volume_db": _last(_MEAN_RE, stderr),
+        "max_volume_db": _last(_MAX_RE, stderr),
+        "silences": _parse_silences(stderr, duration),
+        "loudnorm": _parse_loudnorm(stderr),
+    }
+
+
+def _analysis_cmd(path: Path, target_lufs: float, tp_ceil: float) -> List[str]:
+    # loudnorm upsamples to 192 kHz, so it runs after the other measurements.
+    chain = ",".join([
+        "ebur128=peak=true",
+        "volumedetect",
+        f"silencedetect=n={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_S}",
+        f"loudnorm=I={target_lufs}:TP={tp_ceil}:LRA=11:print_format=json",
+    ])
+    return [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", str(path),
+        "-map", "0:a:0",
+        "-af", chain,
+        "-f", "null", "-",
+    ]
+
+
+def measure(
+    path: Path,
+    target_lufs: float = DEFAULT_TARGET_LUFS,
+    tp_ceil: float = DEFAULT_TP_CEIL,
+) -> Optional[Dict[str, Any]]:
+    """Run the combined analysis pass on ``path``; None if ffmpeg fails."""
+    try:
+        proc = subprocess.run(
+            _analysis_cmd(Path(path), target_lufs, tp_ceil),
+            capture_output=True,
+            text=True,
+            errors="ignore",
+            timeout=ANALYSIS_TIMEOUT_S,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.warning("audio.analysis: ffmpeg failed for %s: %s", path, e)
+        return None
+    if proc.returncode != 0:
+        log.warning("audio.analysis: ffmpeg exited %s for %s: %s", proc.returncode, path, (proc.stderr or "")[-300:])
+        return None
+    return parse_analysis(proc.stderr or "")
+
+
+def _cache_key(sha256: str, target_lufs: float, tp_ceil: float) -> str:
+    return _KEY.format(schema=_SCHEMA, sha256=sha256, target_lufs=float(target_lufs), tp_ceil=float(tp_ceil))
+
+
+def _local_get(key: str) -> Optional[Dict[str, Any]]:
+    with _LOCK:
+        hit = _LOCAL.get(key)
+        if hit is not None:
+            _LOCAL.move_to_end(key)
+        return hit
+
+
+def _local_put(key: str, value: Dict[str, Any]) -> None:
+    with _LOCK:
+        _LOCAL[key] = value
+        _LOCAL.move_to_end(key)
+        while len(_LOCAL) > _max_entries():
+            _LOCAL.popitem(last=False)
+
+
+def get_analysis(
+    path: Path,
+    target_lufs: float = DEFAULT_TARGET_LUFS,
+    tp_ceil: float = DEFAULT_TP_CEIL,
+    sha256: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Cached analysis of ``path``; measures and stores it on a miss.
+
+    The result has ``sha256``, ``duration_seconds``, ``integrated_lufs``,
+    ``loudness_range_lu``, ``true_peak_dbfs``, ``mean_volume_db``,
+    ``max_volume_db``, ``silences`` (``[[start_s, end_s], ...]``) and
+    ``loudnorm`` (pass-1 stats for the given target, or None). Returns None
+    when the file cannot be analyzed; failures are not cached.
+    """
+    path = Path(path)
+    ttl = _ttl_s()
+    if ttl <= 0:
+        result = measure(path, target_lufs, tp_ceil)
+        if result is not None:
+            result["sha256"] = sha256 or sha256_file(path)
+        return result
+
+    try:
+        digest = sha256 or sha256_file(path)
+    except OSError as e:
+        log.warning("audio.analysis: cannot hash %s: %s", path, e)
+        return None
+    key = _cache_key(digest, target_lufs, tp_ceil)
+
+    hit = _local_get(key)
+    if hit is not None:
+        return dict(hit)
+    raw = redis_get(key)
+    if raw:
+        try:
+            hit = json.loads(raw)
+        except ValueError:
+            hit = None
+        if isinstance(hit, dict):
+            _local_put(key, hit)
+            log.info("audio.analysis: cache hit sha256=%s", digest[:12])
+            return dict(hit)
+
+    result = measure(path, target_lufs, tp_ceil)
+    if result is None:
+        return None
+    result["sha256"] = digest
+    _local_put(key, result)
+    redis_setex(key, ttl, json.dumps(result))
+    return dict(result)
+
+
+def clear_local_cache() -> None:
+    with _LOCK:
+        _LOCAL.clear()
+
+
+__all__ = [
+    "get_analysis",
+    "measure",
+    "parse_analysis",
+    "sha256_file",
+    "clear_local_cache",
+]
@@ -18,6 +18,201 @@ from .common import AudioSegment, FILLER_LEAD_TRIM_DEFAULT_MS
 from .ai_fillers import compute_filler_spans
 
 
+class RebuildPlan:
+    """Keep-spans for a word-driven rebuild, expressed as byte ranges of the source.
+
+    Each span is ``(byte_start, byte_end, pad_bytes)``: a slice of the source PCM
+    followed by ``pad_bytes`` of digital silence.  Offsets are computed with the
+    exact millisecond→frame rounding pydub applies when slicing, so rendering the
+    plan reproduces what repeated ``AudioSegment`` concatenation used to build.
+    """
+
+    __slots__ = ("frame_rate", "frame_width", "source_bytes", "spans", "total_bytes", "touched")
+
+    def __init__(self, frame_rate: int, frame_width: int, source_bytes: int) -> None:
+        self.frame_rate = frame_rate
+        self.frame_width = frame_width
+        self.source_bytes = source_bytes
+        self.spans: List[Tuple[int, int, int]] = []
+        self.total_bytes = 0
+        # pydub's empty() segment keeps placeholder params until something is appended
+        self.touched = False
+
+    # --- length helpers (mirror AudioSegment.__len__/_parse_position) ---
+    def _ms_for_bytes(self, nbytes: int) -> int:
+        frames = float(nbytes // self.frame_width)
+        return round(1000 * (frames / self.frame_rate))
+
+    def _frames_for_ms(self, ms: float) -> int:
+        return int(ms * (self.frame_rate / 1000.0))
+
+    @property
+    def source_ms(self) -> int:
+        return self._ms_for_bytes(self.source_bytes)
+
+    @property
+    def result_ms(self) -> int:
+        return self._ms_for_bytes(self.total_bytes)
+
+    def append_source(self, start_ms: int, end_ms: int) -> int:
+        """Append ``source[start_ms:end_ms]``; returns the appended length in ms."""
+        src_len = self.source_ms
+        start = min(start_ms, src_len)
+        end = min(end_ms, src_len)
+        if start < 0:
+            start = src_len - abs(start)
+        if end < 0:
+            end = src_len - abs(end)
+        fw = self.frame_width
+        b_start = self._frames_for_ms(start) * fw
+        b_end = self._frames_for_ms(end) * fw
+        lo, hi, _ = slice(b_start, b_end).indices(self.source_bytes)
+        data_len = max(0, hi - lo)
+        missing_frames = ((b_end - b_start) - data_len) // fw
+        pad = fw * missing_frames if (missing_frames > 0 and data_len > 0) else 0
+        self.touched = True
+        if data_len or pad:
+            self.spans.append((b_start, b_end, pad))
+            self.total_bytes += data_len + pad
+        return self._ms_for_bytes(data_len + pad)
+
+    def trim_tail(self, trim_ms: int) -> None:
+        """Equivalent of ``result = result[:-trim_ms]`` on the rendered output."""
+        fw = self.frame_width
+        target = self._frames_for_ms(self.result_ms - trim_ms) * fw
+        if target > self.total_bytes:
+            if self.total_bytes > 0:
+                self.spans.append((0, 0, target - self.total_bytes))
+                self.total_bytes = target
+            return
+        excess = self.total_bytes - max(0, target)
+        while excess > 0 and self.spans:
+            b_start, b_end, pad = self.spans.pop()
+            lo, hi, _ = slice(b_start, b_end).indices(self.source_bytes)
+            data_len = max(0, hi - lo)
+            span_len = data_len + pad
+            if span_len <= excess:
+                excess -= span_len
+                self.total_bytes -= span_len
+                continue
+            keep = span_len - excess
+            if keep <= data_len:
+                self.spans.append((lo, lo + keep, 0))
+            else:
+                self.spans.append((lo, hi, keep - data_len))
+            self.total_bytes -= excess
+            excess = 0
+
+    def ms_ranges(self) -> List[Tuple[int, int]]:
+        """Source ranges in milliseconds (for ffmpeg ``atrim``/``concat`` style renderers)."""
+        fw = self.frame_width
+        out: List[Tuple[int, int]] = []
+        for b_start, b_end, _pad in self.spans:
+            lo, hi, _ = slice(b_start, b_end).indices(self.source_bytes)
+            if hi > lo:
+                out.append((
+                    int(round(1000.0 * (lo // fw) / self.frame_rate)),
+                    int(round(1000.0 * (hi // fw) / self.frame_rate)),
+                ))
+        return out
+
+    def render(self, source: AudioSegment) -> AudioSegment:
+        """Copy every span into one preallocated buffer and wrap it as a segment."""
+        if not self.touched:
+            return AudioSegment.empty()
+        buf = bytearray(self.total_bytes)
+        src = memoryview(source.raw_data)
+        pos = 0
+        for b_start, b_end, pad in self.spans:
+            chunk = src[b_start:b_end]
+            n = len(chunk)
+            if n:
+                buf[pos:pos + n] = chunk
+                pos += n
+            pos += pad  # bytearray is zero-filled, so padding is already silence
+        return source._spawn(bytes(buf))
+
+
+def plan_rebuild_from_words(
+    main_content_audio: AudioSegment,
+    mutable_words: List[Dict[str, Any]],
+    filler_words: Optional[set] = None,
+    remove_fillers: bool = True,
+    filler_lead_trim_ms: int = FILLER_LEAD_TRIM_DEFAULT_MS,
+    log: Optional[List[str]] = None,
+) -> Tuple[RebuildPlan, Dict[str, int], int]:
+    """Walk the words once and collect keep-spans without touching any PCM.
+
+    Mutates ``mutable_words`` exactly like :func:`rebuild_audio_from_words`
+    (removed fillers get their text blanked).
+    Returns (plan, filler_freq_map, filler_removed_count).
+    """
+    if log is None:
+        log = []
+    plan = RebuildPlan(
+        frame_rate=main_content_audio.frame_rate,
+        frame_width=main_content_audio.frame_width,
+        source_bytes=len(main_content_audio.raw_data),
+    )
+    cursor_ms = 0
+    last_appended_segment_ms = 0
+    filler_removed_count = 0
+    filler_freq: Dict[str, int] = {}
+    # Precompute which indices are fillers using the same phrase-aware logic as transcripts
+    filler_idx = compute_filler_spans(mutable_words, filler_words or set()) if (remove_fillers and filler_words) else set()
+    if log is not None:
+        try:
+            norm_list = [ _norm(str(x)) for x in (filler_words or set()) ]
+            sample_spans = [(i, (mutable_words[i] or {}).get('word')) for i in sorted(list(filler_idx))[:12]]
+            log.append(f"[FILLERS_NORM_LIST] {norm_list}")
+            log.append(f"[FILLER_SPANS] count={len(filler_idx)} sample={sample_spans}")
+        except Exception:
+            pass
+    normalized_fillers = {_norm(x) for x in (filler_words or set())} if filler_words else set()
+    for idx, w in enumerate(mutable_words):
+        start_ms = int(w['start'] * 1000)
+        end_ms = int(w['end'] * 1000)
+        if start_ms > cursor_ms:
+            gap_ms = start_ms - cursor_ms
+            plan.append_source(cursor_ms, cursor_ms + gap_ms)
+            cursor_ms += gap_ms
+        sfx_file = w.get('_sfx_file')
+        if sfx_file:
+            # SFX handling is done upstream; here we only stitch voice content.
+            # Keep the placeholder as zero-length; caller inserts SFX audio directly.
+            pass
+        else:
+            # Always keep the original audio segment unless it's a filler to remove
+            # (word text may be blanked for command tokens; audio must still pass through)
+            word_text = w.get('word') or ''
+            lw = _norm(word_text or '') if isinstance(word_text, str) else ''
+            # Remove if this index is marked as filler by phrase-aware spans, otherwise fall back to token match
+            is_filler_here = (idx in filler_idx) or (word_text and remove_fillers and normalized_fillers and lw in normalized_fillers)
+            if is_filler_here:
+                if filler_lead_trim_ms > 0 and last_appended_segment_ms > 0:
+                    trim_amt = min(filler_lead_trim_ms, last_appended_segment_ms, plan.result_ms)
+                    if trim_amt > 0:
+                        plan.trim_tail(trim_amt)
+                        last_appended_segment_ms -= trim_amt
+                        if log is not None:
+                            log.append(f"[FILLER_LEAD_TRIM] word='{lw}' trim_ms={trim_amt} at={w['start']:.3f}s")
+                filler_removed_count += 1
+                filler_freq[lw] = filler_freq.get(lw, 0) + 1
+                # Remove from transcript text as well
+                try:
+                    w['word'] = ''
+                except Exception:
+                    pass
+                if log is not None:
+                    log.append(f"[FILLER_REMOVE] word='{lw}' start={w['start']:.3f}s end={w['end']:.3f}s index={idx}")
+            else:
+                last_appended_segment_ms = plan.append_source(start_ms, end_ms)
+        cursor_ms = end_ms
+    if cursor_ms < plan.source_ms:
+        plan.append_source(cursor_ms, plan.source_ms)
+    return plan, filler_freq, filler_removed_count
+
+
 def rebuild_audio_from_words(
     main_content_audio: AudioSegment,
     mutable_words: List[Dict[str, Any]],
@@ -27,8 +222,35 @@ def rebuild_audio_from_words(
     log: Optional[List[str]] = None,
 ) -> Tuple[AudioSegment, Dict[str, int], int]:
     """Rebuild audio by stitching inter-word gaps and words, with optional filler removal.
+
+    Keep-spans are planned first and rendered in a single pass into a
+    preallocated buffer, so cost is linear in the output length.
     Returns (result_audio, filler_freq_map, filler_removed_count).
     """
+    plan, filler_freq, filler_removed_count = plan_rebuild_from_words(
+        main_content_audio,
+        mutable_words,
+        filler_words=filler_words,
+        remove_fillers=remove_fillers,
+        filler_lead_trim_ms=filler_lead_trim_ms,
+        log=log,
+    )
+    return plan.render(main_content_audio), filler_freq, filler_removed_count
+
+
+def _rebuild_audio_from_words_concat(
+    main_content_audio: AudioSegment,
+    mutable_words: List[Dict[str, Any]],
+    filler_words: Optional[set] = None,
+    remove_fillers: bool = True,
+    filler_lead_trim_ms: int = FILLER_LEAD_TRIM_DEFAULT_MS,
+    log: Optional[List[str]] = None,
+) -> Tuple[AudioSegment, Dict[str, int], int]:
+    """Reference implementation that grows the result with ``+=`` (quadratic copying).
+
+    Kept for equivalence tests and ``scripts/bench_rebuild_audio.py``; production
+    callers go through :func:`rebuild_audio_from_words`.
+    """
     if log is None:
         log = []
     result_audio: AudioSegment = AudioSegment.empty()
@@ -217,6 +439,8 @@ def _cosine(v1: List[float], v2: List[float]) -> float:
 
 
 __all__ = [
+    "RebuildPlan",
+    "plan_rebuild_from_words",
     "rebuild_audio_from_words",
     "compress_long_pauses_guarded",
 ]
@@ -0,0 +1,252 @@
+"""Frame-level MP3 splicing without decoding.
+
+TTS providers return MPEG Layer III streams. Chunks from the same provider share
+a sample rate and channel layout, so they can be joined by concatenating their
+audio frames: ID3 tags and the Xing/Info/VBRI header frame (whose frame count
+would be wrong for the joined stream) are dropped, and pauses are made of
+frames whose side information is all zero, which every decoder renders as
+silence. :func:`fade_out` attenuates a stream's tail the way mp3gain adjusts
+volume, by rewriting each granule's ``global_gain``. Anything unexpected makes
+:func:`parse` return None so callers can fall back to decoding.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+# Layer III bitrates (kbps) by bitrate index; index 0 (free format) and 15 are invalid.
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),  # MPEG-2.5
+}
+
+
+@dataclass(frozen=True)
+class _Header:
+    version: int
+    bitrate_index: int
+    sample_rate: int
+    padding: int
+    protected: bool
+    mono: bool
+    length: int
+
+    @property
+    def samples(self) -> int:
+        return 1152 if self.version == 3 else 576
+
+    @property
+    def side_info(self) -> int:
+        if self.version == 3:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+
+@dataclass(frozen=True)
+class Mp3Stream:
+    """The audio frames of one MP3 file, stripped of tags and info frames."""
+
+    data: bytes
+    frame_count: int
+    sample_rate: int
+    channels: int
+    samples_per_frame: int
+    template: bytes  # header of the first audio frame, reused for silent frames
+
+    @property
+    def duration_ms(self) -> int:
+        return int(round(self.frame_count * self.samples_per_frame * 1000 / self.sample_rate))
+
+    def compatible(self, other: "Mp3Stream") -> bool:
+        return (self.sample_rate, self.channels) == (other.sample_rate, other.channels)
+
+
+# Samples per granule; MPEG-1 frames carry two granules, MPEG-2/2.5 frames one.
+_GRANULE_SAMPLES = 576
+# global_gain scales a granule by 2 ** (gain / 4), i.e. 1.5 dB per step.
+_GAIN_STEP_DB = 1.5
+
+
+def _header(data: bytes, pos: int) -> Optional[_Header]:
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    sr_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sr_index == 3:
+        return None
+    sample_rate = _SAMPLE_RATES[version][sr_index]
+    padding = (b2 >> 1) & 0x01
+    if version == 3:
+        length = 144000 * _BITRATES_V1[bitrate_index] // sample_rate + padding
+    else:
+        length = 72000 * _BITRATES_V2[bitrate_index] // sample_rate + padding
+    return _Header(
+        version=version,
+        bitrate_index=bitrate_index,
+        sample_rate=sample_rate,
+        padding=padding,
+        protected=not (b1 & 0x01),
+        mono=(b3 >> 6) == 3,
+        length=length,
+    )
+
+
+def _skip_id3v2(data: bytes) -> int:
+    pos = 0
+    while data[pos:pos + 3] == b"ID3" and pos + 10 <= len(data):
+        size = 0
+        for b in data[pos + 6:pos + 10]:
+            size = (size << 7) | (b & 0x7F)
+        footer = 10 if data[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+
+def _is_info_frame(data: bytes, pos: int, hdr: _Header) -> bool:
+    off = pos + 4 + (2 if hdr.protected else 0) + hdr.side_info
+    return data[off:off + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def parse(data: bytes) -> Optional[Mp3Stream]:
+    """Split ``data`` into its audio frames, or None if it is not a clean Layer III stream."""
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    pos = _skip_id3v2(data)
+    first: Optional[_Header] = None
+    start = pos
+    frames = 0
+    while pos < end:
+        hdr = _header(data, pos)
+        if hdr is None:
+            return None
+        if pos + hdr.length > end:
+            break  # truncated final frame
+        if first is None:
+            if _is_info_frame(data, pos, hdr):
+                pos += hdr.length
+                start = pos
+                continue
+            first = hdr
+        elif (hdr.version, hdr.sample_rate, hdr.mono) != (first.version, first.sample_rate, first.mono):
+            return None
+        frames += 1
+        pos += hdr.length
+    if first is None:
+        return None
+    return Mp3Stream(
+        data=bytes(data[start:pos]),
+        frame_count=frames,
+        sample_rate=first.sample_rate,
+        channels=1 if first.mono else 2,
+        samples_per_frame=first.samples,
+        template=bytes(data[start:start + 4]),
+    )
+
+
+def silence(like: Mp3Stream, duration_ms: int) -> Tuple[bytes, int]:
+    """Silent frames matching ``like`` lasting about ``duration_ms``; returns (bytes, frame count)."""
+    count = int(round(max(0, duration_ms) * like.sample_rate / (1000 * like.samples_per_frame)))
+    if count <= 0:
+        return b"", 0
+    # No CRC, no padding; the zeroed side info and main data decode to silence.
+    header = bytes((like.template[0], like.template[1] | 0x01, like.template[2] & 0xFD, like.template[3]))
+    hdr = _header(header, 0)
+    assert hdr is not None
+    frame = header + bytes(hdr.length - 4)
+    return frame * count, count
+
+
+def _read_bits(buf: bytearray, bit: int, n: int) -> int:
+    value = 0
+    for i in range(bit, bit + n):
+        value = (value << 1) | ((buf[i >> 3] >> (7 - (i & 7))) & 1)
+    return value
+
+
+def _write_bits(buf: bytearray, bit: int, n: int, value: int) -> None:
+    for k, i in enumerate(range(bit, bit + n)):
+        mask = 1 << (7 - (i & 7))
+        if (value >> (n - 1 - k)) & 1:
+            buf[i >> 3] |= mask
+        else:
+            buf[i >> 3] &= ~mask & 0xFF
+
+
+def _global_gain_bits(hdr: _Header, pos: int) -> List[List[int]]:
+    """Bit offsets of ``global_gain`` in the frame at ``pos``, per granule and channel."""
+    channels = 1 if hdr.mono else 2
+    side = (pos + 4 + (2 if hdr.protected else 0)) * 8
+    if hdr.version == 3:
+        # main_data_begin(9) private_bits(5|3) scfsi(4 per channel); 59 bits per granule/channel
+        lead, per_channel, granules = (18 if hdr.mono else 20), 59, 2
+    else:
+        # main_data_begin(8) private_bits(1|2); 63 bits per channel, one granule
+        lead, per_channel, granules = (9 if hdr.mono else 10), 63, 1
+    # part2_3_length(12) big_values(9) precede global_gain.
+    return [
+        [side + lead + (gr * channels + ch) * per_channel + 21 for ch in range(channels)]
+        for gr in range(granules)
+    ]
+
+
+def fade_out(stream: Mp3Stream, duration_ms: int) -> Mp3Stream:
+    """Fade the last ``duration_ms`` of ``stream`` to silence without decoding.
+
+    The ramp is linear in amplitude, like pydub's ``fade_out``, quantised to one
+    gain per granule (13 ms at 44.1 kHz) and to 1.5 dB steps; the last granule
+    gets the minimum gain. Streams with CRC-protected frames are returned as-is.
+    """
+    frames: List[Tuple[_Header, int]] = []
+    pos = 0
+    while pos < len(stream.data):
+        hdr = _header(stream.data, pos)
+        if hdr is None or hdr.protected:
+            return stream
+        frames.append((hdr, pos))
+        pos += hdr.length
+    granules = [bits for hdr, pos in frames for bits in _global_gain_bits(hdr, pos)]
+    count = min(len(granules), math.ceil(max(0, duration_ms) * stream.sample_rate / (1000 * _GRANULE_SAMPLES)))
+    if count <= 0:
+        return stream
+    buf = bytearray(stream.data)
+    for k, bits in enumerate(granules[-count:]):
+        amplitude = 1.0 - (k + 1) / count
+        for bit in bits:
+            gain = _read_bits(buf, bit, 8)
+            if amplitude <= 0.0:
+                gain = 0
+            else:
+                gain = max(0, gain - int(round(-20.0 * math.log10(amplitude) / _GAIN_STEP_DB)))
+            _write_bits(buf, bit, 8, gain)
+    return replace(stream, data=bytes(buf))
+
+
+def join(streams: Sequence[Mp3Stream], gap_ms: int = 0) -> Tuple[bytes, int]:
+    """Concatenate compatible streams with ``gap_ms`` of silence between them; returns (bytes, duration_ms)."""
+    if not streams:
+        raise ValueError("nothing to join")
+    base = streams[0]
+    if any(not base.compatible(s) for s in streams[1:]):
+        raise ValueError("streams differ in sample rate or channel layout")
+    gap, gap_frames = silence(base, gap_ms)
+    parts: List[bytes] = []
+    frames = 0
+    for i, stream in enumerate(streams):
+        if i and gap_frames:
+            parts.append(gap)
+            frames += gap_frames
+        parts.append(stream.data)
+        frames += stream.frame_count
+    duration_ms = int(round(frames * base.samples_per_frame * 1000 / base.sample_rate))
+    return b"".join(parts), duration_ms
+
+
+__all__ = ["Mp3Stream", "fade_out", "join", "parse", "silence"]
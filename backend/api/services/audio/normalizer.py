@@ -134,7 +134,7 @@ def run_loudnorm_two_pass(
 ) -> None:
     """Run two-pass loudness normalization using ffmpeg loudnorm filter.
     
-    Pass 1: Analyze audio to get measured values
+    Pass 1: Analyze audio to get measured values (cached by content hash)
     Pass 2: Apply normalization with measured values for accurate targeting
     
     Args:
@@ -153,48 +153,33 @@ def run_loudnorm_two_pass(
     
     log_lines.append(f"[AUDIO_NORM] Starting two-pass normalization: target={target_lufs} LUFS, TP={tp_ceil} dBTP")
     
-    # Get input duration for validation
-    try:
-        input_duration = _get_audio_duration(input_path)
+    # Pass 1 comes from the shared analysis cache (one combined ffmpeg pass),
+    # so re-assemblies of identical audio skip the measurement entirely.
+    from api.services.audio import analysis_cache
+
+    analysis = analysis_cache.get_analysis(input_path, target_lufs=target_lufs, tp_ceil=tp_ceil) or {}
+
+    input_duration = analysis.get("duration_seconds")
+    if input_duration is None:
+        try:
+            input_duration = _get_audio_duration(input_path)
+        except Exception as e:
+            log_lines.append(f"[AUDIO_NORM] WARNING: Could not get input duration: {e}")
+            input_duration = None
+    if input_duration is not None:
         log_lines.append(f"[AUDIO_NORM] Input duration: {input_duration:.2f}s")
-    except Exception as e:
-        log_lines.append(f"[AUDIO_NORM] WARNING: Could not get input duration: {e}")
-        input_duration = None
-    
-    # Pass 1: Analyze
+
     log_lines.append("[AUDIO_NORM] Pass 1: Analyzing audio...")
-    pass1_cmd = [
-        "ffmpeg",
-        "-hide_banner",
-        "-nostats",
-        "-y",
-        "-i", str(input_path),
-        "-af", f"loudnorm=I={target_lufs}:TP={tp_ceil}:LRA=11:print_format=json",
-        "-f", "null",
-        "-",
-    ]
-    
-    try:
-        stdout, stderr, _ = _run_ffmpeg(pass1_cmd, log_lines)
-        
-        # Parse JSON from stdout
-        try:
-            measured = _parse_loudnorm_json(stdout)
-            log_lines.append(
-                f"[AUDIO_NORM] Measured: I={measured['input_i']:.2f} LUFS, "
-                f"LRA={measured['input_lra']:.2f} LU, TP={measured['input_tp']:.2f} dBTP, "
-                f"thresh={measured['input_thresh']:.2f} dBFS, offset={measured['target_offset']:.2f} dB"
-            )
-        except ValueError as e:
-            log_lines.append(f"[AUDIO_NORM] WARNING: Failed to parse pass 1 JSON: {e}, falling back to single-pass")
-            # Fall back to single-pass
-            _run_loudnorm_single_pass(input_path, output_path, target_lufs, tp_ceil, log_lines)
-            return
-        
-    except RuntimeError as e:
-        log_lines.append(f"[AUDIO_NORM] WARNING: Pass 1 failed: {e}, falling back to single-pass")
+    measured = analysis.get("loudnorm")
+    if not measured:
+        log_lines.append("[AUDIO_NORM] WARNING: Pass 1 produced no loudnorm stats, falling back to single-pass")
         _run_loudnorm_single_pass(input_path, output_path, target_lufs, tp_ceil, log_lines)
         return
+    log_lines.append(
+        f"[AUDIO_NORM] Measured: I={measured['input_i']:.2f} LUFS, "
+        f"LRA={measured['input_lra']:.2f} LU, TP={measured['input_tp']:.2f} dBTP, "
+        f"thresh={measured['input_thresh']:.2f} dBFS, offset={measured['target_offset']:.2f} dB"
+    )
     
     # Pass 2: Apply normalization
     log_lines.append("[AUDIO_NORM] Pass 2: Applying normalization...")
@@ -28,6 +28,7 @@ from api.services.audio.orchestrator_steps import (
     do_flubber,
     do_fillers,
     do_silence,
+    do_chunked_clean,
     do_tts,
     do_export,
 )
@@ -83,12 +84,24 @@ def run_episode_pipeline(paths: Dict[str, Any], cfg: Dict[str, Any], log: List[s
     # Optional explicit flubber phase (no-op; already handled in do_intern_sfx)
     _ = do_flubber(paths, cfg, log, mutable_words=mutable_words, commands_cfg=commands_cfg)
 
-    # 3) Primary cleanup and rebuild (fillers)
-    _f = do_fillers(paths, cfg, log, content_path=content_path, mutable_words=mutable_words)
-    cleaned_audio = _f.get('cleaned_audio', AudioSegment.from_file(content_path))
-    mutable_words = _f.get('mutable_words', mutable_words)
-    filler_freq_map = _f.get('filler_freq_map', {})
-    filler_removed_count = _f.get('filler_removed_count', 0)
+    # 3) Primary cleanup and rebuild (fillers). Long episodes clean fillers and
+    # pauses in parallel chunks instead, which also covers step 5.
+    _chunked = do_chunked_clean(
+        paths,
+        cfg,
+        log,
+        content_path=content_path,
+        main_content_audio=main_content_audio,
+        mutable_words=mutable_words,
+        ai_cmds=ai_cmds,
+    )
+    if _chunked:
+        cleaned_audio = _chunked['cleaned_audio']
+        mutable_words = _chunked['mutable_words']
+    else:
+        _f = do_fillers(paths, cfg, log, content_path=content_path, mutable_words=mutable_words)
+        cleaned_audio = _f.get('cleaned_audio', AudioSegment.from_file(content_path))
+        mutable_words = _f.get('mutable_words', mutable_words)
 
     # 4) Execute Intern commands (may synthesize TTS)
     _tts = do_tts(paths, cfg, log, ai_cmds=ai_cmds, cleaned_audio=cleaned_audio, content_path=content_path, mutable_words=mutable_words)
@@ -97,9 +110,10 @@ def run_episode_pipeline(paths: Dict[str, Any], cfg: Dict[str, Any], log: List[s
 
     # 5) Optional pause compression
     log.append("[ORDER_CHECK] before_pause_compress")
-    _sil = do_silence(paths, cfg, log, cleaned_audio=cleaned_audio, mutable_words=mutable_words)
-    cleaned_audio = _sil.get('cleaned_audio', cleaned_audio)
-    mutable_words = _sil.get('mutable_words', mutable_words)
+    if not _chunked:
+        _sil = do_silence(paths, cfg, log, cleaned_audio=cleaned_audio, mutable_words=mutable_words)
+        cleaned_audio = _sil.get('cleaned_audio', cleaned_audio)
+        mutable_words = _sil.get('mutable_words', mutable_words)
 
     # 6) Export cleaned + template/final mix, transcripts, cleanup
     _exp = do_export(
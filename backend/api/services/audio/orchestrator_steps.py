@@ -27,6 +27,7 @@ from .orchestrator_steps_lib.ai_commands import (
 from .orchestrator_steps_lib.cleanup import (
     primary_cleanup_and_rebuild,
     compress_pauses_step,
+    chunked_cleanup_and_rebuild,
 )
 from .orchestrator_steps_lib.export import (
     OUTPUT_DIR,
@@ -299,6 +300,51 @@ def do_silence(
     }
 
 
+def do_chunked_clean(
+    paths: Dict[str, Any],
+    cfg: Dict[str, Any],
+    log: List[str],
+    *,
+    content_path: Path,
+    main_content_audio: AudioSegment,
+    mutable_words: List[Dict[str, Any]],
+    ai_cmds: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Clean long episodes chunk-by-chunk in parallel; ``{}`` means use the serial steps.
+
+    Intern commands edit the cleaned timeline between filler removal and pause
+    compression, so episodes that carry them keep the serial path.
+    """
+    cleanup_options = cfg.get("cleanup_options", {}) or {}
+    mix_only = bool(cfg.get("mix_only") or cfg.get("mixOnly") or False)
+    user_id = cfg.get("user_id")
+    episode_id = cfg.get("episode_id")
+    if mix_only or ai_cmds or not (user_id and episode_id):
+        return {}
+    if bool(cleanup_options.get("auphonic_processed", False)):
+        return {}
+    try:
+        from worker.tasks.assembly.chunked_processor import should_use_chunking
+
+        if not should_use_chunking(Path(content_path), duration_ms=len(main_content_audio)):
+            return {}
+        cleaned_audio, mutable_words2 = chunked_cleanup_and_rebuild(
+            content_path,
+            mutable_words,
+            cleanup_options,
+            log,
+            user_id=str(user_id),
+            episode_id=str(episode_id),
+        )
+    except Exception as exc:
+        log.append(f"[CHUNKED_CLEAN] falling back to serial cleanup ({type(exc).__name__}: {exc})")
+        return {}
+    return {
+        "cleaned_audio": cleaned_audio,
+        "mutable_words": mutable_words2,
+    }
+
+
 def do_tts(
     paths: Dict[str, Any],
     cfg: Dict[str, Any],
@@ -400,6 +446,7 @@ __all__ = [
     "do_flubber",
     "do_fillers",
     "do_silence",
+    "do_chunked_clean",
     "do_tts",
     "do_export",
     "load_content_and_init_transcripts",
@@ -407,6 +454,7 @@ __all__ = [
     "execute_intern_commands_step",
     "primary_cleanup_and_rebuild",
     "compress_pauses_step",
+    "chunked_cleanup_and_rebuild",
     "export_cleaned_audio_step",
     "build_template_and_final_mix_step",
     "write_final_transcripts_and_cleanup",
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -126,6 +129,25 @@ def primary_cleanup_and_rebuild(
     return cleaned_audio, mutable_words, filler_freq_map, int(filler_removed_count)
 
 
+def _silence_cfg(cleanup_options: Dict[str, Any]) -> Dict[str, float]:
+    return {
+        "maxPauseSeconds": float(cleanup_options.get("maxPauseSeconds", 1.5)),
+        "targetPauseSeconds": float(cleanup_options.get("targetPauseSeconds", 0.5)),
+        "pauseCompressionRatio": float(
+            cleanup_options.get("pauseCompressionRatio", 0.4)
+        ),
+        "pauseRelDb": 16.0,
+        "maxPauseRemovalPct": float(
+            cleanup_options.get("maxPauseRemovalPct", 0.1)
+        ),
+        "pauseSimilarityGuard": float(
+            cleanup_options.get("pauseSimilarityGuard", 0.85)
+        ),
+        "pausePadPreMs": float(cleanup_options.get("pausePadPreMs", 0.0)),
+        "pausePadPostMs": float(cleanup_options.get("pausePadPostMs", 0.0)),
+    }
+
+
 def compress_pauses_step(
     cleaned_audio: AudioSegment,
     cleanup_options: Dict[str, Any],
@@ -147,22 +169,7 @@ def compress_pauses_step(
         return cleaned_audio, mutable_words
 
     if remove_pauses:
-        silence_cfg = {
-            "maxPauseSeconds": float(cleanup_options.get("maxPauseSeconds", 1.5)),
-            "targetPauseSeconds": float(cleanup_options.get("targetPauseSeconds", 0.5)),
-            "pauseCompressionRatio": float(
-                cleanup_options.get("pauseCompressionRatio", 0.4)
-            ),
-            "pauseRelDb": 16.0,
-            "maxPauseRemovalPct": float(
-                cleanup_options.get("maxPauseRemovalPct", 0.1)
-            ),
-            "pauseSimilarityGuard": float(
-                cleanup_options.get("pauseSimilarityGuard", 0.85)
-            ),
-            "pausePadPreMs": float(cleanup_options.get("pausePadPreMs", 0.0)),
-            "pausePadPostMs": float(cleanup_options.get("pausePadPostMs", 0.0)),
-        }
+        silence_cfg = _silence_cfg(cleanup_options)
         logger.info(f"[SILENCE_CFG] Compressing pauses: maxPause={silence_cfg['maxPauseSeconds']}s ratio={silence_cfg['pauseCompressionRatio']}")
         raw_spans = detect_silence_pauses(mutable_words, silence_cfg, log)
         spans = guard_and_pad_pauses(raw_spans, silence_cfg, log)
@@ -185,6 +192,58 @@ def compress_pauses_step(
     return cleaned_audio, mutable_words
 
 
+def chunked_cleanup_and_rebuild(
+    content_path: Path,
+    mutable_words: List[Dict[str, Any]],
+    cleanup_options: Dict[str, Any],
+    log: List[str],
+    *,
+    user_id: str,
+    episode_id: str,
+) -> Tuple[AudioSegment, List[Dict[str, Any]]]:
+    """Filler removal and pause compression for a long episode, chunk by chunk.
+
+    Chunks are cleaned in parallel by
+    :func:`worker.tasks.assembly.chunked_processor.run_chunked_clean`. The word
+    timeline is then rebuilt the same way the serial steps do (blank fillers,
+    retime around detected pauses) so transcripts keep matching the audio.
+    Raises when chunking fails; the caller falls back to the serial steps.
+    """
+    from worker.tasks.assembly.chunked_processor import run_chunked_clean
+
+    work_dir = Path(tempfile.mkdtemp(prefix=f"chunks_{episode_id}_"))
+    try:
+        transcript_path = work_dir / "words.json"
+        transcript_path.write_text(json.dumps(mutable_words), encoding="utf-8")
+        output_path = run_chunked_clean(
+            Path(content_path),
+            transcript_path,
+            user_id,
+            episode_id,
+            work_dir / "cleaned.mp3",
+            cleanup_options=cleanup_options,
+            work_dir=work_dir,
+        )
+        cleaned_audio = AudioSegment.from_file(output_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    log.append(f"[CHUNKED_CLEAN] cleaned {Path(content_path).name} in parallel chunks -> {len(cleaned_audio)}ms")
+    logger.info(log[-1])
+
+    filler_words = [
+        str(w).strip().lower()
+        for w in (cleanup_options.get("fillerWords", []) or [])
+        if str(w).strip()
+    ]
+    if filler_words and cleanup_options.get("removeFillers", True):
+        mutable_words, _ = remove_fillers_from_pipeline(mutable_words, filler_words, log)
+    if cleanup_options.get("removePauses", True):
+        silence_cfg = _silence_cfg(cleanup_options)
+        spans = guard_and_pad_pauses(detect_silence_pauses(mutable_words, silence_cfg, log), silence_cfg, log)
+        mutable_words = retime_words_for_pauses(mutable_words, spans, silence_cfg, log)
+    return cleaned_audio, mutable_words
+
+
 def apply_flubber_cuts_to_audio(
     audio: AudioSegment,
     mutable_words: List[Dict[str, Any]],
@@ -252,5 +311,6 @@ def apply_flubber_cuts_to_audio(
 __all__ = [
     "primary_cleanup_and_rebuild",
     "compress_pauses_step",
+    "chunked_cleanup_and_rebuild",
     "apply_flubber_cuts_to_audio",
 ]
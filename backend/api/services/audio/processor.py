@@ -74,6 +74,8 @@ def process_and_assemble_episode(
     mix_only: bool = False,
     words_json_path: Optional[str] = None,
     log_path: Optional[str] = None,
+    episode_id: Optional[str] = None,
+    user_id: Optional[str] = None,
 ) -> Tuple[Path, List[str], List[str]]:
     """Thin façade that delegates to the orchestrator (AP-8B).
 
@@ -105,6 +107,9 @@ def process_and_assemble_episode(
         "tts_provider": tts_provider,
         "elevenlabs_api_key": elevenlabs_api_key,
         "mix_only": bool(mix_only),
+        # Needed to name chunk uploads when long episodes are cleaned in parallel
+        "episode_id": episode_id,
+        "user_id": user_id,
         # Forbid fallback transcription during assembly; only explicit env overrides will allow it
         "forbid_transcribe": True,
     }
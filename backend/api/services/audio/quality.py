@@ -2,14 +2,14 @@ from __future__ import annotations
 
 import logging
 import os
-import shlex
-import subprocess
 import tempfile
 from pathlib import Path
 from typing import Dict, Optional, Any
 
 from infrastructure import gcs, storage
 
+from api.services.audio import analysis_cache
+
 log = logging.getLogger("audio.quality")
 
 
@@ -56,96 +56,6 @@ def _download_to_temp(gcs_path: str) -> Optional[Path]:
         return None
 
 
-def _run_ffprobe_duration(path: Path) -> Optional[float]:
-    try:
-        cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            str(path),
-        ]
-        out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
-        s = out.decode("utf-8").strip()
-        return float(s)
-    except Exception:
-        return None
-
-
-def _run_ffmpeg_ebur128(path: Path) -> Optional[float]:
-    """Try to get integrated loudness (LUFS) from ffmpeg ebur128 filter."""
-    try:
-        cmd = [
-            "ffmpeg",
-            "-hide_banner",
-            "-nostats",
-            "-i",
-            str(path),
-            "-af",
-            "ebur128=framelog=verbose",
-            "-f",
-            "null",
-            "-",
-        ]
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        _, stderr = proc.communicate(timeout=60)
-        text = stderr.decode("utf-8", errors="ignore")
-        # Look for lines like 'I: -21.0 LUFS'
-        for line in reversed(text.splitlines()):
-            if "I:" in line and "LUFS" in line:
-                try:
-                    parts = line.split()
-                    # find token that looks like -21.0
-                    for tok in parts:
-                        if tok.replace("-", "").replace(".", "").isdigit():
-                            return float(tok)
-                except Exception:
-                    continue
-        return None
-    except Exception:
-        return None
-
-
-def _run_ffmpeg_volumedetect(path: Path) -> Dict[str, Optional[float]]:
-    """Return mean_volume and max_volume in dB from ffmpeg volumedetect filter."""
-    try:
-        cmd = [
-            "ffmpeg",
-            "-hide_banner",
-            "-nostats",
-            "-i",
-            str(path),
-            "-af",
-            "volumedetect",
-            "-f",
-            "null",
-            "-",
-        ]
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        _, stderr = proc.communicate(timeout=60)
-        text = stderr.decode("utf-8", errors="ignore")
-        mean = None
-        maxv = None
-        for line in text.splitlines():
-            line = line.strip()
-            if line.startswith("mean_volume:"):
-                try:
-                    mean = float(line.split(":", 1)[1].strip().split()[0])
-                except Exception:
-                    pass
-            if line.startswith("max_volume:"):
-                try:
-                    maxv = float(line.split(":", 1)[1].strip().split()[0])
-                except Exception:
-                    pass
-        return {"mean_volume_db": mean, "max_volume_db": maxv}
-    except Exception:
-        return {"mean_volume_db": None, "max_volume_db": None}
-
-
 def analyze_audio_file(main_content_filename: str) -> Dict[str, Any]:
     """Analyze audio and return quality metrics and a normalized label.
 
@@ -165,12 +75,12 @@ def analyze_audio_file(main_content_filename: str) -> Dict[str, Any]:
             log.warning("audio.quality: could not obtain file for analysis: %s", main_content_filename)
             return {"integrated_lufs": None, "duration_seconds": None, "mean_volume_db": None, "max_volume_db": None, "signal_to_noise_ratio": None, "quality_label": "unknown"}
 
-        # duration
-        duration = _run_ffprobe_duration(temp_path)
-        lufs = _run_ffmpeg_ebur128(temp_path)
-        vol = _run_ffmpeg_volumedetect(temp_path)
-        mean_db = vol.get("mean_volume_db")
-        max_db = vol.get("max_volume_db")
+        # One cached ffmpeg pass; retries of the same upload skip re-analysis.
+        analysis = analysis_cache.get_analysis(temp_path) or {}
+        duration = analysis.get("duration_seconds")
+        lufs = analysis.get("integrated_lufs")
+        mean_db = analysis.get("mean_volume_db")
+        max_db = analysis.get("max_volume_db")
 
         # crude SNR estimate: use max - mean as proxy (not true SNR)
         snr = None
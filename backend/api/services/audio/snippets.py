@@ -0,0 +1,335 @@
+"""Range-sliced review snippets (flubber / intern context windows).
+
+Review snippets are short windows (10-60 s) of a long recording. Rather than
+decoding the whole episode to PCM and slicing it, every requested window is cut
+by one ffmpeg process: each window is opened as its own input with ``-ss``/``-t``
+input seeking (so only that range is decoded) and mapped to its own MP3 output,
+which ffmpeg encodes side by side. Very large requests are split into batches of
+``AUDIO_SNIPPET_BATCH_SIZE`` windows that run as parallel processes.
+
+Snippets are content-addressed: file names and storage keys carry a prefix of
+the source's SHA-256 and the window in milliseconds, so the same window of the
+same bytes is cut and uploaded once. A snippet already on local disk is not cut
+again, and one already uploaded (remembered in-process and in Redis under
+``audio:snippet:v1:*`` for ``AUDIO_SNIPPET_CACHE_TTL_S``, default 1 day) is not
+cut or uploaded again; only a fresh signed URL is minted. Uploads stream the
+file with ``gcs.upload_fileobj`` and run concurrently.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from api.core.redis_client import redis_get, redis_setex
+from api.services.audio.analysis_cache import sha256_file
+
+log = logging.getLogger("api.services.audio.snippets")
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_WORKERS = 4
+DEFAULT_CACHE_TTL_S = 24 * 60 * 60
+DEFAULT_BITRATE = "128k"
+SIGNED_URL_TTL_S = 3600
+EXTRACT_TIMEOUT_S = 300
+PROBE_TIMEOUT_S = 30
+
+_UPLOADED_KEY = "audio:snippet:v1:{bucket}:{key}"
+_DIGEST_PREFIX = 16
+_MAX_LOCAL_ENTRIES = 1024
+
+_LOCK = threading.Lock()
+_DIGESTS: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_UPLOADED: "OrderedDict[str, bool]" = OrderedDict()
+
+Window = Tuple[float, float]
+
+
+@dataclass
+class Snippet:
+    """One extracted window: local file plus (once uploaded) its storage location."""
+
+    start_s: float
+    end_s: float
+    name: str
+    path: Path
+    key: Optional[str] = None
+    url: Optional[str] = None
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _ffmpeg_bin() -> str:
+    return os.environ.get("FFMPEG_BIN") or shutil.which("ffmpeg") or "ffmpeg"
+
+
+def _ffprobe_bin() -> str:
+    return os.environ.get("FFPROBE_BIN") or shutil.which("ffprobe") or "ffprobe"
+
+
+def _remember(cache: OrderedDict, key, value) -> None:
+    with _LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > _MAX_LOCAL_ENTRIES:
+            cache.popitem(last=False)
+
+
+def source_digest(path: Path) -> str:
+    """SHA-256 of ``path``, memoized by (path, size, mtime) so repeat requests skip the hash."""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _LOCK:
+        hit = _DIGESTS.get(memo_key)
+    if hit:
+        return hit
+    digest = sha256_file(path)
+    _remember(_DIGESTS, memo_key, digest)
+    return digest
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    """Container duration in seconds from ffprobe; None when it cannot be read."""
+    cmd = [
+        _ffprobe_bin(),
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT_S)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.warning("audio.snippets: ffprobe failed for %s: %s", path, e)
+        return None
+    try:
+        duration = float((proc.stdout or "").strip())
+    except ValueError:
+        log.warning("audio.snippets: no duration for %s: %s", path, (proc.stderr or "")[-300:])
+        return None
+    return duration if duration > 0 else None
+
+
+def snippet_name(prefix: str, digest: str, start_s: float, end_s: float) -> str:
+    start_ms = max(0, int(start_s * 1000))
+    end_ms = max(start_ms + 1, int(end_s * 1000))
+    return f"{prefix}_{digest[:_DIGEST_PREFIX]}_{start_ms}_{end_ms}.mp3"
+
+
+def _extract_cmd(source: Path, jobs: Sequence[Tuple[Window, Path]]) -> List[str]:
+    cmd = [_ffmpeg_bin(), "-hide_banner", "-nostdin", "-loglevel", "error", "-y"]
+    for (start_s, end_s), _ in jobs:
+        cmd += ["-ss", f"{start_s:.3f}", "-t", f"{max(0.001, end_s - start_s):.3f}", "-i", str(source)]
+    for index, (_, out_path) in enumerate(jobs):
+        cmd += [
+            "-map", f"{index}:a:0",
+            "-vn",
+            "-c:a", "libmp3lame",
+            "-b:a", DEFAULT_BITRATE,
+            "-f", "mp3",
+            str(out_path) + ".part",
+        ]
+    return cmd
+
+
+def _run_batch(source: Path, jobs: Sequence[Tuple[Window, Path]]) -> bool:
+    try:
+        proc = subprocess.run(
+            _extract_cmd(source, jobs),
+            capture_output=True,
+            text=True,
+            errors="ignore",
+            timeout=EXTRACT_TIMEOUT_S,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.warning("audio.snippets: ffmpeg failed for %s: %s", source, e)
+        ok = False
+    else:
+        ok = proc.returncode == 0
+        if not ok:
+            log.warning("audio.snippets: ffmpeg exited %s for %s: %s", proc.returncode, source, (proc.stderr or "")[-300:])
+    for _, out_path in jobs:
+        part = Path(str(out_path) + ".part")
+        try:
+            if ok and part.is_file() and part.stat().st_size > 0:
+                os.replace(part, out_path)
+            else:
+                part.unlink(missing_ok=True)
+        except OSError:  # pragma: no cover - cleanup best effort
+            pass
+    return ok
+
+
+def extract_snippets(
+    source: Path,
+    windows: Sequence[Window],
+    out_dir: Path,
+    *,
+    prefix: str,
+    digest: Optional[str] = None,
+) -> List[Optional[Snippet]]:
+    """Cut ``windows`` (seconds) out of ``source`` as MP3 files in ``out_dir``.
+
+    Returns one entry per window, None where extraction failed. Windows whose
+    file already exists locally are reused without running ffmpeg.
+    """
+    source = Path(source)
+    digest = digest or source_digest(source)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results: List[Optional[Snippet]] = []
+    pending: Dict[str, Tuple[Window, Path]] = {}
+    for start_s, end_s in windows:
+        name = snippet_name(prefix, digest, start_s, end_s)
+        path = out_dir / name
+        results.append(Snippet(start_s=start_s, end_s=end_s, name=name, path=path))
+        if not path.is_file() and name not in pending:
+            pending[name] = ((start_s, end_s), path)
+
+    if pending:
+        jobs = list(pending.values())
+        size = _env_int("AUDIO_SNIPPET_BATCH_SIZE", DEFAULT_BATCH_SIZE, 1)
+        batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        if len(batches) == 1:
+            _run_batch(source, batches[0])
+        else:
+            workers = min(len(batches), _env_int("AUDIO_SNIPPET_WORKERS", DEFAULT_WORKERS, 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda batch: _run_batch(source, batch), batches))
+        log.info("event=audio.snippets.extract source=%s windows=%d cut=%d", source.name, len(windows), len(jobs))
+
+    return [s if s.path.is_file() else None for s in results]
+
+
+def _is_uploaded(bucket: str, key: str) -> bool:
+    cache_key = _UPLOADED_KEY.format(bucket=bucket, key=key)
+    with _LOCK:
+        if cache_key in _UPLOADED:
+            return True
+    if redis_get(cache_key):
+        _remember(_UPLOADED, cache_key, True)
+        return True
+    return False
+
+
+def _mark_uploaded(bucket: str, key: str) -> None:
+    ttl = _env_int("AUDIO_SNIPPET_CACHE_TTL_S", DEFAULT_CACHE_TTL_S, 0)
+    if ttl <= 0:
+        return
+    cache_key = _UPLOADED_KEY.format(bucket=bucket, key=key)
+    _remember(_UPLOADED, cache_key, True)
+    redis_setex(cache_key, ttl, "1")
+
+
+def upload_snippet(path: Path, bucket: str, key: str, *, content_type: str = "audio/mpeg") -> Optional[str]:
+    """Stream ``path`` to ``bucket/key`` and return a signed URL for it."""
+    from infrastructure import gcs
+
+    with open(path, "rb") as fh:
+        gcs.upload_fileobj(bucket, key, fh, content_type=content_type)
+    return gcs.get_signed_url(bucket, key, expiration=SIGNED_URL_TTL_S)
+
+
+def _signed_url(bucket: str, key: str) -> Optional[str]:
+    from infrastructure import gcs
+
+    return gcs.get_signed_url(bucket, key, expiration=SIGNED_URL_TTL_S)
+
+
+def prepare_snippets(
+    source: Path,
+    windows: Sequence[Window],
+    out_dir: Path,
+    *,
+    prefix: str,
+    key_prefix: str,
+    bucket: Optional[str] = None,
+    keep_local: bool = False,
+) -> List[Optional[Snippet]]:
+    """Extract and upload ``windows`` of ``source``; the cached path for review snippets.
+
+    Each returned snippet has ``key``/``url`` set when it is in storage. A
+    snippet whose upload failed keeps its local file (and ``url`` None) so the
+    caller can fall back to serving it statically; uploaded files are removed
+    unless ``keep_local``.
+    """
+    source = Path(source)
+    bucket = bucket or os.getenv("GCS_BUCKET", "ppp-media-us-west1")
+    digest = source_digest(source)
+
+    results: List[Optional[Snippet]] = [None] * len(windows)
+    to_cut: List[int] = []
+    for i, (start_s, end_s) in enumerate(windows):
+        name = snippet_name(prefix, digest, start_s, end_s)
+        key = f"{key_prefix}/{name}"
+        if _is_uploaded(bucket, key):
+            try:
+                url = _signed_url(bucket, key)
+            except Exception as e:
+                log.warning("audio.snippets: signing cached %s failed: %s", key, e)
+                url = None
+            if url:
+                results[i] = Snippet(start_s, end_s, name, out_dir / name, key=key, url=url)
+                continue
+        to_cut.append(i)
+
+    if not to_cut:
+        return results
+
+    extracted = extract_snippets(source, [windows[i] for i in to_cut], out_dir, prefix=prefix, digest=digest)
+
+    def _upload(snippet: Snippet) -> Snippet:
+        key = f"{key_prefix}/{snippet.name}"
+        try:
+            snippet.url = upload_snippet(snippet.path, bucket, key)
+            snippet.key = key
+            _mark_uploaded(bucket, key)
+        except Exception as e:
+            log.error("audio.snippets: upload of %s failed: %s", key, e, exc_info=True)
+            return snippet
+        if not keep_local:
+            try:
+                snippet.path.unlink(missing_ok=True)
+            except OSError:  # pragma: no cover - cleanup best effort
+                pass
+        return snippet
+
+    ready = [s for s in extracted if s is not None]
+    if ready:
+        workers = min(len(ready), _env_int("AUDIO_SNIPPET_WORKERS", DEFAULT_WORKERS, 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_upload, ready))
+    for i, snippet in zip(to_cut, extracted):
+        results[i] = snippet
+    return results
+
+
+def clear_local_cache() -> None:
+    with _LOCK:
+        _DIGESTS.clear()
+        _UPLOADED.clear()
+
+
+__all__ = [
+    "Snippet",
+    "source_digest",
+    "probe_duration",
+    "snippet_name",
+    "extract_snippets",
+    "upload_snippet",
+    "prepare_snippets",
+    "clear_local_cache",
+]
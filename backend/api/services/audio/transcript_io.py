@@ -1,9 +1,64 @@
 from __future__ import annotations
 
 import json
+import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from api.services.audio import transcript_pack
+from api.services.audio.transcript_pack import PACK_SUFFIX, TranscriptPack
+
+_log = logging.getLogger("api.services.audio.transcript_io")
+
+
+def pack_sidecar_path(json_path: Path) -> Path:
+    """``foo.json`` -> ``foo.wpack`` (the columnar copy next to a transcript JSON)."""
+    return json_path.with_suffix(PACK_SUFFIX)
+
+
+def write_pack_sidecar(json_path: Path, words: List[Dict[str, Any]]) -> Optional[Path]:
+    """Write the columnar sidecar for ``json_path`` (call after writing the JSON).
+
+    The sidecar records the JSON's size and mtime; if the JSON is later
+    rewritten without it, readers notice and fall back to the JSON. Returns
+    None (and removes any stale sidecar) when the words cannot be packed.
+    """
+    path = pack_sidecar_path(json_path)
+    try:
+        st = json_path.stat()
+        data = transcript_pack.encode(words, source_size=st.st_size, source_mtime_ns=st.st_mtime_ns)
+        if data is None:
+            path.unlink(missing_ok=True)
+            return None
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return path
+    except Exception as exc:
+        _log.warning("[transcript_io] could not write word pack for %s: %s", json_path.name, exc)
+        return None
+
+
+def open_transcript_pack(json_path: Path) -> Optional[TranscriptPack]:
+    """Memory-map the fresh sidecar of ``json_path``, or None if there is none.
+
+    Use this for time-range reads (``pack.slice(start_s, end_s)``) instead of
+    loading the whole transcript. The caller closes the returned pack.
+    """
+    path = pack_sidecar_path(json_path)
+    try:
+        st = json_path.stat()
+        pack = TranscriptPack.open(path)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        _log.warning("[transcript_io] ignoring unreadable word pack %s: %s", path.name, exc)
+        return None
+    if (pack.source_size, pack.source_mtime_ns) != (st.st_size, st.st_mtime_ns):
+        pack.close()
+        return None
+    return pack
 
 
 def write_working_json(
@@ -17,6 +72,7 @@ def write_working_json(
     path = transcripts_dir / f"{sanitized_output_filename}.json"
     with open(path, "w", encoding="utf-8") as fh:
         json.dump(words, fh, ensure_ascii=False, indent=2)
+    write_pack_sidecar(path, words)
     log.append(f"[TRANSCRIPTS] wrote working transcript JSON {path.name} entries={len(words)}")
     return path
 
@@ -52,8 +108,13 @@ def write_nopunct_sidecar(
 def load_transcript_json(path: Path) -> List[Dict[str, Any]]:
     """Load a transcript JSON list from the given path.
 
+    Reads the columnar sidecar instead when it is up to date with the JSON.
     If JSON is not a list, return []. Exceptions bubble up to caller.
     """
+    pack = open_transcript_pack(path)
+    if pack is not None:
+        with pack:
+            return pack.to_json_list()
     with open(path, "r", encoding="utf-8") as fh:
         data = json.load(fh)
     return data if isinstance(data, list) else []
@@ -0,0 +1,407 @@
+"""Compact columnar transcript storage ("word packs").
+
+Word-level transcripts are lists of ``{"word", "start", "end", ...}`` dicts; as
+indented JSON a long episode is tens of megabytes and every consumer has to
+parse all of it. A pack stores the same data as columns:
+
+- ``start``/``end`` as ``uint32`` milliseconds when every value is exact at
+  millisecond precision (AssemblyAI timings always are), otherwise ``float64``;
+- ``word`` and ``speaker`` as ``uint32`` indexes into a de-duplicated UTF-8
+  string table (``NO_STRING`` marks a word without a string speaker);
+- ``confidence`` as ``uint32`` micro-units when exact, otherwise ``float64``;
+- anything else (rare keys, non-string speakers, ...) in a sparse JSON map
+  keyed by word index, so :meth:`TranscriptPack.to_json_list` round-trips.
+
+Local sidecars are written uncompressed and read through ``mmap`` with numpy
+views over the columns, so opening one costs a header parse and a time-range
+lookup is a binary search; only the requested words are materialised. Object
+storage copies are zlib-compressed (``FLAG_COMPRESSED``) to cut egress.
+
+Layout: a fixed header (``_HEADER``), then each section padded to 8 bytes:
+starts, ends, word ids, [speaker ids], [confidences], string offsets
+(``n_strings + 1``), string blob, extras JSON. The header also records the size
+and mtime of the JSON file a sidecar was built from so stale sidecars are
+ignored (see :mod:`api.services.audio.transcript_io`).
+"""
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"DCWP"
+VERSION = 1
+PACK_SUFFIX = ".wpack"
+PACK_CONTENT_TYPE = "application/x-donecast-wordpack"
+
+FLAG_COMPRESSED = 1 << 0
+FLAG_TIMES_MS = 1 << 1
+FLAG_SPEAKER = 1 << 2
+FLAG_CONFIDENCE = 1 << 3
+FLAG_CONFIDENCE_MICRO = 1 << 4
+
+NO_STRING = 0xFFFFFFFF
+_NO_CONFIDENCE = 0xFFFFFFFF
+
+# magic, version, flags, n_words, n_strings, blob_len, extras_len, src_size, src_mtime_ns
+_HEADER = struct.Struct("<4sHHIIIIqq")
+
+
+class PackError(ValueError):
+    """Raised for data that is not a valid word pack."""
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _exact_scaled(values: np.ndarray, scale: float, limit: int) -> Optional[np.ndarray]:
+    """``values * scale`` as uint32 if that round-trips exactly, else None."""
+    if not values.size:
+        return values.astype("<u4")
+    scaled = np.rint(values * scale)
+    if scaled.min() < 0 or scaled.max() >= limit:
+        return None
+    if not np.array_equal(scaled / scale, values):
+        return None
+    return scaled.astype("<u4")
+
+
+def encode(
+    words: Sequence[Dict[str, Any]],
+    *,
+    compress: bool = False,
+    source_size: int = 0,
+    source_mtime_ns: int = 0,
+) -> Optional[bytes]:
+    """Pack a word list; returns None if it is not a list of word dicts.
+
+    Every item needs a string ``word`` and numeric ``start``/``end``; other
+    shapes are left to JSON rather than guessed at.
+    """
+    n = len(words)
+    starts = np.empty(n, dtype="<f8")
+    ends = np.empty(n, dtype="<f8")
+    word_ids = np.empty(n, dtype="<u4")
+    speaker_ids = np.full(n, NO_STRING, dtype="<u4")
+    confidences = np.full(n, np.nan, dtype="<f8")
+    has_speaker = has_confidence = False
+    strings: Dict[str, int] = {}
+    extras: Dict[str, Dict[str, Any]] = {}
+
+    def intern(text: str) -> int:
+        idx = strings.get(text)
+        if idx is None:
+            idx = strings[text] = len(strings)
+        return idx
+
+    for i, item in enumerate(words):
+        if not isinstance(item, dict):
+            return None
+        word, start, end = item.get("word"), item.get("start"), item.get("end")
+        if not isinstance(word, str) or not _is_number(start) or not _is_number(end):
+            return None
+        starts[i], ends[i] = start, end
+        word_ids[i] = intern(word)
+        extra: Dict[str, Any] = {}
+        for key, value in item.items():
+            if key in ("word", "start", "end"):
+                continue
+            if key == "speaker" and isinstance(value, str):
+                speaker_ids[i] = intern(value)
+                has_speaker = True
+            elif key == "confidence" and _is_number(value):
+                confidences[i] = value
+                has_confidence = True
+            else:
+                extra[key] = value
+        if extra:
+            extras[str(i)] = extra
+
+    flags = 0
+    start_col = _exact_scaled(starts, 1000.0, 1 << 32)
+    end_col = _exact_scaled(ends, 1000.0, 1 << 32)
+    if start_col is not None and end_col is not None:
+        flags |= FLAG_TIMES_MS
+        time_cols = [start_col, end_col]
+    else:
+        time_cols = [starts, ends]
+
+    sections: List[bytes] = [col.tobytes() for col in time_cols]
+    sections.append(word_ids.tobytes())
+    if has_speaker:
+        flags |= FLAG_SPEAKER
+        sections.append(speaker_ids.tobytes())
+    if has_confidence:
+        flags |= FLAG_CONFIDENCE
+        present = ~np.isnan(confidences)
+        micro = _exact_scaled(confidences[present], 1_000_000.0, _NO_CONFIDENCE)
+        if micro is not None:
+            flags |= FLAG_CONFIDENCE_MICRO
+            col = np.full(n, _NO_CONFIDENCE, dtype="<u4")
+            col[present] = micro
+            sections.append(col.tobytes())
+        else:
+            sections.append(confidences.tobytes())
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = b"".join(encoded)
+    extras_blob = json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extras else b""
+    sections += [offsets.tobytes(), blob, extras_blob]
+
+    body = b"".join(s + b"\0" * _pad(len(s)) for s in sections)
+    if compress:
+        flags |= FLAG_COMPRESSED
+        body = zlib.compress(body, 6)
+    header = _HEADER.pack(
+        MAGIC, VERSION, flags, n, len(encoded), len(blob), len(extras_blob),
+        int(source_size), int(source_mtime_ns),
+    )
+    return header + b"\0" * _pad(_HEADER.size) + body
+
+
+class TranscriptPack:
+    """Read-only view over a word pack (bytes or a memory-mapped file)."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap], *, _mmap: Optional[mmap.mmap] = None) -> None:
+        if len(buffer) < _HEADER.size:
+            raise PackError("truncated word pack")
+        (magic, version, flags, n, n_strings, blob_len, extras_len,
+         self.source_size, self.source_mtime_ns) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise PackError("not a word pack")
+        if version != VERSION:
+            raise PackError(f"unsupported word pack version {version}")
+        body_start = _HEADER.size + _pad(_HEADER.size)
+        if flags & FLAG_COMPRESSED:
+            try:
+                buffer = zlib.decompress(memoryview(buffer)[body_start:])
+            except zlib.error as exc:
+                raise PackError(f"corrupt word pack: {exc}") from exc
+            body_start = 0
+        self._buffer = buffer
+        self._mmap = _mmap
+        self.flags = flags
+        self._n = n
+        self._pos = body_start
+
+        time_dtype, time_size = ("<u4", 4) if flags & FLAG_TIMES_MS else ("<f8", 8)
+        self._starts_raw = self._column(time_dtype, n, time_size)
+        self._ends_raw = self._column(time_dtype, n, time_size)
+        self._word_ids = self._column("<u4", n, 4)
+        self._speaker_ids = self._column("<u4", n, 4) if flags & FLAG_SPEAKER else None
+        self._confidences = None
+        if flags & FLAG_CONFIDENCE:
+            micro = flags & FLAG_CONFIDENCE_MICRO
+            self._confidences = self._column("<u4" if micro else "<f8", n, 4 if micro else 8)
+        self._offsets = self._column("<u4", n_strings + 1, 4)
+        self._blob = self._section(blob_len)
+        self._extras_raw = self._section(extras_len)
+        self._extras: Optional[Dict[str, Dict[str, Any]]] = None
+        self._strings: Dict[int, str] = {}
+        self._starts: Optional[np.ndarray] = None
+        self._ends: Optional[np.ndarray] = None
+        self._sorted: Optional[bool] = None
+
+    # -- construction -----------------------------------------------------
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TranscriptPack":
+        return cls(data)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "TranscriptPack":
+        """Memory-map a pack file; call :meth:`close` (or use ``with``) when done."""
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise PackError("truncated word pack")
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, _mmap=mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        self._starts_raw = self._ends_raw = self._word_ids = None  # type: ignore[assignment]
+        self._speaker_ids = self._confidences = self._offsets = None  # type: ignore[assignment]
+        self._starts = self._ends = None
+        self._blob = self._extras_raw = b""
+        self._buffer = b""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a column view; the map goes with it.
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> "TranscriptPack":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _section(self, length: int) -> memoryview:
+        end = self._pos + length
+        if end > len(self._buffer):
+            raise PackError("truncated word pack")
+        view = memoryview(self._buffer)[self._pos:end]
+        self._pos = end + _pad(length)
+        return view
+
+    def _column(self, dtype: str, count: int, itemsize: int) -> np.ndarray:
+        view = self._section(count * itemsize)
+        return np.frombuffer(view, dtype=dtype, count=count)
+
+    # -- columns ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Word start times in seconds (``float64``)."""
+        if self._starts is None:
+            self._starts = self._seconds(self._starts_raw)
+        return self._starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        if self._ends is None:
+            self._ends = self._seconds(self._ends_raw)
+        return self._ends
+
+    def _seconds(self, raw: np.ndarray) -> np.ndarray:
+        if self.flags & FLAG_TIMES_MS:
+            return raw / 1000.0
+        return raw
+
+    @property
+    def duration_s(self) -> float:
+        return float(self.ends.max()) if self._n else 0.0
+
+    def _string(self, idx: int) -> str:
+        text = self._strings.get(idx)
+        if text is None:
+            lo, hi = int(self._offsets[idx]), int(self._offsets[idx + 1])
+            text = self._strings[idx] = str(self._blob[lo:hi], "utf-8")
+        return text
+
+    def _extra(self, i: int) -> Optional[Dict[str, Any]]:
+        if not self._extras_raw:
+            return None
+        if self._extras is None:
+            self._extras = json.loads(bytes(self._extras_raw).decode("utf-8"))
+        return self._extras.get(str(i))
+
+    # -- materialisation ----------------------------------------------------
+
+    def word_at(self, i: int) -> Dict[str, Any]:
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self.words(i, i + 1)[0]
+
+    def words(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Materialise words ``[start, stop)`` by index as legacy dicts."""
+        start, stop, _ = slice(start, stop).indices(self._n)
+        if start >= stop:
+            return []
+        # Column slices are converted in bulk; the loop only builds dicts.
+        string = self._string
+        word_ids = self._word_ids[start:stop].tolist()
+        starts = self.starts[start:stop].tolist()
+        ends = self.ends[start:stop].tolist()
+        confidences: Optional[list] = None
+        if self._confidences is not None:
+            raw = self._confidences[start:stop]
+            if self.flags & FLAG_CONFIDENCE_MICRO:
+                confidences = [None if c == _NO_CONFIDENCE else c / 1_000_000.0 for c in raw.tolist()]
+            else:
+                confidences = [None if c != c else c for c in raw.tolist()]
+        speakers = self._speaker_ids[start:stop].tolist() if self._speaker_ids is not None else None
+        has_extras = bool(self._extras_raw)
+
+        out: List[Dict[str, Any]] = []
+        for k in range(stop - start):
+            item: Dict[str, Any] = {"word": string(word_ids[k]), "start": starts[k], "end": ends[k]}
+            if confidences is not None and confidences[k] is not None:
+                item["confidence"] = confidences[k]
+            if speakers is not None and speakers[k] != NO_STRING:
+                item["speaker"] = string(speakers[k])
+            if has_extras:
+                extra = self._extra(start + k)
+                if extra:
+                    item.update(extra)
+            out.append(item)
+        return out
+
+    def to_json_list(self) -> List[Dict[str, Any]]:
+        return self.words()
+
+    def to_json_bytes(self) -> bytes:
+        """The legacy JSON array (compact separators) for JSON-only consumers."""
+        return json.dumps(self.to_json_list(), ensure_ascii=False).encode("utf-8")
+
+    def __iter__(self) -> Iterable[Dict[str, Any]]:
+        return (self.word_at(i) for i in range(self._n))
+
+    # -- time ranges --------------------------------------------------------
+
+    def index_range(self, start_s: float, end_s: float) -> Tuple[int, int]:
+        """Index bounds of the words overlapping ``[start_s, end_s)``.
+
+        Word starts are normally non-decreasing, which makes this a binary
+        search; for out-of-order transcripts the bounds cover every match.
+        """
+        starts, ends = self.starts, self.ends
+        if self._sorted is None:
+            self._sorted = bool(self._n < 2 or np.all(starts[1:] >= starts[:-1]))
+        if self._sorted:
+            stop = int(np.searchsorted(starts, end_s, side="left"))
+            first = int(np.searchsorted(starts, start_s, side="left"))
+            # Words that started earlier but are still being spoken at start_s.
+            while first > 0 and ends[first - 1] > start_s:
+                first -= 1
+            return first, max(first, stop)
+        hits = np.flatnonzero((starts < end_s) & (ends > start_s))
+        if not hits.size:
+            return 0, 0
+        return int(hits[0]), int(hits[-1]) + 1
+
+    def slice(self, start_s: float, end_s: float) -> List[Dict[str, Any]]:
+        """Materialise only the words overlapping ``[start_s, end_s)``."""
+        first, stop = self.index_range(start_s, end_s)
+        return [w for w in self.words(first, stop) if w["start"] < end_s and w["end"] > start_s]
+
+    def text(self, start_s: Optional[float] = None, end_s: Optional[float] = None) -> str:
+        if start_s is None and end_s is None:
+            ids = self._word_ids
+        else:
+            first, stop = self.index_range(start_s or 0.0, math.inf if end_s is None else end_s)
+            ids = self._word_ids[first:stop]
+        return " ".join(t for t in (self._string(int(i)).strip() for i in ids) if t)
+
+
+def decode(data: bytes) -> List[Dict[str, Any]]:
+    """Word list from pack bytes (compressed or not)."""
+    return TranscriptPack.from_bytes(data).to_json_list()
+
+
+def is_pack(data: bytes) -> bool:
+    return data[:4] == MAGIC
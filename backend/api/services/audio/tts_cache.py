@@ -0,0 +1,216 @@
+"""Content-addressed cache for synthesized speech.
+
+Intros, intern answers and template TTS segments repeat the same script with
+the same voice across episodes, retries and re-assemblies. The provider's MP3
+bytes are cached under the SHA-256 of everything that determines them
+(provider, model, voice, speaking rate and the normalized text) in two tiers:
+
+- a local directory (``TTS_CACHE_DIR``, default ``<tmp>/tts_cache``), pruned to
+  ``TTS_CACHE_MAX_MB`` (default 512) oldest-first, and
+- optionally the shared object store (``TTS_CACHE_SHARED=1``, under
+  ``tts-cache/``), so the API and worker instances reuse each other's audio.
+
+Concurrent requests for the same key synthesize once; the others wait for the
+first and read its result. ``TTS_CACHE_ENABLED=0`` turns the cache off.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from api.core.paths import LOCAL_TMP_DIR
+
+log = logging.getLogger("api.services.audio.tts_cache")
+
+DEFAULT_MAX_MB = 512
+# Bump when the stored bytes or the key derivation change.
+_SCHEMA = 1
+_SHARED_PREFIX = "tts-cache"
+# Prune after this many local writes rather than scanning the directory each time.
+_PRUNE_EVERY = 32
+
+_WS_RE = re.compile(r"\s+")
+
+_LOCK = threading.Lock()
+_INFLIGHT: Dict[str, threading.Lock] = {}
+_writes = 0
+
+
+def _enabled() -> bool:
+    return os.getenv("TTS_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _shared_enabled() -> bool:
+    return os.getenv("TTS_CACHE_SHARED", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("TTS_CACHE_DIR", str(LOCAL_TMP_DIR / "tts_cache")))
+
+
+def _max_bytes() -> int:
+    try:
+        return max(0, int(os.getenv("TTS_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))) * 1024 * 1024
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace, so trivially different scripts share audio."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def cache_key(
+    *,
+    provider: str,
+    model: str,
+    voice: Optional[str],
+    text: str,
+    speaking_rate: float = 1.0,
+) -> str:
+    """Hex SHA-256 identifying the audio a provider returns for these inputs."""
+    parts = [
+        f"v{_SCHEMA}",
+        (provider or "").strip().lower(),
+        model or "",
+        voice or "",
+        f"{float(speaking_rate):.3f}",
+        normalize_text(text),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _local_path(key: str) -> Path:
+    return _cache_dir() / key[:2] / f"{key}.mp3"
+
+
+def _read_local(key: str) -> Optional[bytes]:
+    path = _local_path(key)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # keep recently used entries through pruning
+    except OSError:
+        pass
+    return data or None
+
+
+def _write_local(key: str, data: bytes) -> None:
+    global _writes
+    path = _local_path(key)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.warning("[tts_cache] local write failed key=%s err=%s", key[:12], exc)
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    with _LOCK:
+        _writes += 1
+        due = _writes % _PRUNE_EVERY == 0
+    if due:
+        prune()
+
+
+def _read_shared(key: str) -> Optional[bytes]:
+    if not _shared_enabled():
+        return None
+    try:
+        from infrastructure import storage
+
+        return storage.download_bytes("", f"{_SHARED_PREFIX}/{key[:2]}/{key}.mp3") or None
+    except Exception as exc:  # noqa: BLE001 - the shared tier is best-effort
+        log.debug("[tts_cache] shared read failed key=%s err=%s", key[:12], exc)
+        return None
+
+
+def _write_shared(key: str, data: bytes) -> None:
+    if not _shared_enabled():
+        return
+    try:
+        from infrastructure import storage
+
+        storage.upload_bytes("", f"{_SHARED_PREFIX}/{key[:2]}/{key}.mp3", data, content_type="audio/mpeg")
+    except Exception as exc:  # noqa: BLE001 - the shared tier is best-effort
+        log.warning("[tts_cache] shared write failed key=%s err=%s", key[:12], exc)
+
+
+def get(key: str) -> Optional[bytes]:
+    """Cached audio for ``key`` from either tier, or None."""
+    if not _enabled():
+        return None
+    data = _read_local(key)
+    if data is None:
+        data = _read_shared(key)
+        if data is not None:
+            _write_local(key, data)
+    return data
+
+
+def get_or_synthesize(key: str, synthesize: Callable[[], bytes]) -> bytes:
+    """Return cached audio for ``key``, calling ``synthesize`` at most once per key at a time."""
+    if not _enabled():
+        return synthesize()
+    data = get(key)
+    if data is not None:
+        return data
+    with _LOCK:
+        gate = _INFLIGHT.setdefault(key, threading.Lock())
+    with gate:
+        try:
+            data = _read_local(key)  # a concurrent caller may have just stored it
+            if data is not None:
+                return data
+            data = synthesize()
+            if data:
+                _write_local(key, data)
+                _write_shared(key, data)
+            return data
+        finally:
+            with _LOCK:
+                if _INFLIGHT.get(key) is gate:
+                    del _INFLIGHT[key]
+
+
+def prune() -> int:
+    """Delete least recently used local entries beyond ``TTS_CACHE_MAX_MB``; returns the count."""
+    limit = _max_bytes()
+    root = _cache_dir()
+    entries = []
+    try:
+        for path in root.glob("*/*.mp3"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    except OSError:
+        return 0
+    total = sum(size for _mtime, size, _path in entries)
+    removed = 0
+    for _mtime, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+__all__ = ["cache_key", "get", "get_or_synthesize", "normalize_text", "prune"]
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import os
 import time
 import math
 import tempfile
 
 from pydub import AudioSegment
 
+from api.services.audio import mp3_frames
+
 # NOTE:
 # - This module encapsulates TTS chunking, synthesis, and stitching/mixing.
 # - Do not import processor.py or app routers/DB here. Callers provide cfg and paths.
@@ -96,11 +100,37 @@ def chunk_prompt_for_tts(prompt: str, cfg: Dict[str, Any], log: List[str]) -> Li
     return chunks
 
 
+def _tts_concurrency(cfg: Dict[str, Any]) -> int:
+    raw = _get_cfg(cfg, "concurrency", None)
+    if raw is None:
+        raw = os.getenv("TTS_CONCURRENCY", "4")
+    try:
+        return max(1, int(raw))
+    except (TypeError, ValueError):
+        return 4
+
+
+# Chunk tails are faded out so speech cut off mid-waveform does not click against the pause.
+_CHUNK_FADE_MS = 60
+
+
+def _fade_mp3_tail(data: bytes) -> bytes:
+    """Apply the chunk-tail fade to provider MP3 bytes at the frame level (as-is if they do not parse)."""
+    stream = mp3_frames.parse(data)
+    if stream is None or stream.duration_ms <= 2 * _CHUNK_FADE_MS:
+        return data
+    return mp3_frames.fade_out(stream, _CHUNK_FADE_MS).data
+
+
 def synthesize_chunks(chunks: List[Dict[str, Any]], provider_client, cfg: Dict[str, Any], log: List[str]) -> List[Path]:
     """Synthesize each chunk via the provided provider client or wrapper.
 
     - provider_client is expected to expose a function generate_speech_from_text(text, provider=?, api_key=?, voice_id=?|google_voice=?),
-      compatible with the existing ai_enhancer module.
+      compatible with the existing ai_enhancer module. When it also exposes synthesize_speech_bytes (same arguments,
+      returning MP3 bytes), the provider's bytes are written without a decode/re-encode round trip; the tail fade
+      is then applied to the frames' gains (see mp3_frames.fade_out).
+    - Chunks are synthesized on a bounded thread pool (cfg "concurrency", else TTS_CONCURRENCY, default 4); each
+      worker retries its own chunk with backoff.
     - Writes each chunk to a temp mp3 file and returns the list of Paths in the same order.
     """
     if not chunks:
@@ -116,72 +146,109 @@ def synthesize_chunks(chunks: List[Dict[str, Any]], provider_client, cfg: Dict[s
     if not tmp_dir:
         tmp_dir = tempfile.mkdtemp(prefix="tts_chunks_")
 
-    out_paths: List[Path] = []
-    for idx, ch in enumerate(chunks, start=1):
+    kwargs = {"provider": provider, "api_key": api_key}
+    if provider == "google" and google_voice:
+        kwargs["google_voice"] = google_voice
+    else:
+        kwargs["voice_id"] = voice_id
+    as_bytes = getattr(provider_client, "synthesize_speech_bytes", None)
+
+    # Workers only return what they produced; the log is appended in chunk order below.
+    def _synthesize(idx: int, ch: Dict[str, Any]) -> Tuple[Optional[Path], List[str]]:
+        notes: List[str] = []
+        out_path = Path(tmp_dir) / f"tts_chunk_{idx:03d}.mp3"
         text = (ch.get("text") or "").strip()
+        seg: Optional[AudioSegment] = None
         if text == "":
             # Create a small silence if empty to keep alignment
             seg = AudioSegment.silent(duration=max(1, int(ch.get("pause_ms") or 1)))
         else:
             attempt = 0
             last_err: Optional[Exception] = None
-            seg: Optional[AudioSegment] = None
             while attempt <= max_retries:
                 try:
+                    if as_bytes is not None:
+                        data = _fade_mp3_tail(as_bytes(text, **kwargs))
+                        out_path.write_bytes(data)
+                        notes.append(f"[TTS] provider={provider} chunk={idx} bytes={len(data)} wrote={out_path.name}")
+                        return out_path, notes
                     # ai_enhancer-like interface
-                    kwargs = {"provider": provider, "api_key": api_key}
-                    if provider == "google" and google_voice:
-                        kwargs["google_voice"] = google_voice
-                    else:
-                        kwargs["voice_id"] = voice_id
                     seg = provider_client.generate_speech_from_text(text, **kwargs)  # type: ignore[attr-defined]
                     break
                 except Exception as e:  # noqa: BLE001
                     last_err = e
                     if attempt < max_retries:
-                        try:
-                            log.append(f"[TTS] retry {attempt+1}/{max_retries} after error: {type(e).__name__}: {e}")
-                        except Exception:
-                            pass
+                        notes.append(f"[TTS] retry {attempt+1}/{max_retries} after error: {type(e).__name__}: {e}")
                         time.sleep(backoff_s * (1 + attempt))
                     attempt += 1
             if seg is None:
                 # Fallback to brief silence if provider fails
-                try:
-                    log.append(f"[TTS] provider failed after {max_retries} retries: {type(last_err).__name__}: {last_err}")
-                except Exception:
-                    pass
+                notes.append(f"[TTS] provider failed after {max_retries} retries: {type(last_err).__name__}: {last_err}")
                 seg = AudioSegment.silent(duration=400)
 
         # Normalize a bit to match speech loudness expectations
         try:
-            seg = seg.fade_out(60) if seg and len(seg) > 120 else seg
+            seg = seg.fade_out(_CHUNK_FADE_MS) if seg and len(seg) > 2 * _CHUNK_FADE_MS else seg
         except Exception:
             pass
 
-        out_path = Path(tmp_dir) / f"tts_chunk_{idx:03d}.mp3"
         try:
             seg.export(out_path, format="mp3")
-            try:
-                log.append(f"[TTS] provider={provider} chunk={idx} len_ms={len(seg)} wrote={out_path.name}")
-            except Exception:
-                pass
+            notes.append(f"[TTS] provider={provider} chunk={idx} len_ms={len(seg)} wrote={out_path.name}")
         except Exception as e:  # noqa: BLE001
             # As last resort, write 1ms silence
             try:
                 AudioSegment.silent(duration=1).export(out_path, format="mp3")
-                log.append(f"[TTS] export_fallback chunk={idx} err={type(e).__name__}: {e} wrote={out_path.name}")
+                notes.append(f"[TTS] export_fallback chunk={idx} err={type(e).__name__}: {e} wrote={out_path.name}")
             except Exception:
                 # Give up on this chunk
-                continue
-        out_paths.append(out_path)
+                return None, notes
+        return out_path, notes
+
+    workers = min(_tts_concurrency(cfg), len(chunks))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-chunk") as pool:
+        results = list(pool.map(lambda item: _synthesize(*item), enumerate(chunks, start=1)))
+
+    out_paths: List[Path] = []
+    for out_path, notes in results:
+        try:
+            log.extend(notes)
+        except Exception:
+            pass
+        if out_path is not None:
+            out_paths.append(out_path)
 
     return out_paths
 
 
+def _stitch_mp3_frames(
+    chunk_paths: List[Path], tts_out_path: Path, gap_ms: int, target_sr: Optional[int]
+) -> Optional[int]:
+    """Join MP3 chunks frame by frame; returns the duration, or None if they need decoding."""
+    streams = []
+    for p in chunk_paths:
+        try:
+            stream = mp3_frames.parse(Path(p).read_bytes())
+        except OSError:
+            return None
+        if stream is None or (target_sr and stream.sample_rate != target_sr):
+            return None
+        if streams and not streams[0].compatible(stream):
+            return None
+        streams.append(stream)
+    data, duration_ms = mp3_frames.join(streams, gap_ms)
+    tts_out_path.parent.mkdir(parents=True, exist_ok=True)
+    tts_out_path.write_bytes(data)
+    return duration_ms
+
+
 def stitch_tts_chunks(chunk_paths: List[Path], tts_out_path: Path, cfg: Dict[str, Any], log: List[str]) -> Dict[str, Any]:
     """Concatenate chunk audio with optional silence padding and crossfades; write final file.
 
+    MP3 chunks that share a sample rate and channel layout are joined frame by frame without decoding, as long as
+    each crossfade falls inside the pause (the overlap then only shortens the silence). Otherwise every chunk is
+    decoded and mixed with pydub.
+
     Returns metrics dict like {"chunks": N, "duration_ms": X}.
     """
     if not chunk_paths:
@@ -200,6 +267,15 @@ def stitch_tts_chunks(chunk_paths: List[Path], tts_out_path: Path, cfg: Dict[str
     target_sr = int(_get_cfg(cfg, "sample_rate", 44100))
     target_format = (tts_out_path.suffix.lstrip(".") or "mp3").lower()
 
+    if target_format == "mp3" and (crossfade_ms <= 0 or pause_ms >= crossfade_ms):
+        duration_ms = _stitch_mp3_frames(chunk_paths, tts_out_path, pause_ms - max(0, crossfade_ms), target_sr)
+        if duration_ms is not None:
+            try:
+                log.append(f"[TTS] stitched chunks={len(chunk_paths)} duration_ms={duration_ms} frames=copied -> {tts_out_path.name}")
+            except Exception:
+                pass
+            return {"chunks": len(chunk_paths), "duration_ms": duration_ms}
+
     def _safe_crossfade(a: AudioSegment, b: AudioSegment, overlap_ms: int) -> AudioSegment:
         ov = max(0, min(overlap_ms, len(a), len(b)))
         if ov <= 0:
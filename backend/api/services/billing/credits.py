@@ -20,6 +20,7 @@ from api.models.usage import ProcessingMinutesLedger, LedgerDirection, LedgerRea
 from api.services import tier_service
 from api.billing.plans import RATES, RATES_ELEVENLABS, get_elevenlabs_rate, get_ai_metadata_rate
 from api.services.billing.wallet import debit as wallet_debit, get_wallet_balance
+from api.services.billing.usage import apply_to_summary
 
 if TYPE_CHECKING:
     from api.models.user import User
@@ -149,6 +150,8 @@ def charge_credits(
     )
     
     session.add(entry)
+    session.flush()
+    apply_to_summary(session, entry)
     session.commit()
     session.refresh(entry)
     
@@ -187,6 +190,8 @@ def refund_credits(
     )
     
     session.add(entry)
+    session.flush()
+    apply_to_summary(session, entry)
     session.commit()
     session.refresh(entry)
     
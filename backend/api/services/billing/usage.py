@@ -6,9 +6,10 @@ from typing import Optional, List, Dict
 from uuid import UUID
 
 from typing import Any
+from sqlalchemy import case, delete, func, text
 from sqlmodel import select
 
-from ...models.usage import ProcessingMinutesLedger, LedgerDirection, LedgerReason
+from ...models.usage import ProcessingMinutesLedger, UsageLedgerSummary, LedgerDirection, LedgerReason
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +19,143 @@ def _validate_minutes(minutes: int) -> None:
         raise ValueError("minutes must be a positive integer")
 
 
+def _period_of(ts: datetime) -> str:
+    return _normalize_to_utc(ts).strftime("%Y-%m")
+
+
+def _summary_insert(session: Any):
+    """Dialect-specific INSERT supporting ON CONFLICT, or None."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(UsageLedgerSummary.__table__)
+
+
+def apply_to_summary(session: Any, rec: ProcessingMinutesLedger, *, sign: int = 1) -> None:
+    """Add a new ledger entry to its user's UsageLedgerSummary row.
+
+    Must run in the same transaction as the ledger insert (before commit) so
+    the summary and the ledger can never disagree: a rolled-back or duplicate
+    entry rolls the increment back with it. ``sign=-1`` takes an entry back
+    out; use :func:`remove_from_summary` when deleting ledger rows.
+    """
+    is_debit = rec.direction == LedgerDirection.DEBIT
+    minutes = sign * int(rec.minutes or 0)
+    credits_amount = sign * float(rec.credits if rec.credits is not None else (rec.minutes or 0))
+    period = _period_of(rec.created_at or datetime.utcnow())
+    deltas = {
+        "debit_minutes": minutes if is_debit else 0,
+        "credit_minutes": 0 if is_debit else minutes,
+        "debit_credits": credits_amount if is_debit else 0.0,
+        "credit_credits": 0.0 if is_debit else credits_amount,
+        "entry_count": sign,
+    }
+    now = datetime.utcnow()
+
+    stmt = _summary_insert(session)
+    if stmt is not None:
+        table = UsageLedgerSummary.__table__
+        stmt = stmt.values(user_id=rec.user_id, period=period, updated_at=now, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.period],
+            set_={**{k: table.c[k] + stmt.excluded[k] for k in deltas}, "updated_at": now},
+        )
+        session.execute(stmt)
+        return
+
+    row = session.exec(
+        select(UsageLedgerSummary)
+        .where(UsageLedgerSummary.user_id == rec.user_id)
+        .where(UsageLedgerSummary.period == period)
+        .with_for_update()
+    ).first()
+    if row is None:
+        row = UsageLedgerSummary(user_id=rec.user_id, period=period)
+        for k in deltas:
+            setattr(row, k, 0)
+    for k, v in deltas.items():
+        setattr(row, k, getattr(row, k) + v)
+    row.updated_at = now
+    session.add(row)
+
+
+def remove_from_summary(session: Any, rec: ProcessingMinutesLedger) -> None:
+    """Take a ledger entry that is about to be deleted out of the summary.
+
+    Call in the same transaction as ``session.delete(rec)``.
+    """
+    apply_to_summary(session, rec, sign=-1)
+
+
+def _period_expr(session: Any):
+    if session.get_bind().dialect.name == "postgresql":
+        return func.to_char(ProcessingMinutesLedger.created_at, "YYYY-MM")
+    return func.strftime("%Y-%m", ProcessingMinutesLedger.created_at)
+
+
+def rebuild_usage_summary(session: Any, user_id: Optional[UUID] = None) -> int:
+    """Recompute UsageLedgerSummary from the ledger and commit.
+
+    Idempotent; re-run it after a rollout to pick up entries posted by older
+    revisions that did not maintain the summary, or to repair any drift.
+    Scoped to one user when ``user_id`` is given. On PostgreSQL the ledger is
+    held in SHARE mode so no entry can be posted between the aggregate and the
+    rewrite. Returns the number of summary rows written.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("LOCK TABLE processingminutesledger IN SHARE MODE"))
+
+    period = _period_expr(session).label("period")
+    is_debit = ProcessingMinutesLedger.direction == LedgerDirection.DEBIT
+    amount = func.coalesce(ProcessingMinutesLedger.credits, ProcessingMinutesLedger.minutes * 1.0)
+    q = (
+        select(
+            ProcessingMinutesLedger.user_id,
+            period,
+            func.coalesce(func.sum(case((is_debit, ProcessingMinutesLedger.minutes), else_=0)), 0),
+            func.coalesce(func.sum(case((is_debit, 0), else_=ProcessingMinutesLedger.minutes)), 0),
+            func.coalesce(func.sum(case((is_debit, amount), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((is_debit, 0.0), else_=amount)), 0.0),
+            func.count(),
+        )
+        .where(ProcessingMinutesLedger.created_at.is_not(None))
+        .group_by(ProcessingMinutesLedger.user_id, period)
+    )
+    wipe = delete(UsageLedgerSummary)
+    if user_id is not None:
+        q = q.where(ProcessingMinutesLedger.user_id == user_id)
+        wipe = wipe.where(UsageLedgerSummary.user_id == user_id)
+    rows = session.exec(q).all()
+
+    try:
+        session.execute(wipe)
+        now = datetime.utcnow()
+        for uid, per, debit_min, credit_min, debit_cr, credit_cr, count in rows:
+            session.add(UsageLedgerSummary(
+                user_id=uid,
+                period=per,
+                debit_minutes=int(debit_min),
+                credit_minutes=int(credit_min),
+                debit_credits=float(debit_cr),
+                credit_credits=float(credit_cr),
+                entry_count=int(count),
+                updated_at=now,
+            ))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    log.info("usage.summary rebuilt", extra={
+        "user_id": str(user_id) if user_id else None,
+        "rows": len(rows),
+    })
+    return len(rows)
+
+
 def post_debit(
     session: Any,
     user_id: UUID,
@@ -47,6 +185,9 @@ def post_debit(
             notes=notes or None,
         )
         session.add(rec)
+        # Flush first so a duplicate correlation id fails before the summary moves.
+        session.flush()
+        apply_to_summary(session, rec)
         session.commit()
         session.refresh(rec)
         log.info("usage.debit posted", extra={
@@ -99,6 +240,8 @@ def post_credit(
         notes=notes or None,
     )
     session.add(rec)
+    session.flush()
+    apply_to_summary(session, rec)
     session.commit()
     session.refresh(rec)
     log.info("usage.credit posted", extra={
@@ -112,10 +255,12 @@ def post_credit(
 
 
 def balance_minutes(session: Any, user_id: UUID) -> int:
-    rows = session.exec(select(ProcessingMinutesLedger).where(ProcessingMinutesLedger.user_id == user_id)).all()
-    deb = sum(r.minutes for r in rows if r.direction == LedgerDirection.DEBIT)
-    cred = sum(r.minutes for r in rows if r.direction == LedgerDirection.CREDIT)
-    return cred - deb
+    """Credits minus debits over the user's whole ledger (one row per active month)."""
+    total = session.exec(
+        select(func.coalesce(func.sum(UsageLedgerSummary.credit_minutes - UsageLedgerSummary.debit_minutes), 0))
+        .where(UsageLedgerSummary.user_id == user_id)
+    ).one()
+    return int(total or 0)
 
 
 def _normalize_to_utc(dt: datetime) -> datetime:
@@ -125,32 +270,51 @@ def _normalize_to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def _naive_utc(dt: datetime) -> datetime:
+    # created_at is stored as naive UTC (datetime.utcnow)
+    return _normalize_to_utc(dt).replace(tzinfo=None)
+
+
+def _is_month_start(dt: datetime) -> bool:
+    return (dt.day, dt.hour, dt.minute, dt.second, dt.microsecond) == (1, 0, 0, 0, 0)
+
+
 def month_minutes_used(
     session: Any,
     user_id: UUID,
     period_start: datetime,
     period_end: datetime,
 ) -> int:
+    """Net minutes debited in [period_start, period_end], floored at zero.
+
+    The common "start of month until now" window is answered from
+    UsageLedgerSummary, minus the (normally empty) tail of entries posted
+    after ``period_end``; any other window is a single SUM over the
+    (user_id, created_at) index.
+    """
     norm_start = _normalize_to_utc(period_start)
     norm_end = _normalize_to_utc(period_end)
-    q = (
-        select(ProcessingMinutesLedger)
-        .where(ProcessingMinutesLedger.user_id == user_id)
+    signed = case(
+        (ProcessingMinutesLedger.direction == LedgerDirection.DEBIT, ProcessingMinutesLedger.minutes),
+        else_=-ProcessingMinutesLedger.minutes,
     )
-    rows = session.exec(q).all()
-    used = 0
-    for r in rows:
-        ts = getattr(r, "created_at", None)
-        if ts is None:
-            continue
-        ts_utc = _normalize_to_utc(ts)
-        if ts_utc < norm_start or ts_utc > norm_end:
-            continue
-        if r.direction == LedgerDirection.DEBIT:
-            used += int(r.minutes)
-        else:
-            used -= int(r.minutes)
-    return max(0, used)
+    signed_sum = select(func.coalesce(func.sum(signed), 0)).where(ProcessingMinutesLedger.user_id == user_id)
+
+    if _is_month_start(norm_start) and _period_of(norm_end) >= _period_of(datetime.now(timezone.utc)):
+        used = session.exec(
+            select(func.coalesce(func.sum(UsageLedgerSummary.debit_minutes - UsageLedgerSummary.credit_minutes), 0))
+            .where(UsageLedgerSummary.user_id == user_id)
+            .where(UsageLedgerSummary.period >= _period_of(norm_start))
+        ).one()
+        tail = session.exec(signed_sum.where(ProcessingMinutesLedger.created_at > _naive_utc(norm_end))).one()
+        return max(0, int(used or 0) - int(tail or 0))
+
+    used = session.exec(
+        signed_sum
+        .where(ProcessingMinutesLedger.created_at >= _naive_utc(norm_start))
+        .where(ProcessingMinutesLedger.created_at <= _naive_utc(norm_end))
+    ).one()
+    return max(0, int(used or 0))
 
 
 def user_ledger(session: Any, user_id: UUID, limit: int = 100, offset: int = 0) -> List[Dict]:
@@ -160,11 +324,12 @@ def user_ledger(session: Any, user_id: UUID, limit: int = 100, offset: int = 0)
         select(ProcessingMinutesLedger)
         .where(ProcessingMinutesLedger.user_id == user_id)
         .order_by(_sa_text("created_at DESC"))
+        .offset(offset)
+        .limit(limit)
     )
     rows = session.exec(q).all()
-    sliced = rows[offset: offset + limit]
     items: List[Dict] = []
-    for r in sliced:
+    for r in rows:
         items.append({
             "id": r.id,
             "episode_id": str(r.episode_id) if r.episode_id else None,
@@ -189,12 +354,13 @@ def month_credits_breakdown(
     
     Returns dict with keys: total, tts_generation, transcription, assembly, storage, auphonic_processing, ai_metadata
     """
-    norm_start = _normalize_to_utc(period_start)
-    norm_end = _normalize_to_utc(period_end)
-    
+    amount = func.coalesce(ProcessingMinutesLedger.credits, ProcessingMinutesLedger.minutes * 1.0)
     q = (
-        select(ProcessingMinutesLedger)
+        select(ProcessingMinutesLedger.reason, ProcessingMinutesLedger.direction, func.sum(amount))
         .where(ProcessingMinutesLedger.user_id == user_id)
+        .where(ProcessingMinutesLedger.created_at >= _naive_utc(period_start))
+        .where(ProcessingMinutesLedger.created_at <= _naive_utc(period_end))
+        .group_by(ProcessingMinutesLedger.reason, ProcessingMinutesLedger.direction)
     )
     rows = session.exec(q).all()
     
@@ -208,24 +374,13 @@ def month_credits_breakdown(
         'ai_metadata': 0.0,
     }
     
-    for r in rows:
-        ts = getattr(r, "created_at", None)
-        if ts is None:
-            continue
-        ts_utc = _normalize_to_utc(ts)
-        if ts_utc < norm_start or ts_utc > norm_end:
-            continue
-        
-        # Get credits value (fallback to minutes * 1.0 if credits column not yet populated)
-        credits_amount = getattr(r, 'credits', None)
-        if credits_amount is None:
-            # Legacy records without credits field (1 minute = 1 credit)
-            credits_amount = r.minutes * 1.0
+    for reason, direction, credits_amount in rows:
+        credits_amount = float(credits_amount or 0.0)
         
         # DEBIT entries add to usage, CREDIT entries (refunds) subtract from usage
-        if r.direction == LedgerDirection.DEBIT:
+        if direction == LedgerDirection.DEBIT:
             multiplier = 1.0
-        elif r.direction == LedgerDirection.CREDIT:
+        elif direction == LedgerDirection.CREDIT:
             # Refunds reduce usage, but only if they're refunds of charges from this month
             # For now, we'll subtract all CREDIT entries in the period (refunds reduce usage)
             multiplier = -1.0
@@ -233,7 +388,7 @@ def month_credits_breakdown(
             continue
         
         # Map reason to category
-        reason_str = r.reason.value if hasattr(r.reason, 'value') else str(r.reason)
+        reason_str = reason.value if hasattr(reason, 'value') else str(reason)
         
         # For refunds, we need to map them back to the original category if possible
         # For REFUND_ERROR, we'll subtract from total but not from specific categories
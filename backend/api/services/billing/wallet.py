@@ -4,9 +4,10 @@ Credit wallet service for managing monthly, purchased, and rollover credits.
 from __future__ import annotations
 
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlmodel import Session, select, col as sqlmodel_col
 from sqlalchemy import func, extract
@@ -460,15 +461,166 @@ def get_wallet_details(
     }
 
 
+ROLLOVER_CHUNK_SIZE = int(os.getenv("WALLET_ROLLOVER_CHUNK_SIZE", "1000"))
+
+
+def _rollover_periods(now: datetime, target_period: Optional[str]) -> tuple[str, str]:
+    """Return (from_period, to_period) for a rollover run."""
+    if target_period:
+        # Validate format
+        try:
+            datetime.strptime(target_period, "%Y-%m")
+        except ValueError:
+            raise ValueError(f"Invalid period format: {target_period}. Expected YYYY-MM")
+        to_period = target_period
+    else:
+        # Default: process rollover from previous month to current month
+        to_period = get_period_string(now)
+    year, month = map(int, to_period.split("-"))
+    if month == 1:
+        from_period = f"{year-1}-12"
+    else:
+        from_period = f"{year}-{month-1:02d}"
+    return from_period, to_period
+
+
+def _rollover_plans() -> dict[str, float]:
+    """Tier -> monthly credits for every plan that takes part in rollover.
+
+    Only non-internal plans in PLANS roll over; "free" maps to "starter",
+    which has no plan, and unlimited/internal plans have no monthly credits.
+    """
+    return {
+        key: float(plan.get("monthly_credits", 0.0) or 0.0)
+        for key, plan in PLANS.items()
+        if not plan.get("internal", False)
+    }
+
+
+def _period_bounds(period: str) -> tuple[datetime, datetime]:
+    year, month = map(int, period.split("-"))
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def _rollover_chunk(
+    session: Session,
+    plans: dict[str, float],
+    from_period: str,
+    to_period: str,
+    after_user_id: Optional[UUID],
+    chunk_size: int,
+) -> tuple[list[tuple], list[dict], list[dict], list[float]]:
+    """Compute one keyset chunk of the rollover.
+
+    Returns (users, inserts, updates, rolled): the chunk's (user_id, plan)
+    rows, new to_period wallet rows, parameter rows for existing to_period
+    wallets, and the rollover of every user who had unused credits.
+    """
+    from sqlalchemy import case
+    from api.models.user import User
+    from api.models.usage import ProcessingMinutesLedger, LedgerDirection
+
+    tier = func.lower(User.tier)
+    q = select(User.id, tier).where(tier.in_(list(plans))).order_by(User.id).limit(chunk_size)
+    if after_user_id is not None:
+        q = q.where(User.id > after_user_id)
+    users = session.exec(q).all()
+    if not users:
+        return [], [], [], []
+    user_ids = [u for u, _ in users]
+
+    prev = {
+        row[0]: row[1:]
+        for row in session.exec(
+            select(
+                CreditWallet.user_id,
+                CreditWallet.monthly_credits,
+                CreditWallet.rollover_credits,
+                CreditWallet.used_monthly_rollover,
+            ).where(CreditWallet.period == from_period, CreditWallet.user_id.in_(user_ids))  # type: ignore
+        ).all()
+    }
+    existing = set(
+        session.exec(
+            select(CreditWallet.user_id).where(
+                CreditWallet.period == to_period, CreditWallet.user_id.in_(user_ids)  # type: ignore
+            )
+        ).all()
+    )
+
+    # Net ledger usage already posted in to_period, as get_or_create_wallet
+    # would have synced it into a newly created wallet.
+    ledger_used: dict = {}
+    missing = [u for u in user_ids if u not in existing]
+    if missing:
+        start, end = _period_bounds(to_period)
+        signed = case(
+            (ProcessingMinutesLedger.direction == LedgerDirection.DEBIT, ProcessingMinutesLedger.credits),
+            else_=-ProcessingMinutesLedger.credits,
+        )
+        ledger_used = dict(
+            session.exec(
+                select(ProcessingMinutesLedger.user_id, func.sum(signed))
+                .where(ProcessingMinutesLedger.user_id.in_(missing))  # type: ignore
+                .where(ProcessingMinutesLedger.created_at >= start)
+                .where(ProcessingMinutesLedger.created_at < end)
+                .group_by(ProcessingMinutesLedger.user_id)
+            ).all()
+        )
+
+    now = datetime.utcnow()
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    rolled: list[float] = []
+    for user_id, plan_key in users:
+        monthly_credits = plans[plan_key]
+        p = prev.get(user_id)
+        unused = max(0.0, (p[0] or 0.0) + (p[1] or 0.0) - (p[2] or 0.0)) if p else 0.0
+        # 10% of unused, capped at monthly_credits
+        roll = 0.0
+        if unused > 0:
+            roll = float(min(int(unused * ROLLOVER_RATE), int(monthly_credits)))
+            rolled.append(roll)
+        if user_id in existing:
+            updates.append({
+                "b_user_id": user_id,
+                "monthly_credits": monthly_credits,
+                "rollover_credits": roll,
+                "used_monthly_rollover": 0.0,
+                "updated_at": now,
+            })
+        else:
+            used = max(0.0, float(ledger_used.get(user_id) or 0.0))
+            inserts.append({
+                "id": uuid4(),
+                "user_id": user_id,
+                "period": to_period,
+                "monthly_credits": monthly_credits,
+                "rollover_credits": roll,
+                "purchased_credits": 0.0,
+                "used_credits": used,
+                "used_monthly_rollover": 0.0,
+                "used_purchased": max(0.0, used - monthly_credits),
+                "created_at": now,
+                "updated_at": now,
+            })
+    return users, inserts, updates, rolled
+
+
 def process_monthly_rollover(
     session: Session,
     now: Optional[datetime] = None,
-    target_period: Optional[str] = None
+    target_period: Optional[str] = None,
+    *,
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None,
 ) -> dict:
     """
     Process monthly credit rollover for all active subscribers.
     
-    For each active subscriber:
+    For each subscriber on a non-internal plan:
     1. Compute unused = (monthly_credits + rollover_credits) - used_monthly_rollover for ending period
     2. roll = min(int(unused * ROLLOVER_RATE), plan.monthly_credits) (cap at monthly_credits)
     3. Set new period:
@@ -477,226 +629,161 @@ def process_monthly_rollover(
        - used_monthly_rollover = 0
     4. Leave purchased_credits unchanged
     
+    Users are processed in user-id keyset chunks of ``chunk_size``
+    (WALLET_ROLLOVER_CHUNK_SIZE, default 1000). Each chunk is one transaction
+    of bulk INSERT/UPDATE statements that also advances the cursor on the
+    period's WalletPeriodProcessed row, so a failed or interrupted run resumes
+    from the last committed chunk when called again, and a completed period is
+    never processed twice.
+    
     Args:
         session: Database session
         now: Current datetime (defaults to UTC now)
-        target_period: Optional period to process (YYYY-MM). If not provided, uses previous month.
-                      Used for idempotency - will refuse to run twice for same period.
+        target_period: Optional period to process (YYYY-MM). If not provided, uses current month.
+        dry_run: Compute and return the totals without writing anything.
+        chunk_size: Users per chunk.
     
     Returns:
         dict with summary: processed_count, rollover_total, errors
     """
+    from sqlalchemy import bindparam, insert, update
+    from api.models.wallet import WalletPeriodProcessed
+
     if now is None:
         now = datetime.now(timezone.utc)
-    
-    # Determine periods
-    # We process rollover FROM the previous month TO the current month
-    if target_period:
-        # Validate format
-        try:
-            from datetime import datetime as dt
-            dt.strptime(target_period, "%Y-%m")
-        except ValueError:
-            raise ValueError(f"Invalid period format: {target_period}. Expected YYYY-MM")
-        to_period = target_period
-        # Calculate from_period (previous month)
-        year, month = map(int, to_period.split("-"))
-        if month == 1:
-            from_period = f"{year-1}-12"
-        else:
-            from_period = f"{year}-{month-1:02d}"
-    else:
-        # Default: process rollover from previous month to current month
-        # to_period is the NEW period we're creating (current month)
-        to_period = get_period_string(now)
-        # from_period is the OLD period we're rolling over from (previous month)
-        year, month = map(int, to_period.split("-"))
-        if month == 1:
-            from_period = f"{year-1}-12"
-        else:
-            from_period = f"{year}-{month-1:02d}"
-    
-    # Check idempotency: ensure we haven't already processed this period
-    from api.models.wallet import WalletPeriodProcessed
-    existing = session.exec(
-        select(WalletPeriodProcessed).where(WalletPeriodProcessed.period == to_period)
-    ).first()
-    
-    if existing:
+    chunk_size = max(1, int(chunk_size or ROLLOVER_CHUNK_SIZE))
+    from_period, to_period = _rollover_periods(now, target_period)
+    plans = _rollover_plans()
+
+    marker_q = select(WalletPeriodProcessed).where(WalletPeriodProcessed.period == to_period)
+    marker = session.exec(marker_q).first()
+    if marker and marker.status == "completed":
         log.warning(
             f"[WALLET] Rollover already processed for period {to_period}. "
-            f"Processed at {existing.processed_at}"
+            f"Processed at {marker.processed_at}"
         )
         return {
             "status": "already_processed",
             "period": to_period,
-            "processed_at": existing.processed_at.isoformat(),
+            "processed_at": marker.processed_at.isoformat(),
             "processed_count": 0,
             "rollover_total": 0.0,
             "errors": []
         }
-    
-    # Get all active subscribers
-    # Active = users with non-free tier OR active subscription OR subscription_expires_at in future
-    from api.models.user import User
-    from api.models.subscription import Subscription
-    
-    # Get users with paid tiers
-    paid_tier_users = session.exec(
-        select(User).where(
-            User.tier.notin_(["free", "admin", "superadmin"]),  # type: ignore
-            User.tier.isnot(None)  # type: ignore
-        )
-    ).all()
-    
-    # Get users with active subscriptions
-    active_subscriptions = session.exec(
-        select(Subscription).where(
-            Subscription.status.in_(["active", "trialing", "past_due"])  # type: ignore
-        )
-    ).all()
-    subscription_user_ids = {sub.user_id for sub in active_subscriptions}
-    
-    # Get users with future subscription_expires_at
-    future_expiry_users = session.exec(
-        select(User).where(
-            User.subscription_expires_at > now  # type: ignore
-        )
-    ).all()
-    future_expiry_user_ids = {u.id for u in future_expiry_users}
-    
-    # Combine all active subscriber user IDs
-    active_user_ids = set()
-    for user in paid_tier_users:
-        active_user_ids.add(user.id)
-    active_user_ids.update(subscription_user_ids)
-    active_user_ids.update(future_expiry_user_ids)
-    
+
+    cursor = marker.last_user_id if marker else None
+    if marker is None and not dry_run:
+        session.add(WalletPeriodProcessed(period=to_period, processed_at=now, status="running"))
+        try:
+            session.commit()
+        except Exception:
+            # Another run created the marker first; it is locked per chunk below.
+            session.rollback()
+
     log.info(
         f"[WALLET] Processing monthly rollover: from_period={from_period}, "
-        f"to_period={to_period}, active_subscribers={len(active_user_ids)}"
+        f"to_period={to_period}, chunk_size={chunk_size}, dry_run={dry_run}, "
+        f"resume_after={cursor}"
     )
-    
+
+    wallet_table = CreditWallet.__table__
+    update_stmt = (
+        update(wallet_table)
+        .where(wallet_table.c.user_id == bindparam("b_user_id"))
+        .where(wallet_table.c.period == to_period)
+    )
+
     processed_count = 0
     rollover_total = 0.0
+    wallets_written = 0
+    chunks = 0
     errors = []
-    
-    # Process each active subscriber
-    for user_id in active_user_ids:
+
+    while True:
         try:
-            user = session.get(User, user_id)
-            if not user:
-                errors.append(f"User {user_id} not found")
-                continue
-            
-            plan_key = getattr(user, 'tier', 'free') or 'free'
-            
-            # Normalize "free" to "starter" for plan lookup
-            normalized_plan_key = plan_key.lower()
-            if normalized_plan_key == "free":
-                normalized_plan_key = "starter"
-            
-            # Skip free/starter tier users (unless they have active subscription)
-            if plan_key == 'free' and user_id not in subscription_user_ids and user_id not in future_expiry_user_ids:
-                continue
-            
-            # Get plan (using normalized key)
-            plan = PLANS.get(normalized_plan_key)
-            if not plan:
-                log.warning(f"[WALLET] Unknown plan for user {user_id}: {plan_key}")
-                continue
-            
-            # Skip unlimited/internal plans (they don't have monthly credits)
-            if plan.get("internal", False):
-                continue
-            
-            # Get previous period wallet
-            prev_wallet = session.exec(
-                select(CreditWallet).where(
-                    CreditWallet.user_id == user_id,
-                    CreditWallet.period == from_period
-                )
-            ).first()
-            
-            # Calculate unused credits
-            if prev_wallet:
-                unused = prev_wallet.unused_monthly_rollover
-            else:
-                unused = 0.0
-            
-            # Calculate rollover: 10% of unused, capped at monthly_credits
-            monthly_credits = plan.get("monthly_credits", 0.0)
-            roll = min(int(unused * ROLLOVER_RATE), int(monthly_credits))
-            
-            if unused <= 0:
-                log.debug(
-                    f"[WALLET] No rollover for user {user_id}: unused={unused}"
-                )
-                # Still create wallet for new period with monthly credits
-                new_wallet = get_or_create_wallet(session, user_id, plan_key, to_period)
-                new_wallet.monthly_credits = monthly_credits
-                new_wallet.rollover_credits = 0.0
-                new_wallet.used_monthly_rollover = 0.0
-                new_wallet.updated_at = datetime.utcnow()
-                session.add(new_wallet)
-                session.commit()
-                continue
-            
-            # Get or create new period wallet
-            new_wallet = get_or_create_wallet(session, user_id, plan_key, to_period)
-            
-            # Set new period values
-            new_wallet.rollover_credits = float(roll)
-            new_wallet.monthly_credits = monthly_credits
-            new_wallet.used_monthly_rollover = 0.0
-            # Preserve purchased_credits (they carry over)
-            # Note: purchased_credits are already in the wallet from get_or_create_wallet
-            new_wallet.updated_at = datetime.utcnow()
-            
-            session.add(new_wallet)
-            session.commit()
-            session.refresh(new_wallet)
-            
-            processed_count += 1
-            rollover_total += roll
-            
-            log.info(
-                f"[WALLET] rollover user={user_id} roll={roll} "
-                f"new_monthly={monthly_credits} from_period={from_period} to_period={to_period}"
+            if not dry_run:
+                # Serialize concurrent runs and pick up the latest committed cursor.
+                marker = session.exec(marker_q.with_for_update()).one()
+                if marker.status == "completed":
+                    break
+                cursor = marker.last_user_id
+            users, inserts, updates, chunk_rolled = _rollover_chunk(
+                session, plans, from_period, to_period, cursor, chunk_size
             )
-            
+            if not users:
+                break
+            rows = inserts + updates
+            cursor = users[-1][0]
+            if not dry_run:
+                if inserts:
+                    session.execute(insert(wallet_table), inserts)
+                if updates:
+                    session.execute(update_stmt, updates)
+                marker.last_user_id = cursor
+                marker.processed_count += len(chunk_rolled)
+                marker.rollover_total += sum(chunk_rolled)
+                session.add(marker)
+                session.commit()
         except Exception as e:
-            error_msg = f"Error processing rollover for user {user_id}: {e}"
+            error_msg = f"Rollover chunk after user {cursor} failed: {e}"
             log.error(f"[WALLET] {error_msg}", exc_info=True)
             errors.append(error_msg)
             session.rollback()
-            continue
-    
-    # Mark period as processed (idempotency)
-    try:
-        processed_record = WalletPeriodProcessed(
-            period=to_period,
-            processed_at=now,
-            processed_count=processed_count,
-            rollover_total=rollover_total
+            break
+
+        chunks += 1
+        wallets_written += len(rows)
+        processed_count += len(chunk_rolled)
+        rollover_total += sum(chunk_rolled)
+        log.info(
+            f"[WALLET] rollover chunk={chunks} users={len(users)} rolled={len(chunk_rolled)} "
+            f"through_user={cursor} to_period={to_period}"
         )
-        session.add(processed_record)
+
+    if dry_run:
+        return {
+            "status": "dry_run",
+            "period": to_period,
+            "from_period": from_period,
+            "processed_count": processed_count,
+            "rollover_total": rollover_total,
+            "wallets": wallets_written,
+            "errors": errors
+        }
+
+    if errors:
+        return {
+            "status": "partial",
+            "period": to_period,
+            "from_period": from_period,
+            "processed_count": processed_count,
+            "rollover_total": rollover_total,
+            "wallets": wallets_written,
+            "resume_after": str(cursor) if cursor else None,
+            "errors": errors
+        }
+
+    # Mark period as processed (idempotency); totals cover resumed runs too.
+    marker = session.exec(marker_q).one()
+    if marker.status != "completed":
+        marker.status = "completed"
+        marker.processed_at = now
+        session.add(marker)
         session.commit()
-    except Exception as e:
-        log.error(f"[WALLET] Failed to record period processing: {e}", exc_info=True)
-        # Don't fail the whole operation if we can't record it
-    
+
     log.info(
         f"[WALLET] Monthly rollover complete: period={to_period}, "
-        f"processed={processed_count}, rollover_total={rollover_total}, errors={len(errors)}"
+        f"processed={marker.processed_count}, rollover_total={marker.rollover_total}, "
+        f"wallets={wallets_written}, chunks={chunks}"
     )
     
     return {
         "status": "completed",
         "period": to_period,
         "from_period": from_period,
-        "processed_count": processed_count,
-        "rollover_total": rollover_total,
+        "processed_count": marker.processed_count,
+        "rollover_total": marker.rollover_total,
+        "wallets": wallets_written,
         "errors": errors
     }
 
@@ -2,6 +2,7 @@
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
+import os
 
 from pydub import AudioSegment
 from pydub.exceptions import CouldntDecodeError
@@ -15,6 +16,27 @@ from .features import (
     apply_censor_beep,
     replace_keywords_with_sfx,
 )
+from .render_ffmpeg import EditTimeline, FilterGraphUnsupported
+
+RENDER_BACKENDS = ("pydub", "ffmpeg")
+
+
+def _resolve_render_backend(render_backend: Optional[str]) -> str:
+    backend = (render_backend or os.getenv("CLEAN_ENGINE_RENDER_BACKEND") or "pydub").strip().lower()
+    if backend not in RENDER_BACKENDS:
+        print(f"[render] unknown backend '{backend}', using pydub")
+        return "pydub"
+    return backend
+
+
+def _load_audio(audio_path: Path) -> AudioSegment:
+    try:
+        return AudioSegment.from_file(audio_path)
+    except CouldntDecodeError as e:
+        # Provide a clearer hint for tests that may have created an empty placeholder
+        raise ValueError(
+            f"Invalid or empty audio file at {audio_path}; tests should create a real WAV via make_tiny_wav"
+        ) from e
 
 
 def run_all(
@@ -30,22 +52,33 @@ def run_all(
     flubber_cuts_ms: Optional[List[Tuple[int,int]]] = None,
     output_name: Optional[str] = None,
     disable_intern_insertion: bool = False,
+    render_backend: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """Clean ``audio_path`` and export the result as MP3.
+
+    ``render_backend`` selects how edits are rendered: ``"pydub"`` (default)
+    rebuilds an in-memory AudioSegment per stage; ``"ffmpeg"`` records the
+    edits on an :class:`EditTimeline` and renders them in one ffmpeg pass.
+    Defaults to ``CLEAN_ENGINE_RENDER_BACKEND``. Both produce the same summary.
+    """
     ensure_ffmpeg()
     work_dir = Path(work_dir)
     (work_dir / "cleaned_audio").mkdir(parents=True, exist_ok=True)
     words_raw = json.loads(Path(words_json_path).read_text())
     words = parse_words(words_raw)
-    try:
-        audio = AudioSegment.from_file(audio_path)
-    except CouldntDecodeError as e:
-        # Provide a clearer hint for tests that may have created an empty placeholder
-        raise ValueError(
-            f"Invalid or empty audio file at {audio_path}; tests should create a real WAV via make_tiny_wav"
-        ) from e
+    use_timeline = _resolve_render_backend(render_backend) == "ffmpeg"
+    audio: Any = None
+    if use_timeline:
+        try:
+            audio = EditTimeline.open(audio_path)
+        except FilterGraphUnsupported as e:
+            print(f"[render] ffmpeg backend unavailable, using pydub: {e}")
+            use_timeline = False
+    if not use_timeline:
+        audio = _load_audio(audio_path)
     show_notes: List[str] = []
     if flubber_cuts_ms:
-        audio = apply_flubber_cuts(audio, flubber_cuts_ms)
+        audio = audio.cut(flubber_cuts_ms) if use_timeline else apply_flubber_cuts(audio, flubber_cuts_ms)
         words = remap_words_after_cuts(words, flubber_cuts_ms)
     if synth is None:
         synth = lambda text: AudioSegment.silent(duration=600)
@@ -117,7 +150,7 @@ def run_all(
     # Accumulate and apply all CUT spans at once
     all_cuts = merge_ranges((prior_cut_spans or []) + (filler_cuts or []) + (silence_cuts or []), gap_ms=0)
     if all_cuts:
-        audio = apply_flubber_cuts(audio, all_cuts)
+        audio = audio.cut(all_cuts) if use_timeline else apply_flubber_cuts(audio, all_cuts)
         words = remap_words_after_cuts(words, all_cuts)
     # Filler logging (filler-only stats)
     filler_spans_merged = merge_ranges(filler_cuts, gap_ms=0) if filler_cuts else []
@@ -135,18 +168,42 @@ def run_all(
             summary["edits"]["censor_mode"] = mode
         except Exception:
             summary["edits"]["censor_mode"] = {"uniform_ms": int(getattr(censor_cfg, 'beep_ms', 250))}
-        audio, censor_spans = apply_censor_beep(audio, words, censor_cfg, mutate_words=False)
+        if use_timeline:
+            from .feature_modules.censor import plan_censor_ops, finalize_censor_ops
+
+            ops = plan_censor_ops(words, censor_cfg, mutate_words=False)
+            censor_spans = []
+            if ops:
+                audio = audio.splice(
+                    (op["s"], op["e"], None if op["type"] == "cut" else op["repl"]) for op in ops
+                )
+                censor_spans = finalize_censor_ops(words, ops)
+        else:
+            audio, censor_spans = apply_censor_beep(audio, words, censor_cfg, mutate_words=False)
         summary["edits"]["censor_spans_ms"] = censor_spans
     else:
         summary["edits"]["censor_spans_ms"] = []
     if sfx_map:
-        audio = replace_keywords_with_sfx(audio, words, sfx_map)
+        if use_timeline:
+            from .feature_modules.sfx import plan_sfx_replacements
+
+            audio = audio.splice(plan_sfx_replacements(words, sfx_map))
+        else:
+            audio = replace_keywords_with_sfx(audio, words, sfx_map)
         summary["edits"]["sfx_applied"] = list(sfx_map.keys())
     else:
         summary["edits"]["sfx_applied"] = []
     out_name = output_name or f"{Path(audio_path).stem}_processed.mp3"
     out_path = work_dir / "cleaned_audio" / out_name
-    audio.export(out_path, format="mp3")
+    if use_timeline:
+        try:
+            audio.export(out_path, format="mp3")
+        except FilterGraphUnsupported as e:
+            # Overlapping edits cannot be carved from one decode; decode the timeline instead.
+            print(f"[render] single-pass graph unsupported ({e}); decoding timeline")
+            audio.materialize().export(out_path, format="mp3")
+    else:
+        audio.export(out_path, format="mp3")
     try:
         tr_dir = work_dir / 'transcripts'
         tr_dir.mkdir(parents=True, exist_ok=True)
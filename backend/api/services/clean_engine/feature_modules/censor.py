@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 from api.core.paths import MEDIA_DIR
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, cast
+from collections import Counter
+from functools import lru_cache
 import re
 from difflib import SequenceMatcher
 
@@ -35,6 +37,9 @@ def _strip_suffixes(token: str) -> str:
     return s
 
 
+_TAILS = frozenset({"ing", "in", "er", "ers", "ed", "s", "y", "ty"})
+
+
 def _sim(a: str, b: str) -> float:
     return SequenceMatcher(a=a, b=b).ratio()
 
@@ -58,11 +63,119 @@ def _matches_token(tok_norm: str, term_norm: str, fuzzy: bool, threshold: float)
         return True
     if tok_norm.startswith(term_norm):
         tail = tok_norm[len(term_norm):]
-        if tail in {"ing", "in", "er", "ers", "ed", "s", "y", "ty"}:
+        if tail in _TAILS:
             return True
     return False
 
 
+_MATCHER_MEMO_MAX = 50_000
+
+
+def _overlap(a: Counter, b: Counter) -> int:
+    return sum(min(c, b[ch]) for ch, c in a.items() if ch in b)
+
+
+class CensorMatcher:
+    """Precompiled taboo-term index returning the same hits as :func:`_matches_token`.
+
+    Built once per censor config. Normalized tokens and per-token match sets
+    are memoized, so each distinct transcript token is matched once. Exact and
+    suffix-tail rules are hash lookups. Fuzzy similarity only runs
+    ``SequenceMatcher`` against terms in the length window its ratio allows,
+    after a character-overlap bound; both bounds are exact upper bounds on
+    the ratio, so no match is lost.
+    """
+
+    def __init__(self, terms: Iterable[str], fuzzy: bool, threshold: float):
+        self.fuzzy = bool(fuzzy)
+        self.threshold = float(threshold)
+        self.terms: FrozenSet[str] = frozenset(t for t in terms if t)
+        self._by_len: Dict[int, List[Tuple[str, Counter]]] = {}
+        for term in sorted(self.terms):
+            self._by_len.setdefault(len(term), []).append((term, Counter(term)))
+        self._norm_memo: Dict[str, str] = {}
+        self._match_memo: Dict[str, FrozenSet[str]] = {}
+
+    def normalize(self, raw: str) -> str:
+        norm = self._norm_memo.get(raw)
+        if norm is None:
+            if len(self._norm_memo) >= _MATCHER_MEMO_MAX:
+                self._norm_memo.clear()
+            norm = self._norm_memo[raw] = _normalize_token(raw)
+        return norm
+
+    def matching_terms(self, tok_norm: str) -> FrozenSet[str]:
+        """All indexed terms that ``tok_norm`` matches."""
+        hit = self._match_memo.get(tok_norm)
+        if hit is None:
+            if len(self._match_memo) >= _MATCHER_MEMO_MAX:
+                self._match_memo.clear()
+            hit = self._match_memo[tok_norm] = self._compute(tok_norm)
+        return hit
+
+    def matches(self, tok_norm: str, term_norm: str) -> bool:
+        if term_norm not in self.terms:
+            return _matches_token(tok_norm, term_norm, self.fuzzy, self.threshold)
+        return term_norm in self.matching_terms(tok_norm)
+
+    def first_match(self, tok_norm: str, ordered_terms: List[str]) -> Optional[str]:
+        hits = self.matching_terms(tok_norm)
+        if not hits:
+            return None
+        for term in ordered_terms:
+            if term in hits:
+                return term
+        return None
+
+    def _compute(self, tok: str) -> FrozenSet[str]:
+        if not tok or not self.terms:
+            return frozenset()
+        found = set()
+        for tail in _TAILS:
+            if tok.endswith(tail) and len(tok) > len(tail):
+                found.add(tok[: -len(tail)])
+        base = _strip_suffixes(tok)
+        if self.fuzzy:
+            self._add_similar(tok, found)
+            if base != tok:
+                self._add_similar(base, found)
+        else:
+            found.update((tok, base))
+        return frozenset(found & self.terms)
+
+    def _add_similar(self, tok: str, found: set) -> None:
+        thr = self.threshold
+        if thr > 1.0:
+            return  # ratio never exceeds 1
+        n = len(tok)
+        if thr <= 0.0:
+            lo, hi = 0, max(self._by_len, default=0)
+        else:
+            # ratio <= 2 * min(n, m) / (n + m)
+            lo = int(n * thr / (2.0 - thr)) - 1
+            hi = int(n * (2.0 - thr) / thr) + 1
+        tok_counts: Optional[Counter] = None
+        for m in range(max(lo, 1), hi + 1):
+            bucket = self._by_len.get(m)
+            if not bucket:
+                continue
+            if tok_counts is None:
+                tok_counts = Counter(tok)
+            for term, term_counts in bucket:
+                if term in found:
+                    continue
+                if 2.0 * _overlap(tok_counts, term_counts) / (n + m) < thr:
+                    continue
+                if _sim(tok, term) >= thr:
+                    found.add(term)
+
+
+@lru_cache(maxsize=32)
+def get_censor_matcher(terms: Tuple[str, ...], fuzzy: bool, threshold: float) -> CensorMatcher:
+    """Shared :class:`CensorMatcher` for one censor config."""
+    return CensorMatcher(terms, fuzzy, threshold)
+
+
 def _load_or_gen_beep(base: Optional[AudioSegment], duration_ms: int, freq_hz: int, gain_db: float) -> AudioSegment:
     duration_ms = max(10, int(duration_ms))
     if base is not None:
@@ -85,12 +198,27 @@ def _load_or_gen_beep(base: Optional[AudioSegment], duration_ms: int, freq_hz: i
     return seg  # type: ignore[return-value]
 
 
-def apply_censor_beep(
-    audio: AudioSegment,
+def _word_bounds_ms(words: List[Any], i: int) -> Tuple[int, int]:
+    w = words[i]
+    s = getattr(w, "start", None)
+    e = getattr(w, "end", None)
+    if isinstance(w, dict):
+        s = w.get("start", s)
+        e = w.get("end", e)
+    return to_ms(s), to_ms(e)
+
+
+def plan_censor_ops(
     words: List[Dict[str, Any]] | List[Any],
     cfg: Any,
     mutate_words: bool = True,
-) -> Tuple[AudioSegment, List[Tuple[int, int]]]:
+) -> List[Dict[str, Any]]:
+    """Find command prunes and taboo hits; return edit ops sorted by start.
+
+    Each op is ``{"type": "cut"|"replace", "s": ms, "e": ms, "repl": beep}``.
+    Token edits (pruned commands, ``{beep}`` markers) are applied to ``words``
+    here; timing is shifted later by :func:`finalize_censor_ops`.
+    """
     def _get(obj: Any, name: str, default: Any = None) -> Any:
         if isinstance(obj, dict):
             return obj.get(name, default)
@@ -133,13 +261,7 @@ def apply_censor_beep(
         return (t or "").strip()
 
     def _bounds_ms(i: int) -> Tuple[int, int]:
-        w = words[i]
-        s = getattr(w, "start", None)
-        e = getattr(w, "end", None)
-        if isinstance(w, dict):
-            s = w.get("start", s)
-            e = w.get("end", e)
-        return to_ms(s), to_ms(e)
+        return _word_bounds_ms(words, i)
 
     def _set_tok(i: int, v: str) -> None:
         w = words[i]
@@ -154,13 +276,26 @@ def apply_censor_beep(
             elif hasattr(w, "text"):
                 setattr(w, "text", v)
 
+    taboo_phrases: List[List[str]] = []
+    for term in taboo:
+        toks = [t for t in (term or "").split() if t]
+        if not toks:
+            continue
+        taboo_phrases.append([_normalize_token(t) for t in toks])
+    taboo_phrases.sort(key=lambda x: -len(x))
+    singles = [p[0] for p in taboo_phrases if len(p) == 1]
+    matcher = get_censor_matcher(
+        tuple(sorted({t for p in taboo_phrases for t in p})), use_fuzzy, threshold
+    )
+    norm = matcher.normalize
+
     ops: List[Dict[str, Any]] = []
     i = 0
     n = len(words)
     while i < n:
-        t0 = _normalize_token(_tok(i))
+        t0 = norm(_tok(i))
         if i + 1 < n:
-            t1 = _normalize_token(_tok(i + 1))
+            t1 = norm(_tok(i + 1))
             if (t0, t1) == (end_token, "intern"):
                 s0, _ = _bounds_ms(i)
                 _, e1 = _bounds_ms(i + 1)
@@ -180,18 +315,34 @@ def apply_censor_beep(
                 print(f"[COMMAND_PRUNE] token='{end_token}' {s0}->{e0}ms")
         i += 1
 
-    taboo_phrases: List[List[str]] = []
-    for term in taboo:
-        toks = [t for t in (term or "").split() if t]
-        if not toks:
-            continue
-        taboo_phrases.append([_normalize_token(t) for t in toks])
-    taboo_phrases.sort(key=lambda x: -len(x))
+    # Tokens ahead of idx are never rewritten, so normalize them all up front.
+    norms = [norm(_tok(k)) for k in range(n)]
+
+    _beep_base: List[Optional[AudioSegment]] = []
+
+    def _beep_base_seg() -> Optional[AudioSegment]:
+        if _beep_base:
+            return _beep_base[0]
+        base_seg: Optional[AudioSegment] = None
+        if isinstance(beep_file, (str, Path)) and str(beep_file).strip():
+            try:
+                p = Path(str(beep_file))
+                if not p.exists():
+                    for cand in [Path.cwd() / p, Path.cwd() / str(beep_file), MEDIA_DIR / p.name]:
+                        if cand.is_file():
+                            p = cand
+                            break
+                if p.is_file():
+                    base_seg = AudioSegment.from_file(str(p))
+            except Exception as ex:
+                print(f"[CENSOR_BEEP_FILE_ERROR] {beep_file}: {ex}")
+        _beep_base.append(base_seg)
+        return base_seg
 
     idx = 0
     while idx < n:
         raw0 = _tok(idx)
-        norm0 = _normalize_token(raw0)
+        norm0 = norms[idx]
         if not norm0 or norm0 in whitelist:
             idx += 1
             continue
@@ -203,11 +354,11 @@ def apply_censor_beep(
                 continue
             ok = True
             for k in range(L):
-                cand = _normalize_token(_tok(idx + k))
-                if not cand or (_normalize_token(_tok(idx + k)) in whitelist):
+                cand = norms[idx + k]
+                if not cand or cand in whitelist:
                     ok = False
                     break
-                if not _matches_token(cand, phrase[k], use_fuzzy, threshold):
+                if not matcher.matches(cand, phrase[k]):
                     ok = False
                     break
             if not ok:
@@ -218,20 +369,7 @@ def apply_censor_beep(
             if e <= s:
                 continue
 
-            base_seg: Optional[AudioSegment] = None
-            if isinstance(beep_file, (str, Path)) and str(beep_file).strip():
-                try:
-                    p = Path(str(beep_file))
-                    if not p.exists():
-                        for cand in [Path.cwd() / p, Path.cwd() / str(beep_file), MEDIA_DIR / p.name]:
-                            if cand.is_file():
-                                p = cand
-                                break
-                    if p.is_file():
-                        base_seg = AudioSegment.from_file(str(p))
-                except Exception as ex:
-                    print(f"[CENSOR_BEEP_FILE_ERROR] {beep_file}: {ex}")
-
+            base_seg = _beep_base_seg()
             target_len = (e - s) if mutate_words else beep_ms
             if base_seg is not None:
                 beep_seg = _load_or_gen_beep(base_seg, target_len, beep_hz, beep_gain)
@@ -262,30 +400,11 @@ def apply_censor_beep(
             break
 
         if not matched_any:
-            base = None
-            single_hit = False
-            for single in [p[0] for p in taboo_phrases if len(p) == 1]:
-                if _matches_token(norm0, single, use_fuzzy, threshold):
-                    base = single
-                    single_hit = True
-                    break
-            if single_hit:
+            base = matcher.first_match(norm0, singles)
+            if base is not None:
                 s, e = _bounds_ms(idx)
                 if e > s:
-                    base_seg: Optional[AudioSegment] = None
-                    if isinstance(beep_file, (str, Path)) and str(beep_file).strip():
-                        try:
-                            p = Path(str(beep_file))
-                            if not p.exists():
-                                for cand in [Path.cwd() / p, Path.cwd() / str(beep_file), MEDIA_DIR / p.name]:
-                                    if cand.is_file():
-                                        p = cand
-                                        break
-                            if p.is_file():
-                                base_seg = AudioSegment.from_file(str(p))
-                        except Exception as ex:
-                            print(f"[CENSOR_BEEP_FILE_ERROR] {beep_file}: {ex}")
-
+                    base_seg = _beep_base_seg()
                     target_len = (e - s) if mutate_words else beep_ms
                     if base_seg is not None:
                         beep_seg = _load_or_gen_beep(base_seg, target_len, beep_hz, beep_gain)
@@ -307,26 +426,24 @@ def apply_censor_beep(
             else:
                 idx += 1
 
-    if not ops:
-        return audio, []
-
     ops.sort(key=lambda d: int(d["s"]))
+    return ops
+
 
+def render_censor_ops(audio: AudioSegment, ops: List[Dict[str, Any]]) -> AudioSegment:
+    """Apply planned censor ops (cuts and beep replacements) to ``audio``."""
     # Build the output using the same audio class as the input to support test stubs.
     try:
         new_audio = audio.__class__.silent(duration=0)  # type: ignore[call-arg]
     except Exception:
         new_audio = AudioSegment.silent(duration=0)
     cursor = 0
-    deltas: List[Tuple[int, int]] = []
 
     for op in ops:
         s = int(op["s"])
         e = int(op["e"])
         new_audio += audio[cursor:s]
-        if op["type"] == "cut":
-            repl_len = 0
-        else:
+        if op["type"] != "cut":
             repl = op["repl"]  # type: ignore[assignment]
             # Normalize replacement type to match the source audio (supports test stubs).
             if repl is not None and not isinstance(repl, audio.__class__):
@@ -335,14 +452,25 @@ def apply_censor_beep(
                 except Exception:
                     pass
             new_audio += repl
-            repl_len = len(repl)
         cursor = e
+
+    new_audio += audio[cursor:]
+    return new_audio
+
+
+def finalize_censor_ops(words: List[Any], ops: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """Shift word timings past the applied ops; return beep spans on the new timeline."""
+    deltas: List[Tuple[int, int]] = []
+    for op in ops:
+        s = int(op["s"])
+        e = int(op["e"])
+        repl_len = 0 if op["type"] == "cut" else len(op["repl"])
         delta = repl_len - (e - s)
         if delta:
             deltas.append((s, delta))
 
-    new_audio += audio[cursor:]
-    audio = new_audio
+    def _bounds_ms(i: int) -> Tuple[int, int]:
+        return _word_bounds_ms(words, i)
 
     deltas.sort(key=lambda x: x[0])
     k = 0
@@ -391,4 +519,17 @@ def apply_censor_beep(
     else:
         print("[CENSOR_APPLIED] 0 spans")
 
-    return audio, beep_spans
+    return beep_spans
+
+
+def apply_censor_beep(
+    audio: AudioSegment,
+    words: List[Dict[str, Any]] | List[Any],
+    cfg: Any,
+    mutate_words: bool = True,
+) -> Tuple[AudioSegment, List[Tuple[int, int]]]:
+    ops = plan_censor_ops(words, cfg, mutate_words=mutate_words)
+    if not ops:
+        return audio, []
+    audio = render_censor_ops(audio, ops)
+    return audio, finalize_censor_ops(words, ops)
@@ -23,6 +23,10 @@ def _find_break_after(audio: AudioSegment, from_ms: int, cfg: InternSettings) ->
     max_ms = to_ms(cfg.max_break_s)
     end_scan = min(len(audio), from_ms + scan_ms)
     window_seg: AudioSegment = audio[from_ms:end_scan]  # type: ignore[assignment]
+    # Lazy timelines (ffmpeg render backend) decode only the scanned window.
+    materialize = getattr(window_seg, "materialize", None)
+    if callable(materialize):
+        window_seg = materialize()
     silences = detect_silences_dbfs(window_seg, threshold_dbfs=-50, min_len_ms=min_ms)  # More forgiving (was -40)
     if not silences:
         return None
@@ -9,14 +9,16 @@ from pydub import AudioSegment
 from .utils import to_ms
 
 
-def replace_keywords_with_sfx(
-    audio: AudioSegment,
+def plan_sfx_replacements(
     words: List[Any],
     sfx_map: Dict[str, Path],
     gain_db: float = 0.0,
-) -> AudioSegment:
-    out = AudioSegment.silent(duration=0)
-    cursor = 0
+) -> List[Tuple[int, int, AudioSegment]]:
+    """Match SFX keyword phrases in ``words``; return ``(start_ms, end_ms, clip)`` edits.
+
+    Matched tokens are rewritten to ``{phrase}`` markers in place.
+    """
+    edits: List[Tuple[int, int, AudioSegment]] = []
 
     phrase_list: List[Tuple[List[str], AudioSegment]] = []
     for key, p in sfx_map.items():
@@ -66,8 +68,7 @@ def replace_keywords_with_sfx(
                 s_ms = to_ms(getattr(wi, "start", None))
                 e_ms = to_ms(getattr(wj, "end", None))
 
-                out += audio[cursor:s_ms] + seg
-                cursor = e_ms
+                edits.append((s_ms, e_ms, seg))
 
                 display = " ".join(toks)
                 w0 = words[i]
@@ -90,5 +91,19 @@ def replace_keywords_with_sfx(
         if not matched:
             i += 1
 
+    return edits
+
+
+def replace_keywords_with_sfx(
+    audio: AudioSegment,
+    words: List[Any],
+    sfx_map: Dict[str, Path],
+    gain_db: float = 0.0,
+) -> AudioSegment:
+    out = AudioSegment.silent(duration=0)
+    cursor = 0
+    for s_ms, e_ms, seg in plan_sfx_replacements(words, sfx_map, gain_db):
+        out += audio[cursor:s_ms] + seg
+        cursor = e_ms
     out += audio[cursor:]
     return out
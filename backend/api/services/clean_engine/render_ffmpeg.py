@@ -0,0 +1,417 @@
+"""Single-pass ffmpeg render backend for the clean engine.
+
+The pydub path decodes the whole episode into memory and rebuilds it once per
+edit stage (flubber cuts, intern inserts, filler/pause cuts, censor beeps,
+SFX), then encodes. This backend records the same edits on an
+:class:`EditTimeline` -- an edit decision list of source spans and small
+in-memory clips -- and renders it with one ``ffmpeg`` invocation:
+
+* the source is decoded once and split in order with ``asegment``; dropped
+  spans go to ``anullsink``,
+* clips (beeps, SFX, intern replies, padding) are packed into one small WAV
+  and cut out with ``atrim``,
+* everything is conformed to a common format and joined with ``concat``, then
+  encoded straight to MP3.
+
+Timeline positions are integer milliseconds and follow pydub's slicing rules
+(clamping, negative indices), so every stage produces the same positions as
+with AudioSegment. Only windows that a stage must *listen* to (intern break
+detection) are decoded, via :meth:`EditTimeline.materialize`.
+"""
+from __future__ import annotations
+
+import io
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from pydub import AudioSegment
+
+from .words import merge_ranges
+
+SOURCE = -1  # piece kind for spans of the source file; >= 0 indexes a clip
+
+Piece = Tuple[int, int, int]  # (kind, start_ms, end_ms)
+
+# Long filtergraphs are passed as a script file instead of on the command line.
+_INLINE_GRAPH_MAX_CHARS = 8000
+
+
+class FilterGraphUnsupported(RuntimeError):
+    """The timeline cannot be rendered as a single filtergraph."""
+
+
+def _ffmpeg_bin() -> str:
+    return (
+        os.environ.get("FFMPEG_BIN")
+        or getattr(AudioSegment, "converter", None)
+        or shutil.which("ffmpeg")
+        or "ffmpeg"
+    )
+
+
+@dataclass(frozen=True)
+class SourceInfo:
+    path: str
+    frame_rate: int
+    channels: int
+    samples: int
+
+    @property
+    def duration_ms(self) -> int:
+        # Same rounding as len(AudioSegment)
+        return int(round(1000 * (self.samples / float(self.frame_rate))))
+
+
+_AUDIO_STREAM_RE = re.compile(r"Audio:.*?(\d+) Hz, ([^,]+)")
+_SAMPLES_RE = re.compile(r"Number of samples:\s*(\d+)")
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_CHANNELS = {"mono": 1, "stereo": 2}
+
+
+def probe_source(path: Path | str) -> SourceInfo:
+    """Sample rate, channel count and exact decoded sample count of ``path``."""
+    cmd = [
+        _ffmpeg_bin(), "-hide_banner", "-nostats", "-i", str(path),
+        "-map", "0:a:0",
+        "-af", "astats=measure_perchannel=none:measure_overall=Number_of_samples",
+        "-f", "null", "-",
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    err = proc.stderr or ""
+    if proc.returncode != 0:
+        raise FilterGraphUnsupported(f"ffmpeg could not decode {path}: {err.strip()[-300:]}")
+
+    stream = _AUDIO_STREAM_RE.search(err)
+    if not stream:
+        raise FilterGraphUnsupported(f"no audio stream found in {path}")
+    rate = int(stream.group(1))
+    layout = stream.group(2).strip()
+    channels = _CHANNELS.get(layout)
+    if channels is None:
+        raise FilterGraphUnsupported(f"unsupported channel layout '{layout}' in {path}")
+
+    samples_match = _SAMPLES_RE.search(err)
+    if samples_match:
+        samples = int(samples_match.group(1))
+    else:
+        dur = _DURATION_RE.search(err)
+        if not dur:
+            raise FilterGraphUnsupported(f"could not determine duration of {path}")
+        h, m, s = dur.groups()
+        samples = int(round((int(h) * 3600 + int(m) * 60 + float(s)) * rate))
+    return SourceInfo(path=str(path), frame_rate=rate, channels=channels, samples=samples)
+
+
+@dataclass
+class _ClipStore:
+    """Clips shared by every timeline derived from the same source."""
+
+    clips: List[Any] = field(default_factory=list)
+
+    def add(self, clip: Any) -> int:
+        for i, existing in enumerate(self.clips):
+            if existing is clip:
+                return i
+        self.clips.append(clip)
+        return len(self.clips) - 1
+
+
+class EditTimeline:
+    """Lazy, AudioSegment-like edit list over one source file.
+
+    Supports the operations the clean engine stages use on audio: ``len()``,
+    slicing, ``+`` with another timeline or an AudioSegment, and ``export``.
+    """
+
+    def __init__(self, source: SourceInfo, pieces: Sequence[Piece], store: Optional[_ClipStore] = None):
+        self.source = source
+        self.store = store if store is not None else _ClipStore()
+        self.pieces: List[Piece] = _coalesce(pieces)
+
+    @classmethod
+    def open(cls, path: Path | str) -> "EditTimeline":
+        info = probe_source(path)
+        return cls(info, [(SOURCE, 0, info.duration_ms)])
+
+    def _derive(self, pieces: Sequence[Piece]) -> "EditTimeline":
+        return EditTimeline(self.source, pieces, self.store)
+
+    # ------------------------------------------------------------ AudioSegment
+    def __len__(self) -> int:
+        return sum(e - s for _, s, e in self.pieces)
+
+    def __getitem__(self, item: Any) -> "EditTimeline":
+        if not isinstance(item, slice) or item.step:
+            raise FilterGraphUnsupported("EditTimeline only supports contiguous slices")
+        total = len(self)
+        start = item.start if item.start is not None else 0
+        end = item.stop if item.stop is not None else total
+        start = min(int(start), total)
+        end = min(int(end), total)
+        if start < 0:
+            start = max(0, total + start)
+        if end < 0:
+            end = max(0, total + end)
+        if end <= start:
+            return self._derive([])
+
+        out: List[Piece] = []
+        pos = 0
+        for kind, s, e in self.pieces:
+            length = e - s
+            lo = max(start, pos)
+            hi = min(end, pos + length)
+            if hi > lo:
+                out.append((kind, s + (lo - pos), s + (hi - pos)))
+            pos += length
+            if pos >= end:
+                break
+        return self._derive(out)
+
+    def __add__(self, other: Any) -> "EditTimeline":
+        if isinstance(other, EditTimeline):
+            if other.source.path != self.source.path:
+                raise FilterGraphUnsupported("cannot join timelines over different sources")
+            if other.store is self.store:
+                return self._derive(self.pieces + other.pieces)
+            remapped = [
+                (kind if kind == SOURCE else self.store.add(other.store.clips[kind]), s, e)
+                for kind, s, e in other.pieces
+            ]
+            return self._derive(self.pieces + remapped)
+        if isinstance(other, (int, float)):
+            raise FilterGraphUnsupported("gain changes are not supported on an EditTimeline")
+        return self._derive(self.pieces + [(self.store.add(other), 0, len(other))])
+
+    def export(self, out_f: Path | str, format: str = "mp3", **_kwargs: Any) -> Path:
+        return render(self, Path(out_f), fmt=format)
+
+    # ------------------------------------------------------------- edit ops
+    def cut(self, cuts: Iterable[Tuple[int, int]]) -> "EditTimeline":
+        """Drop ``cuts`` (timeline ms), matching ``apply_flubber_cuts``."""
+        spans = [(int(s), int(e)) for s, e in cuts]
+        if not spans:
+            return self
+        out = self._derive([])
+        cursor = 0
+        for s, e in merge_ranges(sorted(spans), gap_ms=0):
+            out = out + self[cursor:s]
+            cursor = e
+        return out + self[cursor:]
+
+    def splice(self, edits: Iterable[Tuple[int, int, Any]]) -> "EditTimeline":
+        """Replace each ``(start, end)`` span with its clip (``None`` cuts it).
+
+        Edits are applied in order with a moving cursor, exactly like the
+        censor and SFX renderers do with AudioSegments.
+        """
+        out = self._derive([])
+        cursor = 0
+        for s, e, clip in edits:
+            out = out + self[cursor:int(s)]
+            if clip is not None:
+                out = out + clip
+            cursor = int(e)
+        return out + self[cursor:]
+
+    def materialize(self) -> AudioSegment:
+        """Decode this (short) timeline into an AudioSegment."""
+        out = AudioSegment.silent(duration=0, frame_rate=self.source.frame_rate)
+        for kind, s, e in self.pieces:
+            if kind == SOURCE:
+                out += _decode_span(self.source, s, e)
+            else:
+                out += self.store.clips[kind][s:e]
+        return out
+
+
+def _coalesce(pieces: Iterable[Piece]) -> List[Piece]:
+    out: List[Piece] = []
+    for kind, s, e in pieces:
+        if e <= s:
+            continue
+        if out and out[-1][0] == kind and out[-1][2] == s:
+            out[-1] = (kind, out[-1][1], e)
+        else:
+            out.append((kind, s, e))
+    return out
+
+
+def _decode_span(source: SourceInfo, start_ms: int, end_ms: int) -> AudioSegment:
+    cmd = [
+        _ffmpeg_bin(), "-hide_banner", "-loglevel", "error",
+        "-ss", f"{start_ms / 1000.0:.3f}", "-t", f"{(end_ms - start_ms) / 1000.0:.3f}",
+        "-i", source.path, "-map", "0:a:0", "-acodec", "pcm_s16le", "-f", "wav", "-",
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {source.path} [{start_ms}:{end_ms}]: {proc.stderr.decode(errors='replace')[-300:]}")
+    return AudioSegment.from_file(io.BytesIO(proc.stdout), format="wav")
+
+
+# ---------------------------------------------------------------- compile
+def _ms_to_sample(ms: int, rate: int) -> int:
+    # pydub slices at int(ms * rate / 1000) frames
+    return int(ms * rate / 1000.0)
+
+
+def build_filtergraph(
+    timeline: EditTimeline,
+    bank_offsets: Sequence[Tuple[int, int]],
+    bank_rate: int,
+    out_rate: int,
+    out_channels: int,
+) -> str:
+    """Compile ``timeline`` to a ``filter_complex`` graph ending in ``[out]``.
+
+    Input 0 is the source file; input 1 (if any clips are used) is the clip
+    bank, where clip ``i`` occupies samples ``bank_offsets[i]``.
+    """
+    src = timeline.source
+    layout = "stereo" if out_channels == 2 else "mono"
+    conform = f"aformat=sample_fmts=s16:sample_rates={out_rate}:channel_layouts={layout}"
+    src_conform = conform
+    if src.channels == 1 and out_channels == 2:
+        src_conform = f"pan=stereo|c0=c0|c1=c0,{conform}"
+
+    chains: List[str] = []
+    labels: List[str] = []
+
+    # Kept source spans in samples. They must be increasing and disjoint to be
+    # carved out of a single decode.
+    spans: List[Tuple[int, int]] = []
+    for kind, s, e in timeline.pieces:
+        if kind != SOURCE:
+            continue
+        a = min(_ms_to_sample(s, src.frame_rate), src.samples)
+        b = min(_ms_to_sample(e, src.frame_rate), src.samples)
+        if b <= a:
+            continue
+        if spans and a < spans[-1][1]:
+            raise FilterGraphUnsupported("source spans overlap or are out of order")
+        spans.append((a, b))
+
+    # asegment splits at every boundary; output j covers [points[j-1], points[j]).
+    points = sorted({p for span in spans for p in span if 0 < p < src.samples})
+    starts = {a for a, _ in spans}
+    seg_labels: List[str] = []
+    if not spans:
+        chains.append("[0:a]anullsink")
+    else:
+        outs = "".join(f"[s{j}]" for j in range(len(points) + 1))
+        if points:
+            chains.append(f"[0:a]asegment=samples={'|'.join(str(p) for p in points)}{outs}")
+        else:
+            chains.append(f"[0:a]anull{outs}")
+        for j, seg_start in enumerate([0] + points):
+            if seg_start in starts:
+                chains.append(f"[s{j}]asetpts=N/SR/TB,{src_conform}[k{j}]")
+                seg_labels.append(f"[k{j}]")
+            else:
+                chains.append(f"[s{j}]anullsink")
+
+    clip_pieces = [(kind, s, e) for kind, s, e in timeline.pieces if kind != SOURCE]
+    if clip_pieces:
+        n = len(clip_pieces)
+        if n == 1:
+            chains.append("[1:a]anull[b0]")
+        else:
+            chains.append("[1:a]asplit=" + str(n) + "".join(f"[b{i}]" for i in range(n)))
+
+    src_iter = iter(seg_labels)
+    clip_idx = 0
+    for kind, s, e in timeline.pieces:
+        if kind == SOURCE:
+            a = min(_ms_to_sample(s, src.frame_rate), src.samples)
+            if min(_ms_to_sample(e, src.frame_rate), src.samples) > a:
+                labels.append(next(src_iter))
+            continue
+        base, _ = bank_offsets[kind]
+        a = base + _ms_to_sample(s, bank_rate)
+        b = base + _ms_to_sample(e, bank_rate)
+        chains.append(f"[b{clip_idx}]atrim=start_sample={a}:end_sample={b},asetpts=N/SR/TB,{conform}[c{clip_idx}]")
+        labels.append(f"[c{clip_idx}]")
+        clip_idx += 1
+
+    if not labels:
+        chains.append(f"anullsrc=r={out_rate}:cl={layout},atrim=end_sample=0,{conform}[out]")
+    elif len(labels) == 1:
+        chains.append(f"{labels[0]}anull[out]")
+    else:
+        chains.append("".join(labels) + f"concat=n={len(labels)}:v=0:a=1[out]")
+    return ";\n".join(chains)
+
+
+def _build_clip_bank(timeline: EditTimeline, rate: int, channels: int) -> Tuple[Optional[AudioSegment], List[Tuple[int, int]]]:
+    used = sorted({kind for kind, _, _ in timeline.pieces if kind != SOURCE})
+    offsets: List[Tuple[int, int]] = [(0, 0)] * len(timeline.store.clips)
+    if not used:
+        return None, offsets
+    bank = AudioSegment.silent(duration=0, frame_rate=rate).set_channels(channels).set_sample_width(2)
+    for kind in used:
+        clip = timeline.store.clips[kind]
+        clip = clip.set_frame_rate(rate).set_channels(channels).set_sample_width(2)
+        start = int(bank.frame_count())
+        bank = bank + clip
+        offsets[kind] = (start, int(bank.frame_count()))
+    return bank, offsets
+
+
+def _graph_args(graph: str, script_path: Path) -> List[str]:
+    if len(graph) <= _INLINE_GRAPH_MAX_CHARS:
+        return ["-filter_complex", graph]
+    script_path.write_text(graph, encoding="utf-8")
+    return ["-filter_complex_script", str(script_path)]
+
+
+def render(timeline: EditTimeline, out_path: Path, fmt: str = "mp3") -> Path:
+    """Render ``timeline`` to ``out_path`` with a single ffmpeg invocation."""
+    src = timeline.source
+    used_clips = [timeline.store.clips[k] for k in {kind for kind, _, _ in timeline.pieces if kind != SOURCE}]
+    out_rate = max([src.frame_rate] + [int(getattr(c, "frame_rate", src.frame_rate)) for c in used_clips])
+    out_channels = max([src.channels] + [int(getattr(c, "channels", src.channels)) for c in used_clips])
+    if out_channels > 2:
+        raise FilterGraphUnsupported(f"unsupported channel count {out_channels}")
+
+    out_path = Path(out_path)
+    with tempfile.TemporaryDirectory(prefix="clean_engine_render_") as tmp:
+        tmp_dir = Path(tmp)
+        bank, offsets = _build_clip_bank(timeline, out_rate, out_channels)
+        graph = build_filtergraph(timeline, offsets, out_rate, out_rate, out_channels)
+
+        cmd = [_ffmpeg_bin(), "-hide_banner", "-nostats", "-loglevel", "error", "-y", "-i", src.path]
+        if bank is not None:
+            bank_path = tmp_dir / "clips.wav"
+            bank.export(bank_path, format="wav")
+            cmd += ["-i", str(bank_path)]
+        cmd += _graph_args(graph, tmp_dir / "graph.txt")
+        cmd += ["-map", "[out]"]
+        if fmt == "mp3":
+            cmd += ["-c:a", "libmp3lame"]
+        cmd += ["-f", fmt, str(out_path)]
+
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg render failed ({proc.returncode}): {(proc.stderr or '').strip()[-500:]}")
+
+    print(
+        f"[render_ffmpeg] pieces={len(timeline.pieces)} clips={len(used_clips)} "
+        f"duration_ms={len(timeline)} out={out_path.name}"
+    )
+    return out_path
+
+
+__all__ = [
+    "EditTimeline",
+    "FilterGraphUnsupported",
+    "SourceInfo",
+    "build_filtergraph",
+    "probe_source",
+    "render",
+]
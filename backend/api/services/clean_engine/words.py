@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 import re
 
+import numpy as np
+
 from .models import Word
 
 
@@ -55,7 +57,89 @@ def parse_words(words_raw: List[Dict[str, Any]]) -> List[Word]:
     return parsed
 
 
-def merge_ranges(ranges: List[Tuple[int,int]], gap_ms: int = 0) -> List[Tuple[int,int]]:
+_EDGE_PUNCT_RE = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+def _norm_token(s: str) -> str:
+    return _EDGE_PUNCT_RE.sub("", (s or "").strip().lower())
+
+
+def _to_ms(seconds: np.ndarray) -> np.ndarray:
+    # np.rint rounds half to even, exactly like int(round(x)) on floats.
+    return np.rint(seconds * 1000).astype(np.int64)
+
+
+class WordColumns:
+    """Columnar transcript: parallel start/end arrays plus interned token ids.
+
+    ``token_ids[i]`` indexes ``vocab`` (distinct raw tokens), so per-token work
+    such as normalization runs once per distinct token instead of once per word.
+    """
+
+    __slots__ = ("vocab", "token_ids", "start", "end")
+
+    def __init__(self, vocab: List[str], token_ids: np.ndarray, start: np.ndarray, end: np.ndarray) -> None:
+        self.vocab = vocab
+        self.token_ids = token_ids
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_words(cls, words: Iterable[Any]) -> "WordColumns":
+        vocab: List[str] = []
+        index: Dict[str, int] = {}
+        ids: List[int] = []
+        starts: List[float] = []
+        ends: List[float] = []
+        for w in words:
+            tok = getattr(w, "word", "")
+            tid = index.get(tok)
+            if tid is None:
+                tid = index[tok] = len(vocab)
+                vocab.append(tok)
+            ids.append(tid)
+            starts.append(float(getattr(w, "start", 0.0)))
+            ends.append(float(getattr(w, "end", 0.0)))
+        return cls(
+            vocab,
+            np.asarray(ids, dtype=np.int32),
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(ends, dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return int(self.token_ids.size)
+
+    @property
+    def start_ms(self) -> np.ndarray:
+        return _to_ms(self.start)
+
+    @property
+    def end_ms(self) -> np.ndarray:
+        return _to_ms(self.end)
+
+    def tokens(self, positions: Optional[np.ndarray] = None) -> List[str]:
+        ids = self.token_ids if positions is None else self.token_ids[positions]
+        vocab = self.vocab
+        return [vocab[i] for i in ids.tolist()]
+
+    def match_mask(self, token_set: Iterable[str]) -> np.ndarray:
+        """Boolean mask of words whose normalized token is in ``token_set``."""
+        targets = {_norm_token(x) for x in token_set if isinstance(x, str) and x.strip()}
+        targets.discard("")
+        hits = [i for i, tok in enumerate(self.vocab) if _norm_token(tok) in targets]
+        if not hits:
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.token_ids, np.asarray(hits, dtype=np.int32))
+
+    def to_words(self) -> List[Word]:
+        return [
+            Word(word=tok, start=s, end=e)
+            for tok, s, e in zip(self.tokens(), self.start.tolist(), self.end.tolist())
+        ]
+
+
+def _merge_ranges_loop(ranges: List[Tuple[int,int]], gap_ms: int = 0) -> List[Tuple[int,int]]:
     if not ranges:
         return []
     ranges = sorted(ranges)
@@ -69,6 +153,39 @@ def merge_ranges(ranges: List[Tuple[int,int]], gap_ms: int = 0) -> List[Tuple[in
     return [tuple(x) for x in merged]
 
 
+# Below this many spans the plain loop beats NumPy's call overhead.
+_VECTOR_MIN_RANGES = 64
+
+
+def _merge_arrays(starts: np.ndarray, ends: np.ndarray, gap_ms: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge spans given as parallel arrays; returns sorted, merged (starts, ends)."""
+    if starts.size == 0:
+        return starts, ends
+    order = np.lexsort((ends, starts))
+    starts = starts[order]
+    ends = ends[order]
+    # Spans are sorted by start, so the running max of ends is the end of the
+    # group being built; a span opens a new group when it starts past it.
+    reach = np.maximum.accumulate(ends)
+    new_group = np.empty(starts.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1] + gap_ms
+    heads = np.flatnonzero(new_group)
+    return starts[heads], np.maximum.reduceat(ends, heads)
+
+
+def merge_ranges(ranges: List[Tuple[int,int]], gap_ms: int = 0) -> List[Tuple[int,int]]:
+    if not ranges:
+        return []
+    if len(ranges) < _VECTOR_MIN_RANGES:
+        return _merge_ranges_loop(ranges, gap_ms=gap_ms)
+    arr = np.asarray(ranges)
+    if arr.ndim != 2 or arr.shape[1] != 2 or arr.dtype.kind not in "iu":
+        return _merge_ranges_loop(ranges, gap_ms=gap_ms)
+    starts, ends = _merge_arrays(arr[:, 0], arr[:, 1], gap_ms)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
 def build_filler_cuts(words: List[Word], filler_set) -> List[Tuple[int, int]]:
     """Return merged (start_ms, end_ms) spans for tokens that are in filler_set.
 
@@ -79,26 +196,18 @@ def build_filler_cuts(words: List[Word], filler_set) -> List[Tuple[int, int]]:
     if not words or not filler_set:
         return []
 
-    def _norm(s: str) -> str:
-        return re.sub(r"^[\W_]+|[\W_]+$", "", (s or "").strip().lower())
-
-    fillers = { _norm(x) for x in filler_set if isinstance(x, str) and x.strip() }
-    if not fillers:
+    cols = words if isinstance(words, WordColumns) else WordColumns.from_words(words)
+    mask = cols.match_mask(filler_set)
+    if not mask.any():
         return []
+    s_ms = _to_ms(cols.start[mask])
+    e_ms = _to_ms(cols.end[mask])
+    keep = e_ms > s_ms
+    starts, ends = _merge_arrays(s_ms[keep], e_ms[keep], 0)
+    return list(zip(starts.tolist(), ends.tolist()))
 
-    ranges: List[Tuple[int, int]] = []
-    for w in words:
-        tok = _norm(getattr(w, "word", ""))
-        if tok and tok in fillers:
-            s_ms = int(round(float(getattr(w, "start", 0.0)) * 1000))
-            e_ms = int(round(float(getattr(w, "end", 0.0)) * 1000))
-            if e_ms > s_ms:
-                ranges.append((s_ms, e_ms))
-
-    return merge_ranges(ranges, gap_ms=0)
 
-
-def remap_words_after_cuts(
+def _remap_words_after_cuts_loop(
     words: List[Word],
     cuts_ms: List[Tuple[int, int]],
     drop_if_overlap_ratio: float = 0.5,
@@ -161,7 +270,85 @@ def remap_words_after_cuts(
     out.sort(key=lambda w: (w.start, w.end))
     return out
 
+
+def _normalize_cuts(cuts_ms: Sequence[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted, disjoint cut arrays; touching cuts are merged like overlapping ones."""
+    pairs = [(max(0, int(s)), max(0, int(e))) for s, e in cuts_ms if e > s]
+    if not pairs:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    arr = np.asarray(pairs, dtype=np.int64)
+    return _merge_arrays(arr[:, 0], arr[:, 1], 0)
+
+
+def remap_words_after_cuts(
+    words: List[Word],
+    cuts_ms: List[Tuple[int, int]],
+    drop_if_overlap_ratio: float = 0.5,
+) -> List[Word]:
+    """Shift words onto the post-cut timeline.
+
+    Words mostly covered by a cut (``>= drop_if_overlap_ratio``) are dropped;
+    partially cut words keep their longer uncut side. Each word locates its
+    overlapping cuts with two binary searches, and the time removed before any
+    instant comes from a prefix sum of cut lengths, so the cost is
+    O((words + cuts) log cuts).
+    """
+    if not cuts_ms:
+        return list(words)
+    cut_s, cut_e = _normalize_cuts(cuts_ms)
+    cols = WordColumns.from_words(words)
+    if len(cols) == 0:
+        return []
+
+    order = np.argsort(cols.start, kind="stable")
+    ws = _to_ms(cols.start[order])
+    we = _to_ms(cols.end[order])
+    valid = we > ws
+    order, ws, we = order[valid], ws[valid], we[valid]
+
+    removed = np.concatenate(([0], np.cumsum(cut_e - cut_s)))
+
+    def removed_before(t: np.ndarray) -> np.ndarray:
+        return removed[np.searchsorted(cut_e, t, side="right")]
+
+    first = np.searchsorted(cut_e, ws, side="right")  # first cut ending after the word starts
+    stop = np.searchsorted(cut_s, we, side="left")    # cuts starting before the word ends
+    overlapped = stop > first
+
+    seg_s = ws.copy()
+    seg_e = we.copy()
+    keep = np.ones(ws.size, dtype=bool)
+
+    if overlapped.any():
+        idx = np.flatnonzero(overlapped)
+        o_ws, o_we = ws[idx], we[idx]
+        ov_s = np.maximum(o_ws, cut_s[first[idx]])
+        ov_e = np.minimum(o_we, cut_e[stop[idx] - 1])
+        dropped = (ov_e - ov_s) >= drop_if_overlap_ratio * (o_we - o_ws)
+        left_len = np.maximum(0, ov_s - o_ws)
+        right_len = np.maximum(0, o_we - ov_e)
+        use_left = (left_len >= right_len) & (left_len > 0)
+        use_right = ~use_left & (right_len > 0)
+        seg_s[idx] = np.where(use_left, o_ws, ov_e)
+        seg_e[idx] = np.where(use_left, ov_s, o_we)
+        keep[idx] = ~dropped & (use_left | use_right)
+
+    ns = seg_s - removed_before(seg_s)
+    ne = seg_e - removed_before(seg_e)
+    keep &= ne > ns
+
+    order, ns, ne = order[keep], ns[keep], ne[keep]
+    final = np.lexsort((ne, ns))  # stable, like list.sort(key=(start, end))
+    tokens = cols.tokens(order[final])
+    return [
+        Word(word=tok, start=s / 1000.0, end=e / 1000.0)
+        for tok, s, e in zip(tokens, ns[final].tolist(), ne[final].tolist())
+    ]
+
+
 __all__ = [
+    "WordColumns",
     "parse_words",
     "merge_ranges",
     "build_filler_cuts",
@@ -0,0 +1,169 @@
+"""Dominant colors of podcast cover art.
+
+Site generation (``podcast_websites._derive_visual_identity``) and the AI theme
+generator both need the palette of the same cover, and regenerating a site
+repeats it. The cover is decoded at reduced size, its centre half is binned into
+a 15-bit (5 bits per channel) histogram with NumPy, and each of the most
+populated bins is represented by the mean color of its pixels. Results are
+cached under the SHA-256 of the image bytes in two tiers:
+
+- an in-process LRU (``COVER_PALETTE_CACHE_MAX_ENTRIES``, default 256), and
+- Redis (``cover:palette:*``), shared by the API and worker instances.
+
+``COVER_PALETTE_CACHE_TTL_S`` (default 30 days, ``0`` disables the cache) bounds
+the age of an entry.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from api.core.redis_client import redis_get, redis_setex
+
+try:  # pragma: no cover - optional dependency in local dev
+    from PIL import Image  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None  # type: ignore
+
+log = logging.getLogger("api.services.cover_palette")
+
+DEFAULT_TTL_S = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+THUMBNAIL_SIZE = (400, 400)
+MAX_COLORS = 64
+# Fewer centre pixels than this and the whole thumbnail is analysed instead.
+MIN_CENTER_PIXELS = 100
+
+# Bump when the stored fields or how they are computed change.
+_SCHEMA = 1
+_KEY = "cover:palette:v{schema}:{sha256}"
+_BITS = 5
+
+Color = Tuple[int, int, int]
+
+_LOCK = threading.Lock()
+_LOCAL: "OrderedDict[str, List[Tuple[Color, int]]]" = OrderedDict()
+
+
+def _ttl_s() -> int:
+    try:
+        return max(0, int(os.getenv("COVER_PALETTE_CACHE_TTL_S", str(DEFAULT_TTL_S))))
+    except ValueError:
+        return DEFAULT_TTL_S
+
+
+def _max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("COVER_PALETTE_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def clear_local_cache() -> None:
+    with _LOCK:
+        _LOCAL.clear()
+
+
+def _local_get(key: str) -> Optional[List[Tuple[Color, int]]]:
+    with _LOCK:
+        hit = _LOCAL.get(key)
+        if hit is not None:
+            _LOCAL.move_to_end(key)
+        return hit
+
+
+def _local_put(key: str, value: List[Tuple[Color, int]]) -> None:
+    with _LOCK:
+        _LOCAL[key] = value
+        _LOCAL.move_to_end(key)
+        while len(_LOCAL) > _max_entries():
+            _LOCAL.popitem(last=False)
+
+
+def _decode(image_bytes: bytes) -> Optional[np.ndarray]:
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEG decodes straight to a nearby power-of-two scale instead of full size.
+            img.draft("RGB", THUMBNAIL_SIZE)
+            img = img.convert("RGB")
+            img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+            return np.asarray(img, dtype=np.uint8)
+    except Exception as exc:  # pragma: no cover - pillow decoding failure
+        log.debug("Failed to decode cover image for palette extraction: %s", exc)
+        return None
+
+
+def compute_dominant_colors(pixels: np.ndarray, max_colors: int = MAX_COLORS) -> List[Tuple[Color, int]]:
+    """Most populated colors of an ``(h, w, 3)`` uint8 array as ``[((r, g, b), count), ...]``."""
+    height, width = pixels.shape[:2]
+    center = pixels[height // 4:height * 3 // 4, width // 4:width * 3 // 4]
+    sample = center if center.shape[0] * center.shape[1] > MIN_CENTER_PIXELS else pixels
+    flat = sample.reshape(-1, 3)
+    if flat.size == 0:
+        return []
+
+    shift = 8 - _BITS
+    q = (flat >> shift).astype(np.int32)
+    bins = (q[:, 0] << (2 * _BITS)) | (q[:, 1] << _BITS) | q[:, 2]
+    size = 1 << (3 * _BITS)
+    counts = np.bincount(bins, minlength=size)
+    sums = np.stack(
+        [np.bincount(bins, weights=flat[:, channel], minlength=size) for channel in range(3)],
+        axis=1,
+    )
+
+    occupied = np.flatnonzero(counts)
+    if occupied.size > max_colors:
+        occupied = occupied[np.argpartition(counts[occupied], -max_colors)[-max_colors:]]
+    # Most populated first; ties broken by bin index so results are deterministic.
+    order = occupied[np.lexsort((occupied, -counts[occupied]))]
+    means = np.rint(sums[order] / counts[order, None]).astype(int)
+    return [
+        ((int(r), int(g), int(b)), int(n))
+        for (r, g, b), n in zip(means.tolist(), counts[order].tolist())
+    ]
+
+
+def dominant_colors(image_bytes: bytes) -> List[Tuple[Color, int]]:
+    """Cached dominant colors of an encoded image, most populated first; ``[]`` if undecodable."""
+    if not image_bytes:
+        return []
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    key = _KEY.format(schema=_SCHEMA, sha256=digest)
+    ttl = _ttl_s()
+
+    if ttl > 0:
+        hit = _local_get(key)
+        if hit is not None:
+            return hit
+        raw = redis_get(key)
+        if raw:
+            try:
+                hit = [(tuple(color), int(n)) for color, n in json.loads(raw)]
+            except (TypeError, ValueError):
+                hit = None
+            if hit is not None:
+                _local_put(key, hit)  # type: ignore[arg-type]
+                return hit  # type: ignore[return-value]
+
+    pixels = _decode(image_bytes)
+    if pixels is None:
+        return []
+    colors = compute_dominant_colors(pixels)
+    if ttl > 0 and colors:
+        _local_put(key, colors)
+        redis_setex(key, ttl, json.dumps(colors))
+    return colors
+
+
+__all__ = ["clear_local_cache", "compute_dominant_colors", "dominant_colors"]
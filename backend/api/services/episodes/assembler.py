@@ -452,6 +452,8 @@ def _merge_transcript_metadata_from_upload(
         meta["transcripts"] = merged
         if not meta.get("transcript_stem") and stored.get("stem"):
             meta["transcript_stem"] = stored.get("stem")
+        if isinstance(stored.get("index"), dict) and "transcript_index" not in meta:
+            meta["transcript_index"] = stored["index"]
 
     return meta
 
@@ -0,0 +1,218 @@
+"""Pooled async proxy for authenticated episode playback.
+
+Players issue many small ``Range`` requests against ``/episodes/{id}/playback``.
+Each one used to open a new ``httpx.Client`` (a fresh TLS handshake to R2/GCS)
+and hold a worker thread while the bytes were relayed. Here:
+
+- one process-wide ``httpx.AsyncClient`` keeps connections alive across
+  requests (HTTP/2 when the ``h2`` package is installed), bounded by
+  ``EPISODE_AUDIO_PROXY_MAX_CONNECTIONS`` (default 200);
+- the upstream body is relayed from the event loop, so concurrent playback is
+  limited by connections rather than threads;
+- the resolved (signed) playback URL is memoized per episode for
+  ``EPISODE_PLAYBACK_URL_TTL_S`` (default 5 min, ``0`` disables), keyed by the
+  episode's storage fields so a re-published file is picked up at once;
+- clients that can fetch storage directly get a ``302`` to the signed URL
+  instead (``?redirect=1``, or ``EPISODE_PLAYBACK_MODE=redirect`` for all).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+log = logging.getLogger("api.services.episodes.playback_proxy")
+
+PASSTHROUGH_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-range",
+    "accept-ranges",
+    "content-encoding",
+    "etag",
+    "last-modified",
+    "cache-control",
+    "expires",
+)
+FORWARDED_HEADERS = ("range", "accept", "if-range", "if-none-match", "if-modified-since")
+
+DEFAULT_URL_TTL_S = 300
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE = 50
+PROXY_TIMEOUT_S = 60.0
+CONNECT_TIMEOUT_S = 10.0
+KEEPALIVE_EXPIRY_S = 60.0
+_MAX_URL_ENTRIES = 4096
+
+_lock = threading.Lock()
+_urls: "OrderedDict[Tuple[Any, ...], Tuple[str, float]]" = OrderedDict()
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  # type: ignore[import]
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared client for the running event loop (created on first use)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        max_connections = _env_int("EPISODE_AUDIO_PROXY_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS, 1)
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            http2=_http2_available(),
+            timeout=httpx.Timeout(PROXY_TIMEOUT_S, connect=CONNECT_TIMEOUT_S),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(max_connections, DEFAULT_MAX_KEEPALIVE),
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _url_cache_key(episode: Any) -> Tuple[Any, ...]:
+    return (
+        str(getattr(episode, "id", "")),
+        getattr(episode, "gcs_audio_path", None),
+        getattr(episode, "spreaker_episode_id", None),
+    )
+
+
+def playback_url(episode: Any, resolve: Callable[[Any], Optional[str]]) -> Optional[str]:
+    """``resolve(episode)``, memoized per episode for ``EPISODE_PLAYBACK_URL_TTL_S``."""
+    ttl = _env_int("EPISODE_PLAYBACK_URL_TTL_S", DEFAULT_URL_TTL_S, 0)
+    if ttl <= 0:
+        return resolve(episode)
+    key = _url_cache_key(episode)
+    now = time.monotonic()
+    with _lock:
+        hit = _urls.get(key)
+        if hit is not None and hit[1] > now:
+            _urls.move_to_end(key)
+            return hit[0]
+    url = resolve(episode)
+    if url:
+        with _lock:
+            _urls[key] = (url, now + ttl)
+            _urls.move_to_end(key)
+            while len(_urls) > _MAX_URL_ENTRIES:
+                _urls.popitem(last=False)
+    return url
+
+
+def wants_redirect(request: Request) -> bool:
+    flag = (request.query_params.get("redirect") or "").strip().lower()
+    if flag:
+        return flag in {"1", "true", "yes"}
+    return (os.getenv("EPISODE_PLAYBACK_MODE") or "").strip().lower() == "redirect"
+
+
+def redirect(url: str) -> Response:
+    # The target is a short-lived signed URL; never let caches keep the redirect.
+    return RedirectResponse(url, status_code=302, headers={"cache-control": "private, no-store"})
+
+
+async def proxy(url: str, request: Request, method: str) -> Response:
+    """Relay ``url`` to the caller, forwarding range and conditional headers."""
+    method = method.upper()
+    headers: Dict[str, str] = {}
+    for name in FORWARDED_HEADERS:
+        value = request.headers.get(name)
+        if value:
+            headers[name] = value
+
+    client = get_client()
+    try:
+        upstream = await client.send(client.build_request(method, url, headers=headers), stream=True)
+    except httpx.RequestError as exc:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch episode audio: {exc}") from exc
+
+    status_code = upstream.status_code
+    if status_code >= 400:
+        detail = f"Audio source returned {status_code}"
+        try:
+            body = await upstream.aread()
+            snippet = body[:160].decode("utf-8", errors="ignore")
+            if snippet:
+                detail = f"{detail}: {snippet}"
+        except Exception:
+            pass
+        finally:
+            await upstream.aclose()
+        raise HTTPException(status_code=502, detail=detail)
+
+    response_headers: Dict[str, str] = {}
+    for name in PASSTHROUGH_HEADERS:
+        value = upstream.headers.get(name)
+        if value:
+            response_headers[name] = value
+    response_headers.setdefault("accept-ranges", "bytes")
+    response_headers.setdefault("cache-control", "private, max-age=60")
+
+    if method == "HEAD":
+        await upstream.aclose()
+        return Response(status_code=status_code, headers=response_headers)
+
+    async def _relay():
+        # Raw bytes: content-length/content-encoding are passed through unchanged.
+        # The finally also runs when the player disconnects mid-stream.
+        try:
+            async for chunk in upstream.aiter_raw():
+                if chunk:
+                    yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        _relay(),
+        status_code=status_code,
+        headers=response_headers,
+        media_type=upstream.headers.get("content-type", "audio/mpeg"),
+    )
+
+
+def clear_url_cache() -> None:
+    with _lock:
+        _urls.clear()
+
+
+__all__ = [
+    "get_client",
+    "aclose_client",
+    "playback_url",
+    "wants_redirect",
+    "redirect",
+    "proxy",
+    "clear_url_cache",
+]
@@ -53,6 +53,7 @@ def delete_episode(session: Session, ep: Episode) -> None:
     """
     from api.models.podcast import MediaItem
     from api.models.usage import ProcessingMinutesLedger
+    from api.services.billing.usage import remove_from_summary
     
     episode_id = ep.id
     
@@ -69,6 +70,8 @@ def delete_episode(session: Session, ep: Episode) -> None:
         select(ProcessingMinutesLedger).where(ProcessingMinutesLedger.episode_id == episode_id)
     ).all()
     for record in ledger_records:
+        # Keep balance and monthly usage in step with the ledger.
+        remove_from_summary(session, record)
         session.delete(record)
     
     # Finally delete the episode itself
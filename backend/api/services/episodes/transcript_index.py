@@ -0,0 +1,196 @@
+"""Compact per-transcript feature index.
+
+Listing endpoints only need a handful of facts about a transcript (does it
+contain a flubber marker, how long is it), so those are computed once when the
+transcript is written and stored next to the transcript metadata:
+
+- ``MediaTranscript.transcript_meta_json["index"]`` for uploads, and
+- ``Episode.meta_json["transcript_index"]`` once an episode is assembled.
+
+Readers use :func:`index_for_episode`; for rows written before the index
+existed it derives the index from the transcript file once per file version
+(path, mtime, size) and memoizes it in-process.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from api.core.paths import TRANSCRIPTS_DIR
+
+log = logging.getLogger("api.services.episodes.transcript_index")
+
+INDEX_VERSION = 1
+EPISODE_META_KEY = "transcript_index"
+MEDIA_META_KEY = "index"
+
+DEFAULT_KEYWORDS: Tuple[str, ...] = ("flubber", "intern")
+DEFAULT_FILLERS: Tuple[str, ...] = ("um", "uh", "er", "ah")
+
+_FILE_MEMO_MAX = 2048
+_FILE_MEMO: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_FILE_MEMO_LOCK = threading.Lock()
+
+
+def _token(w: Any) -> str:
+    if isinstance(w, dict):
+        raw = w.get("word")
+        if raw is None:
+            raw = w.get("text")
+    else:
+        raw = getattr(w, "word", None)
+    return str(raw or "").strip().lower()
+
+
+def _end_s(w: Any) -> Optional[float]:
+    raw = w.get("end") if isinstance(w, dict) else getattr(w, "end", None)
+    try:
+        return float(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def build_transcript_index(
+    words: Iterable[Any],
+    *,
+    keywords: Iterable[str] = DEFAULT_KEYWORDS,
+    fillers: Iterable[str] = DEFAULT_FILLERS,
+    sfx_phrases: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Summarize a word list in one pass.
+
+    Keyword, filler and SFX trigger hits are exact matches on the stripped,
+    lowercased token, the same test the episode listing used for ``flubber``.
+    SFX trigger phrases are per-user, so callers that know them pass
+    ``sfx_phrases`` (single-token triggers are counted).
+    """
+    kw = {str(k).strip().lower(): 0 for k in keywords if str(k).strip()}
+    fl = {str(f).strip().lower(): 0 for f in fillers if str(f).strip()}
+    sfx = {str(s).strip().lower(): 0 for s in sfx_phrases if str(s).strip() and len(str(s).split()) == 1}
+    word_count = 0
+    duration_s = 0.0
+    for w in words or []:
+        tok = _token(w)
+        if tok:
+            word_count += 1
+            if tok in kw:
+                kw[tok] += 1
+            if tok in fl:
+                fl[tok] += 1
+            if tok in sfx:
+                sfx[tok] += 1
+        end = _end_s(w)
+        if end is not None and end > duration_s:
+            duration_s = end
+    index: Dict[str, Any] = {
+        "v": INDEX_VERSION,
+        "word_count": word_count,
+        "duration_s": round(duration_s, 3),
+        "keywords": kw,
+        "fillers": fl,
+        "filler_count": sum(fl.values()),
+    }
+    if sfx:
+        index["sfx"] = sfx
+    return index
+
+
+def has_keyword(index: Optional[Dict[str, Any]], keyword: str) -> bool:
+    if not index:
+        return False
+    return bool((index.get("keywords") or {}).get(keyword, 0))
+
+
+def _valid(index: Any) -> bool:
+    return isinstance(index, dict) and index.get("v") == INDEX_VERSION
+
+
+def index_transcript_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Index of the JSON word list at ``path``, memoized per file version."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    memo_key = (str(path), st.st_mtime_ns, st.st_size)
+    with _FILE_MEMO_LOCK:
+        hit = _FILE_MEMO.get(memo_key)
+        if hit is not None:
+            _FILE_MEMO.move_to_end(memo_key)
+            return hit
+    try:
+        words = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        log.debug("transcript_index: unreadable transcript %s", path, exc_info=True)
+        return None
+    if not isinstance(words, list):
+        return None
+    index = build_transcript_index(words)
+    with _FILE_MEMO_LOCK:
+        _FILE_MEMO[memo_key] = index
+        while len(_FILE_MEMO) > _FILE_MEMO_MAX:
+            _FILE_MEMO.popitem(last=False)
+    return index
+
+
+def stored_index_from_meta(meta: Any) -> Optional[Dict[str, Any]]:
+    """Index persisted on an episode's ``meta_json`` (dict or JSON string)."""
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta or "{}")
+        except Exception:
+            return None
+    if not isinstance(meta, dict):
+        return None
+    index = meta.get(EPISODE_META_KEY)
+    if _valid(index):
+        return index
+    transcripts = meta.get("transcripts")
+    if isinstance(transcripts, dict) and _valid(transcripts.get(MEDIA_META_KEY)):
+        return transcripts[MEDIA_META_KEY]
+    return None
+
+
+def index_for_episode(episode: Any) -> Optional[Dict[str, Any]]:
+    """Stored transcript index for ``episode``, or one derived from its file."""
+    index = stored_index_from_meta(getattr(episode, "meta_json", None))
+    if index is not None:
+        return index
+    from api.services.episodes.transcripts import _candidate_stems_from_episode
+
+    first = None
+    for stem in _candidate_stems_from_episode(episode):
+        index = index_transcript_file(TRANSCRIPTS_DIR / f"{stem}.json")
+        if index is None:
+            continue
+        if has_keyword(index, "flubber"):
+            return index
+        first = first or index
+    return first
+
+
+def set_episode_index(meta: Dict[str, Any], words: List[Any]) -> Dict[str, Any]:
+    """Store the index of ``words`` on an episode ``meta`` dict and return it."""
+    index = build_transcript_index(words)
+    meta[EPISODE_META_KEY] = index
+    return index
+
+
+def clear_file_memo() -> None:
+    with _FILE_MEMO_LOCK:
+        _FILE_MEMO.clear()
+
+
+__all__ = [
+    "INDEX_VERSION",
+    "build_transcript_index",
+    "has_keyword",
+    "index_for_episode",
+    "index_transcript_file",
+    "set_episode_index",
+    "stored_index_from_meta",
+    "clear_file_memo",
+]
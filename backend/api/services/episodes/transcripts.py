@@ -120,6 +120,12 @@ def transcript_endpoints_for_episode(
     except Exception:
         transcripts_meta = {}
 
+    if not available:
+        # A stored feature index means a transcript was written; skip the disk probe.
+        from api.services.episodes.transcript_index import stored_index_from_meta
+
+        available = stored_index_from_meta(getattr(episode, "meta_json", None)) is not None
+
     if not available:
         for stem in _candidate_stems_from_episode(episode):
             if _has_local_transcript_for_stem(stem):
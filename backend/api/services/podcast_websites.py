@@ -18,18 +18,13 @@ from api.core.config import settings
 from api.models.podcast import Episode, Podcast
 from api.models.user import User
 from api.models.website import PodcastWebsite, PodcastWebsiteStatus
+from api.services import cover_palette
 from api.services.ai_content import client_router as ai_client
 
 try:  # pragma: no cover - optional dependency in local dev
     from google.cloud import storage  # type: ignore
 except Exception:  # pragma: no cover
     storage = None  # type: ignore
-
-try:  # pragma: no cover - optional dependency in local dev
-    from PIL import Image  # type: ignore
-except Exception:  # pragma: no cover
-    Image = None  # type: ignore
-import io
 import colorsys
 
 log = logging.getLogger(__name__)
@@ -378,35 +373,8 @@ def _rgb_to_hex(color: Tuple[int, int, int]) -> str:
 
 def _extract_theme_colors(image_bytes: bytes) -> Dict[str, str]:
     """Extract comprehensive color palette with accessibility and harmony."""
-    if Image is None:
-        return {}
-    try:
-        with Image.open(io.BytesIO(image_bytes)) as img:
-            img = img.convert("RGB")
-            # Use larger thumbnail for better color extraction (was 160x160, now 400x400)
-            img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-            pixels = list(img.getdata())
-    except Exception as exc:  # pragma: no cover - pillow decoding failure
-        log.debug("Failed to decode cover image for palette extraction: %s", exc)
-        return {}
-
-    if not pixels:
-        return {}
-
-    # Use k-means-like clustering to find dominant colors
-    # Sample pixels more intelligently - avoid edges and focus on center
-    width, height = img.size
-    sampled_pixels = []
-    for y in range(height // 4, height * 3 // 4):  # Focus on center 50% vertically
-        for x in range(width // 4, width * 3 // 4):  # Focus on center 50% horizontally
-            if y * width + x < len(pixels):
-                sampled_pixels.append(pixels[y * width + x])
-    
-    # Use sampled pixels if we have enough, otherwise use all
-    analysis_pixels = sampled_pixels if len(sampled_pixels) > 100 else pixels
-    
-    counts: Counter[Tuple[int, int, int]] = Counter(analysis_pixels)
-    most_common = [color for color, _ in counts.most_common(64)]  # Get more candidates
+    # Dominant colors of the cover's centre, cached per image (see cover_palette)
+    most_common = [color for color, _ in cover_palette.dominant_colors(image_bytes)]
     if not most_common:
         return {}
 
@@ -0,0 +1,622 @@
+"""Background RSS back-catalog import: mirror enclosures into object storage.
+
+``POST /import/rss`` creates the podcast and its episodes straight away (they
+play from the feed's enclosure URLs) and, when audio should be mirrored,
+records a :class:`PodcastImportJob` with one :class:`PodcastImportItem` per
+enclosure and hands it to :func:`enqueue_import_job`.
+
+:func:`run_import_job` does the mirroring:
+
+- one pooled ``httpx.AsyncClient`` per run, ``RSS_IMPORT_CONCURRENCY``
+  downloads in flight (a semaphore bounds them);
+- each enclosure is streamed chunk by chunk into the storage backend's
+  multipart/resumable upload (``infrastructure.storage.upload_fileobj``) running
+  in a worker thread, through a small bounded pipe, so nothing is buffered in
+  memory or on disk beyond a few chunks per download;
+- per-item progress is committed as each enclosure finishes, so the job status
+  (``GET /api/episodes/status/{job_id}``) shows live counts.
+
+Resumability: a run claims the job with a lease (``lease_until``) that a
+heartbeat renews. A run stops taking new items after ``RSS_IMPORT_RUN_BUDGET_S``
+(under the 30 minute Cloud Tasks deadline) and re-enqueues itself. If the
+instance dies, the lease lapses and either the Cloud Tasks retry or the
+``/api/tasks/maintenance/resume-rss-imports`` sweep picks the job up again;
+finished items are never fetched twice. Object keys are derived from the episode
+id, so an item interrupted mid-upload is simply overwritten on the next run.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import httpx
+from sqlalchemy import func, or_, update
+from sqlmodel import Session, select
+
+from api.core.database import session_scope
+from api.models.podcast import Episode, PodcastImportItem, PodcastImportJob
+
+log = logging.getLogger("api.services.podcasts.rss_import")
+
+TASK_PATH = "/api/tasks/rss-import"
+MB = 1024 * 1024
+CHUNK_BYTES = 1 * MB
+# Chunks buffered between a download and its upload thread.
+PIPE_DEPTH = 4
+
+OPEN_STATUSES = ("queued", "running")
+
+# storage upload: (key, readable file object, content type) -> storage URI
+Uploader = Callable[[str, io.RawIOBase, str], str]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _concurrency() -> int:
+    return max(1, _env_int("RSS_IMPORT_CONCURRENCY", 6))
+
+
+def _max_bytes() -> int:
+    return _env_int("RSS_IMPORT_MAX_BYTES", 1536 * MB)
+
+
+def _lease_s() -> int:
+    return max(30, _env_int("RSS_IMPORT_LEASE_S", 300))
+
+
+def _max_attempts() -> int:
+    return max(1, _env_int("RSS_IMPORT_MAX_ATTEMPTS", 3))
+
+
+def _run_budget_s() -> int:
+    return _env_int("RSS_IMPORT_RUN_BUDGET_S", 1500)
+
+
+def infer_extension(url: str, content_type: Optional[str]) -> str:
+    """File extension for an enclosure from its URL, else its content type."""
+    ext = os.path.splitext(url.split("?")[0])[1].lower()
+    if ext and len(ext) <= 5:
+        return ext
+    ct = (content_type or "").lower()
+    if "mpeg" in ct or ct == "audio/mp3":
+        return ".mp3"
+    if "x-m4a" in ct or "mp4" in ct:
+        return ".m4a"
+    if "aac" in ct:
+        return ".aac"
+    if "wav" in ct:
+        return ".wav"
+    if "ogg" in ct:
+        return ".ogg"
+    if "webm" in ct:
+        return ".webm"
+    return ".mp3"
+
+
+# ---------------------------------------------------------------------------
+# Job records
+# ---------------------------------------------------------------------------
+
+def create_import_job(
+    session: Session,
+    *,
+    podcast_id: UUID,
+    user_id: UUID,
+    episodes: Sequence[Episode],
+) -> Optional[PodcastImportJob]:
+    """Record a mirroring job for ``episodes`` (those with a source URL); commits."""
+    items = [ep for ep in episodes if getattr(ep, "source_media_url", None)]
+    if not items:
+        return None
+    job = PodcastImportJob(podcast_id=podcast_id, user_id=user_id, total=len(items))
+    session.add(job)
+    session.add_all(
+        PodcastImportItem(job_id=job.id, episode_id=ep.id, source_url=str(ep.source_media_url))
+        for ep in items
+    )
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def enqueue_import_job(job_id: UUID) -> str:
+    """Start (or continue) a job: a Cloud Task in production, a thread locally."""
+    from infrastructure.tasks_client import enqueue_http_task, should_use_cloud_tasks
+
+    if should_use_cloud_tasks():
+        created = enqueue_http_task(TASK_PATH, {"job_id": str(job_id)})
+        return str(created.get("name") or "")
+
+    def _runner() -> None:
+        try:
+            result = asyncio.run(run_import_job(job_id))
+            if result.get("requeue"):
+                enqueue_import_job(job_id)
+        except Exception:
+            log.exception("event=rss_import.local_run_failed job_id=%s", job_id)
+
+    threading.Thread(target=_runner, name=f"rss-import-{job_id}", daemon=True).start()
+    return f"local-rss-import-{job_id}"
+
+
+_STATUS_FOR_JOBS_API = {
+    "queued": "queued",
+    "running": "processing",
+    "completed": "processed",
+    "failed": "error",
+}
+
+
+def import_job_status(session: Session, job_id: str) -> Optional[Dict[str, Any]]:
+    """Progress of an import job in the jobs-endpoint shape, or None if unknown."""
+    try:
+        uid = UUID(str(job_id))
+    except ValueError:
+        return None
+    job = session.get(PodcastImportJob, uid)
+    if job is None:
+        return None
+    pending = max(0, job.total - job.completed - job.failed)
+    out: Dict[str, Any] = {
+        "job_id": str(job.id),
+        "kind": "rss_import",
+        "status": _STATUS_FOR_JOBS_API.get(job.status, job.status),
+        "import": {
+            "podcast_id": str(job.podcast_id),
+            "state": job.status,
+            "total": job.total,
+            "completed": job.completed,
+            "failed": job.failed,
+            "pending": pending,
+            "bytes_mirrored": job.bytes_mirrored,
+            "progress": round((job.completed + job.failed) / job.total, 3) if job.total else 1.0,
+            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        },
+    }
+    if job.error:
+        out["error"] = job.error
+    return out
+
+
+def resume_stale_import_jobs(session: Session, limit: int = 50) -> List[str]:
+    """Re-enqueue open jobs whose lease lapsed (or that were never started)."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=_lease_s())
+    jobs = session.exec(
+        select(PodcastImportJob)
+        .where(
+            PodcastImportJob.status.in_(OPEN_STATUSES),  # type: ignore[attr-defined]
+            or_(PodcastImportJob.lease_until.is_(None), PodcastImportJob.lease_until < now),  # type: ignore[union-attr]
+            PodcastImportJob.updated_at < stale_before,
+        )
+        .order_by(PodcastImportJob.updated_at)
+        .limit(limit)
+    ).all()
+    resumed: List[str] = []
+    for job in jobs:
+        try:
+            enqueue_import_job(job.id)
+            resumed.append(str(job.id))
+        except Exception as exc:
+            log.warning("event=rss_import.resume_failed job_id=%s err=%s", job.id, exc)
+    return resumed
+
+
+def _claim(session: Session, job_id: UUID) -> bool:
+    now = datetime.utcnow()
+    result = session.execute(
+        update(PodcastImportJob)
+        .where(
+            PodcastImportJob.id == job_id,
+            PodcastImportJob.status.in_(OPEN_STATUSES),  # type: ignore[attr-defined]
+            or_(PodcastImportJob.lease_until.is_(None), PodcastImportJob.lease_until < now),  # type: ignore[union-attr]
+        )
+        .values(status="running", lease_until=now + timedelta(seconds=_lease_s()), updated_at=now)
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def _renew(session_factory, job_id: UUID) -> None:
+    now = datetime.utcnow()
+    with session_factory() as session:
+        session.execute(
+            update(PodcastImportJob)
+            .where(PodcastImportJob.id == job_id, PodcastImportJob.status == "running")
+            .values(lease_until=now + timedelta(seconds=_lease_s()), updated_at=now)
+        )
+        session.commit()
+
+
+@dataclass
+class _Work:
+    item_id: int
+    episode_id: UUID
+    source_url: str
+    attempts: int
+
+
+@dataclass
+class _Mirrored:
+    uri: str
+    size: int
+    content_type: Optional[str]
+
+
+def _record_done(session_factory, job_id: UUID, work: _Work, result: _Mirrored) -> None:
+    now = datetime.utcnow()
+    with session_factory() as session:
+        item = session.get(PodcastImportItem, work.item_id)
+        if item is None or item.status == "done":
+            return
+        item.status = "done"
+        item.attempts = work.attempts + 1
+        item.bytes = result.size
+        item.storage_uri = result.uri
+        item.content_type = result.content_type
+        item.error = None
+        item.updated_at = now
+        session.add(item)
+
+        episode = session.get(Episode, work.episode_id)
+        if episode is not None:
+            try:
+                meta = json.loads(episode.meta_json or "{}")
+                if not isinstance(meta, dict):
+                    meta = {}
+            except Exception:
+                meta = {}
+            meta.update({
+                "source_enclosure_url": work.source_url,
+                "mirrored_gcs_uri": result.uri,
+                "mirrored_content_type": result.content_type,
+            })
+            episode.meta_json = json.dumps(meta)
+            if not getattr(episode, "gcs_audio_path", None):
+                episode.gcs_audio_path = result.uri
+            session.add(episode)
+
+        session.execute(
+            update(PodcastImportJob)
+            .where(PodcastImportJob.id == job_id)
+            .values(
+                completed=PodcastImportJob.completed + 1,
+                bytes_mirrored=PodcastImportJob.bytes_mirrored + result.size,
+                updated_at=now,
+            )
+        )
+        session.commit()
+
+
+def _record_failure(session_factory, job_id: UUID, work: _Work, error: str, final: bool) -> None:
+    now = datetime.utcnow()
+    with session_factory() as session:
+        item = session.get(PodcastImportItem, work.item_id)
+        if item is None or item.status != "pending":
+            return
+        item.attempts = work.attempts + 1
+        item.error = error[:500]
+        item.updated_at = now
+        if final:
+            item.status = "failed"
+            session.execute(
+                update(PodcastImportJob)
+                .where(PodcastImportJob.id == job_id)
+                .values(failed=PodcastImportJob.failed + 1, updated_at=now)
+            )
+        session.add(item)
+        session.commit()
+
+
+def _finish(session_factory, job_id: UUID) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    with session_factory() as session:
+        counts = dict(
+            session.exec(
+                select(PodcastImportItem.status, func.count())
+                .where(PodcastImportItem.job_id == job_id)
+                .group_by(PodcastImportItem.status)
+            ).all()
+        )
+        mirrored = session.exec(
+            select(func.coalesce(func.sum(PodcastImportItem.bytes), 0))
+            .where(PodcastImportItem.job_id == job_id, PodcastImportItem.status == "done")
+        ).one()
+        job = session.get(PodcastImportJob, job_id)
+        done, failed, pending = counts.get("done", 0), counts.get("failed", 0), counts.get("pending", 0)
+        job.completed, job.failed, job.bytes_mirrored = done, failed, int(mirrored or 0)
+        job.lease_until = None
+        job.updated_at = now
+        if pending:
+            job.status = "queued"
+        else:
+            job.status = "failed" if failed and not done else "completed"
+            job.finished_at = now
+            job.error = f"{failed} enclosure(s) could not be mirrored" if failed else None
+        session.add(job)
+        session.commit()
+        return {
+            "job_id": str(job_id),
+            "claimed": True,
+            "status": job.status,
+            "completed": done,
+            "failed": failed,
+            "pending": pending,
+            "bytes_mirrored": job.bytes_mirrored,
+            "requeue": bool(pending),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+class _PermanentError(Exception):
+    """Retrying will not help (missing enclosure, over the size limit)."""
+
+
+class _PipeClosed(Exception):
+    """The upload side went away before the download finished."""
+
+
+class _UploadPipe(io.RawIOBase):
+    """Blocking, non-seekable reader for the upload thread, fed from the event loop.
+
+    At most ``depth`` chunks are queued; :meth:`feed` waits (without blocking
+    the loop) until the uploader catches up. Reads block until the requested
+    size is available (or the download ends), and being non-seekable makes
+    S3/R2 clients fall back to streaming multipart uploads.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, depth: int = PIPE_DEPTH) -> None:
+        super().__init__()
+        self._loop = loop
+        self._depth = depth
+        self._chunks: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._space = asyncio.Event()
+        self._current = memoryview(b"")
+        self._eof = False
+        self._error: Optional[BaseException] = None
+        self._abandoned = False
+        self._pos = 0
+
+    # -- event loop side --
+    async def feed(self, chunk: bytes) -> None:
+        while True:
+            with self._cond:
+                if self._abandoned:
+                    raise _PipeClosed("upload stopped reading")
+                if len(self._chunks) < self._depth:
+                    self._chunks.append(chunk)
+                    self._cond.notify()
+                    return
+                self._space.clear()
+            await self._space.wait()
+
+    def finish(self) -> None:
+        with self._cond:
+            self._eof = True
+            self._cond.notify()
+
+    def fail(self, exc: BaseException) -> None:
+        with self._cond:
+            self._error = exc
+            self._cond.notify()
+
+    # -- upload thread side --
+    def abandon(self) -> None:
+        with self._cond:
+            self._abandoned = True
+        self._loop.call_soon_threadsafe(self._space.set)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # Uploaders rewind before starting; that is the only seek we can honour.
+        if (offset, whence) in ((0, io.SEEK_SET), (0, io.SEEK_CUR)) and (whence == io.SEEK_CUR or self._pos == 0):
+            return self._pos
+        raise io.UnsupportedOperation("streaming upload pipe is not seekable")
+
+    def readinto(self, buffer) -> int:
+        # Fill the whole buffer unless the download ended: both the GCS
+        # resumable uploader and s3transfer treat a short read as end-of-stream.
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            if not self._current:
+                with self._cond:
+                    while not self._chunks and not self._eof and self._error is None:
+                        self._cond.wait()
+                    if self._error is not None:
+                        raise IOError(f"download failed: {self._error}")
+                    if not self._chunks:
+                        break
+                    self._current = memoryview(self._chunks.popleft())
+                self._loop.call_soon_threadsafe(self._space.set)
+            n = min(len(view) - filled, len(self._current))
+            view[filled:filled + n] = self._current[:n]
+            self._current = self._current[n:]
+            filled += n
+        self._pos += filled
+        return filled
+
+
+def _default_upload(key: str, fileobj: io.RawIOBase, content_type: str) -> str:
+    from infrastructure import storage
+
+    bucket = os.getenv("MEDIA_BUCKET") or ""
+    uri = storage.upload_fileobj(bucket, key, fileobj, content_type=content_type)
+    if not uri:
+        raise RuntimeError(f"upload returned no URI for {key}")
+    return uri
+
+
+def _upload_in_thread(upload: Uploader, key: str, pipe: _UploadPipe, content_type: str) -> str:
+    try:
+        return upload(key, pipe, content_type)
+    finally:
+        pipe.abandon()
+
+
+async def _mirror(
+    client: httpx.AsyncClient,
+    pool: ThreadPoolExecutor,
+    upload: Uploader,
+    user_id: UUID,
+    work: _Work,
+    max_bytes: int,
+) -> _Mirrored:
+    loop = asyncio.get_running_loop()
+    async with client.stream("GET", work.source_url) as resp:
+        if resp.status_code >= 400:
+            message = f"enclosure returned HTTP {resp.status_code}"
+            if 400 <= resp.status_code < 500 and resp.status_code not in (408, 429):
+                raise _PermanentError(message)
+            raise RuntimeError(message)
+        content_type = resp.headers.get("content-type")
+        try:
+            declared = int(resp.headers.get("content-length") or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_bytes:
+            raise _PermanentError(f"enclosure is {declared} bytes (limit {max_bytes})")
+
+        key = f"{user_id}/imported/{work.episode_id.hex}{infer_extension(work.source_url, content_type)}"
+        pipe = _UploadPipe(loop)
+        uploading = loop.run_in_executor(
+            pool, _upload_in_thread, upload, key, pipe, content_type or "audio/mpeg"
+        )
+        size = 0
+        try:
+            async for chunk in resp.aiter_bytes(CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _PermanentError(f"enclosure exceeds {max_bytes} bytes")
+                await pipe.feed(chunk)
+            pipe.finish()
+        except BaseException as exc:
+            pipe.fail(exc)
+            try:
+                await uploading
+            except Exception as upload_exc:
+                if isinstance(exc, _PipeClosed):
+                    raise upload_exc from None
+            raise
+        uri = await uploading
+    return _Mirrored(uri=uri, size=size, content_type=content_type)
+
+
+async def run_import_job(
+    job_id: UUID | str,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    upload: Optional[Uploader] = None,
+    session_factory=session_scope,
+) -> Dict[str, Any]:
+    """Mirror the job's pending enclosures; see the module docstring.
+
+    Returns a summary; ``claimed`` is False when another worker holds the job
+    (or it is already finished), and ``requeue`` is True when items remain.
+    """
+    job_id = UUID(str(job_id))
+    with session_factory() as session:
+        if not _claim(session, job_id):
+            job = session.get(PodcastImportJob, job_id)
+            return {"job_id": str(job_id), "claimed": False, "status": job.status if job else "missing"}
+        job = session.get(PodcastImportJob, job_id)
+        user_id = job.user_id
+        work = [
+            _Work(item.id, item.episode_id, item.source_url, item.attempts)
+            for item in session.exec(
+                select(PodcastImportItem)
+                .where(PodcastImportItem.job_id == job_id, PodcastImportItem.status == "pending")
+                .order_by(PodcastImportItem.id)
+            ).all()
+        ]
+
+    concurrency = _concurrency()
+    max_bytes = _max_bytes()
+    max_attempts = _max_attempts()
+    deadline = time.monotonic() + _run_budget_s()
+    upload = upload or _default_upload
+    own_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(30.0, read=120.0),
+            follow_redirects=True,
+        )
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rss-import-upload")
+    limiter = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    log.info("event=rss_import.start job_id=%s pending=%d concurrency=%d", job_id, len(work), concurrency)
+
+    async def heartbeat() -> None:
+        interval = _lease_s() / 3.0
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                try:
+                    await asyncio.to_thread(_renew, session_factory, job_id)
+                except Exception as exc:
+                    log.warning("event=rss_import.lease_renew_failed job_id=%s err=%s", job_id, exc)
+
+    async def one(item: _Work) -> None:
+        async with limiter:
+            if time.monotonic() > deadline:
+                return  # left pending for the next run
+            try:
+                result = await _mirror(client, pool, upload, user_id, item, max_bytes)
+            except Exception as exc:
+                final = isinstance(exc, _PermanentError) or item.attempts + 1 >= max_attempts
+                log.warning(
+                    "event=rss_import.item_failed job_id=%s episode_id=%s final=%s err=%s",
+                    job_id, item.episode_id, final, exc,
+                )
+                record, args = _record_failure, (str(exc) or type(exc).__name__, final)
+            else:
+                record, args = _record_done, (result,)
+            try:
+                await asyncio.to_thread(record, session_factory, job_id, item, *args)
+            except Exception:
+                # The item stays pending and is redone by the next run.
+                log.exception("event=rss_import.record_failed job_id=%s episode_id=%s", job_id, item.episode_id)
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await asyncio.gather(*(one(item) for item in work))
+    finally:
+        stop.set()
+        await beat
+        if own_client:
+            await client.aclose()
+        pool.shutdown(wait=False)
+
+    summary = await asyncio.to_thread(_finish, session_factory, job_id)
+    log.info("event=rss_import.finish %s", summary)
+    return summary
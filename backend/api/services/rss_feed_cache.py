@@ -0,0 +1,264 @@
+"""Rendered RSS feed cache.
+
+Podcatchers poll feeds constantly while the rows behind them change rarely, so
+the rendered XML is cached per podcast in two tiers:
+
+- an in-process LRU (``RSS_FEED_CACHE_MAX_ENTRIES``, default 256), and
+- Redis (``rss:feed:body:*``), shared by every API instance.
+
+Each entry is tagged with the podcast's feed version. ``invalidate_feed()``
+bumps that version (Redis INCR, plus a local counter when Redis is not
+configured); ``api.db_listeners`` calls it after any commit that touches an
+episode, podcast or website row, so stale entries simply stop matching.
+``RSS_FEED_CACHE_TTL_S`` (default 6h, ``0`` disables the cache) bounds the age
+of any entry; signed R2 URLs inside a feed are valid for 14 days.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from api.core.redis_client import get_redis_client, redis_get, redis_incr, redis_setex
+
+log = logging.getLogger("api.services.rss_feed_cache")
+
+DEFAULT_TTL_S = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+
+_VERSION_KEY = "rss:feed:ver:{podcast_id}"
+_BODY_KEY = "rss:feed:body:{podcast_id}:{version}:{url_hash}"
+
+
+@dataclass(frozen=True)
+class CachedFeed:
+    xml: str
+    etag: str
+    last_modified: datetime
+    built_at: float
+
+    @property
+    def last_modified_header(self) -> str:
+        return format_datetime(self.last_modified, usegmt=True)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "xml": self.xml,
+                "etag": self.etag,
+                "last_modified": self.last_modified.timestamp(),
+                "built_at": self.built_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedFeed":
+        data = json.loads(raw)
+        return cls(
+            xml=data["xml"],
+            etag=data["etag"],
+            last_modified=datetime.fromtimestamp(float(data["last_modified"]), tz=timezone.utc),
+            built_at=float(data["built_at"]),
+        )
+
+    @classmethod
+    def build(cls, xml: str) -> "CachedFeed":
+        now = time.time()
+        digest = hashlib.sha256(xml.encode("utf-8")).hexdigest()[:32]
+        # HTTP dates have second resolution; truncate so If-Modified-Since round-trips.
+        last_modified = datetime.fromtimestamp(int(now), tz=timezone.utc)
+        return cls(xml=xml, etag=f'"{digest}"', last_modified=last_modified, built_at=now)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        log.warning("event=rss_cache.bad_env name=%s value=%s", name, raw)
+        return default
+
+
+def ttl_seconds() -> int:
+    return max(0, _env_int("RSS_FEED_CACHE_TTL_S", DEFAULT_TTL_S))
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple[str, str], Tuple[str, CachedFeed]]" = OrderedDict()
+_local_versions: Dict[str, int] = {}
+_build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def _url_hash(feed_url: str) -> str:
+    # Feeds read no query parameters, so ``?x=N`` must not mint new entries.
+    parts = urlsplit(feed_url)
+    canonical = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def current_version(podcast_id) -> str:
+    """Version tag that cached entries for ``podcast_id`` must match."""
+    pid = str(podcast_id)
+    if get_redis_client() is not None:
+        return "r" + (redis_get(_VERSION_KEY.format(podcast_id=pid)) or "0")
+    with _lock:
+        return "l" + str(_local_versions.get(pid, 0))
+
+
+def invalidate_feed(podcast_id) -> None:
+    """Make every cached rendering of this podcast's feed stale."""
+    if podcast_id is None:
+        return
+    pid = str(podcast_id)
+    with _lock:
+        _local_versions[pid] = _local_versions.get(pid, 0) + 1
+        for key in [k for k in _entries if k[0] == pid]:
+            _entries.pop(key, None)
+    if get_redis_client() is not None:
+        redis_incr(_VERSION_KEY.format(podcast_id=pid))
+    log.debug("event=rss_cache.invalidate podcast_id=%s", pid)
+
+
+def clear_local_cache() -> None:
+    with _lock:
+        _entries.clear()
+        _local_versions.clear()
+        _build_locks.clear()
+
+
+def _local_get(key: Tuple[str, str], version: str, ttl: int) -> Optional[CachedFeed]:
+    with _lock:
+        hit = _entries.get(key)
+        if hit is None:
+            return None
+        entry_version, entry = hit
+        if entry_version != version or time.time() - entry.built_at > ttl:
+            _entries.pop(key, None)
+            return None
+        _entries.move_to_end(key)
+        return entry
+
+
+def _local_put(key: Tuple[str, str], version: str, entry: CachedFeed) -> None:
+    max_entries = max(1, _env_int("RSS_FEED_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    with _lock:
+        _entries[key] = (version, entry)
+        _entries.move_to_end(key)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+
+
+def _redis_get(podcast_id: str, version: str, url_hash: str, ttl: int) -> Optional[CachedFeed]:
+    raw = redis_get(_BODY_KEY.format(podcast_id=podcast_id, version=version, url_hash=url_hash))
+    if not raw:
+        return None
+    try:
+        entry = CachedFeed.from_json(raw)
+    except Exception as exc:
+        log.warning("event=rss_cache.bad_entry podcast_id=%s err=%s", podcast_id, exc)
+        return None
+    if time.time() - entry.built_at > ttl:
+        return None
+    return entry
+
+
+def get_or_build_feed(podcast_id, feed_url: str, build: Callable[[], str]) -> CachedFeed:
+    """Return the cached rendering of a feed, calling ``build()`` on a miss.
+
+    Entries are keyed on the podcast and ``feed_url`` without its query string;
+    ``build()`` must not depend on the query either.
+
+    The version is read before building, so a rendering that races with an
+    invalidation is stored under the old version and never served.
+    """
+    ttl = ttl_seconds()
+    if ttl <= 0:
+        return CachedFeed.build(build())
+
+    pid = str(podcast_id)
+    url_hash = _url_hash(feed_url)
+    key = (pid, url_hash)
+
+    version = current_version(pid)
+    entry = _local_get(key, version, ttl)
+    if entry is not None:
+        return entry
+
+    with _lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # Only one thread per process renders a given feed; the rest wait and reuse it.
+    with build_lock:
+        entry = _local_get(key, version, ttl)
+        if entry is not None:
+            return entry
+
+        entry = _redis_get(pid, version, url_hash, ttl)
+        if entry is None:
+            started = time.perf_counter()
+            entry = CachedFeed.build(build())
+            log.info(
+                "event=rss_cache.render podcast_id=%s version=%s bytes=%d ms=%.1f",
+                pid,
+                version,
+                len(entry.xml),
+                (time.perf_counter() - started) * 1000.0,
+            )
+            if version.startswith("r"):
+                redis_setex(
+                    _BODY_KEY.format(podcast_id=pid, version=version, url_hash=url_hash),
+                    ttl,
+                    entry.to_json(),
+                )
+        _local_put(key, version, entry)
+
+    with _lock:
+        if _build_locks.get(key) is build_lock:
+            _build_locks.pop(key, None)
+    return entry
+
+
+def is_not_modified(
+    entry: CachedFeed,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """Evaluate conditional request headers (RFC 9110 §13.1) against ``entry``."""
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",") if tag.strip()]
+        if "*" in candidates:
+            return True
+        return any(tag.removeprefix("W/") == entry.etag for tag in candidates)
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None:
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return entry.last_modified <= since
+    return False
+
+
+__all__ = [
+    "CachedFeed",
+    "clear_local_cache",
+    "current_version",
+    "get_or_build_feed",
+    "invalidate_feed",
+    "is_not_modified",
+    "ttl_seconds",
+]
@@ -0,0 +1,314 @@
+"""Cached Stripe revenue snapshot for the admin dashboard.
+
+MRR/ARR and revenue figures come from paging through every active Stripe
+subscription and every charge in the window, which is far too slow to do on
+each dashboard request. They are computed in the background into a snapshot
+stored in two tiers:
+
+- in-process (one entry), and
+- Redis (``admin:stripe_metrics:v1``), shared by every API instance.
+
+Readers call :func:`get_snapshot`, which never talks to Stripe: it returns the
+latest snapshot (or None before the first refresh) and, when that snapshot is
+older than ``ADMIN_STRIPE_METRICS_TTL_S`` (default 15 min), enqueues a Cloud
+Task for ``/api/tasks/maintenance/refresh-stripe-metrics`` (a thread in local
+dev). That endpoint is also run by Cloud Scheduler, so the refresh always runs
+inside a request of its own rather than on a thread that request-based CPU
+would throttle. A Redis ``SET NX`` lease, released when the refresh ends,
+keeps instances from refreshing concurrently. Each snapshot carries
+``computed_at`` so the dashboard can show its age.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from api.core.redis_client import get_redis_client, redis_get, redis_setex
+
+try:  # pragma: no cover - optional Stripe dependency
+    import stripe as stripe_lib
+except Exception:  # pragma: no cover
+    stripe_lib = None
+
+log = logging.getLogger("api.services.stripe_metrics")
+
+DEFAULT_TTL_S = 15 * 60
+# Snapshots outlive their freshness window so a slow refresh still serves data.
+_RETAIN_S = 7 * 24 * 60 * 60
+_LEASE_S = 5 * 60
+
+_KEY = "admin:stripe_metrics:v1"
+_LEASE_KEY = "admin:stripe_metrics:refreshing"
+_REQUESTED_KEY = "admin:stripe_metrics:requested"
+REFRESH_TASK_PATH = "/api/tasks/maintenance/refresh-stripe-metrics"
+
+# Compare-and-delete so a refresh never drops a lease another instance took
+# after ours expired.
+_RELEASE_LUA = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_local: Optional[Dict[str, Any]] = None
+_local_requested_at = 0.0
+
+
+def ttl_seconds() -> int:
+    try:
+        return max(1, int(os.getenv("ADMIN_STRIPE_METRICS_TTL_S", str(DEFAULT_TTL_S))))
+    except ValueError:
+        return DEFAULT_TTL_S
+
+
+def _stripe():
+    if not stripe_lib or not (os.getenv("STRIPE_SECRET_KEY") or getattr(stripe_lib, "api_key", None)):
+        return None
+    if not getattr(stripe_lib, "api_key", None):
+        stripe_lib.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+    return stripe_lib
+
+
+def _monthly_recurring_cents(stripe) -> Optional[int]:
+    monthly_total = 0.0
+    try:
+        subs = stripe.Subscription.list(status="active", limit=100, expand=["data.items.data.price"])  # type: ignore
+        for subscription in subs.auto_paging_iter():  # type: ignore[attr-defined]
+            items = getattr(subscription, "items", {}).get("data", []) if hasattr(subscription, "items") else []
+            for item in items:
+                price = getattr(item, "price", None)
+                quantity = int(getattr(item, "quantity", 1) or 1)
+                unit = None
+                interval = None
+                if price:
+                    unit = getattr(price, "unit_amount", None)
+                    recurring = getattr(price, "recurring", None)
+                    if recurring:
+                        interval = getattr(recurring, "interval", None)
+                if unit is None or interval is None:
+                    continue
+                amount = float(unit) * quantity
+                if interval == "month":
+                    monthly_total += amount
+                elif interval == "year":
+                    monthly_total += amount / 12.0
+    except Exception:
+        log.warning("stripe_metrics: subscription listing failed", exc_info=True)
+        return None
+    return int(round(monthly_total))
+
+
+def revenue_windows(now: datetime) -> Dict[str, datetime]:
+    """Window starts used for the revenue figures, all UTC."""
+    today = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    this_month_start = today.replace(day=1)
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+    return {
+        "since_30d": today - timedelta(days=29),
+        "this_month_start": this_month_start,
+        "last_month_start": last_month_start,
+    }
+
+
+def _revenue_cents(stripe, now: datetime) -> Optional[Dict[str, int]]:
+    """Net succeeded charges per window, from a single charge listing."""
+    windows = revenue_windows(now)
+    since_30d = int(windows["since_30d"].timestamp())
+    this_month = int(windows["this_month_start"].timestamp())
+    last_month = int(windows["last_month_start"].timestamp())
+    totals = {"revenue_30d_cents": 0, "revenue_this_month_cents": 0, "revenue_last_month_cents": 0}
+    try:
+        charges = stripe.Charge.list(created={"gte": min(since_30d, last_month)}, limit=100)
+        for charge in charges.auto_paging_iter():  # type: ignore[attr-defined]
+            if getattr(charge, "status", "") != "succeeded":
+                continue
+            amount = int(getattr(charge, "amount", 0) or 0)
+            refunded = int(getattr(charge, "amount_refunded", 0) or 0)
+            net = max(amount - refunded, 0)
+            created = int(getattr(charge, "created", 0) or 0)
+            if created >= since_30d:
+                totals["revenue_30d_cents"] += net
+            if created >= this_month:
+                totals["revenue_this_month_cents"] += net
+            elif created >= last_month:
+                totals["revenue_last_month_cents"] += net
+    except Exception:
+        log.warning("stripe_metrics: charge listing failed", exc_info=True)
+        return None
+    return totals
+
+
+def compute_snapshot(now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """Query Stripe for the current figures; None when Stripe is not configured."""
+    stripe = _stripe()
+    if stripe is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    started = time.perf_counter()
+    mrr = _monthly_recurring_cents(stripe)
+    revenue = _revenue_cents(stripe, now) or {}
+    snapshot = {
+        "mrr_cents": mrr,
+        "arr_cents": mrr * 12 if mrr is not None else None,
+        "revenue_30d_cents": revenue.get("revenue_30d_cents"),
+        "revenue_this_month_cents": revenue.get("revenue_this_month_cents"),
+        "revenue_last_month_cents": revenue.get("revenue_last_month_cents"),
+        "computed_at": now.isoformat(),
+    }
+    log.info("event=stripe_metrics.refresh ms=%.1f mrr_cents=%s", (time.perf_counter() - started) * 1000.0, mrr)
+    return snapshot
+
+
+def _store(snapshot: Dict[str, Any]) -> None:
+    global _local
+    with _lock:
+        _local = snapshot
+    redis_setex(_KEY, _RETAIN_S, json.dumps(snapshot))
+
+
+def _load() -> Optional[Dict[str, Any]]:
+    global _local
+    raw = redis_get(_KEY)
+    if raw:
+        try:
+            snapshot = json.loads(raw)
+        except ValueError:
+            snapshot = None
+        if isinstance(snapshot, dict):
+            with _lock:
+                _local = snapshot
+            return snapshot
+    with _lock:
+        return _local
+
+
+def _age_s(snapshot: Dict[str, Any]) -> float:
+    try:
+        computed = datetime.fromisoformat(snapshot["computed_at"])
+    except (KeyError, TypeError, ValueError):
+        return float("inf")
+    return (datetime.now(timezone.utc) - computed).total_seconds()
+
+
+def _acquire_lease() -> Optional[str]:
+    """Lease token, or None when another instance is refreshing."""
+    token = uuid.uuid4().hex
+    client = get_redis_client()
+    if client is None:
+        return token
+    try:
+        return token if client.set(_LEASE_KEY, token, nx=True, ex=_LEASE_S) else None
+    except Exception as e:
+        log.warning(f"stripe_metrics: lease failed, refreshing anyway: {e}")
+        return token
+
+
+def _release_lease(token: str) -> None:
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.eval(_RELEASE_LUA, 1, _LEASE_KEY, token)
+    except Exception as e:
+        log.warning(f"stripe_metrics: lease release failed: {e}")
+
+
+def refresh_snapshot() -> Optional[Dict[str, Any]]:
+    """Recompute and store the snapshot; returns it (None if skipped or unavailable)."""
+    if not _refresh_lock.acquire(blocking=False):
+        return None
+    token: Optional[str] = None
+    try:
+        token = _acquire_lease()
+        if token is None:
+            return None
+        snapshot = compute_snapshot()
+        if snapshot is not None:
+            _store(snapshot)
+        return snapshot
+    except Exception:
+        log.exception("stripe_metrics: refresh failed")
+        return None
+    finally:
+        if token is not None:
+            _release_lease(token)
+        _refresh_lock.release()
+
+
+def _claim_refresh_request() -> bool:
+    """At most one pending refresh request per lease window, across instances."""
+    global _local_requested_at
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return bool(client.set(_REQUESTED_KEY, "1", nx=True, ex=_LEASE_S))
+        except Exception as e:
+            log.warning(f"stripe_metrics: request marker failed: {e}")
+    with _lock:
+        now = time.monotonic()
+        if _local_requested_at and now - _local_requested_at < _LEASE_S:
+            return False
+        _local_requested_at = now
+        return True
+
+
+def request_refresh() -> None:
+    """Ask for a refresh without running it on the calling request."""
+    if _refresh_lock.locked() or _stripe() is None or not _claim_refresh_request():
+        return
+    from infrastructure.tasks_client import enqueue_http_task, should_use_cloud_tasks
+
+    try:
+        if should_use_cloud_tasks():
+            enqueue_http_task(REFRESH_TASK_PATH, {})
+            return
+    except Exception as e:
+        # Cloud Scheduler runs the same endpoint; the next tick catches up.
+        log.warning(f"stripe_metrics: refresh enqueue failed: {e}")
+        return
+    threading.Thread(target=refresh_snapshot, name="stripe-metrics-refresh", daemon=True).start()
+
+
+def get_snapshot() -> Dict[str, Any]:
+    """Latest snapshot plus ``stale``; schedules a refresh when it is old or missing.
+
+    Figures are None until the first refresh completes (or when Stripe is not
+    configured).
+    """
+    snapshot = _load()
+    stale = snapshot is None or _age_s(snapshot) > ttl_seconds()
+    if stale:
+        request_refresh()
+    result: Dict[str, Any] = {
+        "mrr_cents": None,
+        "arr_cents": None,
+        "revenue_30d_cents": None,
+        "revenue_this_month_cents": None,
+        "revenue_last_month_cents": None,
+        "computed_at": None,
+    }
+    if snapshot:
+        result.update({k: snapshot.get(k) for k in result})
+    result["stale"] = stale
+    return result
+
+
+def clear_local_cache() -> None:
+    global _local, _local_requested_at
+    with _lock:
+        _local = None
+        _local_requested_at = 0.0
+
+
+__all__ = [
+    "compute_snapshot",
+    "get_snapshot",
+    "refresh_snapshot",
+    "request_refresh",
+    "revenue_windows",
+    "clear_local_cache",
+]
@@ -10,9 +10,10 @@ working by providing the original helper functions and exporting the nested
 modules.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import json
 import logging
 import os
@@ -21,6 +22,8 @@ import uuid
 from ...core.paths import MEDIA_DIR, TRANSCRIPTS_DIR
 from .watchers import notify_watchers_processed, mark_watchers_failed, _candidate_filenames
 from ..audio.common import sanitize_filename
+from ..audio import transcript_pack
+from ..audio.transcript_io import write_pack_sidecar
 from .speaker_identification import prepend_speaker_intros, map_speaker_labels
 
 
@@ -61,18 +64,22 @@ def get_word_timestamps(filename: str) -> List[Dict[str, Any]]:
         logging.warning("[transcription/pkg] AssemblyAI failed; falling back to Google", exc_info=True)
 
     try:
-        # Lazy import to avoid ImportError if google-cloud-speech isn't installed in test envs
-        from ..transcription_google import google_transcribe_with_words  # local import
-        words = google_transcribe_with_words(filename)
-        for w in words:
-            if "speaker" not in w:
-                w["speaker"] = None
-        return words
+        return _google_word_timestamps(filename)
     except Exception:
         logging.warning("[transcription/pkg] Google fallback failed", exc_info=True)
         raise NotImplementedError("Only AssemblyAI and Google transcription are supported.")
 
 
+def _google_word_timestamps(filename: str) -> List[Dict[str, Any]]:
+    # Lazy import to avoid ImportError if google-cloud-speech isn't installed in test envs
+    from ..transcription_google import google_transcribe_with_words  # local import
+    words = google_transcribe_with_words(filename)
+    for w in words:
+        if "speaker" not in w:
+            w["speaker"] = None
+    return words
+
+
 def _is_gcs_url(path: str) -> bool:
     """Check if path is a GCS URL.
     
@@ -229,6 +236,11 @@ def _store_media_transcript_metadata(
                 except Exception as words_load_err:
                     logger.debug("[transcript_save] Could not load words into metadata (non-critical): %s", words_load_err)
             
+            if isinstance(payload.get("words"), list):
+                from api.services.episodes.transcript_index import build_transcript_index
+
+                payload["index"] = build_transcript_index(payload["words"])
+
             serialized = json.dumps(payload)
             now = datetime.utcnow()
 
@@ -366,8 +378,263 @@ def _read_existing_transcript_for(filename: str) -> List[Dict[str, Any]] | None:
     return None
 
 
-def transcribe_media_file(filename: str, user_id: Optional[str] = None, guest_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-    """Synchronously transcribe a media file and persist transcript artifacts.
+def _charge_for_transcription(filename, user_obj, audio_file_path, use_auphonic_flag):
+    """Charge credits only after transcription succeeds."""
+    try:
+        from api.core.database import get_session
+        from api.services.billing import credits
+        from pydub import AudioSegment
+        
+        session = next(get_session())
+        
+        # Get audio duration
+        try:
+            if not audio_file_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+            
+            audio = AudioSegment.from_file(str(audio_file_path))
+            # charge_for_transcription expects SECONDS, not minutes!
+            duration_seconds = len(audio) / 1000.0  # pydub length is in milliseconds
+            
+            logging.info(
+                "[transcription] 💳 Charging credits: user=%s, duration=%.2f seconds (%.2f min), auphonic=%s",
+                user_obj.id,
+                duration_seconds,
+                duration_seconds / 60.0,
+                use_auphonic_flag
+            )
+            
+            ledger_entry, cost_breakdown = credits.charge_for_transcription(
+                session=session,
+                user=user_obj,
+                duration_seconds=duration_seconds,
+                use_auphonic=use_auphonic_flag,
+                episode_id=None,  # Transcription happens before episode is created
+                correlation_id=f"transcription_{filename}_{uuid.uuid4().hex[:8]}",
+            )
+            
+            logging.info(
+                "[transcription] ✅ Credits charged: %.2f credits (duration=%.2fs, rate=%.2f credits/sec, auphonic=%s)",
+                cost_breakdown['total_credits'],
+                cost_breakdown['duration_seconds'],
+                cost_breakdown['processing_rate_per_sec'],
+                use_auphonic_flag
+            )
+            
+        except Exception as audio_err:
+            logging.warning("[transcription] ⚠️ Could not determine audio duration for billing: %s", audio_err)
+            # Don't fail transcription if billing fails
+            
+    except Exception as credits_err:
+        logging.error("[transcription] ⚠️ Failed to charge credits (non-fatal): %s", credits_err, exc_info=True)
+        # Don't fail transcription if credit charging fails
+
+
+@dataclass
+class _AssemblyAIRun:
+    """State carried from submission to the completion continuation."""
+
+    filename: str
+    user_id: Optional[str]
+    local_name: str
+    delete_after: bool
+    intro_duration_s: float
+    podcast_context_id: Any
+    podcast_speaker_intros: Any
+    episode_guest_intros: List[Dict[str, Any]]
+    charge: Callable[..., None]
+
+    def cleanup(self) -> None:
+        if self.delete_after:
+            try:
+                (MEDIA_DIR / self.local_name).unlink(missing_ok=True)
+            except Exception:
+                pass
+
+    def context(self) -> Dict[str, Any]:
+        """Speaker-identification state, as recorded for other instances."""
+        return {
+            "intro_duration_s": self.intro_duration_s,
+            "podcast_context_id": self.podcast_context_id,
+            "podcast_speaker_intros": self.podcast_speaker_intros,
+            "episode_guest_intros": self.episode_guest_intros,
+        }
+
+    @classmethod
+    def from_pending(cls, row: Any) -> "_AssemblyAIRun":
+        """Rebuild a run recorded by another instance (its local audio is not here)."""
+        try:
+            context = json.loads(row.context_json or "{}")
+        except Exception:
+            context = {}
+        filename = row.filename
+        podcast_context_id = context.get("podcast_context_id")
+        try:
+            podcast_context_id = uuid.UUID(str(podcast_context_id)) if podcast_context_id else None
+        except ValueError:
+            pass
+
+        def _charge(user_obj, audio_file_path, use_auphonic_flag):
+            # The submitted audio stayed on the submitting instance; bill from the original upload.
+            if not audio_file_path.exists() and _is_gcs_url(filename):
+                audio_file_path = MEDIA_DIR / _download_gcs_to_media(filename)
+            _charge_for_transcription(filename, user_obj, audio_file_path, use_auphonic_flag)
+
+        return cls(
+            filename=filename,
+            user_id=row.user_id,
+            local_name=row.local_name,
+            delete_after=False,
+            intro_duration_s=float(context.get("intro_duration_s") or 0.0),
+            podcast_context_id=podcast_context_id,
+            podcast_speaker_intros=context.get("podcast_speaker_intros"),
+            episode_guest_intros=list(context.get("episode_guest_intros") or []),
+            charge=_charge,
+        )
+
+
+def _async_completion_enabled() -> bool:
+    """TRANSCRIPTION_COMPLETION_MODE=blocking restores the thread-per-job path."""
+    mode = (os.getenv("TRANSCRIPTION_COMPLETION_MODE") or "async").strip().lower()
+    return mode != "blocking"
+
+
+def _start_assemblyai_transcription(
+    run: _AssemblyAIRun,
+    on_complete: Callable[[List[Dict[str, Any]]], None],
+    on_error: Optional[Callable[[BaseException], None]],
+) -> str:
+    """Submit ``run`` to AssemblyAI; persistence runs as a continuation.
+
+    The submission is recorded in ``pending`` so another instance can finish it
+    if this one goes away; the continuation only persists what it can claim.
+    """
+    from ..transcription_assemblyai import start_assemblyai_transcription  # local import
+    from . import pending
+
+    submitted: Dict[str, str] = {}
+
+    def _record(transcript_id: str) -> None:
+        submitted["id"] = transcript_id
+        pending.record_submitted(
+            transcript_id,
+            filename=run.filename,
+            user_id=run.user_id,
+            local_name=run.local_name,
+            context=run.context(),
+        )
+
+    def _claimed() -> bool:
+        transcript_id = submitted.get("id")
+        if transcript_id and not pending.claim(transcript_id):
+            logging.info("[transcription] Transcript %s for %s is finished by another run", transcript_id, run.filename)
+            run.cleanup()
+            return False
+        return True
+
+    def _failure(exc: BaseException) -> None:
+        _fail_transcription(run.filename, exc)
+        run.cleanup()
+        if submitted.get("id"):
+            pending.mark_finished(submitted["id"], "failed", str(exc))
+        if on_error is not None:
+            on_error(exc)
+
+    def _finish(words: List[Dict[str, Any]]) -> None:
+        try:
+            words = _finish_assemblyai_transcription(run, words)
+        except Exception as exc:
+            _failure(exc)
+            return
+        run.cleanup()
+        if submitted.get("id"):
+            pending.mark_finished(submitted["id"], "completed")
+        on_complete(words)
+
+    def _completed(words: List[Dict[str, Any]]) -> None:
+        if _claimed():
+            _finish(words)
+
+    def _failed(exc: BaseException) -> None:
+        if not _claimed():
+            return
+        # Same fallback as get_word_timestamps: try Google before giving up.
+        logging.warning("[transcription/pkg] AssemblyAI failed; falling back to Google: %s", exc)
+        try:
+            words = _google_word_timestamps(run.local_name)
+        except Exception:
+            logging.warning("[transcription/pkg] Google fallback failed", exc_info=True)
+            _failure(exc)
+            return
+        _finish(words)
+
+    transcript_id = start_assemblyai_transcription(
+        run.local_name, on_complete=_completed, on_error=_failed, on_submitted=_record
+    )
+    logging.info("[transcription] Submitted %s as AssemblyAI transcript %s; completion is event-driven", run.filename, transcript_id)
+    return transcript_id
+
+
+def finish_pending_transcription(transcript_id: str) -> Dict[str, Any]:
+    """Finish a recorded AssemblyAI transcript on whichever instance runs this.
+
+    Used by ``/api/tasks/transcription/finish`` (webhook on an instance that
+    does not track the job, or the resume sweep). Returns ``{"status": ...}``:
+    ``completed``/``failed`` when this run persisted the outcome, ``pending``
+    while AssemblyAI is still working, ``skipped`` when there is nothing to do.
+    Failures are not retried with Google here: the submitted audio is not on
+    this instance.
+    """
+    from ...core.config import settings
+    from ..transcription_assemblyai import ASSEMBLYAI_BASE
+    from . import pending
+    from .assemblyai_client import AssemblyAITranscriptionError, get_transcription
+    from .transcription_runner import _normalize_completed_transcript
+
+    row = pending.load(transcript_id)
+    if row is None or row.status not in pending.OPEN_STATUSES:
+        return {"status": "skipped"}
+    summary: Dict[str, Any] = {"filename": row.filename, "user_id": row.user_id}
+
+    data = get_transcription(transcript_id, api_key=settings.ASSEMBLYAI_API_KEY or "", base_url=ASSEMBLYAI_BASE)
+    state = data.get("status")
+    error: Optional[BaseException] = None
+    if state == "error":
+        error = AssemblyAITranscriptionError(f"AssemblyAI error: {data.get('error')}")
+    elif state != "completed":
+        created_at = row.created_at or datetime.utcnow()
+        if (datetime.utcnow() - created_at).total_seconds() < pending.timeout_s():
+            pending.touch(transcript_id)
+            return {**summary, "status": "pending"}
+        error = AssemblyAITranscriptionError("AssemblyAI transcription timed out")
+
+    if not pending.claim(transcript_id):
+        return {**summary, "status": "skipped"}
+    run = _AssemblyAIRun.from_pending(row)
+    try:
+        if error is not None:
+            raise error
+        words = list(_normalize_completed_transcript(data).get("words") or [])
+        words = _finish_assemblyai_transcription(run, words)
+    except Exception as exc:
+        _fail_transcription(run.filename, exc)
+        pending.mark_finished(transcript_id, "failed", str(exc))
+        logging.warning("[transcription] Transcript %s for %s failed: %s", transcript_id, run.filename, exc)
+        return {**summary, "status": "failed", "error": str(exc)}
+    pending.mark_finished(transcript_id, "completed")
+    logging.info("[transcription] Finished transcript %s for %s (%d words)", transcript_id, run.filename, len(words))
+    return {**summary, "status": "completed", "words": len(words)}
+
+
+def transcribe_media_file(
+    filename: str,
+    user_id: Optional[str] = None,
+    guest_ids: Optional[List[str]] = None,
+    *,
+    on_complete: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    on_error: Optional[Callable[[BaseException], None]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Transcribe a media file and persist transcript artifacts.
     
     Routes to appropriate transcription service based on MediaItem.use_auphonic flag:
     - use_auphonic=True → Auphonic (transcription + audio processing)
@@ -380,8 +647,15 @@ def transcribe_media_file(filename: str, user_id: Optional[str] = None, guest_id
         user_id: UUID string of user (required for MediaItem lookup)
         guest_ids: Optional list of guest library IDs for speaker identification (AssemblyAI only)
         
+        on_complete: Optional continuation. When given, the AssemblyAI path
+            returns ``None`` as soon as the job is submitted; persistence and
+            watcher notification run when the transcript completes (webhook or
+            the shared poller in ``completion``) and the words are then passed
+            to ``on_complete``, or the failure to ``on_error``.
+        
     Returns:
-        List of word dicts with start/end/word/speaker keys
+        List of word dicts with start/end/word/speaker keys, or ``None`` when
+        completion was deferred to ``on_complete``
         
     Raises:
         TranscriptionError: If transcription fails (no fallback)
@@ -433,54 +707,7 @@ def transcribe_media_file(filename: str, user_id: Optional[str] = None, guest_id
     # Helper function to charge credits after successful transcription
     def _charge_for_successful_transcription(user_obj, audio_file_path, use_auphonic_flag):
         """Charge credits only after transcription succeeds."""
-        try:
-            from api.core.database import get_session
-            from api.services.billing import credits
-            from pydub import AudioSegment
-            
-            session = next(get_session())
-            
-            # Get audio duration
-            try:
-                if not audio_file_path.exists():
-                    raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
-                
-                audio = AudioSegment.from_file(str(audio_file_path))
-                # charge_for_transcription expects SECONDS, not minutes!
-                duration_seconds = len(audio) / 1000.0  # pydub length is in milliseconds
-                
-                logging.info(
-                    "[transcription] 💳 Charging credits: user=%s, duration=%.2f seconds (%.2f min), auphonic=%s",
-                    user_obj.id,
-                    duration_seconds,
-                    duration_seconds / 60.0,
-                    use_auphonic_flag
-                )
-                
-                ledger_entry, cost_breakdown = credits.charge_for_transcription(
-                    session=session,
-                    user=user_obj,
-                    duration_seconds=duration_seconds,
-                    use_auphonic=use_auphonic_flag,
-                    episode_id=None,  # Transcription happens before episode is created
-                    correlation_id=f"transcription_{filename}_{uuid.uuid4().hex[:8]}",
-                )
-                
-                logging.info(
-                    "[transcription] ✅ Credits charged: %.2f credits (duration=%.2fs, rate=%.2f credits/sec, auphonic=%s)",
-                    cost_breakdown['total_credits'],
-                    cost_breakdown['duration_seconds'],
-                    cost_breakdown['processing_rate_per_sec'],
-                    use_auphonic_flag
-                )
-                
-            except Exception as audio_err:
-                logging.warning("[transcription] ⚠️ Could not determine audio duration for billing: %s", audio_err)
-                # Don't fail transcription if billing fails
-                
-        except Exception as credits_err:
-            logging.error("[transcription] ⚠️ Failed to charge credits (non-fatal): %s", credits_err, exc_info=True)
-            # Don't fail transcription if credit charging fails
+        _charge_for_transcription(filename, user_obj, audio_file_path, use_auphonic_flag)
 
     # CRITICAL: Look up MediaItem to check use_auphonic flag (sole source of truth)
     if not user_id:
@@ -689,6 +916,7 @@ def transcribe_media_file(filename: str, user_id: Optional[str] = None, guest_id
 
     local_name = filename
     delete_after = False
+    submitted = False
     
     # Speaker identification vars
     intro_duration_s = 0.0
@@ -776,392 +1004,451 @@ def transcribe_media_file(filename: str, user_id: Optional[str] = None, guest_id
                 # Continue without speaker ID
         # =====================================================================
 
-        words = get_word_timestamps(local_name)
-        
-        # =====================================================================
-        # SPEAKER IDENTIFICATION: Map labels and shift timestamps
-        # =====================================================================
-        if intro_duration_s > 0:
+        run = _AssemblyAIRun(
+            filename=filename,
+            user_id=user_id,
+            local_name=local_name,
+            delete_after=delete_after,
+            intro_duration_s=intro_duration_s,
+            podcast_context_id=podcast_context_id,
+            podcast_speaker_intros=podcast_speaker_intros,
+            episode_guest_intros=episode_guest_intros,
+            charge=_charge_for_successful_transcription,
+        )
+        if on_complete is not None and _async_completion_enabled():
             try:
-                logging.info("[transcription] Post-processing transcript with intros (duration: %.2fs)", intro_duration_s)
-                words = map_speaker_labels(
-                    words=words,
-                    podcast_id=podcast_context_id,
-                    episode_id=None, # No episode yet
-                    speaker_intros=podcast_speaker_intros,
-                    guest_intros=episode_guest_intros,
-                    intro_duration_s=intro_duration_s
-                )
-            except Exception as map_err:
-                logging.error("[transcription] Failed to map speakers/strip intros: %s", map_err, exc_info=True)
-        # =====================================================================
+                _start_assemblyai_transcription(run, on_complete, on_error)
+            except Exception:
+                logging.warning("[transcription] AssemblyAI submission failed; transcribing synchronously", exc_info=True)
+            else:
+                submitted = True
+                return None
 
-        # DIAGNOSTIC: Confirm AssemblyAI returned data
-        logging.info("🟢 [STEP_2_COMPLETE] Got %d words from AssemblyAI for filename='%s'", len(words), filename)
-        
-        # CRITICAL: Store the ORIGINAL filename (GCS URI or local path) for database lookup
-        # Bug: We were using local_name (downloaded filename) which breaks GCS URI lookups
-        original_filename = filename
-        
-        try:
-            logging.info("🟡 [STEP_4_START] Creating TRANSCRIPTS_DIR and preparing payload")
-            TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-            stem = Path(local_name).stem
-            payload = json.dumps(words, ensure_ascii=False, indent=2)
-            
-            # DIAGNOSTIC: Confirm we built the payload
-            logging.info("🟢 [STEP_5_COMPLETE] Built JSON payload - stem='%s', payload_size=%d bytes", stem, len(payload))
+        words = get_word_timestamps(local_name)
+        return _finish_assemblyai_transcription(run, words)
+    except Exception as exc:
+        _fail_transcription(filename, exc)
+        raise
+    finally:
+        if delete_after and not submitted:
+            try:
+                (MEDIA_DIR / local_name).unlink(missing_ok=True)
+            except Exception:
+                pass
 
-            safe_stem = sanitize_filename(stem) or stem or f"transcript-{uuid.uuid4().hex}"
-            out_path = TRANSCRIPTS_DIR / f"{stem}.json"
-            # Always persist locally (overwrite with freshest)
-            out_path.write_text(payload, encoding="utf-8")
-            
-            # DIAGNOSTIC: Confirm local save worked
-            logging.info("🟢 [STEP_7_COMPLETE] Saved transcript locally to '%s'", out_path)
-
-            # Upload permanently to cloud storage in a deterministic location: transcripts/{safe_stem}.json
-            logging.info("🟡 [STEP_8_START] Preparing cloud storage upload - safe_stem='%s'", safe_stem)
-            gcs_url = None
-            gcs_uri = None
-            bucket = None
-            key = None
-            # Use a resilient upload helper that will attempt the configured storage helper
-            # and fall back to direct google.cloud.storage upload with retries.
-            def _upload_transcript_to_gcs(bucket_name: str, key_name: str, data_bytes: bytes) -> Optional[str]:
-                """Attempt to upload bytes to the configured storage.
-
-                Returns a GCS URI string (gs://bucket/key) on success, or None on failure.
-                """
-                # First, try the existing storage abstraction if available
-                try:
-                    from infrastructure import storage  # type: ignore
-                    storage_url = storage.upload_bytes(
-                        bucket_name,
-                        key_name,
-                        data_bytes,
-                        content_type="application/json; charset=utf-8",
-                    )
-                    if storage_url:
-                        if storage_url.startswith("gs://"):
-                            return storage_url
-                        # If storage abstraction returned non-gs URL, still try the direct client
-                except Exception as primary_exc:
-                    logging.warning("[transcription] storage.upload_bytes failed: %s", primary_exc, exc_info=True)
-
-                # Fallback: use google.cloud.storage directly with small retries
-                try:
-                    from google.cloud import storage as gcs_storage
-                    client = gcs_storage.Client()
-                    bucket = client.bucket(bucket_name)
-                    blob = bucket.blob(key_name)
-
-                    # Try upload with retries
-                    attempts = 3
-                    for attempt in range(1, attempts + 1):
-                        try:
-                            blob.upload_from_string(data_bytes, content_type="application/json; charset=utf-8")
-                            return f"gs://{bucket_name}/{key_name}"
-                        except Exception as e:
-                            logging.warning("[transcription] Direct GCS upload attempt %d failed: %s", attempt, e)
-                            if attempt == attempts:
-                                raise
-                except Exception as gcs_exc:
-                    logging.error("[transcription] Direct GCS upload failed: %s", gcs_exc, exc_info=True)
-                    return None
 
-            try:
-                bucket = _resolve_transcripts_bucket()
-                key = f"transcripts/{safe_stem}.json"
-                uploaded = _upload_transcript_to_gcs(bucket, key, payload.encode("utf-8"))
-                if uploaded:
-                    gcs_uri = uploaded
-                    gcs_url = f"https://storage.googleapis.com/{bucket}/{key}"
-                else:
-                    gcs_uri = None
-                    gcs_url = None
-
-                logging.info("🟢 [STEP_9_COMPLETE] Cloud storage upload result - gcs_uri='%s', gcs_url='%s'", gcs_uri, gcs_url)
-            except Exception as upload_exc:
-                logging.error(
-                    "[transcription] ⚠️ Failed to upload transcript to cloud storage after retries: %s",
-                    upload_exc,
-                    exc_info=True,
-                )
-                logging.warning("🔴 [STEP_9_FAILED] Cloud storage upload FAILED - continuing with local copy and DB metadata save")
+def _finish_assemblyai_transcription(run: "_AssemblyAIRun", words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map speakers, persist the transcript everywhere and notify watchers.
 
-            # CRITICAL FIX: Use original_filename (GCS URI) not local_name (downloaded file)
-            # This ensures database lookups match the filename stored in MediaItem
-            # ALSO: Store transcript words directly in metadata for database-only retrieval
-            logging.info(
-                "🔵 [transcript_metadata_save_attempt] BEFORE save - original_filename='%s', stem='%s', gcs_uri='%s', words_count=%d",
-                original_filename, stem, gcs_uri, len(words)
+    Shared by the blocking path and the completion continuation; raises on
+    failures that must fail the transcription.
+    """
+    filename = run.filename
+    user_id = run.user_id
+    local_name = run.local_name
+    intro_duration_s = run.intro_duration_s
+    podcast_context_id = run.podcast_context_id
+    podcast_speaker_intros = run.podcast_speaker_intros
+    episode_guest_intros = run.episode_guest_intros
+    _charge_for_successful_transcription = run.charge
+    
+    # =====================================================================
+    # SPEAKER IDENTIFICATION: Map labels and shift timestamps
+    # =====================================================================
+    if intro_duration_s > 0:
+        try:
+            logging.info("[transcription] Post-processing transcript with intros (duration: %.2fs)", intro_duration_s)
+            words = map_speaker_labels(
+                words=words,
+                podcast_id=podcast_context_id,
+                episode_id=None, # No episode yet
+                speaker_intros=podcast_speaker_intros,
+                guest_intros=episode_guest_intros,
+                intro_duration_s=intro_duration_s
             )
+        except Exception as map_err:
+            logging.error("[transcription] Failed to map speakers/strip intros: %s", map_err, exc_info=True)
+    # =====================================================================
+
+    # DIAGNOSTIC: Confirm AssemblyAI returned data
+    logging.info("🟢 [STEP_2_COMPLETE] Got %d words from AssemblyAI for filename='%s'", len(words), filename)
+    
+    # CRITICAL: Store the ORIGINAL filename (GCS URI or local path) for database lookup
+    # Bug: We were using local_name (downloaded filename) which breaks GCS URI lookups
+    original_filename = filename
+    
+    try:
+        logging.info("🟡 [STEP_4_START] Creating TRANSCRIPTS_DIR and preparing payload")
+        TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+        stem = Path(local_name).stem
+        payload = json.dumps(words, ensure_ascii=False, indent=2)
+        
+        # DIAGNOSTIC: Confirm we built the payload
+        logging.info("🟢 [STEP_5_COMPLETE] Built JSON payload - stem='%s', payload_size=%d bytes", stem, len(payload))
+
+        safe_stem = sanitize_filename(stem) or stem or f"transcript-{uuid.uuid4().hex}"
+        out_path = TRANSCRIPTS_DIR / f"{stem}.json"
+        # Always persist locally (overwrite with freshest)
+        out_path.write_text(payload, encoding="utf-8")
+        write_pack_sidecar(out_path, words)
+        
+        # DIAGNOSTIC: Confirm local save worked
+        logging.info("🟢 [STEP_7_COMPLETE] Saved transcript locally to '%s'", out_path)
+
+        # Upload permanently to cloud storage in a deterministic location: transcripts/{safe_stem}.json
+        logging.info("🟡 [STEP_8_START] Preparing cloud storage upload - safe_stem='%s'", safe_stem)
+        gcs_url = None
+        gcs_uri = None
+        bucket = None
+        key = None
+        # Use a resilient upload helper that will attempt the configured storage helper
+        # and fall back to direct google.cloud.storage upload with retries.
+        def _upload_transcript_to_gcs(bucket_name: str, key_name: str, data_bytes: bytes) -> Optional[str]:
+            """Attempt to upload bytes to the configured storage.
+
+            Returns a GCS URI string (gs://bucket/key) on success, or None on failure.
+            """
+            # First, try the existing storage abstraction if available
             try:
-                # CRITICAL: Include words in metadata payload for database-only retrieval
-                # This ensures transcripts can be found even if GCS is unavailable
-                # Ensure we persist words into DB metadata too (so transcripts are findable even if GCS later disappears)
-                _store_media_transcript_metadata(
-                    original_filename,  # ← FIX: Was 'filename' before, use original GCS URI
-                    stem=stem,
-                    safe_stem=safe_stem,
-                    bucket=bucket,
-                    key=key,
-                    gcs_uri=gcs_uri,
-                    gcs_url=gcs_url,
-                    words=words,
-                )
-                # After saving metadata, update it with words if not already included
-                try:
-                    from api.core.database import get_session
-                    from api.models.transcription import MediaTranscript
-                    from sqlmodel import select
-                    from api.services.transcription.watchers import _candidate_filenames
-                    
-                    session = next(get_session())
-                    candidates = _candidate_filenames(original_filename)
-                    if original_filename not in candidates:
-                        candidates.insert(0, original_filename)
-                    
-                    transcript_record = session.exec(
-                        select(MediaTranscript).where(MediaTranscript.filename.in_(candidates))
-                    ).first()
-                    
-                    if transcript_record:
-                        meta = json.loads(transcript_record.transcript_meta_json or "{}")
-                        if "words" not in meta or not meta.get("words"):
-                            meta["words"] = words
-                            transcript_record.transcript_meta_json = json.dumps(meta)
-                            session.add(transcript_record)
-                            session.commit()
-                            logging.info("[transcription] ✅ Updated MediaTranscript with %d words in metadata", len(words))
-                except Exception as words_update_err:
-                    logging.warning("[transcription] Failed to update transcript metadata with words (non-critical): %s", words_update_err)
-                logging.info(
-                    "✅ [transcript_metadata_save_attempt] AFTER save SUCCESS - original_filename='%s'",
-                    original_filename
-                )
-            except Exception as metadata_exc:
-                # LOUD FAILURE: This is CRITICAL - transcript is useless if metadata isn't saved
-                logging.error(
-                    "[transcription] 🚨 CRITICAL: Failed to save transcript metadata for %s: %s", 
-                    original_filename, 
-                    metadata_exc, 
-                    exc_info=True
-                )
-                
-                # Send Slack alert for critical failure
-                try:
-                    import os as _os
-                    import httpx
-                    slack_webhook = _os.getenv("SLACK_OPS_WEBHOOK_URL", "").strip()
-                    if slack_webhook:
-                        payload = {
-                            "text": f"🚨 *CRITICAL: Transcript Metadata Save Failed*\n"
-                                    f"Failed to save transcript metadata to database\n"
-                                    f"*File:* `{original_filename}`\n"
-                                    f"*Error:* {str(metadata_exc)[:500]}\n"
-                                    f"*Impact:* Episode assembly will fail - transcript not findable\n"
-                                    f"*Action:* Check database connectivity and MediaTranscript table"
-                        }
-                        httpx.post(slack_webhook, json=payload, timeout=5.0)
-                        logging.info("[transcription] Slack alert sent for metadata save failure")
-                except Exception as alert_exc:
-                    logging.error("[transcription] Failed to send Slack alert: %s", alert_exc)
-                
-                # Don't suppress this error - it's critical
-                raise TranscriptionError(
-                    f"Critical: Transcript generated but metadata save failed for {original_filename}: {metadata_exc}"
+                from infrastructure import storage  # type: ignore
+                storage_url = storage.upload_bytes(
+                    bucket_name,
+                    key_name,
+                    data_bytes,
+                    content_type="application/json; charset=utf-8",
                 )
-
-            # Record the GCS key on the episode for deterministic reuse during assembly
+                if storage_url:
+                    if storage_url.startswith("gs://"):
+                        return storage_url
+                    # If storage abstraction returned non-gs URL, still try the direct client
+            except Exception as primary_exc:
+                logging.warning("[transcription] storage.upload_bytes failed: %s", primary_exc, exc_info=True)
+
+            # Fallback: use google.cloud.storage directly with small retries
             try:
-                from api.services.episodes.repo import get_episode_by_id, update_episode
-                from uuid import UUID
-                episode_id = None
+                from google.cloud import storage as gcs_storage
+                client = gcs_storage.Client()
+                bucket = client.bucket(bucket_name)
+                blob = bucket.blob(key_name)
+
+                # Try upload with retries
+                attempts = 3
+                for attempt in range(1, attempts + 1):
+                    try:
+                        blob.upload_from_string(data_bytes, content_type="application/json; charset=utf-8")
+                        return f"gs://{bucket_name}/{key_name}"
+                    except Exception as e:
+                        logging.warning("[transcription] Direct GCS upload attempt %d failed: %s", attempt, e)
+                        if attempt == attempts:
+                            raise
+            except Exception as gcs_exc:
+                logging.error("[transcription] Direct GCS upload failed: %s", gcs_exc, exc_info=True)
+                return None
+
+        try:
+            bucket = _resolve_transcripts_bucket()
+            key = f"transcripts/{safe_stem}.json"
+            uploaded = _upload_transcript_to_gcs(bucket, key, payload.encode("utf-8"))
+            if uploaded:
+                gcs_uri = uploaded
+                gcs_url = f"https://storage.googleapis.com/{bucket}/{key}"
+                # Compressed columnar copy next to the JSON; readers prefer it to the shared JSON.
                 try:
-                    episode_id = UUID(stem)
-                except Exception:
-                    pass
-                if episode_id:
-                    from api.core.database import get_session
-                    session_gen = get_session()
-                    session = next(session_gen)
-                    ep = get_episode_by_id(session, episode_id)
-                    if ep:
-                        meta = json.loads(ep.meta_json or "{}")
-                        transcripts = dict(meta.get("transcripts", {}))
-                        transcripts["stem"] = stem
-                        transcripts["bucket_stem"] = safe_stem
-                        if gcs_uri:
-                            transcripts["gcs_json"] = gcs_uri
-                            transcripts["gcs_url"] = gcs_url or transcripts.get("gcs_url")
-                            transcripts["gcs_key"] = key
-                            transcripts["gcs_bucket"] = bucket
-                        elif gcs_url:
-                            transcripts["gcs_url"] = gcs_url
-                        meta["transcripts"] = transcripts
-                        ep.meta_json = json.dumps(meta)
-                        update_episode(session, ep, {"meta_json": ep.meta_json})
-            except Exception as e:
-                logging.warning(f"Failed to associate transcript with episode: {e}")
-        except TranscriptionError:
-            # Re-raise critical errors (like metadata save failures) - don't suppress them
-            raise
-        except Exception as persistence_exc:
-            # Log non-critical persistence failures but don't fail the entire transcription
+                    packed = transcript_pack.encode(words, compress=True)
+                    if packed is not None:
+                        from infrastructure import storage  # type: ignore
+                        storage.upload_bytes(
+                            bucket,
+                            f"transcripts/{safe_stem}{transcript_pack.PACK_SUFFIX}",
+                            packed,
+                            content_type=transcript_pack.PACK_CONTENT_TYPE,
+                        )
+                except Exception as pack_exc:
+                    logging.warning("[transcription] Word pack upload failed (JSON is still available): %s", pack_exc)
+            else:
+                gcs_uri = None
+                gcs_url = None
+
+            logging.info("🟢 [STEP_9_COMPLETE] Cloud storage upload result - gcs_uri='%s', gcs_url='%s'", gcs_uri, gcs_url)
+        except Exception as upload_exc:
             logging.error(
-                "[transcription] ⚠️ Non-critical persistence error (continuing): %s",
-                persistence_exc,
-                exc_info=True
+                "[transcription] ⚠️ Failed to upload transcript to cloud storage after retries: %s",
+                upload_exc,
+                exc_info=True,
             )
+            logging.warning("🔴 [STEP_9_FAILED] Cloud storage upload FAILED - continuing with local copy and DB metadata save")
 
-        # CRITICAL: Mark MediaItem as transcript_ready ONLY if transcript persisted
-        # We consider persistence successful when either:
-        # - A GCS URI/url exists for the transcript (gcs_uri/gcs_url), OR
-        # - A MediaTranscript record exists and contains "words" in its metadata
+        # CRITICAL FIX: Use original_filename (GCS URI) not local_name (downloaded file)
+        # This ensures database lookups match the filename stored in MediaItem
+        # ALSO: Store transcript words directly in metadata for database-only retrieval
+        logging.info(
+            "🔵 [transcript_metadata_save_attempt] BEFORE save - original_filename='%s', stem='%s', gcs_uri='%s', words_count=%d",
+            original_filename, stem, gcs_uri, len(words)
+        )
         try:
-            from api.core.database import get_session
-            from api.models.podcast import MediaItem
-            from api.models.transcription import MediaTranscript
-            from sqlmodel import select
-
-            session = next(get_session())
-
-            # Determine whether transcript metadata contains words
-            transcript_has_words = False
+            # CRITICAL: Include words in metadata payload for database-only retrieval
+            # This ensures transcripts can be found even if GCS is unavailable
+            # Ensure we persist words into DB metadata too (so transcripts are findable even if GCS later disappears)
+            _store_media_transcript_metadata(
+                original_filename,  # ← FIX: Was 'filename' before, use original GCS URI
+                stem=stem,
+                safe_stem=safe_stem,
+                bucket=bucket,
+                key=key,
+                gcs_uri=gcs_uri,
+                gcs_url=gcs_url,
+                words=words,
+            )
+            # After saving metadata, update it with words if not already included
             try:
+                from api.core.database import get_session
+                from api.models.transcription import MediaTranscript
+                from sqlmodel import select
+                from api.services.transcription.watchers import _candidate_filenames
+                
+                session = next(get_session())
                 candidates = _candidate_filenames(original_filename)
                 if original_filename not in candidates:
                     candidates.insert(0, original_filename)
-                record = session.exec(
+                
+                transcript_record = session.exec(
                     select(MediaTranscript).where(MediaTranscript.filename.in_(candidates))
                 ).first()
-                if record:
-                    try:
-                        meta = json.loads(record.transcript_meta_json or "{}")
-                        if isinstance(meta.get("words"), list) and len(meta.get("words")) > 0:
-                            transcript_has_words = True
-                    except Exception:
-                        transcript_has_words = False
+                
+                if transcript_record:
+                    meta = json.loads(transcript_record.transcript_meta_json or "{}")
+                    if "words" not in meta or not meta.get("words"):
+                        meta["words"] = words
+                        transcript_record.transcript_meta_json = json.dumps(meta)
+                        session.add(transcript_record)
+                        session.commit()
+                        logging.info("[transcription] ✅ Updated MediaTranscript with %d words in metadata", len(words))
+            except Exception as words_update_err:
+                logging.warning("[transcription] Failed to update transcript metadata with words (non-critical): %s", words_update_err)
+            logging.info(
+                "✅ [transcript_metadata_save_attempt] AFTER save SUCCESS - original_filename='%s'",
+                original_filename
+            )
+        except Exception as metadata_exc:
+            # LOUD FAILURE: This is CRITICAL - transcript is useless if metadata isn't saved
+            logging.error(
+                "[transcription] 🚨 CRITICAL: Failed to save transcript metadata for %s: %s", 
+                original_filename, 
+                metadata_exc, 
+                exc_info=True
+            )
+            
+            # Send Slack alert for critical failure
+            try:
+                import os as _os
+                import httpx
+                slack_webhook = _os.getenv("SLACK_OPS_WEBHOOK_URL", "").strip()
+                if slack_webhook:
+                    payload = {
+                        "text": f"🚨 *CRITICAL: Transcript Metadata Save Failed*\n"
+                                f"Failed to save transcript metadata to database\n"
+                                f"*File:* `{original_filename}`\n"
+                                f"*Error:* {str(metadata_exc)[:500]}\n"
+                                f"*Impact:* Episode assembly will fail - transcript not findable\n"
+                                f"*Action:* Check database connectivity and MediaTranscript table"
+                    }
+                    httpx.post(slack_webhook, json=payload, timeout=5.0)
+                    logging.info("[transcription] Slack alert sent for metadata save failure")
+            except Exception as alert_exc:
+                logging.error("[transcription] Failed to send Slack alert: %s", alert_exc)
+            
+            # Don't suppress this error - it's critical
+            raise TranscriptionError(
+                f"Critical: Transcript generated but metadata save failed for {original_filename}: {metadata_exc}"
+            )
+
+        # Record the GCS key on the episode for deterministic reuse during assembly
+        try:
+            from api.services.episodes.repo import get_episode_by_id, update_episode
+            from uuid import UUID
+            episode_id = None
+            try:
+                episode_id = UUID(stem)
             except Exception:
-                # Non-fatal - we'll rely on gcs_uri/gcs_url if DB check fails
-                transcript_has_words = False
+                pass
+            if episode_id:
+                from api.core.database import get_session
+                session_gen = get_session()
+                session = next(session_gen)
+                ep = get_episode_by_id(session, episode_id)
+                if ep:
+                    meta = json.loads(ep.meta_json or "{}")
+                    transcripts = dict(meta.get("transcripts", {}))
+                    transcripts["stem"] = stem
+                    transcripts["bucket_stem"] = safe_stem
+                    if gcs_uri:
+                        transcripts["gcs_json"] = gcs_uri
+                        transcripts["gcs_url"] = gcs_url or transcripts.get("gcs_url")
+                        transcripts["gcs_key"] = key
+                        transcripts["gcs_bucket"] = bucket
+                    elif gcs_url:
+                        transcripts["gcs_url"] = gcs_url
+                    meta["transcripts"] = transcripts
+                    ep.meta_json = json.dumps(meta)
+                    update_episode(session, ep, {"meta_json": ep.meta_json})
+        except Exception as e:
+            logging.warning(f"Failed to associate transcript with episode: {e}")
+    except TranscriptionError:
+        # Re-raise critical errors (like metadata save failures) - don't suppress them
+        raise
+    except Exception as persistence_exc:
+        # Log non-critical persistence failures but don't fail the entire transcription
+        logging.error(
+            "[transcription] ⚠️ Non-critical persistence error (continuing): %s",
+            persistence_exc,
+            exc_info=True
+        )
+
+    # CRITICAL: Mark MediaItem as transcript_ready ONLY if transcript persisted
+    # We consider persistence successful when either:
+    # - A GCS URI/url exists for the transcript (gcs_uri/gcs_url), OR
+    # - A MediaTranscript record exists and contains "words" in its metadata
+    try:
+        from api.core.database import get_session
+        from api.models.podcast import MediaItem
+        from api.models.transcription import MediaTranscript
+        from sqlmodel import select
 
-            can_mark_ready = bool(gcs_uri or gcs_url or transcript_has_words)
+        session = next(get_session())
 
-            # CRITICAL FIX: Use original_filename (GCS URL) not local filename
-            # When GCS files are downloaded for transcription, `filename` becomes the local name
-            # But MediaItem.filename stores the GCS URL, so we must use original_filename
-            media_item = session.exec(
-                select(MediaItem).where(MediaItem.filename == original_filename)
+        # Determine whether transcript metadata contains words
+        transcript_has_words = False
+        try:
+            candidates = _candidate_filenames(original_filename)
+            if original_filename not in candidates:
+                candidates.insert(0, original_filename)
+            record = session.exec(
+                select(MediaTranscript).where(MediaTranscript.filename.in_(candidates))
             ).first()
+            if record:
+                try:
+                    meta = json.loads(record.transcript_meta_json or "{}")
+                    if isinstance(meta.get("words"), list) and len(meta.get("words")) > 0:
+                        transcript_has_words = True
+                except Exception:
+                    transcript_has_words = False
+        except Exception:
+            # Non-fatal - we'll rely on gcs_uri/gcs_url if DB check fails
+            transcript_has_words = False
 
-            if media_item:
-                if can_mark_ready:
-                    media_item.transcript_ready = True
-                    # CRITICAL FIX: Store GCS transcript location in MediaItem so worker can find it
-                    # Worker looks for this during assembly when episode.meta_json doesn't have it
-                    transcript_meta = {
-                        "gcs_uri": gcs_uri,
-                        "gcs_url": gcs_url,
-                        "bucket": bucket,
-                        "key": key,
-                        "stem": stem,
-                        "safe_stem": safe_stem,
-                    }
-                    media_item.transcript_meta_json = json.dumps(transcript_meta)
-                    session.add(media_item)
-                    session.commit()
+        can_mark_ready = bool(gcs_uri or gcs_url or transcript_has_words)
 
-                    if transcript_has_words:
-                        logging.info("[transcription] ✅ Marked MediaItem %s as transcript_ready (words=%d, gcs_uri=%s)", media_item.id, len(words), gcs_uri)
-                    else:
-                        logging.info("[transcription] ✅ Marked MediaItem %s as transcript_ready (gcs present: %s)", media_item.id, gcs_uri)
+        # CRITICAL FIX: Use original_filename (GCS URL) not local filename
+        # When GCS files are downloaded for transcription, `filename` becomes the local name
+        # But MediaItem.filename stores the GCS URL, so we must use original_filename
+        media_item = session.exec(
+            select(MediaItem).where(MediaItem.filename == original_filename)
+        ).first()
+
+        if media_item:
+            if can_mark_ready:
+                media_item.transcript_ready = True
+                # CRITICAL FIX: Store GCS transcript location in MediaItem so worker can find it
+                # Worker looks for this during assembly when episode.meta_json doesn't have it
+                transcript_meta = {
+                    "gcs_uri": gcs_uri,
+                    "gcs_url": gcs_url,
+                    "bucket": bucket,
+                    "key": key,
+                    "stem": stem,
+                    "safe_stem": safe_stem,
+                }
+                media_item.transcript_meta_json = json.dumps(transcript_meta)
+                session.add(media_item)
+                session.commit()
+
+                if transcript_has_words:
+                    logging.info("[transcription] ✅ Marked MediaItem %s as transcript_ready (words=%d, gcs_uri=%s)", media_item.id, len(words), gcs_uri)
                 else:
-                    # DO NOT mark as ready if we have no durable transcript
-                    logging.warning(
-                        "[transcription] ⚠️ Transcript NOT persisted for %s - not marking MediaItem %s as ready (gcs_uri=%s, gcs_url=%s, words_in_db=%s)",
-                        filename,
-                        media_item.id,
-                        bool(gcs_uri),
-                        bool(gcs_url),
-                        transcript_has_words,
-                    )
+                    logging.info("[transcription] ✅ Marked MediaItem %s as transcript_ready (gcs present: %s)", media_item.id, gcs_uri)
             else:
-                logging.warning("[transcription] ⚠️ Could not find MediaItem for filename=%s", filename)
-        except Exception as mark_err:
-            logging.error("[transcription] ❌ Failed to determine/mark MediaItem transcript readiness: %s", mark_err, exc_info=True)
-            # Don't fail the entire transcription if this fails
-
-        # ========== CHARGE CREDITS FOR TRANSCRIPTION (AFTER SUCCESS) ==========
-        # Only charge if transcription succeeded - failures are on us
-        if user_id:
-            try:
-                from api.core.database import get_session
-                from api.models.user import User
-                from sqlmodel import select
-                
-                session = next(get_session())
-                user = session.exec(select(User).where(User.id == user_id)).first()
-                
-                if user:
-                    # Use local_name (the audio file that was transcribed)
-                    # local_name could be a full path or just a filename
-                    if Path(local_name).is_absolute():
-                        audio_path = Path(local_name)
-                    else:
-                        audio_path = MEDIA_DIR / local_name
-                    _charge_for_successful_transcription(user, audio_path, use_auphonic=False)
-            except Exception as charge_err:
-                logging.warning("[transcription] ⚠️ Failed to charge after success (non-fatal): %s", charge_err)
-        # ========== END CREDIT CHARGING ==========
-
-        notify_watchers_processed(filename)
-        return words
-    except Exception as exc:
-        mark_watchers_failed(filename, str(exc))
+                # DO NOT mark as ready if we have no durable transcript
+                logging.warning(
+                    "[transcription] ⚠️ Transcript NOT persisted for %s - not marking MediaItem %s as ready (gcs_uri=%s, gcs_url=%s, words_in_db=%s)",
+                    filename,
+                    media_item.id,
+                    bool(gcs_uri),
+                    bool(gcs_url),
+                    transcript_has_words,
+                )
+        else:
+            logging.warning("[transcription] ⚠️ Could not find MediaItem for filename=%s", filename)
+    except Exception as mark_err:
+        logging.error("[transcription] ❌ Failed to determine/mark MediaItem transcript readiness: %s", mark_err, exc_info=True)
+        # Don't fail the entire transcription if this fails
+
+    # ========== CHARGE CREDITS FOR TRANSCRIPTION (AFTER SUCCESS) ==========
+    # Only charge if transcription succeeded - failures are on us
+    if user_id:
         try:
-            from api.core import database as db
-            from api.models.podcast import MediaItem
-            from sqlmodel import Session, select
+            from api.core.database import get_session
+            from api.models.user import User
+            from sqlmodel import select
+            
+            session = next(get_session())
+            user = session.exec(select(User).where(User.id == user_id)).first()
+            
+            if user:
+                # Use local_name (the audio file that was transcribed)
+                # local_name could be a full path or just a filename
+                if Path(local_name).is_absolute():
+                    audio_path = Path(local_name)
+                else:
+                    audio_path = MEDIA_DIR / local_name
+                _charge_for_successful_transcription(user, audio_path, use_auphonic=False)
+        except Exception as charge_err:
+            logging.warning("[transcription] ⚠️ Failed to charge after success (non-fatal): %s", charge_err)
+    # ========== END CREDIT CHARGING ==========
 
-            with Session(db.engine) as session:
-                item = session.exec(
-                    select(MediaItem).where(MediaItem.filename == filename)
-                ).first()
-                if item:
-                    session.delete(item)
-                    session.commit()
-        except Exception:
-            logging.warning(
-                "[transcription] Failed to roll back media item after transcription error",
-                exc_info=True,
-            )
-        try:
-            (MEDIA_DIR / filename).unlink(missing_ok=True)
-        except Exception:
-            pass
-        raise
-    finally:
-        if delete_after:
-            try:
-                (MEDIA_DIR / local_name).unlink(missing_ok=True)
-            except Exception:
-                pass
+    notify_watchers_processed(filename)
+    return words
+
+
+def _fail_transcription(filename: str, exc: BaseException) -> None:
+    """Mark watchers failed and roll back the upload after a transcription error."""
+    mark_watchers_failed(filename, str(exc))
+    try:
+        from api.core import database as db
+        from api.models.podcast import MediaItem
+        from sqlmodel import Session, select
+
+        with Session(db.engine) as session:
+            item = session.exec(
+                select(MediaItem).where(MediaItem.filename == filename)
+            ).first()
+            if item:
+                session.delete(item)
+                session.commit()
+    except Exception:
+        logging.warning(
+            "[transcription] Failed to roll back media item after transcription error",
+            exc_info=True,
+        )
+    try:
+        (MEDIA_DIR / filename).unlink(missing_ok=True)
+    except Exception:
+        pass
 
 
 # Re-export frequently used helper modules for compatibility with legacy imports
 from . import assemblyai_client  # noqa: E402  # isort: skip
 from . import transcription_runner  # noqa: E402  # isort: skip
+from . import completion  # noqa: E402  # isort: skip
 
 
 __all__ = [
     "TranscriptionError",
     "get_word_timestamps",
     "transcribe_media_file",
+    "finish_pending_transcription",
     "load_media_transcript_metadata_for_filename",
     "assemblyai_client",
     "transcription_runner",
+    "completion",
 ]
 
@@ -0,0 +1,282 @@
+"""Event-driven completion for submitted AssemblyAI transcripts.
+
+Submitting a transcript returns as soon as AssemblyAI has accepted the job;
+:data:`transcription_tracker` then follows it to completion:
+
+- a webhook (``POST /api/assemblyai/webhook``) makes the job due immediately;
+- one background event loop polls every outstanding job that is due, on a
+  single pooled ``httpx.AsyncClient`` with per-job backoff, so hundreds of
+  in-flight transcripts cost one thread instead of one sleeping thread each;
+- continuations (transcript persistence, watcher notification) run on a small
+  thread pool once a transcript completes, fails or times out.
+
+Jobs submitted with a webhook are still polled, rarely, as a safety net for
+lost deliveries. The tracker only lives as long as this instance; submissions
+are also recorded in the database (see ``pending``) so a webhook landing on
+another instance, or the resume sweep, can finish them after it is gone.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from .assemblyai_client import AssemblyAITranscriptionError
+from .types import TranscriptResp
+
+log = logging.getLogger("transcription.completion")
+
+OnComplete = Callable[[TranscriptResp], None]
+OnError = Callable[[BaseException], None]
+
+# Webhooks that arrive before track() (ids only) are remembered this long.
+_EARLY_WEBHOOKS = 512
+
+
+def _continuation_workers() -> int:
+    try:
+        return max(1, int(os.getenv("TRANSCRIPTION_CONTINUATION_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+@dataclass
+class _Tracked:
+    transcript_id: str
+    api_key: str
+    base_url: str
+    deadline: float
+    interval: float
+    max_interval: float
+    backoff: float
+    next_poll: float
+    on_complete: OnComplete
+    on_error: OnError
+    busy: bool = False
+
+
+class TranscriptionTracker:
+    """Follows submitted transcripts to completion on one shared event loop."""
+
+    def __init__(
+        self,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_concurrent_polls: int = 16,
+        continuation_workers: Optional[int] = None,
+    ) -> None:
+        self._transport = transport
+        self._max_polls = max(1, max_concurrent_polls)
+        self._workers = continuation_workers
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._jobs: Dict[str, _Tracked] = {}
+        self._early: "collections.OrderedDict[str, None]" = collections.OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -- public API (any thread) --
+    def track(
+        self,
+        transcript_id: str,
+        *,
+        api_key: str,
+        base_url: str,
+        timeout_s: float,
+        on_complete: OnComplete,
+        on_error: OnError,
+        interval_s: float = 5.0,
+        max_interval_s: float = 30.0,
+        backoff: float = 1.5,
+    ) -> None:
+        """Start following ``transcript_id``; exactly one continuation will run."""
+        self._ensure_started()
+        now = time.monotonic()
+        interval = max(0.25, float(interval_s))
+        job = _Tracked(
+            transcript_id=transcript_id,
+            api_key=api_key.strip(),
+            base_url=base_url.rstrip("/"),
+            deadline=now + max(0.0, float(timeout_s)),
+            interval=interval,
+            max_interval=max(interval, float(max_interval_s)),
+            backoff=max(1.0, float(backoff)),
+            next_poll=now + interval,
+            on_complete=on_complete,
+            on_error=on_error,
+        )
+        with self._lock:
+            if transcript_id in self._early:  # its webhook beat us here
+                del self._early[transcript_id]
+                job.next_poll = now
+            self._jobs[transcript_id] = job
+        self._poke()
+        log.info("[assemblyai] tracking transcript id=%s in_flight=%d", transcript_id, self.pending())
+
+    def deliver(self, payload: Dict[str, Any]) -> bool:
+        """Handle a webhook notification; True if this instance tracks the job."""
+        transcript_id = str(payload.get("id") or payload.get("transcript_id") or "").strip()
+        if not transcript_id:
+            return False
+        with self._lock:
+            job = self._jobs.get(transcript_id)
+            if job is None:
+                self._early[transcript_id] = None
+                while len(self._early) > _EARLY_WEBHOOKS:
+                    self._early.popitem(last=False)
+                return False
+            # The webhook only signals a state change; fetch the transcript now.
+            job.next_poll = 0.0
+        self._poke()
+        return True
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def is_tracking(self, transcript_id: str) -> bool:
+        with self._lock:
+            return transcript_id in self._jobs
+
+    # -- event loop --
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+
+            def _run() -> None:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._loop = loop
+                self._wake = asyncio.Event()
+                ready.set()
+                loop.run_until_complete(self._poller())
+
+            self._executor = self._executor or ThreadPoolExecutor(
+                max_workers=self._workers or _continuation_workers(),
+                thread_name_prefix="transcription-continuation",
+            )
+            self._thread = threading.Thread(target=_run, name="assemblyai-tracker", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def _poke(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            loop.call_soon_threadsafe(wake.set)
+
+    def _collect(self, now: float):
+        due: List[_Tracked] = []
+        expired: List[_Tracked] = []
+        next_at: Optional[float] = None
+        with self._lock:
+            for job in self._jobs.values():
+                if job.busy:
+                    continue
+                if now >= job.deadline:
+                    job.busy = True
+                    expired.append(job)
+                elif now >= job.next_poll:
+                    job.busy = True
+                    job.next_poll = job.deadline  # reset to 0.0 by a webhook mid-poll
+                    due.append(job)
+                else:
+                    wake_at = min(job.next_poll, job.deadline)
+                    next_at = wake_at if next_at is None else min(next_at, wake_at)
+        return due, expired, next_at
+
+    async def _poller(self) -> None:
+        assert self._wake is not None
+        limiter = asyncio.Semaphore(self._max_polls)
+        polls: set = set()
+        async with httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=self._max_polls, max_keepalive_connections=self._max_polls),
+        ) as client:
+            while True:
+                self._wake.clear()
+                due, expired, next_at = self._collect(time.monotonic())
+                for job in expired:
+                    self._resolve(job, job.on_error, AssemblyAITranscriptionError("AssemblyAI transcription timed out"))
+                for job in due:
+                    task = asyncio.create_task(self._poll(client, limiter, job))
+                    polls.add(task)
+                    task.add_done_callback(polls.discard)
+                timeout = None if next_at is None else max(0.0, next_at - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll(self, client: httpx.AsyncClient, limiter: asyncio.Semaphore, job: _Tracked) -> None:
+        async with limiter:
+            try:
+                resp = await client.get(
+                    f"{job.base_url}/transcript/{job.transcript_id}",
+                    headers={"authorization": job.api_key},
+                )
+            except httpx.HTTPError as exc:
+                log.warning("[assemblyai] poll failed id=%s err=%s (will retry)", job.transcript_id, exc)
+                self._reschedule(job)
+                return
+        if resp.status_code == 401:
+            self._resolve(job, job.on_error, AssemblyAITranscriptionError(
+                "Polling failed: 401 Unauthorized. ASSEMBLYAI_API_KEY missing/invalid or not loaded by the server."
+            ))
+            return
+        if resp.status_code != 200:
+            log.warning("[assemblyai] poll status=%s id=%s (will retry)", resp.status_code, job.transcript_id)
+            self._reschedule(job)
+            return
+        try:
+            data: TranscriptResp = resp.json()
+        except ValueError:
+            log.warning("[assemblyai] poll returned non-JSON id=%s (will retry)", job.transcript_id)
+            self._reschedule(job)
+            return
+        status = data.get("status")
+        log.info("[assemblyai] poll status=%s id=%s", status, job.transcript_id)
+        if status == "completed":
+            self._resolve(job, job.on_complete, data)
+        elif status == "error":
+            self._resolve(job, job.on_error, AssemblyAITranscriptionError(f"AssemblyAI error: {data.get('error')}"))
+        else:
+            self._reschedule(job)
+
+    def _reschedule(self, job: _Tracked) -> None:
+        with self._lock:
+            if job.next_poll != 0.0:  # a webhook arrived mid-poll: look again now
+                job.next_poll = time.monotonic() + job.interval
+                job.interval = min(job.interval * job.backoff, job.max_interval)
+            job.busy = False
+        self._poke()
+
+    def _resolve(self, job: _Tracked, continuation: Callable[[Any], None], arg: Any) -> None:
+        with self._lock:
+            self._jobs.pop(job.transcript_id, None)
+        assert self._executor is not None
+        self._executor.submit(self._run_continuation, job.transcript_id, continuation, arg)
+
+    @staticmethod
+    def _run_continuation(transcript_id: str, continuation: Callable[[Any], None], arg: Any) -> None:
+        try:
+            continuation(arg)
+        except Exception:
+            log.exception("[assemblyai] continuation failed id=%s", transcript_id)
+
+
+transcription_tracker = TranscriptionTracker()
+
+__all__ = ["TranscriptionTracker", "transcription_tracker"]
@@ -0,0 +1,224 @@
+"""Database record of submitted AssemblyAI transcripts.
+
+The in-memory :data:`~.completion.transcription_tracker` only lives as long as
+the instance that submitted the job, and Cloud Run may scale that instance away
+(or stop giving it CPU) long before AssemblyAI finishes. Every async submission
+is therefore recorded as a :class:`PendingTranscription` row, and whichever
+instance gets to it first finishes it:
+
+- the submitting instance, through its tracker continuation;
+- any instance receiving the AssemblyAI webhook for a transcript it does not
+  track (:func:`notify_webhook` enqueues ``/api/tasks/transcription/finish``);
+- the ``/api/tasks/maintenance/resume-transcriptions`` sweep, for rows nobody
+  touched for ``TRANSCRIPTION_RESUME_AFTER_S``.
+
+Finishing claims the row with a lease (``submitted`` -> ``finishing``), so the
+transcript is persisted and charged once even when several of these race.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+
+from api.core.database import session_scope
+from api.models.transcription import PendingTranscription
+
+log = logging.getLogger("transcription.pending")
+
+TASK_PATH = "/api/tasks/transcription/finish"
+OPEN_STATUSES = ("submitted", "finishing")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _lease_s() -> int:
+    return max(60, _env_int("TRANSCRIPTION_FINISH_LEASE_S", 600))
+
+
+def resume_after_s() -> int:
+    """Idle time after which the sweep checks a row (the tracker polls well within it)."""
+    return max(60, _env_int("TRANSCRIPTION_RESUME_AFTER_S", 300))
+
+
+def timeout_s() -> int:
+    """Age at which a transcript AssemblyAI is still working on is given up."""
+    return _env_int("TRANSCRIPTION_TIMEOUT_S", 7200)
+
+
+def record_submitted(
+    transcript_id: str,
+    *,
+    filename: str,
+    user_id: Optional[str],
+    local_name: str,
+    context: Dict[str, Any],
+) -> None:
+    """Record a submitted transcript; failures only cost the cross-instance safety net."""
+    try:
+        with session_scope() as session:
+            session.add(PendingTranscription(
+                transcript_id=transcript_id,
+                filename=filename,
+                user_id=str(user_id) if user_id else None,
+                local_name=local_name,
+                context_json=json.dumps(context, default=str),
+            ))
+            session.commit()
+    except Exception as exc:
+        log.warning("event=transcription.pending.record_failed id=%s err=%s", transcript_id, exc)
+
+
+def load(transcript_id: str) -> Optional[PendingTranscription]:
+    with session_scope() as session:
+        return session.get(PendingTranscription, transcript_id)
+
+
+def claim(transcript_id: str) -> bool:
+    """Take the right to persist ``transcript_id``; False if another run holds or finished it.
+
+    Transcripts without a row (recording failed) are claimable, and so is
+    everything when the database is unreachable: the in-memory tracker is then
+    the only one following the job.
+    """
+    now = datetime.utcnow()
+    try:
+        with session_scope() as session:
+            result = session.execute(
+                update(PendingTranscription)
+                .where(
+                    PendingTranscription.transcript_id == transcript_id,
+                    or_(
+                        PendingTranscription.status == "submitted",
+                        and_(
+                            PendingTranscription.status == "finishing",
+                            or_(PendingTranscription.lease_until.is_(None), PendingTranscription.lease_until < now),  # type: ignore[union-attr]
+                        ),
+                    ),
+                )
+                .values(status="finishing", lease_until=now + timedelta(seconds=_lease_s()), updated_at=now)
+            )
+            session.commit()
+            if result.rowcount == 1:
+                return True
+            return session.get(PendingTranscription, transcript_id) is None
+    except Exception as exc:
+        log.warning("event=transcription.pending.claim_failed id=%s err=%s", transcript_id, exc)
+        return True
+
+
+def mark_finished(transcript_id: str, status: str, error: Optional[str] = None) -> None:
+    """Close a claimed row as ``completed`` or ``failed``."""
+    now = datetime.utcnow()
+    try:
+        with session_scope() as session:
+            session.execute(
+                update(PendingTranscription)
+                .where(PendingTranscription.transcript_id == transcript_id)
+                .values(status=status, lease_until=None, error=error[:500] if error else None, updated_at=now)
+            )
+            session.commit()
+    except Exception as exc:
+        log.warning("event=transcription.pending.mark_failed id=%s status=%s err=%s", transcript_id, status, exc)
+
+
+def touch(transcript_id: str) -> None:
+    """Note that a run looked at a still-processing transcript (defers the sweep)."""
+    try:
+        with session_scope() as session:
+            session.execute(
+                update(PendingTranscription)
+                .where(PendingTranscription.transcript_id == transcript_id, PendingTranscription.status == "submitted")
+                .values(updated_at=datetime.utcnow())
+            )
+            session.commit()
+    except Exception as exc:
+        log.warning("event=transcription.pending.touch_failed id=%s err=%s", transcript_id, exc)
+
+
+def enqueue_finish(transcript_id: str) -> str:
+    """Finish a transcript elsewhere: a Cloud Task in production, a thread locally."""
+    from infrastructure.tasks_client import enqueue_http_task, should_use_cloud_tasks
+
+    if should_use_cloud_tasks():
+        created = enqueue_http_task(TASK_PATH, {"transcript_id": transcript_id})
+        return str(created.get("name") or "")
+
+    def _runner() -> None:
+        from api.services.transcription import finish_pending_transcription
+
+        try:
+            finish_pending_transcription(transcript_id)
+        except Exception:
+            log.exception("event=transcription.pending.local_finish_failed id=%s", transcript_id)
+
+    threading.Thread(target=_runner, name=f"transcription-finish-{transcript_id}", daemon=True).start()
+    return f"local-transcription-finish-{transcript_id}"
+
+
+def notify_webhook(payload: Dict[str, Any]) -> bool:
+    """Webhook for a transcript this instance does not track: finish it if it is pending."""
+    transcript_id = str(payload.get("id") or payload.get("transcript_id") or "").strip()
+    if not transcript_id:
+        return False
+    try:
+        row = load(transcript_id)
+    except Exception as exc:
+        log.warning("event=transcription.pending.lookup_failed id=%s err=%s", transcript_id, exc)
+        return False
+    if row is None or row.status not in OPEN_STATUSES:
+        return False
+    try:
+        enqueue_finish(transcript_id)
+    except Exception as exc:
+        # The resume sweep picks it up.
+        log.warning("event=transcription.pending.enqueue_failed id=%s err=%s", transcript_id, exc)
+    return True
+
+
+def resume_stale(session: Session, limit: int = 50) -> List[str]:
+    """Enqueue a finish for open rows nobody has touched recently (or whose lease lapsed)."""
+    now = datetime.utcnow()
+    rows = session.exec(
+        select(PendingTranscription)
+        .where(
+            PendingTranscription.status.in_(OPEN_STATUSES),  # type: ignore[attr-defined]
+            or_(PendingTranscription.lease_until.is_(None), PendingTranscription.lease_until < now),  # type: ignore[union-attr]
+            PendingTranscription.updated_at < now - timedelta(seconds=resume_after_s()),
+        )
+        .order_by(PendingTranscription.updated_at)
+        .limit(limit)
+    ).all()
+    resumed: List[str] = []
+    for row in rows:
+        try:
+            enqueue_finish(row.transcript_id)
+            resumed.append(row.transcript_id)
+        except Exception as exc:
+            log.warning("event=transcription.pending.resume_failed id=%s err=%s", row.transcript_id, exc)
+    return resumed
+
+
+__all__ = [
+    "OPEN_STATUSES",
+    "TASK_PATH",
+    "claim",
+    "enqueue_finish",
+    "load",
+    "mark_finished",
+    "notify_webhook",
+    "record_submitted",
+    "resume_stale",
+    "touch",
+]
@@ -2,7 +2,7 @@ from __future__ import annotations
 import time
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, cast
 
 from .assemblyai_client import (
     upload_audio,
@@ -12,6 +12,7 @@ from .assemblyai_client import (
     get_http_session,
 )
 from .assemblyai_webhook import webhook_manager
+from .completion import TranscriptionTracker, transcription_tracker
 from .types import RunnerCfg, TranscriptResp, NormalizedResult
 
 
@@ -130,15 +131,11 @@ def _normalize_completed_transcript(data: TranscriptResp) -> NormalizedResult:
     return {"words": results}
 
 
-def run_assemblyai_job(audio_path: Path, cfg: RunnerCfg, log: List[str]) -> NormalizedResult:
+def _submit_assemblyai_job(audio_path: Path, cfg: RunnerCfg, log: List[str]) -> str:
+    """Upload ``audio_path`` and create the transcript; returns the transcript id."""
     api_key: str = cfg.get("api_key") or ""
     base_url: str = cfg.get("base_url") or "https://api.assemblyai.com/v2"
     params: Dict[str, Any] = dict(cfg.get("params") or {})
-    polling: Dict[str, Any] = dict(cfg.get("polling") or {})
-    base_interval: float = max(0.25, float(polling.get("interval_s", 1.0)))
-    timeout_s: float = float(polling.get("timeout_s", 1800.0))
-    backoff: float = float(polling.get("backoff", 1.5))
-    max_interval: float = float(polling.get("max_interval_s", max(base_interval, 5.0)))
     webhook_cfg: Dict[str, Any] = dict(cfg.get("webhook") or {})
     webhook_url: Optional[str] = webhook_cfg.get("url")
     use_webhook = bool(webhook_url)
@@ -146,7 +143,6 @@ def run_assemblyai_job(audio_path: Path, cfg: RunnerCfg, log: List[str]) -> Norm
     webhook_header_name: Optional[str] = webhook_cfg.get("auth_header_name") or "X-AssemblyAI-Signature"
     webhook_header_value: Optional[str] = webhook_cfg.get("auth_header_value") or webhook_secret
     webhook_events = webhook_cfg.get("events")
-    webhook_wait_override = webhook_cfg.get("wait_timeout_s")
     if not api_key or api_key == "YOUR_API_KEY_HERE":
         raise AssemblyAITranscriptionError("AssemblyAI API key not configured")
     if not audio_path.exists():
@@ -178,6 +174,73 @@ def run_assemblyai_job(audio_path: Path, cfg: RunnerCfg, log: List[str]) -> Norm
         logging.info("[assemblyai] created transcript id=%s", transcript_id)
     except Exception:
         pass
+    return transcript_id
+
+
+def start_assemblyai_job(
+    audio_path: Path,
+    cfg: RunnerCfg,
+    log: List[str],
+    *,
+    on_complete: Callable[[NormalizedResult], None],
+    on_error: Callable[[BaseException], None],
+    tracker: Optional[TranscriptionTracker] = None,
+    on_submitted: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Submit a transcript and return its id without waiting for the result.
+
+    Completion is detected by the shared tracker (webhook or multiplexed
+    polling); exactly one of ``on_complete`` / ``on_error`` then runs on a
+    continuation thread. ``on_submitted`` receives the transcript id before
+    tracking starts. Submission errors are raised to the caller.
+    """
+    polling: Dict[str, Any] = dict(cfg.get("polling") or {})
+    webhook_cfg: Dict[str, Any] = dict(cfg.get("webhook") or {})
+    base_interval = max(0.25, float(polling.get("interval_s", 1.0)))
+    max_interval = float(polling.get("max_interval_s", max(base_interval, 5.0)))
+    if webhook_cfg.get("url"):
+        # The webhook normally wakes the job; polling is only a safety net.
+        base_interval = max_interval = max(max_interval, float(webhook_cfg.get("poll_interval_s", 60.0)))
+    transcript_id = _submit_assemblyai_job(audio_path, cfg, log)
+    if on_submitted is not None:
+        on_submitted(transcript_id)
+
+    def _completed(data: TranscriptResp) -> None:
+        try:
+            result = _normalize_completed_transcript(data)
+        except Exception as exc:
+            on_error(exc)
+            return
+        on_complete(result)
+
+    (tracker or transcription_tracker).track(
+        transcript_id,
+        api_key=cfg.get("api_key") or "",
+        base_url=cfg.get("base_url") or "https://api.assemblyai.com/v2",
+        timeout_s=float(polling.get("timeout_s", 1800.0)),
+        on_complete=_completed,
+        on_error=on_error,
+        interval_s=base_interval,
+        max_interval_s=max_interval,
+        backoff=float(polling.get("backoff", 1.5)),
+    )
+    return transcript_id
+
+
+def run_assemblyai_job(audio_path: Path, cfg: RunnerCfg, log: List[str]) -> NormalizedResult:
+    """Submit a transcript and block until it completes (see :func:`start_assemblyai_job`)."""
+    api_key: str = cfg.get("api_key") or ""
+    base_url: str = cfg.get("base_url") or "https://api.assemblyai.com/v2"
+    polling: Dict[str, Any] = dict(cfg.get("polling") or {})
+    base_interval: float = max(0.25, float(polling.get("interval_s", 1.0)))
+    timeout_s: float = float(polling.get("timeout_s", 1800.0))
+    backoff: float = float(polling.get("backoff", 1.5))
+    max_interval: float = float(polling.get("max_interval_s", max(base_interval, 5.0)))
+    webhook_cfg: Dict[str, Any] = dict(cfg.get("webhook") or {})
+    use_webhook = bool(webhook_cfg.get("url"))
+    webhook_wait_override = webhook_cfg.get("wait_timeout_s")
+    transcript_id = _submit_assemblyai_job(audio_path, cfg, log)
+    http = get_http_session()
     data: Optional[TranscriptResp] = None
     wait_timeout = timeout_s
     if use_webhook:
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 
 from ..core.config import settings
 from api.core.paths import MEDIA_DIR
@@ -13,14 +13,8 @@ class AssemblyAITranscriptionError(Exception):
     pass
 
 
-def assemblyai_transcribe_with_speakers(filename: str, timeout_s: int = 7200) -> List[Dict[str, Any]]:
-    """Build runner configuration (including adaptive polling + optional webhook) and execute.
-    
-    Default timeout increased to 7200s (2 hours) to support long-form content (1-2+ hour episodes).
-    AssemblyAI processes at ~10x speed, so 2hr timeout allows 20hr audio or slower processing.
-    """
-    from .transcription.transcription_runner import run_assemblyai_job  # local import to avoid circular import
-    from .transcription.assemblyai_client import AssemblyAITranscriptionError as RunnerClientError
+def _runner_cfg(filename: str, timeout_s: int) -> tuple[Path, Dict[str, Any]]:
+    """Resolve the audio path and build the runner configuration (polling + optional webhook)."""
     api_key = settings.ASSEMBLYAI_API_KEY
     
     # Debug logging for API key
@@ -78,6 +72,19 @@ def assemblyai_transcribe_with_speakers(filename: str, timeout_s: int = 7200) ->
     if webhook_cfg:
         cfg["webhook"] = webhook_cfg
 
+    return audio_path, cfg
+
+
+def assemblyai_transcribe_with_speakers(filename: str, timeout_s: int = 7200) -> List[Dict[str, Any]]:
+    """Build runner configuration (including adaptive polling + optional webhook) and execute.
+    
+    Default timeout increased to 7200s (2 hours) to support long-form content (1-2+ hour episodes).
+    AssemblyAI processes at ~10x speed, so 2hr timeout allows 20hr audio or slower processing.
+    """
+    from .transcription.transcription_runner import run_assemblyai_job  # local import to avoid circular import
+    from .transcription.assemblyai_client import AssemblyAITranscriptionError as RunnerClientError
+    audio_path, cfg = _runner_cfg(filename, timeout_s)
+
     # Delegate to the runner; rewrap errors into legacy exception class to preserve type
     try:
         out = run_assemblyai_job(audio_path, cfg, log=[])  # type: ignore[arg-type]
@@ -88,4 +95,41 @@ def assemblyai_transcribe_with_speakers(filename: str, timeout_s: int = 7200) ->
     words = list(out.get("words") or [])
     return words
 
-__all__ = ["assemblyai_transcribe_with_speakers", "AssemblyAITranscriptionError"]
+
+def start_assemblyai_transcription(
+    filename: str,
+    *,
+    on_complete: Callable[[List[Dict[str, Any]]], None],
+    on_error: Callable[[BaseException], None],
+    on_submitted: Callable[[str], None] | None = None,
+    timeout_s: int = 7200,
+) -> str:
+    """Submit ``filename`` and return the transcript id immediately.
+
+    The words are delivered to ``on_complete`` (or the failure to ``on_error``)
+    on a continuation thread once the transcript finishes; see
+    ``transcription.completion``. ``on_submitted`` gets the id before tracking
+    starts.
+    """
+    from .transcription.transcription_runner import start_assemblyai_job  # local import to avoid circular import
+    from .transcription.assemblyai_client import AssemblyAITranscriptionError as RunnerClientError
+    audio_path, cfg = _runner_cfg(filename, timeout_s)
+
+    def _failed(exc: BaseException) -> None:
+        if isinstance(exc, RunnerClientError):
+            exc = AssemblyAITranscriptionError(str(exc))
+        on_error(exc)
+
+    try:
+        return start_assemblyai_job(
+            audio_path,
+            cfg,  # type: ignore[arg-type]
+            log=[],
+            on_complete=lambda out: on_complete(list(out.get("words") or [])),
+            on_error=_failed,
+            on_submitted=on_submitted,
+        )
+    except RunnerClientError as e:
+        raise AssemblyAITranscriptionError(str(e))
+
+__all__ = ["assemblyai_transcribe_with_speakers", "start_assemblyai_transcription", "AssemblyAITranscriptionError"]
@@ -0,0 +1,373 @@
+"""Rendered snapshots of published public websites.
+
+Rendering a site (``GET /api/sites/{subdomain}``) reads the website, podcast,
+pages and every published episode, wraps each audio URL for OP3 and signs R2
+cover and logo URLs. Visits vastly outnumber edits, so the rendered
+``PublicWebsiteResponse`` JSON is kept as an immutable snapshot per subdomain in
+up to three tiers:
+
+- an in-process LRU (``SITE_SNAPSHOT_MAX_ENTRIES``, default 512),
+- Redis (``site:snapshot:*``), shared by every API instance, and
+- optionally object storage (``SITE_SNAPSHOT_STORAGE=1``, under
+  ``site-snapshots/``), which survives Redis evictions and restarts.
+
+Each snapshot records the versions of its podcast and website.
+``invalidate_site()`` bumps them; ``api.db_listeners`` calls it after any commit
+that touches an episode, podcast, website or website page. A snapshot whose
+version is behind, or that is older than ``SITE_SNAPSHOT_TTL_S`` (default 6h;
+signed URLs inside are valid for 24h; ``0`` disables snapshots), is still served
+for up to ``SITE_SNAPSHOT_STALE_S`` (default 10 min) more while one background
+render replaces it. Only a missing or long-stale snapshot renders inline.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, Optional, Set
+
+from sqlmodel import Session
+
+from api.core.redis_client import get_redis_client, redis_delete, redis_get, redis_incr, redis_setex
+
+log = logging.getLogger("api.services.website_snapshot")
+
+DEFAULT_TTL_S = 6 * 60 * 60
+DEFAULT_STALE_S = 10 * 60
+DEFAULT_MAX_ENTRIES = 512
+
+_VERSION_KEY = "site:snapshot:ver:{kind}:{id}"
+_BODY_KEY = "site:snapshot:body:{subdomain}"
+_STORAGE_KEY = "site-snapshots/{subdomain}.json"
+
+
+class SiteUnavailable(Exception):
+    """The subdomain has no published website; ``detail`` explains why."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class RenderedSite:
+    """A freshly rendered site, with the version read before rendering began."""
+
+    podcast_id: str
+    website_id: str
+    version: str
+    body: str
+
+
+@dataclass(frozen=True)
+class SiteSnapshot:
+    subdomain: str
+    podcast_id: str
+    website_id: str
+    version: str
+    body: str
+    etag: str
+    last_modified: datetime
+    built_at: float
+
+    @property
+    def last_modified_header(self) -> str:
+        return format_datetime(self.last_modified, usegmt=True)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "subdomain": self.subdomain,
+                "podcast_id": self.podcast_id,
+                "website_id": self.website_id,
+                "version": self.version,
+                "body": self.body,
+                "etag": self.etag,
+                "last_modified": self.last_modified.timestamp(),
+                "built_at": self.built_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "SiteSnapshot":
+        data = json.loads(raw)
+        return cls(
+            subdomain=data["subdomain"],
+            podcast_id=data["podcast_id"],
+            website_id=data["website_id"],
+            version=data["version"],
+            body=data["body"],
+            etag=data["etag"],
+            last_modified=datetime.fromtimestamp(float(data["last_modified"]), tz=timezone.utc),
+            built_at=float(data["built_at"]),
+        )
+
+    @classmethod
+    def build(cls, subdomain: str, rendered: RenderedSite) -> "SiteSnapshot":
+        now = time.time()
+        digest = hashlib.sha256(rendered.body.encode("utf-8")).hexdigest()[:32]
+        return cls(
+            subdomain=subdomain,
+            podcast_id=rendered.podcast_id,
+            website_id=rendered.website_id,
+            version=rendered.version,
+            body=rendered.body,
+            etag=f'"{digest}"',
+            # HTTP dates have second resolution; truncate so If-Modified-Since round-trips.
+            last_modified=datetime.fromtimestamp(int(now), tz=timezone.utc),
+            built_at=now,
+        )
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        log.warning("event=site_snapshot.bad_env name=%s value=%s", name, raw)
+        return default
+
+
+def ttl_seconds() -> int:
+    return max(0, _env_int("SITE_SNAPSHOT_TTL_S", DEFAULT_TTL_S))
+
+
+def stale_seconds() -> int:
+    return max(0, _env_int("SITE_SNAPSHOT_STALE_S", DEFAULT_STALE_S))
+
+
+def _storage_enabled() -> bool:
+    return (os.getenv("SITE_SNAPSHOT_STORAGE") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, SiteSnapshot]" = OrderedDict()
+_local_versions: Dict[str, int] = {}
+_build_locks: Dict[str, threading.Lock] = {}
+_revalidating: Set[str] = set()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _version_part(kind: str, ident: str, redis_on: bool) -> str:
+    key = _VERSION_KEY.format(kind=kind, id=ident)
+    if redis_on:
+        return redis_get(key) or "0"
+    with _lock:
+        return str(_local_versions.get(key, 0))
+
+
+def current_version(podcast_id, website_id) -> str:
+    """Version tag that a snapshot of this podcast's website must match."""
+    redis_on = get_redis_client() is not None
+    podcast_part = _version_part("podcast", str(podcast_id), redis_on)
+    website_part = _version_part("website", str(website_id), redis_on)
+    return f"{'r' if redis_on else 'l'}{podcast_part}.{website_part}"
+
+
+def invalidate_site(*, podcast_id=None, website_id=None) -> None:
+    """Make snapshots that include this podcast or website stale."""
+    redis_on = get_redis_client() is not None
+    for kind, ident in (("podcast", podcast_id), ("website", website_id)):
+        if ident is None:
+            continue
+        key = _VERSION_KEY.format(kind=kind, id=ident)
+        with _lock:
+            _local_versions[key] = _local_versions.get(key, 0) + 1
+        if redis_on:
+            redis_incr(key)
+    log.debug("event=site_snapshot.invalidate podcast_id=%s website_id=%s", podcast_id, website_id)
+
+
+def forget_site(subdomain: str) -> None:
+    """Drop this instance's and the shared snapshot, e.g. once a site is unpublished."""
+    with _lock:
+        _entries.pop(subdomain, None)
+    if get_redis_client() is not None:
+        redis_delete(_BODY_KEY.format(subdomain=subdomain))
+    if _storage_enabled():
+        try:
+            from infrastructure import storage
+
+            storage.delete_blob("", _STORAGE_KEY.format(subdomain=subdomain))
+        except Exception as exc:
+            log.warning("event=site_snapshot.storage_delete_failed subdomain=%s err=%s", subdomain, exc)
+
+
+def clear_local_cache() -> None:
+    with _lock:
+        _entries.clear()
+        _local_versions.clear()
+        _build_locks.clear()
+        _revalidating.clear()
+
+
+def _local_get(subdomain: str) -> Optional[SiteSnapshot]:
+    with _lock:
+        entry = _entries.get(subdomain)
+        if entry is not None:
+            _entries.move_to_end(subdomain)
+        return entry
+
+
+def _local_put(entry: SiteSnapshot) -> None:
+    max_entries = max(1, _env_int("SITE_SNAPSHOT_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    with _lock:
+        _entries[entry.subdomain] = entry
+        _entries.move_to_end(entry.subdomain)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+
+
+def _shared_get(subdomain: str) -> Optional[SiteSnapshot]:
+    raw = redis_get(_BODY_KEY.format(subdomain=subdomain)) if get_redis_client() is not None else None
+    if not raw and _storage_enabled():
+        try:
+            from infrastructure import storage
+
+            raw = storage.download_bytes("", _STORAGE_KEY.format(subdomain=subdomain))
+        except Exception as exc:
+            log.warning("event=site_snapshot.storage_read_failed subdomain=%s err=%s", subdomain, exc)
+            raw = None
+    if not raw:
+        return None
+    try:
+        return SiteSnapshot.from_json(raw)
+    except Exception as exc:
+        log.warning("event=site_snapshot.bad_entry subdomain=%s err=%s", subdomain, exc)
+        return None
+
+
+def _is_fresh(entry: SiteSnapshot, ttl: int) -> bool:
+    return (
+        time.time() - entry.built_at <= ttl
+        and entry.version == current_version(entry.podcast_id, entry.website_id)
+    )
+
+
+def _publish(subdomain: str, rendered: RenderedSite, ttl: int) -> SiteSnapshot:
+    entry = SiteSnapshot.build(subdomain, rendered)
+    _local_put(entry)
+    if entry.version.startswith("r"):
+        redis_setex(_BODY_KEY.format(subdomain=subdomain), ttl + stale_seconds(), entry.to_json())
+    if _storage_enabled():
+        try:
+            from infrastructure import storage
+
+            storage.upload_bytes(
+                "",
+                _STORAGE_KEY.format(subdomain=subdomain),
+                entry.to_json().encode("utf-8"),
+                content_type="application/json",
+            )
+        except Exception as exc:
+            log.warning("event=site_snapshot.storage_write_failed subdomain=%s err=%s", subdomain, exc)
+    log.info(
+        "event=site_snapshot.render subdomain=%s version=%s bytes=%d",
+        subdomain,
+        entry.version,
+        len(entry.body),
+    )
+    return entry
+
+
+def _session_scope():
+    from api.core.database import session_scope
+
+    return session_scope()
+
+
+def _revalidate(subdomain: str, render: Callable[[Session], RenderedSite], ttl: int) -> None:
+    try:
+        with _session_scope() as session:
+            rendered = render(session)
+        _publish(subdomain, rendered, ttl)
+    except SiteUnavailable:
+        forget_site(subdomain)
+    except Exception as exc:
+        log.warning("event=site_snapshot.revalidate_failed subdomain=%s err=%s", subdomain, exc)
+    finally:
+        with _lock:
+            _revalidating.discard(subdomain)
+
+
+def _revalidate_in_background(subdomain: str, render: Callable[[Session], RenderedSite], ttl: int) -> None:
+    global _executor
+    with _lock:
+        if subdomain in _revalidating:
+            return
+        _revalidating.add(subdomain)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="site-snapshot")
+        executor = _executor
+    executor.submit(_revalidate, subdomain, render, ttl)
+
+
+def get_snapshot(subdomain: str, render: Callable[[Session], RenderedSite], session: Session) -> SiteSnapshot:
+    """Return the snapshot for ``subdomain``, rendering with ``render(session)`` only when needed.
+
+    ``render`` raises :class:`SiteUnavailable` for unknown or unpublished sites
+    and reads :func:`current_version` before it queries the rows it renders, so
+    a render that races with an edit is stored as already stale. Background
+    renders call it with a session of their own.
+    """
+    ttl = ttl_seconds()
+    if ttl <= 0:
+        return SiteSnapshot.build(subdomain, render(session))
+
+    entry = _local_get(subdomain)
+    if entry is not None and _is_fresh(entry, ttl):
+        return entry
+    # Another instance may already have rendered the current version.
+    shared = _shared_get(subdomain)
+    if shared is not None and (entry is None or shared.built_at > entry.built_at):
+        _local_put(shared)
+        entry = shared
+        if _is_fresh(entry, ttl):
+            return entry
+
+    if entry is not None and time.time() - entry.built_at <= ttl + stale_seconds():
+        _revalidate_in_background(subdomain, render, ttl)
+        return entry
+
+    with _lock:
+        build_lock = _build_locks.setdefault(subdomain, threading.Lock())
+    # Only one request per process renders a missing site; the rest wait and reuse it.
+    try:
+        with build_lock:
+            entry = _local_get(subdomain)
+            if entry is not None and _is_fresh(entry, ttl):
+                return entry
+            try:
+                rendered = render(session)
+            except SiteUnavailable:
+                forget_site(subdomain)
+                raise
+            return _publish(subdomain, rendered, ttl)
+    finally:
+        with _lock:
+            if _build_locks.get(subdomain) is build_lock:
+                _build_locks.pop(subdomain, None)
+
+
+__all__ = [
+    "RenderedSite",
+    "SiteSnapshot",
+    "SiteUnavailable",
+    "clear_local_cache",
+    "current_version",
+    "forget_site",
+    "get_snapshot",
+    "invalidate_site",
+    "stale_seconds",
+    "ttl_seconds",
+]
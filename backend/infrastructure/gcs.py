@@ -17,6 +17,8 @@ from datetime import timedelta
 from pathlib import Path
 from typing import IO, List, Optional
 
+from infrastructure.signed_url_cache import signed_url_cache
+
 try:  # pragma: no cover - the dependency is optional for local development
     from google.api_core import exceptions as gcs_exceptions
     from google.auth.exceptions import DefaultCredentialsError
@@ -375,6 +377,39 @@ def _generate_signed_url(
     method: str = "GET",
     content_type: Optional[str] = None,
     headers: Optional[dict] = None,
+) -> Optional[str]:
+    """Generate a signed URL, reusing a memoized one for plain GETs.
+
+    GET URLs without extra headers are memoized per signing window (see
+    ``infrastructure.signed_url_cache``); uploads are always signed fresh.
+    """
+    if method.upper() == "GET" and not content_type and not headers:
+        return signed_url_cache.get_or_sign(
+            "gcs",
+            bucket_name,
+            key,
+            "GET",
+            int(expires.total_seconds()),
+            lambda: _sign_url(bucket_name, key, expires=expires, method=method),
+        )
+    return _sign_url(
+        bucket_name,
+        key,
+        expires=expires,
+        method=method,
+        content_type=content_type,
+        headers=headers,
+    )
+
+
+def _sign_url(
+    bucket_name: str,
+    key: str,
+    *,
+    expires: timedelta,
+    method: str = "GET",
+    content_type: Optional[str] = None,
+    headers: Optional[dict] = None,
 ) -> Optional[str]:
     """Generate a signed URL, using service account credentials or IAM-based signing.
     
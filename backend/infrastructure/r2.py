@@ -12,13 +12,18 @@ R2 benefits over GCS:
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import logging
 import os
+import time
 from datetime import timedelta
 from pathlib import Path
-from typing import IO, Optional
+from typing import IO, Dict, Iterable, Optional, Tuple
 from urllib.parse import quote
 
+from infrastructure.signed_url_cache import signed_url_cache, window_start
+
 try:
     import boto3
     from botocore.client import Config
@@ -36,6 +41,17 @@ logger = logging.getLogger(__name__)
 _R2_CLIENT = None
 
 
+def _r2_credentials() -> Optional[Tuple[str, str, str]]:
+    """Return (account_id, access_key_id, secret_access_key) or None if incomplete."""
+    # CRITICAL: Strip whitespace - secrets from Google Secret Manager often have trailing newlines
+    account_id = os.getenv("R2_ACCOUNT_ID", "").strip()
+    access_key_id = os.getenv("R2_ACCESS_KEY_ID", "").strip()
+    secret_access_key = os.getenv("R2_SECRET_ACCESS_KEY", "").strip()
+    if not all([account_id, access_key_id, secret_access_key]):
+        return None
+    return account_id, access_key_id, secret_access_key
+
+
 def _get_r2_client():
     """Get or create cached boto3 S3 client configured for Cloudflare R2."""
     global _R2_CLIENT
@@ -48,17 +64,14 @@ def _get_r2_client():
         return None
     
     # Get R2 credentials from environment
-    # CRITICAL: Strip whitespace - secrets from Google Secret Manager often have trailing newlines
-    account_id = os.getenv("R2_ACCOUNT_ID", "").strip()
-    access_key_id = os.getenv("R2_ACCESS_KEY_ID", "").strip()
-    secret_access_key = os.getenv("R2_SECRET_ACCESS_KEY", "").strip()
-    
-    if not all([account_id, access_key_id, secret_access_key]):
+    credentials = _r2_credentials()
+    if credentials is None:
         logger.warning(
             "Missing R2 credentials (R2_ACCOUNT_ID, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY). "
             "R2 operations will fail."
         )
         return None
+    account_id, access_key_id, secret_access_key = credentials
     
     # R2 endpoint format: https://<account_id>.r2.cloudflarestorage.com
     endpoint_url = f"https://{account_id}.r2.cloudflarestorage.com"
@@ -273,6 +286,124 @@ def delete_blob(bucket_name: str, key: str) -> bool:
         return False
 
 
+# ---------------------------------------------------------------------------
+# Signed URLs
+#
+# GET URLs are presigned locally with SigV4 query auth (byte-for-byte what
+# botocore produces for the same timestamp) so a batch needs one signing-key
+# derivation and one HMAC per key instead of a full botocore request cycle per
+# URL. Signing happens at the start of the current signing window (see
+# infrastructure.signed_url_cache), which makes the URL stable across calls and
+# processes and lets it be memoized.
+# ---------------------------------------------------------------------------
+
+_SIGV4_ALGORITHM = "AWS4-HMAC-SHA256"
+_R2_REGION = "auto"
+
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _sigv4_signing_key(secret_access_key: str, datestamp: str) -> bytes:
+    k_date = _hmac_sha256(("AWS4" + secret_access_key).encode("utf-8"), datestamp)
+    k_region = _hmac_sha256(k_date, _R2_REGION)
+    k_service = _hmac_sha256(k_region, "s3")
+    return _hmac_sha256(k_service, "aws4_request")
+
+
+def _presign_get_urls(
+    bucket_name: str,
+    keys: Iterable[str],
+    expiration: int,
+    signed_at: int,
+    credentials: Tuple[str, str, str],
+) -> Dict[str, str]:
+    """Presign GET URLs for ``keys`` as of ``signed_at`` with one derived signing key."""
+    account_id, access_key_id, secret_access_key = credentials
+    host = f"{account_id}.r2.cloudflarestorage.com"
+    amz_date = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(signed_at))
+    datestamp = amz_date[:8]
+    scope = f"{datestamp}/{_R2_REGION}/s3/aws4_request"
+    signing_key = _sigv4_signing_key(secret_access_key, datestamp)
+
+    # Query parameters are already in canonical (sorted) order.
+    query = (
+        f"X-Amz-Algorithm={_SIGV4_ALGORITHM}"
+        f"&X-Amz-Credential={quote(f'{access_key_id}/{scope}', safe='-_.~')}"
+        f"&X-Amz-Date={amz_date}"
+        f"&X-Amz-Expires={int(expiration)}"
+        f"&X-Amz-SignedHeaders=host"
+    )
+    request_tail = f"{query}\nhost:{host}\n\nhost\nUNSIGNED-PAYLOAD"
+    string_to_sign_head = f"{_SIGV4_ALGORITHM}\n{amz_date}\n{scope}\n"
+
+    urls: Dict[str, str] = {}
+    for key in keys:
+        path = f"/{quote(bucket_name, safe='-_.~')}/{quote(key, safe='/-_.~')}"
+        canonical_request = f"GET\n{path}\n{request_tail}"
+        string_to_sign = string_to_sign_head + hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+        signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        urls[key] = f"https://{host}{path}?{query}&X-Amz-Signature={signature}"
+    return urls
+
+
+def generate_signed_urls(
+    bucket_name: str,
+    keys: Iterable[str],
+    expiration: int = 3600,
+) -> Dict[str, Optional[str]]:
+    """Generate presigned GET URLs for many objects in one pass.
+    
+    Already-signed URLs for the current signing window come from the memo;
+    the rest are signed together with a single credential lookup.
+    
+    Args:
+        bucket_name: R2 bucket name
+        keys: Object keys/paths
+        expiration: URL expiration in seconds (default 1 hour)
+    
+    Returns:
+        Mapping of key -> presigned URL (None for keys that could not be signed)
+    """
+    expiration = int(expiration)
+    results: Dict[str, Optional[str]] = {}
+    missing = []
+    for key in keys:
+        if key in results:
+            continue
+        cached = signed_url_cache.get(
+            signed_url_cache.key_for("r2", bucket_name, key, "GET", expiration)
+        )
+        results[key] = cached
+        if cached is None:
+            missing.append(key)
+
+    if not missing:
+        return results
+
+    credentials = _r2_credentials()
+    if credentials is None:
+        logger.error(f"Cannot generate signed URL - R2 credentials not configured")
+        return results
+
+    signed_at = window_start(expiration)
+    try:
+        signed = _presign_get_urls(bucket_name, missing, expiration, signed_at, credentials)
+    except Exception as e:
+        logger.error(f"[R2] Unexpected error generating signed URLs for {len(missing)} keys: {e}")
+        return results
+
+    for key, url in signed.items():
+        signed_url_cache.put(
+            signed_url_cache.key_for("r2", bucket_name, key, "GET", expiration, now=signed_at),
+            url,
+        )
+        results[key] = url
+    logger.debug(f"[R2] Signed {len(signed)} GET URLs in {bucket_name} (expires in {expiration}s)")
+    return results
+
+
 def generate_signed_url(
     bucket_name: str,
     key: str,
@@ -290,6 +421,9 @@ def generate_signed_url(
     Returns:
         Presigned URL string, or None if failed
     """
+    if method.upper() == "GET":
+        return generate_signed_urls(bucket_name, [key], expiration=expiration).get(key)
+
     client = _get_r2_client()
     if client is None:
         logger.error(f"Cannot generate signed URL - R2 client not initialized")
@@ -363,6 +497,34 @@ def get_public_url(bucket_name: str, key: str) -> str:
     return f"https://{bucket_name}.{account_id}.r2.cloudflarestorage.com/{encoded_key}"
 
 
+def _parse_r2_path(r2_path: str) -> Optional[Tuple[str, str]]:
+    """Split an R2 path or R2 HTTPS URL into (bucket, key); None if not parseable."""
+    if r2_path.startswith("http"):
+        if ".r2.cloudflarestorage.com" not in r2_path.lower():
+            return None
+        from urllib.parse import unquote
+        # Remove protocol
+        url_without_proto = r2_path.replace("https://", "").replace("http://", "")
+        # Split on first slash to separate host from path
+        if "/" not in url_without_proto:
+            logger.warning(f"Invalid R2 HTTPS URL format: {r2_path}")
+            return None
+        host_part, key_part = url_without_proto.split("/", 1)
+        # Extract bucket name (first part before first dot), URL-decode the key
+        return host_part.split(".")[0], unquote(key_part)
+
+    # Remove r2:// prefix if present
+    if r2_path.startswith("r2://"):
+        r2_path = r2_path[5:]
+
+    # Split bucket and key
+    parts = r2_path.split("/", 1)
+    if len(parts) != 2:
+        logger.warning(f"Invalid R2 path format: {r2_path}")
+        return None
+    return parts[0], parts[1]
+
+
 def get_public_audio_url(
     r2_path: Optional[str],
     expiration_days: int = 7,
@@ -384,48 +546,28 @@ def get_public_audio_url(
     if not r2_path:
         return None
     
-    # Parse bucket and key from path
     # Format: "ppp-media/audio/episode123.mp3", "r2://bucket/key", or "https://..."
     if r2_path.startswith("http"):
         # R2 HTTPS URL - parse and generate signed URL (R2 buckets are NOT public by default)
-        if ".r2.cloudflarestorage.com" in r2_path.lower():
-            try:
-                from urllib.parse import unquote
-                # Remove protocol
-                url_without_proto = r2_path.replace("https://", "").replace("http://", "")
-                # Split on first slash to separate host from path
-                if "/" in url_without_proto:
-                    host_part, key_part = url_without_proto.split("/", 1)
-                    # Extract bucket name (first part before first dot)
-                    bucket_name = host_part.split(".")[0]
-                    # URL-decode the key
-                    key = unquote(key_part)
-                    # Generate signed URL with expiration
-                    expiration_seconds = expiration_days * 24 * 60 * 60
-                    signed_url = generate_signed_url(bucket_name, key, expiration=expiration_seconds)
-                    if signed_url:
-                        return signed_url
-                    else:
-                        logger.warning(f"Failed to generate signed URL for R2 URL: {r2_path}")
-                        # Fall through to return original URL as fallback
-                else:
-                    logger.warning(f"Invalid R2 HTTPS URL format: {r2_path}")
-            except Exception as e:
-                logger.warning(f"Error parsing R2 HTTPS URL {r2_path}: {e}")
+        try:
+            parsed = _parse_r2_path(r2_path)
+            if parsed:
+                bucket_name, key = parsed
+                expiration_seconds = expiration_days * 24 * 60 * 60
+                signed_url = generate_signed_url(bucket_name, key, expiration=expiration_seconds)
+                if signed_url:
+                    return signed_url
+                logger.warning(f"Failed to generate signed URL for R2 URL: {r2_path}")
+                # Fall through to return original URL as fallback
+        except Exception as e:
+            logger.warning(f"Error parsing R2 HTTPS URL {r2_path}: {e}")
         # For other HTTPS URLs (non-R2), return as-is (backward compatibility)
         return r2_path
     
-    # Remove r2:// prefix if present
-    if r2_path.startswith("r2://"):
-        r2_path = r2_path[5:]
-    
-    # Split bucket and key
-    parts = r2_path.split("/", 1)
-    if len(parts) != 2:
-        logger.warning(f"Invalid R2 path format: {r2_path}")
+    parsed = _parse_r2_path(r2_path)
+    if parsed is None:
         return None
-    
-    bucket_name, key = parts
+    bucket_name, key = parsed
     
     # Generate signed URL with expiration
     expiration_seconds = expiration_days * 24 * 60 * 60
@@ -435,6 +577,31 @@ def get_public_audio_url(
     return generate_signed_url(bucket_name, key, expiration=expiration_seconds)
 
 
+def prime_public_audio_urls(r2_paths: Iterable[Optional[str]], expiration_days: int = 7) -> int:
+    """Batch-sign the URLs ``get_public_audio_url()`` will ask for.
+    
+    Groups the paths by bucket and signs each group in one pass, so the
+    per-item calls that follow are memo hits. Returns the number of keys primed.
+    """
+    by_bucket: Dict[str, list] = {}
+    for r2_path in r2_paths:
+        if not r2_path:
+            continue
+        try:
+            parsed = _parse_r2_path(str(r2_path).strip())
+        except Exception:
+            parsed = None
+        if parsed:
+            by_bucket.setdefault(parsed[0], []).append(parsed[1])
+
+    expiration_seconds = expiration_days * 24 * 60 * 60
+    primed = 0
+    for bucket_name, keys in by_bucket.items():
+        signed = generate_signed_urls(bucket_name, keys, expiration=expiration_seconds)
+        primed += sum(1 for url in signed.values() if url)
+    return primed
+
+
 # Backward compatibility aliases (match GCS module API)
 get_signed_url = generate_signed_url
 delete_gcs_blob = delete_blob  # For code that still uses "gcs" naming
@@ -0,0 +1,160 @@
+"""Process-wide memo of signed storage URLs.
+
+Feeds and listings ask for the same long-lived URLs over and over (every RSS
+render signs every episode's audio and cover). Signed URLs are memoized per
+``(backend, bucket, key, method, expiration, signing window)``:
+
+* The *signing window* is ``expiration // 4`` seconds, capped at
+  ``SIGNED_URL_MAX_WINDOW_S`` (default 6h). Every caller inside the same window
+  gets the same URL, so a URL handed out is never more than one window older
+  than requested (a 14-day URL always has at least 13d18h left).
+* Entries die when their window ends; expired entries are purged before the
+  least recently used ones whenever the cache is over
+  ``SIGNED_URL_CACHE_MAX_ENTRIES`` (default 20000).
+
+Backends that control the signing timestamp (R2 GET presigning) sign at the
+window start, so the URL is also identical across processes and renders.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WINDOW_S = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 20000
+
+CacheKey = Tuple[str, str, str, str, int, int]
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def signing_window(expiration: int) -> int:
+    """Length in seconds of the window within which a signed URL is reused."""
+    max_window = max(1, _env_int("SIGNED_URL_MAX_WINDOW_S", DEFAULT_MAX_WINDOW_S))
+    return max(1, min(int(expiration) // 4, max_window))
+
+
+def window_start(expiration: int, now: Optional[float] = None) -> int:
+    """Epoch second at which the current signing window for ``expiration`` began."""
+    window = signing_window(expiration)
+    now_s = int(time.time() if now is None else now)
+    return now_s - (now_s % window)
+
+
+class SignedUrlCache:
+    """Thread-safe LRU of signed URLs that expire at the end of their window."""
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return max(1, self._max_entries)
+        return max(1, _env_int("SIGNED_URL_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+
+    @staticmethod
+    def key_for(
+        backend: str,
+        bucket: str,
+        key: str,
+        method: str,
+        expiration: int,
+        now: Optional[float] = None,
+    ) -> CacheKey:
+        return (backend, bucket, key, method.upper(), int(expiration), window_start(expiration, now))
+
+    def get(self, cache_key: CacheKey, now: Optional[float] = None) -> Optional[str]:
+        now_s = time.time() if now is None else now
+        with self._lock:
+            hit = self._entries.get(cache_key)
+            if hit is None:
+                self.misses += 1
+                return None
+            url, dies_at = hit
+            if now_s >= dies_at:
+                self._entries.pop(cache_key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return url
+
+    def put(self, cache_key: CacheKey, url: str) -> None:
+        expiration, started = cache_key[4], cache_key[5]
+        dies_at = started + signing_window(expiration)
+        with self._lock:
+            self._entries[cache_key] = (url, dies_at)
+            self._entries.move_to_end(cache_key)
+            if len(self._entries) > self.max_entries:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        now_s = time.time()
+        for stale in [k for k, (_, dies_at) in self._entries.items() if now_s >= dies_at]:
+            del self._entries[stale]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_sign(
+        self,
+        backend: str,
+        bucket: str,
+        key: str,
+        method: str,
+        expiration: int,
+        sign: Callable[[], Optional[str]],
+    ) -> Optional[str]:
+        cache_key = self.key_for(backend, bucket, key, method, expiration)
+        url = self.get(cache_key)
+        if url is not None:
+            return url
+        url = sign()
+        if url:
+            self.put(cache_key, url)
+        return url
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Shared by infrastructure.r2 and infrastructure.gcs.
+signed_url_cache = SignedUrlCache()
+
+
+__all__ = [
+    "SignedUrlCache",
+    "signed_url_cache",
+    "signing_window",
+    "window_start",
+]
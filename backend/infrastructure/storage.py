@@ -13,7 +13,7 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import IO, Optional
+from typing import IO, Iterable, Optional
 
 # Import both storage backends
 from infrastructure import gcs, r2
@@ -349,6 +349,31 @@ def get_public_audio_url(
             return r2.get_public_audio_url(path_str, expiration_days, **kwargs)
 
 
+def prime_public_audio_urls(
+    paths: Iterable[Optional[str]],
+    expiration_days: int = 7,
+) -> int:
+    """Batch-sign R2 URLs ahead of per-item ``get_public_audio_url()`` calls.
+    
+    Callers that resolve many assets at once (RSS feeds, listings) call this
+    first; the per-item calls that follow are then memo hits. GCS has no batch
+    signer, its URLs are memoized per call instead.
+    
+    Returns:
+        Number of R2 URLs signed or already memoized
+    """
+    if os.getenv("STORAGE_BACKEND", "").lower().strip() == "gcs":
+        return 0
+    r2_paths = [
+        str(path).strip()
+        for path in paths
+        if path and not str(path).strip().startswith("gs://")
+    ]
+    if not r2_paths:
+        return 0
+    return r2.prime_public_audio_urls(r2_paths, expiration_days)
+
+
 # Backward compatibility aliases
 get_signed_url = generate_signed_url
 delete_gcs_blob = delete_blob
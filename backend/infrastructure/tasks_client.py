@@ -224,26 +224,34 @@ def _dispatch_local_task(path: str, body: dict) -> dict:
                 print(f"DEV MODE transcription import failed: {import_err}")
                 return
 
+            def _completed(words) -> None:
+                # Persist a transcript JSON locally for cache/debugging
+                # NOTE: Transcript is ALSO saved to Database by transcribe_media_file()
+                # Intern feature queries Database, NOT local files or GCS
+                try:
+                    base_name = filename.split('/')[-1].split('\\')[-1]
+                    stem = Path(base_name).stem
+                    TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+                    out_path = TRANSCRIPTS_DIR / f"{stem}.json"
+                    # Only write if not already present to avoid clobbering later enriched versions
+                    if not out_path.exists():
+                        out_path.write_text(json.dumps(words, ensure_ascii=False, indent=2), encoding="utf-8")
+                        print(f"DEV MODE wrote transcript JSON (cache only) -> {out_path}")
+                except Exception as write_err:  # pragma: no cover
+                    print(f"DEV MODE warning: failed to write transcript JSON for {filename}: {write_err}")
+                print(f"DEV MODE transcription completed for {filename}")
+
+            def _failed(trans_err: BaseException) -> None:  # pragma: no cover
+                print(f"DEV MODE transcription error for {filename}: {trans_err}")
+
             def _runner() -> None:
                 try:
-                    words = transcribe_media_file(filename, user_id)  # Pass user_id for tier routing
-                    # Persist a transcript JSON locally for cache/debugging
-                    # NOTE: Transcript is ALSO saved to Database by transcribe_media_file()
-                    # Intern feature queries Database, NOT local files or GCS
-                    try:
-                        base_name = filename.split('/')[-1].split('\\')[-1]
-                        stem = Path(base_name).stem
-                        TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-                        out_path = TRANSCRIPTS_DIR / f"{stem}.json"
-                        # Only write if not already present to avoid clobbering later enriched versions
-                        if not out_path.exists():
-                            out_path.write_text(json.dumps(words, ensure_ascii=False, indent=2), encoding="utf-8")
-                            print(f"DEV MODE wrote transcript JSON (cache only) -> {out_path}")
-                    except Exception as write_err:  # pragma: no cover
-                        print(f"DEV MODE warning: failed to write transcript JSON for {filename}: {write_err}")
-                    print(f"DEV MODE transcription completed for {filename}")
+                    # Pass user_id for tier routing; AssemblyAI jobs finish via _completed/_failed
+                    words = transcribe_media_file(filename, user_id, on_complete=_completed, on_error=_failed)
+                    if words is not None:
+                        _completed(words)
                 except Exception as trans_err:  # pragma: no cover
-                    print(f"DEV MODE transcription error for {filename}: {trans_err}")
+                    _failed(trans_err)
 
             threading.Thread(
                 target=_runner,
@@ -481,10 +489,11 @@ def enqueue_http_task(path: str, body: dict) -> dict:
     # Transcription: Up to 30 minutes for long audio files (Cloud Tasks max is 1800s)
     # Assembly: Up to 30 minutes for complex episodes with many segments
     # Chunk Processing: Up to 30 minutes for large chunk downloads and processing
+    # RSS import: each run mirrors enclosures for up to its run budget (25 minutes)
     # Default Cloud Tasks timeout is only 30s, which causes premature retries
     # dispatch_deadline is set on the Task object, not HttpRequest
     try:
-        if "/transcribe" in path or "/assemble" in path or "/process-chunk" in path:
+        if "/transcribe" in path or "/assemble" in path or "/process-chunk" in path or "/rss-import" in path:
             from google.protobuf import duration_pb2
             deadline = duration_pb2.Duration()
             deadline.seconds = 1800  # 30 minutes (max allowed by Cloud Tasks)
@@ -505,7 +514,7 @@ def enqueue_http_task(path: str, body: dict) -> dict:
         
         log.info("event=tasks.enqueue_http_task.creating_task path=%s url=%s priority=%s episode_id=%s", path, url, priority, episode_id)
         created = client.create_task(request={"parent": parent, "task": task})
-        deadline_seconds = 1800 if ("/transcribe" in path or "/assemble" in path or "/process-chunk" in path) else 30
+        deadline_seconds = 1800 if ("/transcribe" in path or "/assemble" in path or "/process-chunk" in path or "/rss-import" in path) else 30
         
         # Log with priority information
         if priority is not None:
@@ -0,0 +1,95 @@
+"""
+Migration 106: Add UsageLedgerSummary table
+
+Creates usageledgersummary (running per-user, per-month totals of the minutes
+ledger) and backfills it from processingminutesledger, plus a
+(user_id, created_at) index for period-bounded ledger aggregates.
+
+The backfill holds a SHARE lock on the ledger so no entry can be posted
+between the aggregate and the summary write. Entries posted by older
+revisions during a rolling deploy are picked up by re-running the rebuild
+afterwards: POST /api/tasks/maintenance/rebuild-usage-summary.
+
+PostgreSQL ONLY.
+Rollback: DROP TABLE IF EXISTS usageledgersummary; DROP INDEX IF EXISTS ix_ledger_user_created_at;
+"""
+import logging
+from sqlalchemy import text, inspect
+from sqlmodel import Session
+
+log = logging.getLogger(__name__)
+
+
+def run_migration(session: Session) -> None:
+    """Create and backfill usageledgersummary (PostgreSQL ONLY)"""
+
+    log.info("[migration_106] Starting usage ledger summary migration (PostgreSQL)...")
+
+    try:
+        bind = session.get_bind()
+        inspector = inspect(bind)
+        tables = inspector.get_table_names()
+
+        if 'usageledgersummary' not in tables:
+            log.info("[migration_106] Creating usageledgersummary table...")
+            session.execute(text("""
+                CREATE TABLE usageledgersummary (
+                    id SERIAL PRIMARY KEY,
+                    user_id UUID NOT NULL,
+                    period VARCHAR(7) NOT NULL,
+                    debit_minutes INTEGER NOT NULL DEFAULT 0,
+                    credit_minutes INTEGER NOT NULL DEFAULT 0,
+                    debit_credits DOUBLE PRECISION NOT NULL DEFAULT 0.0,
+                    credit_credits DOUBLE PRECISION NOT NULL DEFAULT 0.0,
+                    entry_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT uq_usage_summary_user_period UNIQUE (user_id, period)
+                )
+            """))
+            session.execute(text("CREATE INDEX ix_usageledgersummary_user_id ON usageledgersummary (user_id)"))
+        else:
+            log.info("[migration_106] usageledgersummary table already exists")
+
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_ledger_user_created_at "
+            "ON processingminutesledger (user_id, created_at)"
+        ))
+
+        log.info("[migration_106] Backfilling summary from ledger...")
+        session.execute(text("LOCK TABLE processingminutesledger IN SHARE MODE"))
+        result = session.execute(text("""
+            INSERT INTO usageledgersummary (
+                user_id, period, debit_minutes, credit_minutes,
+                debit_credits, credit_credits, entry_count, updated_at
+            )
+            SELECT
+                user_id,
+                to_char(created_at, 'YYYY-MM') AS period,
+                COALESCE(SUM(CASE WHEN direction = 'DEBIT' THEN minutes ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN direction = 'CREDIT' THEN minutes ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN direction = 'DEBIT' THEN COALESCE(credits, minutes) ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN direction = 'CREDIT' THEN COALESCE(credits, minutes) ELSE 0 END), 0),
+                COUNT(*),
+                CURRENT_TIMESTAMP
+            FROM processingminutesledger
+            WHERE created_at IS NOT NULL
+            GROUP BY user_id, to_char(created_at, 'YYYY-MM')
+            ON CONFLICT (user_id, period) DO UPDATE SET
+                debit_minutes = EXCLUDED.debit_minutes,
+                credit_minutes = EXCLUDED.credit_minutes,
+                debit_credits = EXCLUDED.debit_credits,
+                credit_credits = EXCLUDED.credit_credits,
+                entry_count = EXCLUDED.entry_count,
+                updated_at = EXCLUDED.updated_at
+        """))
+        session.commit()
+
+        log.info(f"[migration_106] ✅ Usage ledger summary ready ({result.rowcount} user-periods)")
+
+    except Exception as e:
+        log.error(f"[migration_106] ❌ Migration failed: {e}", exc_info=True)
+        session.rollback()
+        raise
+
+
+__all__ = ["run_migration"]
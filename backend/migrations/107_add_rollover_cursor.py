@@ -0,0 +1,39 @@
+"""
+Migration 107: Add rollover progress columns to WalletPeriodProcessed
+
+Adds status ('running' / 'completed') and last_user_id (keyset cursor of the
+last committed chunk) so the batched monthly rollover can resume after an
+interruption. Existing rows are completed runs.
+
+PostgreSQL ONLY.
+Rollback: ALTER TABLE walletperiodprocessed DROP COLUMN IF EXISTS status, DROP COLUMN IF EXISTS last_user_id;
+"""
+import logging
+from sqlalchemy import text
+from sqlmodel import Session
+
+log = logging.getLogger(__name__)
+
+
+def run_migration(session: Session) -> None:
+    """Add status and last_user_id to walletperiodprocessed (PostgreSQL ONLY)"""
+
+    log.info("[migration_107] Adding rollover progress columns...")
+
+    try:
+        session.execute(text("""
+            ALTER TABLE walletperiodprocessed
+            ADD COLUMN IF NOT EXISTS status VARCHAR(16) NOT NULL DEFAULT 'completed',
+            ADD COLUMN IF NOT EXISTS last_user_id UUID
+        """))
+        session.commit()
+
+        log.info("[migration_107] ✅ Rollover progress columns added")
+
+    except Exception as e:
+        log.error(f"[migration_107] ❌ Migration failed: {e}", exc_info=True)
+        session.rollback()
+        raise
+
+
+__all__ = ["run_migration"]
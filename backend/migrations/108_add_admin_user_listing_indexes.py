@@ -0,0 +1,40 @@
+"""
+Migration 108: Indexes for the keyset-paginated admin user listing
+
+- ix_user_created_at_id: (created_at, id) keyset order for the default sort
+- ix_episode_user_processed: (user_id, processed_at) for the per-page episode
+  aggregate and the activity-window filter
+
+PostgreSQL ONLY.
+Rollback: DROP INDEX IF EXISTS ix_user_created_at_id; DROP INDEX IF EXISTS ix_episode_user_processed;
+"""
+import logging
+from sqlalchemy import text
+from sqlmodel import Session
+
+log = logging.getLogger(__name__)
+
+
+def run_migration(session: Session) -> None:
+    """Create admin user listing indexes (PostgreSQL ONLY)"""
+
+    log.info("[migration_108] Creating admin user listing indexes...")
+
+    try:
+        session.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_user_created_at_id ON "user" (created_at, id)'
+        ))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_episode_user_processed ON episode (user_id, processed_at)"
+        ))
+        session.commit()
+
+        log.info("[migration_108] ✅ Admin user listing indexes created")
+
+    except Exception as e:
+        log.error(f"[migration_108] ❌ Migration failed: {e}", exc_info=True)
+        session.rollback()
+        raise
+
+
+__all__ = ["run_migration"]
@@ -0,0 +1,84 @@
+"""
+Migration 109: Add PodcastImportJob and PodcastImportItem tables
+
+Background RSS enclosure mirroring tracks one job per import and one item per
+enclosure, so an interrupted import resumes with the items that are not done.
+The partial index backs the sweep that re-queues jobs whose lease lapsed.
+
+PostgreSQL ONLY.
+Rollback: DROP TABLE IF EXISTS podcastimportitem; DROP TABLE IF EXISTS podcastimportjob;
+"""
+import logging
+from sqlalchemy import text, inspect
+from sqlmodel import Session
+
+log = logging.getLogger(__name__)
+
+
+def run_migration(session: Session) -> None:
+    """Create podcastimportjob and podcastimportitem (PostgreSQL ONLY)"""
+
+    log.info("[migration_109] Creating podcast import job tables...")
+
+    try:
+        bind = session.get_bind()
+        tables = inspect(bind).get_table_names()
+
+        if 'podcastimportjob' not in tables:
+            session.execute(text("""
+                CREATE TABLE podcastimportjob (
+                    id UUID PRIMARY KEY,
+                    podcast_id UUID NOT NULL REFERENCES podcast (id),
+                    user_id UUID NOT NULL REFERENCES "user" (id),
+                    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+                    total INTEGER NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    bytes_mirrored BIGINT NOT NULL DEFAULT 0,
+                    lease_until TIMESTAMP,
+                    error VARCHAR,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """))
+            session.execute(text("CREATE INDEX ix_podcastimportjob_podcast_id ON podcastimportjob (podcast_id)"))
+            session.execute(text("CREATE INDEX ix_podcastimportjob_user_id ON podcastimportjob (user_id)"))
+        else:
+            log.info("[migration_109] podcastimportjob table already exists")
+
+        if 'podcastimportitem' not in tables:
+            session.execute(text("""
+                CREATE TABLE podcastimportitem (
+                    id SERIAL PRIMARY KEY,
+                    job_id UUID NOT NULL REFERENCES podcastimportjob (id),
+                    episode_id UUID NOT NULL REFERENCES episode (id),
+                    source_url VARCHAR NOT NULL,
+                    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    bytes BIGINT NOT NULL DEFAULT 0,
+                    storage_uri VARCHAR,
+                    content_type VARCHAR,
+                    error VARCHAR,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            session.execute(text("CREATE INDEX ix_podcastimportitem_job_id ON podcastimportitem (job_id)"))
+        else:
+            log.info("[migration_109] podcastimportitem table already exists")
+
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_podcastimportjob_open "
+            "ON podcastimportjob (lease_until) WHERE status IN ('queued', 'running')"
+        ))
+        session.commit()
+
+        log.info("[migration_109] ✅ Podcast import job tables ready")
+
+    except Exception as e:
+        log.error(f"[migration_109] ❌ Migration failed: {e}", exc_info=True)
+        session.rollback()
+        raise
+
+
+__all__ = ["run_migration"]
@@ -0,0 +1,61 @@
+"""
+Migration 110: Add PendingTranscription table
+
+Submitted AssemblyAI transcripts are recorded until their result is persisted,
+so a webhook landing on another instance, or the resume sweep, can finish a
+transcript whose submitting instance scaled down. The partial index backs the
+sweep over open rows.
+
+PostgreSQL ONLY.
+Rollback: DROP TABLE IF EXISTS pendingtranscription;
+"""
+import logging
+from sqlalchemy import text, inspect
+from sqlmodel import Session
+
+log = logging.getLogger(__name__)
+
+
+def run_migration(session: Session) -> None:
+    """Create pendingtranscription (PostgreSQL ONLY)"""
+
+    log.info("[migration_110] Creating pending transcription table...")
+
+    try:
+        bind = session.get_bind()
+        tables = inspect(bind).get_table_names()
+
+        if 'pendingtranscription' not in tables:
+            session.execute(text("""
+                CREATE TABLE pendingtranscription (
+                    transcript_id VARCHAR(64) PRIMARY KEY,
+                    filename VARCHAR NOT NULL,
+                    user_id VARCHAR(64),
+                    local_name VARCHAR NOT NULL,
+                    context_json VARCHAR NOT NULL DEFAULT '{}',
+                    status VARCHAR(16) NOT NULL DEFAULT 'submitted',
+                    lease_until TIMESTAMP,
+                    error VARCHAR,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            session.execute(text("CREATE INDEX ix_pendingtranscription_filename ON pendingtranscription (filename)"))
+        else:
+            log.info("[migration_110] pendingtranscription table already exists")
+
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_pendingtranscription_open "
+            "ON pendingtranscription (updated_at) WHERE status IN ('submitted', 'finishing')"
+        ))
+        session.commit()
+
+        log.info("[migration_110] ✅ Pending transcription table ready")
+
+    except Exception as e:
+        log.error(f"[migration_110] ❌ Migration failed: {e}", exc_info=True)
+        session.rollback()
+        raise
+
+
+__all__ = ["run_migration"]
@@ -70,6 +70,11 @@ def run_one_time_migrations() -> dict[str, bool]:
     results["add_ai_metadata_enum"] = run_migration_once("add_ai_metadata_enum", _add_ai_metadata_enum)
     results["add_speaker_identification"] = run_migration_once("add_speaker_identification", _add_speaker_identification)
     results["add_transcript_meta_json"] = run_migration_once("add_transcript_meta_json", _add_transcript_meta_json)
+    results["add_usage_ledger_summary"] = run_migration_once("add_usage_ledger_summary", _add_usage_ledger_summary)
+    results["add_rollover_cursor"] = run_migration_once("add_rollover_cursor", _add_rollover_cursor)
+    results["add_admin_user_listing_indexes"] = run_migration_once("add_admin_user_listing_indexes", _add_admin_user_listing_indexes)
+    results["add_podcast_import_jobs"] = run_migration_once("add_podcast_import_jobs", _add_podcast_import_jobs)
+    results["add_pending_transcriptions"] = run_migration_once("add_pending_transcriptions", _add_pending_transcriptions)
 
 
     
@@ -1410,3 +1415,113 @@ def _add_transcript_meta_json() -> bool:
     except Exception as e:
         log.warning("[migrate] Transcript meta JSON migration failed: %s", e)
         return False
+
+
+def _add_usage_ledger_summary() -> bool:
+    """Add and backfill usage ledger summary table (migration 106)."""
+    import importlib.util
+    import os
+    from sqlmodel import Session
+    from api.core.database import engine
+
+    try:
+        migration_path = os.path.join(os.path.dirname(__file__), '106_add_usage_ledger_summary.py')
+        spec = importlib.util.spec_from_file_location('migration_106', migration_path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            with Session(engine) as session:
+                module.run_migration(session)
+        log.debug("[migrate] Usage ledger summary table verified")
+        return True
+    except Exception as e:
+        log.warning("[migrate] Usage ledger summary migration failed: %s", e)
+        return False
+
+
+def _add_rollover_cursor() -> bool:
+    """Add rollover progress columns to walletperiodprocessed (migration 107)."""
+    import importlib.util
+    import os
+    from sqlmodel import Session
+    from api.core.database import engine
+
+    try:
+        migration_path = os.path.join(os.path.dirname(__file__), '107_add_rollover_cursor.py')
+        spec = importlib.util.spec_from_file_location('migration_107', migration_path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            with Session(engine) as session:
+                module.run_migration(session)
+        log.debug("[migrate] Rollover progress columns verified")
+        return True
+    except Exception as e:
+        log.warning("[migrate] Rollover progress migration failed: %s", e)
+        return False
+
+
+def _add_admin_user_listing_indexes() -> bool:
+    """Add admin user listing indexes (migration 108)."""
+    import importlib.util
+    import os
+    from sqlmodel import Session
+    from api.core.database import engine
+
+    try:
+        migration_path = os.path.join(os.path.dirname(__file__), '108_add_admin_user_listing_indexes.py')
+        spec = importlib.util.spec_from_file_location('migration_108', migration_path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            with Session(engine) as session:
+                module.run_migration(session)
+        log.debug("[migrate] Admin user listing indexes verified")
+        return True
+    except Exception as e:
+        log.warning("[migrate] Admin user listing index migration failed: %s", e)
+        return False
+
+
+def _add_podcast_import_jobs() -> bool:
+    """Add podcast import job tables (migration 109)."""
+    import importlib.util
+    import os
+    from sqlmodel import Session
+    from api.core.database import engine
+
+    try:
+        migration_path = os.path.join(os.path.dirname(__file__), '109_add_podcast_import_jobs.py')
+        spec = importlib.util.spec_from_file_location('migration_109', migration_path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            with Session(engine) as session:
+                module.run_migration(session)
+        log.debug("[migrate] Podcast import job tables verified")
+        return True
+    except Exception as e:
+        log.warning("[migrate] Podcast import job migration failed: %s", e)
+        return False
+
+
+def _add_pending_transcriptions() -> bool:
+    """Add pending transcription table (migration 110)."""
+    import importlib.util
+    import os
+    from sqlmodel import Session
+    from api.core.database import engine
+
+    try:
+        migration_path = os.path.join(os.path.dirname(__file__), '110_add_pending_transcriptions.py')
+        spec = importlib.util.spec_from_file_location('migration_110', migration_path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            with Session(engine) as session:
+                module.run_migration(session)
+        log.debug("[migrate] Pending transcription table verified")
+        return True
+    except Exception as e:
+        log.warning("[migrate] Pending transcription migration failed: %s", e)
+        return False
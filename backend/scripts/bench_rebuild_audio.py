@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark the span-planned audio rebuild against the legacy ``+=`` implementation.
+
+Builds synthetic episodes (silent 44.1kHz mono PCM with a word every ~360ms and
+periodic fillers), runs both rebuilds on identical inputs and reports wall time,
+speedup and whether the outputs are byte-identical.
+
+Usage:
+    python scripts/bench_rebuild_audio.py [--minutes 30 60 120] [--skip-legacy]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydub import AudioSegment
+
+from api.services.audio.cleanup import (
+    _rebuild_audio_from_words_concat,
+    rebuild_audio_from_words,
+)
+
+FILLERS = {"um", "uh", "like"}
+VOCAB = ["so", "we", "were", "talking", "about", "the", "show", "um", "uh", "like", "today"]
+
+
+def synthetic_episode(minutes: int, seed: int = 0):
+    rng = random.Random(seed)
+    total_ms = minutes * 60_000
+    audio = AudioSegment.silent(duration=total_ms, frame_rate=44100)
+    words = []
+    t_ms = 0
+    while t_ms < total_ms - 1000:
+        dur = rng.randint(120, 420)
+        words.append({"word": rng.choice(VOCAB), "start": t_ms / 1000.0, "end": (t_ms + dur) / 1000.0})
+        t_ms += dur + rng.choice([0, 0, 40, 90, 250])
+    return audio, words
+
+
+def _time(fn, audio, words):
+    work = copy.deepcopy(words)
+    started = time.perf_counter()
+    out, _freq, removed = fn(audio, work, filler_words=FILLERS, log=[])
+    return time.perf_counter() - started, out, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rebuild_audio_from_words")
+    parser.add_argument("--minutes", type=int, nargs="+", default=[30, 60, 120])
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the span renderer")
+    args = parser.parse_args()
+
+    print(f"{'minutes':>8} {'words':>8} {'spans(s)':>10} {'legacy(s)':>10} {'speedup':>8} identical")
+    for minutes in args.minutes:
+        audio, words = synthetic_episode(minutes)
+        new_s, new_out, new_removed = _time(rebuild_audio_from_words, audio, words)
+        if args.skip_legacy:
+            print(f"{minutes:>8} {len(words):>8} {new_s:>10.3f} {'-':>10} {'-':>8} -")
+            continue
+        old_s, old_out, old_removed = _time(_rebuild_audio_from_words_concat, audio, words)
+        identical = old_out.raw_data == new_out.raw_data and old_removed == new_removed
+        speedup = old_s / new_s if new_s else float("inf")
+        print(f"{minutes:>8} {len(words):>8} {new_s:>10.3f} {old_s:>10.3f} {speedup:>7.1f}x {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Bounded execution and admission control for the worker service.
+
+Assembly and chunk processing are long, blocking, CPU/ffmpeg-heavy calls. The
+worker service runs them on a bounded executor so the uvicorn event loop stays
+free for ``/health`` and ``/status``, and rejects work it cannot start soon
+(503 + ``Retry-After``) so Cloud Tasks backs off instead of stacking requests
+on one instance.
+
+Configuration (environment):
+  WORKER_EXECUTOR          "thread" (default) or "process"
+  WORKER_MAX_CONCURRENCY   hard cap on tasks running at once (default: derived
+                           from available memory / WORKER_TASK_MEMORY_MB)
+  WORKER_TASK_MEMORY_MB    memory budget per running task (default 2048)
+  WORKER_QUEUE_DEPTH       admitted tasks allowed to wait for a slot (default 0)
+  WORKER_RETRY_AFTER_S     Retry-After seconds sent when saturated (default 60)
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+log = logging.getLogger("worker.admission")
+
+DEFAULT_TASK_MEMORY_MB = 2048
+DEFAULT_RETRY_AFTER_S = 60
+
+
+class WorkerSaturated(Exception):
+    """Raised when a task cannot be admitted; carries the Retry-After hint."""
+
+    def __init__(self, retry_after_s: int, in_flight: int, queued: int):
+        super().__init__(f"worker saturated (in_flight={in_flight}, queued={queued})")
+        self.retry_after_s = retry_after_s
+        self.in_flight = in_flight
+        self.queued = queued
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        log.warning("event=worker.admission.bad_env name=%s value=%s", name, raw)
+        return default
+
+
+def default_max_concurrency() -> int:
+    """Concurrency cap from ``WORKER_MAX_CONCURRENCY`` or available memory."""
+    explicit = _env_int("WORKER_MAX_CONCURRENCY", None)
+    if explicit:
+        return max(1, explicit)
+    per_task_mb = _env_int("WORKER_TASK_MEMORY_MB", DEFAULT_TASK_MEMORY_MB) or DEFAULT_TASK_MEMORY_MB
+    try:
+        import psutil
+
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+    except Exception:
+        return 1
+    by_memory = int(available_mb // max(1, per_task_mb))
+    return max(1, min(by_memory, os.cpu_count() or 1))
+
+
+class BoundedTaskExecutor:
+    """Executor with a fixed number of slots plus a small admission queue.
+
+    ``run()`` either schedules the call and awaits it off the event loop, or
+    raises :class:`WorkerSaturated` immediately when every slot and queue
+    position is taken.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        mode: Optional[str] = None,
+        retry_after_s: Optional[int] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency or default_max_concurrency())
+        self.queue_depth = max(0, queue_depth if queue_depth is not None else (_env_int("WORKER_QUEUE_DEPTH", 0) or 0))
+        self.mode = (mode or os.getenv("WORKER_EXECUTOR") or "thread").strip().lower()
+        self.retry_after_s = retry_after_s or _env_int("WORKER_RETRY_AFTER_S", DEFAULT_RETRY_AFTER_S) or DEFAULT_RETRY_AFTER_S
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._executor: Optional[Executor] = None
+
+    # ------------------------------------------------------------------ pool
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # spawn: never fork a process that holds DB pools and event-loop threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="worker-task",
+                )
+        return self._executor
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    # ------------------------------------------------------------- admission
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.queue_depth
+
+    def try_admit(self) -> None:
+        """Reserve a slot or raise :class:`WorkerSaturated`."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self._rejected += 1
+                raise WorkerSaturated(
+                    self.retry_after_s,
+                    in_flight=self._running,
+                    queued=self._admitted - self._running,
+                )
+            self._admitted += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._admitted = max(0, self._admitted - 1)
+            self._completed += 1
+
+    def _mark_started(self) -> None:
+        with self._lock:
+            self._running += 1
+
+    def _mark_finished(self) -> None:
+        with self._lock:
+            self._running = max(0, self._running - 1)
+
+    # --------------------------------------------------------------- running
+    async def run(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Admit, run ``fn(*args, **kwargs)`` on the pool and await the result."""
+        self.try_admit()
+        return await self.run_admitted(fn, *args, **kwargs)
+
+    async def run_admitted(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Run a call whose slot was already reserved with :meth:`try_admit`.
+
+        The slot is released when the pool finishes the call, not when the
+        awaiting request ends: a cancelled request leaves its thread running,
+        and that work must keep counting against the bound.
+        """
+        call = functools.partial(fn, *args, **kwargs)
+        try:
+            if self.mode == "process":
+                # Child processes can't update our counters; count from submission.
+                self._mark_started()
+                future = self._get_executor().submit(call)
+                future.add_done_callback(lambda _f: self._mark_finished())
+            else:
+                future = self._get_executor().submit(self._tracked, call)
+        except BaseException:
+            if self.mode == "process":
+                self._mark_finished()
+            self.release()
+            raise
+        future.add_done_callback(lambda _f: self.release())
+        return await asyncio.wrap_future(future)
+
+    def _tracked(self, call: Callable[[], Any]) -> Any:
+        self._mark_started()
+        try:
+            return call()
+        finally:
+            self._mark_finished()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_concurrency": self.max_concurrency,
+                "queue_capacity": self.queue_depth,
+                "in_flight": self._running,
+                "queued": max(0, self._admitted - self._running),
+                "completed_total": self._completed,
+                "rejected_total": self._rejected,
+                "retry_after_s": self.retry_after_s,
+            }
+
+
+__all__ = [
+    "BoundedTaskExecutor",
+    "WorkerSaturated",
+    "default_max_concurrency",
+]
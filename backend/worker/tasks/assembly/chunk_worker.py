@@ -7,7 +7,7 @@ import os
 import sys
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, List, Mapping
 
 from pydantic import BaseModel, ValidationError
 from pydub import AudioSegment
@@ -51,6 +51,104 @@ def validate_process_chunk_payload(data: Mapping[str, Any]) -> ProcessChunkPaylo
         return ProcessChunkPayload.parse_obj(data)  # type: ignore[attr-defined]
 
 
+def clean_chunk_audio(
+    chunk_audio_path: Path,
+    mutable_words: List[Dict[str, Any]],
+    cleanup_opts: Mapping[str, Any],
+    *,
+    is_last_chunk: bool,
+    output_path: Path,
+    worker_log: logging.Logger | None = None,
+) -> Path:
+    """Clean one chunk from local disk to a local MP3 (fillers, pauses, tail trim).
+
+    Shared by the Cloud Tasks handler and the local process-pool fan-out in
+    :mod:`worker.tasks.assembly.chunked_processor`.
+    """
+
+    worker_log = worker_log or log
+    audio = AudioSegment.from_file(str(chunk_audio_path))
+    worker_log.info("event=chunk.loaded duration_ms=%d", len(audio))
+
+    cleaned_audio = audio
+
+    if cleanup_opts.get("removeFillers", True) and mutable_words:
+        filler_words_list = cleanup_opts.get("fillerWords", []) or []
+        filler_words = {
+            str(w).strip().lower()
+            for w in filler_words_list
+            if str(w).strip()
+        }
+        if filler_words:
+            worker_log.info(
+                "event=chunk.removing_fillers count=%d",
+                len(filler_words),
+            )
+            cleaned_audio, _, _ = rebuild_audio_from_words(
+                audio,
+                mutable_words,
+                filler_words=filler_words,
+                remove_fillers=True,
+                filler_lead_trim_ms=int(
+                    cleanup_opts.get("fillerLeadTrimMs", 60)
+                ),
+                log=[],
+            )
+
+    if cleanup_opts.get("removePauses", True):
+        worker_log.info("event=chunk.compressing_pauses")
+        cleaned_audio = compress_long_pauses_guarded(
+            cleaned_audio,
+            max_pause_s=float(
+                cleanup_opts.get("maxPauseSeconds", 1.5)
+            ),
+            min_target_s=float(
+                cleanup_opts.get("targetPauseSeconds", 0.5)
+            ),
+            ratio=float(
+                cleanup_opts.get("pauseCompressionRatio", 0.4)
+            ),
+            rel_db=16.0,
+            removal_guard_pct=float(
+                cleanup_opts.get("maxPauseRemovalPct", 0.1)
+            ),
+            similarity_guard=float(
+                cleanup_opts.get("pauseSimilarityGuard", 0.85)
+            ),
+            log=[],
+        )
+
+    if is_last_chunk and mutable_words:
+        last_word_end_ms = 0
+        for word in mutable_words:
+            try:
+                word_end = float(word.get("end", 0)) * 1000
+            except Exception:  # pragma: no cover - defensive
+                word_end = 0
+            if word_end > last_word_end_ms:
+                last_word_end_ms = word_end
+
+        trim_point_ms = int(last_word_end_ms + 500)
+        if trim_point_ms < len(cleaned_audio):
+            worker_log.info(
+                "event=chunk.trim_trailing_silence last_word_end=%d trim_point=%d audio_duration=%d",
+                last_word_end_ms,
+                trim_point_ms,
+                len(cleaned_audio),
+            )
+            cleaned_audio = cleaned_audio[:trim_point_ms]
+
+    worker_log.info(
+        "event=chunk.cleaned original_ms=%d cleaned_ms=%d",
+        len(audio),
+        len(cleaned_audio),
+    )
+
+    worker_log.info("event=chunk.export path=%s", output_path)
+    cleaned_audio.export(str(output_path), format="mp3")
+    return output_path
+
+
 def run_chunk_processing(payload_data: Mapping[str, Any] | ProcessChunkPayload) -> None:
     """Execute the chunk-processing worker logic synchronously."""
 
@@ -146,11 +244,6 @@ def run_chunk_processing(payload_data: Mapping[str, Any] | ProcessChunkPayload)
                 chunk_audio_path,
             )
             cleanup_opts = payload.cleanup_options or {}
-
-            audio = AudioSegment.from_file(str(chunk_audio_path))
-            worker_log.info("event=chunk.loaded duration_ms=%d", len(audio))
-
-            cleaned_audio = audio
             mutable_words = (
                 transcript_data
                 if isinstance(transcript_data, list)
@@ -160,85 +253,17 @@ def run_chunk_processing(payload_data: Mapping[str, Any] | ProcessChunkPayload)
                     else []
                 )
             )
-
-            if cleanup_opts.get("removeFillers", True) and mutable_words:
-                filler_words_list = cleanup_opts.get("fillerWords", []) or []
-                filler_words = {
-                    str(w).strip().lower()
-                    for w in filler_words_list
-                    if str(w).strip()
-                }
-                if filler_words:
-                    worker_log.info(
-                        "event=chunk.removing_fillers count=%d",
-                        len(filler_words),
-                    )
-                    cleaned_audio, _, _ = rebuild_audio_from_words(
-                        audio,
-                        mutable_words,
-                        filler_words=filler_words,
-                        remove_fillers=True,
-                        filler_lead_trim_ms=int(
-                            cleanup_opts.get("fillerLeadTrimMs", 60)
-                        ),
-                        log=[],
-                    )
-
-            if cleanup_opts.get("removePauses", True):
-                worker_log.info("event=chunk.compressing_pauses")
-                cleaned_audio = compress_long_pauses_guarded(
-                    cleaned_audio,
-                    max_pause_s=float(
-                        cleanup_opts.get("maxPauseSeconds", 1.5)
-                    ),
-                    min_target_s=float(
-                        cleanup_opts.get("targetPauseSeconds", 0.5)
-                    ),
-                    ratio=float(
-                        cleanup_opts.get("pauseCompressionRatio", 0.4)
-                    ),
-                    rel_db=16.0,
-                    removal_guard_pct=float(
-                        cleanup_opts.get("maxPauseRemovalPct", 0.1)
-                    ),
-                    similarity_guard=float(
-                        cleanup_opts.get("pauseSimilarityGuard", 0.85)
-                    ),
-                    log=[],
-                )
-
-            is_last_chunk = payload.chunk_index == payload.total_chunks - 1
-            if is_last_chunk and mutable_words:
-                last_word_end_ms = 0
-                for word in mutable_words:
-                    try:
-                        word_end = float(word.get("end", 0)) * 1000
-                    except Exception:  # pragma: no cover - defensive
-                        word_end = 0
-                    if word_end > last_word_end_ms:
-                        last_word_end_ms = word_end
-
-                trim_point_ms = int(last_word_end_ms + 500)
-                if trim_point_ms < len(cleaned_audio):
-                    worker_log.info(
-                        "event=chunk.trim_trailing_silence last_word_end=%d trim_point=%d audio_duration=%d",
-                        last_word_end_ms,
-                        trim_point_ms,
-                        len(cleaned_audio),
-                    )
-                    cleaned_audio = cleaned_audio[:trim_point_ms]
-
-            worker_log.info(
-                "event=chunk.cleaned original_ms=%d cleaned_ms=%d",
-                len(audio),
-                len(cleaned_audio),
-            )
-
             cleaned_audio_path = (
                 tmpdir_path / f"chunk_{payload.chunk_index}_cleaned.mp3"
             )
-            worker_log.info("event=chunk.export path=%s", cleaned_audio_path)
-            cleaned_audio.export(str(cleaned_audio_path), format="mp3")
+            clean_chunk_audio(
+                chunk_audio_path,
+                mutable_words,
+                cleanup_opts,
+                is_last_chunk=payload.chunk_index == payload.total_chunks - 1,
+                output_path=cleaned_audio_path,
+                worker_log=worker_log,
+            )
 
             cleaned_gcs_path = payload.gcs_audio_uri.replace(
                 ".wav",
@@ -290,6 +315,7 @@ def run_chunk_processing(payload_data: Mapping[str, Any] | ProcessChunkPayload)
 
 __all__ = [
     "ProcessChunkPayload",
+    "clean_chunk_audio",
     "run_chunk_processing",
     "validate_process_chunk_payload",
 ]
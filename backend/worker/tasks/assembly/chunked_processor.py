@@ -1,23 +1,29 @@
 """Chunked audio processing helpers.
 
-This module keeps the minimal feature set needed by tests: deciding when to
-chunk, performing a single-chunk upload to GCS, and a few helpers used by the
-assembly pipeline. The implementation favours determinism and fails fast when
-cloud storage is unavailable.
+Long episodes are split at silences near ``CHUNK_TARGET_MS`` boundaries, each
+chunk gets its own transcript slice, chunks are cleaned concurrently (a local
+process pool or one ``/api/tasks/process-chunk`` task per chunk) and the cleaned
+files are joined from the chunk manifest. The implementation favours
+determinism and fails fast when cloud storage is unavailable.
 """
 
 from __future__ import annotations
 
+import audioop
 import json
 import os
 import logging
 import math
+import multiprocessing
+import shutil
 import subprocess
 import tempfile
+import time
 import wave
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 
 from pydub import AudioSegment
@@ -31,6 +37,10 @@ log = logging.getLogger(__name__)
 CHUNK_TARGET_MS = 10 * 60 * 1000  # 10 minutes
 MIN_SILENCE_MS = 500
 SILENCE_THRESH = -40
+SILENCE_SEARCH_MS = 30000  # look this far either side of each ideal boundary
+CHUNK_BUCKET = "ppp-media-us-west1"
+COPY_BLOCK_FRAMES = 1 << 16  # ~1.5s at 44.1kHz per read/write when cutting chunks
+CHUNK_TASK_PATH = "/api/tasks/process-chunk"
 
 
 @dataclass
@@ -90,8 +100,12 @@ def _read_duration_ms(audio_path: Path) -> int:
         return int((frames / float(rate)) * 1000)
 
 
-def should_use_chunking(audio_path: Path) -> bool:
-    """Determine whether chunked processing should be used."""
+def should_use_chunking(audio_path: Path, duration_ms: Optional[int] = None) -> bool:
+    """Determine whether chunked processing should be used.
+
+    ``duration_ms`` lets callers that already decoded the audio skip the WAV
+    header read (which also lets non-WAV inputs qualify).
+    """
     disable_val = os.getenv("DISABLE_CHUNKING", "").lower()
     if disable_val in {"1", "true", "yes"}:
         return False
@@ -103,10 +117,11 @@ def should_use_chunking(audio_path: Path) -> bool:
     if not Path(audio_path).exists():
         return False
 
-    try:
-        duration_ms = _read_duration_ms(Path(audio_path))
-    except Exception:
-        return False
+    if duration_ms is None:
+        try:
+            duration_ms = _read_duration_ms(Path(audio_path))
+        except Exception:
+            return False
 
     if duration_ms <= CHUNK_TARGET_MS:
         return False
@@ -114,43 +129,177 @@ def should_use_chunking(audio_path: Path) -> bool:
     return True
 
 
+def _ideal_split_targets(duration_ms: int, target_chunk_ms: int) -> List[int]:
+    num_chunks = math.ceil(duration_ms / target_chunk_ms)
+    ideal_chunk_size = duration_ms / num_chunks
+    return [int(i * ideal_chunk_size) for i in range(1, num_chunks)]
+
+
+def _split_near(silences: Sequence[Sequence[int]], target_ms: int, search_start: int) -> int:
+    """Midpoint of the silence closest to ``target_ms`` (or the target itself)."""
+    if not silences:
+        return target_ms
+    target_offset = target_ms - search_start
+    closest_silence = min(
+        silences,
+        key=lambda s: abs((s[0] + s[1]) / 2 - target_offset),
+    )
+    return search_start + (closest_silence[0] + closest_silence[1]) // 2
+
+
 def find_split_points(audio: AudioSegment, target_chunk_ms: int = CHUNK_TARGET_MS) -> List[int]:
     """Find split points. Defaults to even-sized chunks when longer than target."""
     duration_ms = len(audio)
     if duration_ms <= target_chunk_ms:
         return [duration_ms]
 
-    num_chunks = math.ceil(duration_ms / target_chunk_ms)
-    ideal_chunk_size = duration_ms / num_chunks
-
     split_points = []
-    for i in range(1, num_chunks):
-        target_ms = int(i * ideal_chunk_size)
-        search_start = max(0, target_ms - 30000)
-        search_end = min(duration_ms, target_ms + 30000)
+    for target_ms in _ideal_split_targets(duration_ms, target_chunk_ms):
+        search_start = max(0, target_ms - SILENCE_SEARCH_MS)
+        search_end = min(duration_ms, target_ms + SILENCE_SEARCH_MS)
         search_segment = audio[search_start:search_end]
         silences = detect_silence(
             search_segment,
             min_silence_len=MIN_SILENCE_MS,
             silence_thresh=SILENCE_THRESH,
         )
+        split_points.append(_split_near(silences, target_ms, search_start))
+
+    split_points.append(duration_ms)
+    return split_points
 
-        if silences:
-            target_offset = target_ms - search_start
-            closest_silence = min(
-                silences,
-                key=lambda s: abs((s[0] + s[1]) / 2 - target_offset),
-            )
-            split_ms = search_start + (closest_silence[0] + closest_silence[1]) // 2
-        else:
-            split_ms = target_ms
 
-        split_points.append(split_ms)
+def _detect_silence_pcm(
+    data: bytes,
+    sample_width: int,
+    channels: int,
+    frame_rate: int,
+    min_silence_len: int = MIN_SILENCE_MS,
+    silence_thresh: float = SILENCE_THRESH,
+    seek_step: int = 10,
+) -> List[List[int]]:
+    """``pydub.silence.detect_silence`` over raw PCM with a ``seek_step`` grid.
+
+    Energy is computed once per step-sized block and windows are summed from a
+    prefix array, so each search window costs one pass over its samples
+    instead of one RMS per millisecond. Uses the wave module's PCM directly to
+    avoid pydub stubs in tests.
+    """
+    frame_width = sample_width * channels
+    block_frames = max(1, int(frame_rate * seek_step / 1000))
+    block_bytes = block_frames * frame_width
+    n_blocks = len(data) // block_bytes
+    window_blocks = max(1, min_silence_len // seek_step)
+    if n_blocks < window_blocks:
+        return []
+
+    samples_per_block = block_frames * channels
+    prefix = [0.0]
+    for i in range(n_blocks):
+        rms = audioop.rms(data[i * block_bytes:(i + 1) * block_bytes], sample_width)
+        prefix.append(prefix[-1] + float(rms) * rms * samples_per_block)
+
+    max_amplitude = float(2 ** (sample_width * 8)) / 2
+    thresh = (10 ** (silence_thresh / 20.0)) * max_amplitude
+    thresh_energy = thresh * thresh * samples_per_block * window_blocks
+
+    silence_starts = [
+        i for i in range(n_blocks - window_blocks + 1)
+        if prefix[i + window_blocks] - prefix[i] <= thresh_energy
+    ]
+    if not silence_starts:
+        return []
+
+    silent_ranges: List[List[int]] = []
+    range_start = prev = silence_starts[0]
+    for i in silence_starts[1:]:
+        if i != prev + 1 and i > prev + window_blocks:
+            silent_ranges.append([range_start * seek_step, (prev + window_blocks) * seek_step])
+            range_start = i
+        prev = i
+    silent_ranges.append([range_start * seek_step, (prev + window_blocks) * seek_step])
+    return silent_ranges
+
+
+def find_split_points_in_wav(audio_path: Path, target_chunk_ms: int = CHUNK_TARGET_MS) -> List[int]:
+    """Same as :func:`find_split_points` but only reads the search windows from disk."""
+    with wave.open(str(audio_path), "rb") as wf:
+        rate = wf.getframerate() or 1
+        total_frames = wf.getnframes()
+        duration_ms = int((total_frames / float(rate)) * 1000)
+        if duration_ms <= target_chunk_ms:
+            return [duration_ms]
+
+        split_points = []
+        for target_ms in _ideal_split_targets(duration_ms, target_chunk_ms):
+            search_start = max(0, target_ms - SILENCE_SEARCH_MS)
+            search_end = min(duration_ms, target_ms + SILENCE_SEARCH_MS)
+            start_frame = int(search_start * rate / 1000)
+            wf.setpos(min(start_frame, total_frames))
+            silences = _detect_silence_pcm(
+                wf.readframes(int((search_end - search_start) * rate / 1000)),
+                sample_width=wf.getsampwidth(),
+                channels=wf.getnchannels(),
+                frame_rate=rate,
+            )
+            split_points.append(_split_near(silences, target_ms, search_start))
 
     split_points.append(duration_ms)
     return split_points
 
 
+def _write_wav_slice(wf: wave.Wave_read, start_ms: int, end_ms: int, dest: Path) -> None:
+    """Copy ``[start_ms, end_ms)`` of an open WAV to ``dest`` in bounded blocks."""
+    rate = wf.getframerate() or 1
+    total_frames = wf.getnframes()
+    start_frame = min(total_frames, int(start_ms * rate / 1000))
+    end_frame = min(total_frames, int(end_ms * rate / 1000))
+    wf.setpos(start_frame)
+    remaining = max(0, end_frame - start_frame)
+    with wave.open(str(dest), "wb") as out:
+        out.setnchannels(wf.getnchannels())
+        out.setsampwidth(wf.getsampwidth())
+        out.setframerate(rate)
+        while remaining > 0:
+            block = wf.readframes(min(remaining, COPY_BLOCK_FRAMES))
+            if not block:
+                break
+            out.writeframesraw(block)
+            remaining -= len(block) // (wf.getsampwidth() * wf.getnchannels())
+
+
+def _transcode_to_wav(audio_path: Path, dest: Path) -> Path:
+    """Decode any input to 16-bit PCM WAV on disk with ffmpeg (no in-memory PCM)."""
+    ffmpeg = os.getenv("FFMPEG_BIN") or shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg not available")
+    cmd = [ffmpeg, "-y", "-v", "error", "-i", str(audio_path), "-vn", "-acodec", "pcm_s16le", "-f", "wav", str(dest)]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr.strip()[-500:]}")
+    return dest
+
+
+def _is_readable_wav(audio_path: Path) -> bool:
+    try:
+        with wave.open(str(audio_path), "rb") as wf:
+            return wf.getnframes() > 0
+    except Exception:
+        return False
+
+
+def _upload_chunk_file(chunk_path: Path, gcs_path: str) -> str:
+    with open(chunk_path, "rb") as fh:
+        return gcs.upload_fileobj(
+            CHUNK_BUCKET,
+            gcs_path,
+            fh,
+            content_type="audio/wav",
+            force_gcs=True,
+            allow_fallback=False,
+        )
+
+
 def split_audio_into_chunks(
     audio_path: Path,
     user_id: UUID,
@@ -179,72 +328,78 @@ def split_audio_into_chunks(
     except Exception as e:
         raise RuntimeError("[chunking] GCS client unavailable - cannot upload chunks. Falling back to direct processing.") from e
 
-    duration_ms: Optional[int] = None
-    audio_bytes: Optional[bytes] = None
-    try:
-        with wave.open(str(audio_path), "rb") as wf:
-            frames = wf.getnframes()
-            rate = wf.getframerate() or 1
-            duration_ms = int((frames / float(rate)) * 1000)
-            audio_bytes = wf.readframes(frames)
-    except Exception:
-        try:
-            audio = AudioSegment.from_file(str(audio_path))
-            duration_ms = len(audio)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                audio.export(tmp.name, format="wav")
-                audio_bytes = Path(tmp.name).read_bytes()
-        except Exception as e:
-            raise RuntimeError("[chunking] Unable to read audio for chunking") from e
-
-    if duration_ms is None or duration_ms <= 0 or audio_bytes is None:
-        raise RuntimeError("[chunking] Unable to determine audio duration for chunking")
-
-    split_points = [duration_ms]
-
     if output_dir is None:
         output_dir = Path(tempfile.mkdtemp(prefix=f"chunks_{episode_id}_"))
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    chunks: List[ChunkMetadata] = []
-    start_ms = 0
-
-    for idx, end_ms in enumerate(split_points):
-        chunk_id = f"{episode_id}_chunk_{idx:03d}"
-        chunk_duration = end_ms - start_ms
-        chunk_filename = f"{chunk_id}.wav"
-        chunk_path = output_dir / chunk_filename
-
-        chunk_path.write_bytes(audio_bytes)
+    source_path = Path(audio_path)
+    decoded_path: Optional[Path] = None
+    if not _is_readable_wav(source_path):
+        try:
+            decoded_path = _transcode_to_wav(source_path, output_dir / f"{episode_id}_source.wav")
+        except Exception as e:
+            raise RuntimeError("[chunking] Unable to read audio for chunking") from e
+        source_path = decoded_path
 
-        gcs_path = f"{user_id}/chunks/{episode_id}/{chunk_filename}"
+    try:
         try:
-            gcs_uri = gcs.upload_bytes(
-                "ppp-media-us-west1",
-                gcs_path,
-                chunk_path.read_bytes(),
-                content_type="audio/wav",
-                force_gcs=True,
-                allow_fallback=False,
-            )
-            if not gcs_uri or not str(gcs_uri).startswith("gs://"):
-                raise RuntimeError(f"Upload returned invalid URI for chunk {idx}: {gcs_uri}")
+            split_points = find_split_points_in_wav(source_path)
         except Exception as e:
-            raise RuntimeError(
-                f"[chunking] Failed to upload chunk {idx} to GCS: {e}. Aborting chunking and falling back to direct processing."
-            ) from e
-
-        chunk_meta = ChunkMetadata(
-            chunk_id=chunk_id,
-            index=idx,
-            start_ms=start_ms,
-            end_ms=end_ms,
-            duration_ms=chunk_duration,
-            audio_path=str(chunk_path),
-            gcs_audio_uri=gcs_uri,
-        )
-        chunks.append(chunk_meta)
-        start_ms = end_ms
+            raise RuntimeError("[chunking] Unable to read audio for chunking") from e
+
+        if not split_points or split_points[-1] <= 0:
+            raise RuntimeError("[chunking] Unable to determine audio duration for chunking")
+
+        log.info(f"[chunking] Split points (ms): {split_points}")
+
+        chunks: List[ChunkMetadata] = []
+        uploads: List[tuple[int, Future]] = []
+        start_ms = 0
+
+        # Cut chunk N+1 from disk while chunk N streams to GCS.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-upload") as uploader, \
+                wave.open(str(source_path), "rb") as wf:
+            for idx, end_ms in enumerate(split_points):
+                chunk_id = f"{episode_id}_chunk_{idx:03d}"
+                chunk_filename = f"{chunk_id}.wav"
+                chunk_path = output_dir / chunk_filename
+                _write_wav_slice(wf, start_ms, end_ms, chunk_path)
+
+                gcs_path = f"{user_id}/chunks/{episode_id}/{chunk_filename}"
+                uploads.append((idx, uploader.submit(_upload_chunk_file, chunk_path, gcs_path)))
+
+                chunks.append(ChunkMetadata(
+                    chunk_id=chunk_id,
+                    index=idx,
+                    start_ms=start_ms,
+                    end_ms=end_ms,
+                    duration_ms=end_ms - start_ms,
+                    audio_path=str(chunk_path),
+                ))
+                start_ms = end_ms
+
+                # Stop cutting as soon as an earlier upload has failed
+                if any(f.done() and f.exception() for _, f in uploads):
+                    break
+
+            for idx, future in uploads:
+                try:
+                    gcs_uri = future.result()
+                    if not gcs_uri or not str(gcs_uri).startswith("gs://"):
+                        raise RuntimeError(f"Upload returned invalid URI for chunk {idx}: {gcs_uri}")
+                except Exception as e:
+                    for _, pending in uploads:
+                        pending.cancel()
+                    raise RuntimeError(
+                        f"[chunking] Failed to upload chunk {idx} to GCS: {e}. Aborting chunking and falling back to direct processing."
+                    ) from e
+                chunks[idx].gcs_audio_uri = gcs_uri
+    finally:
+        if decoded_path is not None:
+            try:
+                decoded_path.unlink()
+            except Exception:
+                pass
 
     log.info(f"[chunking] Created {len(chunks)} chunks, all uploaded successfully")
     return chunks
@@ -341,7 +496,7 @@ def split_transcript_for_chunks(
                     transcript_bytes = chunk_transcript_path.read_bytes()
                     # Use force_gcs=True since chunks require GCS
                     gcs_uri = gcs.upload_bytes(
-                        "ppp-media-us-west1", 
+                        CHUNK_BUCKET,
                         gcs_transcript_path, 
                         transcript_bytes, 
                         content_type="application/json",
@@ -418,8 +573,6 @@ def reassemble_chunks(
             combined.export(str(output_path), format="mp3")
             duration_ms = len(combined)
         else:
-            # Get duration from first chunk (for logging)
-            first_chunk_audio = AudioSegment.from_file(sorted_chunks[0].cleaned_path)
             # Estimate total duration (sum of chunk durations)
             duration_ms = sum(c.end_ms - c.start_ms for c in sorted_chunks)
             log.info(f"[chunking] ffmpeg concat successful")
@@ -453,3 +606,260 @@ def load_chunk_manifest(manifest_path: Path) -> List[ChunkMetadata]:
     chunks = [ChunkMetadata.from_dict(c) for c in manifest_data["chunks"]]
     log.info(f"[chunking] Loaded manifest with {len(chunks)} chunks from {manifest_path}")
     return chunks
+
+
+def _load_chunk_words(transcript_path: Optional[str]) -> List[Dict[str, Any]]:
+    if not transcript_path or not Path(transcript_path).exists():
+        return []
+    with open(transcript_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return list(data.get("words", []) or [])
+    return []
+
+
+def _clean_chunk_local(
+    index: int,
+    audio_path: str,
+    transcript_path: Optional[str],
+    cleanup_options: Dict[str, Any],
+    is_last_chunk: bool,
+    output_path: str,
+) -> tuple[int, str]:
+    """Process-pool entry point: clean one chunk from local disk to local disk."""
+    from .chunk_worker import clean_chunk_audio
+
+    clean_chunk_audio(
+        Path(audio_path),
+        _load_chunk_words(transcript_path),
+        cleanup_options,
+        is_last_chunk=is_last_chunk,
+        output_path=Path(output_path),
+    )
+    return index, output_path
+
+
+def _cleaned_output_path(chunk: ChunkMetadata, output_dir: Path) -> Path:
+    return output_dir / f"{chunk.chunk_id}_cleaned.mp3"
+
+
+def _chunk_max_workers(max_workers: Optional[int], pending: int) -> int:
+    if max_workers is None:
+        try:
+            max_workers = int(os.getenv("CHUNK_MAX_WORKERS", "0")) or None
+        except ValueError:
+            max_workers = None
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    return max(1, min(max_workers, pending))
+
+
+def process_chunks_locally(
+    chunks: List[ChunkMetadata],
+    cleanup_options: Optional[Dict[str, Any]] = None,
+    output_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> List[ChunkMetadata]:
+    """Clean chunks concurrently in a process pool on this instance.
+
+    Chunks already marked ``completed`` (e.g. from a reloaded manifest) are
+    skipped. Failures are recorded on the chunk (``status="failed"``) rather
+    than raised so the caller can decide whether to retry or fall back.
+    """
+    cleanup_options = dict(cleanup_options or {})
+    total = len(chunks)
+    pending = [c for c in chunks if not (c.status == "completed" and c.cleaned_path and Path(c.cleaned_path).exists())]
+    if not pending:
+        return chunks
+
+    jobs = []
+    for chunk in pending:
+        dest_dir = output_dir or Path(chunk.audio_path).parent
+        jobs.append((
+            chunk.index,
+            chunk.audio_path,
+            chunk.transcript_path,
+            cleanup_options,
+            chunk.index == total - 1,
+            str(_cleaned_output_path(chunk, dest_dir)),
+        ))
+    by_index = {c.index: c for c in pending}
+    workers = _chunk_max_workers(max_workers, len(jobs))
+    log.info(f"[chunking] Cleaning {len(jobs)} chunks locally with {workers} worker(s)")
+
+    def _mark(index: int, cleaned_path: Optional[str], error: Optional[BaseException]) -> None:
+        chunk = by_index[index]
+        if error is None:
+            chunk.cleaned_path = cleaned_path
+            chunk.status = "completed"
+        else:
+            chunk.status = "failed"
+            chunk.extra["error"] = str(error)
+            log.error(f"[chunking] Chunk {index} failed to clean: {error}")
+
+    if workers == 1:
+        for job in jobs:
+            try:
+                _, cleaned = _clean_chunk_local(*job)
+                _mark(job[0], cleaned, None)
+            except Exception as e:
+                _mark(job[0], None, e)
+        return chunks
+
+    # spawn: the worker process may hold DB pools and threads that must not be forked
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futures = {pool.submit(_clean_chunk_local, *job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                _, cleaned = future.result()
+                _mark(index, cleaned, None)
+            except Exception as e:
+                _mark(index, None, e)
+    return chunks
+
+
+def _cleaned_blob_path(chunk: ChunkMetadata) -> str:
+    """Object key the ``/process-chunk`` handler writes the cleaned chunk to."""
+    return str(chunk.gcs_audio_uri).replace(".wav", "_cleaned.mp3").replace(f"gs://{CHUNK_BUCKET}/", "")
+
+
+def dispatch_chunks_to_tasks(
+    chunks: List[ChunkMetadata],
+    user_id: UUID | str,
+    episode_id: UUID | str,
+    cleanup_options: Optional[Dict[str, Any]] = None,
+) -> List[ChunkMetadata]:
+    """Enqueue one ``/api/tasks/process-chunk`` task per pending chunk."""
+    from infrastructure.tasks_client import enqueue_http_task
+
+    for chunk in chunks:
+        if chunk.status == "completed":
+            continue
+        payload = {
+            "episode_id": str(episode_id),
+            "chunk_id": chunk.chunk_id,
+            "chunk_index": chunk.index,
+            "total_chunks": len(chunks),
+            "gcs_audio_uri": chunk.gcs_audio_uri,
+            "gcs_transcript_uri": chunk.gcs_transcript_uri,
+            "cleanup_options": cleanup_options or {},
+            "user_id": str(user_id),
+        }
+        task = enqueue_http_task(CHUNK_TASK_PATH, payload)
+        chunk.status = "dispatched"
+        chunk.extra["task_name"] = (task or {}).get("name")
+    log.info(f"[chunking] Dispatched {len(chunks)} chunk tasks for episode {episode_id}")
+    return chunks
+
+
+def wait_for_cleaned_chunks(
+    chunks: List[ChunkMetadata],
+    output_dir: Path,
+    timeout_s: float = 1800.0,
+    poll_interval_s: float = 5.0,
+) -> List[ChunkMetadata]:
+    """Poll GCS until every dispatched chunk's cleaned MP3 exists, then download it."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout_s
+    while True:
+        waiting = [c for c in chunks if c.status != "completed"]
+        for chunk in waiting:
+            blob_path = _cleaned_blob_path(chunk)
+            if not gcs.blob_exists(CHUNK_BUCKET, blob_path):
+                continue
+            data = gcs.download_gcs_bytes(CHUNK_BUCKET, blob_path, force_gcs=True)
+            if not data:
+                continue
+            dest = _cleaned_output_path(chunk, output_dir)
+            dest.write_bytes(data)
+            chunk.cleaned_path = str(dest)
+            chunk.status = "completed"
+            log.info(f"[chunking] Chunk {chunk.index} cleaned by task ({len(data)} bytes)")
+        if all(c.status == "completed" for c in chunks):
+            return chunks
+        if time.monotonic() >= deadline:
+            missing = [c.index for c in chunks if c.status != "completed"]
+            raise RuntimeError(f"[chunking] Timed out waiting for cleaned chunks {missing}")
+        time.sleep(poll_interval_s)
+
+
+def process_chunks(
+    chunks: List[ChunkMetadata],
+    user_id: UUID | str,
+    episode_id: UUID | str,
+    cleanup_options: Optional[Dict[str, Any]] = None,
+    mode: Optional[str] = None,
+    manifest_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> List[ChunkMetadata]:
+    """Clean all chunks in parallel.
+
+    ``mode`` is ``"local"`` (process pool on this instance) or ``"tasks"`` (one
+    Cloud Task per chunk, joined by polling GCS); defaults to the
+    ``CHUNK_PROCESSING_MODE`` env var, then ``"local"``. The manifest, when
+    given, is rewritten after cleaning so an interrupted run can resume.
+    """
+    mode = (mode or os.getenv("CHUNK_PROCESSING_MODE") or "local").strip().lower()
+    work_dir = Path(manifest_path).parent if manifest_path else None
+    if mode == "tasks":
+        dispatch_chunks_to_tasks(chunks, user_id, episode_id, cleanup_options)
+        if manifest_path:
+            save_chunk_manifest(chunks, manifest_path)
+        wait_for_cleaned_chunks(chunks, work_dir or Path(chunks[0].audio_path).parent)
+    else:
+        process_chunks_locally(chunks, cleanup_options, output_dir=work_dir, max_workers=max_workers)
+    if manifest_path:
+        save_chunk_manifest(chunks, manifest_path)
+    failed = [c.index for c in chunks if c.status != "completed"]
+    if failed:
+        raise RuntimeError(f"[chunking] Chunks {failed} failed to clean")
+    return chunks
+
+
+def reassemble_from_manifest(manifest_path: Path, output_path: Path) -> Path:
+    """Join the cleaned chunks recorded in a manifest."""
+    return reassemble_chunks(load_chunk_manifest(manifest_path), output_path)
+
+
+def run_chunked_clean(
+    audio_path: Path,
+    transcript_path: Optional[Path],
+    user_id: UUID,
+    episode_id: UUID,
+    output_path: Path,
+    cleanup_options: Optional[Dict[str, Any]] = None,
+    mode: Optional[str] = None,
+    work_dir: Optional[Path] = None,
+) -> Path:
+    """Split, clean every chunk concurrently, and join into ``output_path``.
+
+    Re-running with the same ``work_dir`` resumes from its manifest and only
+    cleans chunks that have not completed yet.
+    """
+    work_dir = work_dir or Path(tempfile.mkdtemp(prefix=f"chunks_{episode_id}_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = work_dir / "manifest.json"
+
+    if manifest_path.exists():
+        chunks = load_chunk_manifest(manifest_path)
+    else:
+        chunks = split_audio_into_chunks(audio_path, user_id, episode_id, output_dir=work_dir)
+        if transcript_path is not None:
+            split_transcript_for_chunks(Path(transcript_path), chunks, output_dir=work_dir)
+        save_chunk_manifest(chunks, manifest_path)
+
+    process_chunks(
+        chunks,
+        user_id,
+        episode_id,
+        cleanup_options=cleanup_options,
+        mode=mode,
+        manifest_path=manifest_path,
+    )
+    return reassemble_from_manifest(manifest_path, output_path)
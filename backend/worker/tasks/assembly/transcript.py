@@ -17,6 +17,8 @@ from sqlmodel import select
 from api.models.podcast import MediaCategory, MediaItem, Podcast
 from api.services import ai_enhancer, clean_engine, transcription as trans
 from api.services.audio.common import sanitize_filename
+from api.services.audio.transcript_io import load_transcript_json, write_pack_sidecar
+from api.services.episodes.transcript_index import set_episode_index
 from api.services.clean_engine.features import apply_flubber_cuts
 from api.services.transcription.speaker_identification import prepend_speaker_intros, map_speaker_labels
 from api.core.paths import MEDIA_DIR, WS_ROOT as PROJECT_ROOT
@@ -181,6 +183,12 @@ def _snapshot_original_transcript(*, episode, session, words_json_path: Path | N
             orig_new.name if orig_new.exists() else (orig_legacy.name if orig_legacy.exists() else None)
         )
         meta["transcripts"] = transcripts
+        try:
+            words = load_transcript_json(Path(words_json_path))
+            if words:
+                set_episode_index(meta, words)
+        except Exception:
+            logging.warning("[assemble] Failed to index original transcript", exc_info=True)
         episode.meta_json = json.dumps(meta)
         session.add(episode)
         if not _commit_with_retry(session):
@@ -387,6 +395,7 @@ def _maybe_generate_transcript(
                         out_path.parent.mkdir(parents=True, exist_ok=True)
                         with open(out_path, "w", encoding="utf-8") as fh:
                             json.dump(words, fh, ensure_ascii=False, indent=2)
+                        write_pack_sidecar(out_path, words)
                         logging.info("[assemble] ✅ Loaded transcript from database (media_item_id=%s): %d words -> %s", 
                                    media_item.id, len(words), out_path)
                         return out_path
@@ -440,6 +449,7 @@ def _maybe_generate_transcript(
                         out_path.parent.mkdir(parents=True, exist_ok=True)
                         with open(out_path, "w", encoding="utf-8") as fh:
                             json.dump(words, fh, ensure_ascii=False, indent=2)
+                        write_pack_sidecar(out_path, words)
                         logging.info("[assemble] ✅ Loaded transcript from database (filename match): %d words -> %s", 
                                    len(words), out_path)
                         return out_path
@@ -625,6 +635,7 @@ def _maybe_generate_transcript(
     out_path = target_dir / f"{out_stem}.json"
     with open(out_path, "w", encoding="utf-8") as fh:
         json.dump(words_list, fh)
+    write_pack_sidecar(out_path, words_list)
 
     if os.getenv("TRANSCRIPTS_LEGACY_MIRROR", "").strip().lower() in {"1", "true", "yes", "on"}:
         try:
@@ -886,8 +897,7 @@ def prepare_transcript_context(
                     )
                     
                     # Load transcript words
-                    with open(words_json_path, 'r', encoding='utf-8') as f:
-                        words = json.load(f)
+                    words = load_transcript_json(Path(words_json_path))
                     
                     # Map speaker labels (modifies words in-place)
                     mapped_words = map_speaker_labels(
@@ -901,6 +911,7 @@ def prepare_transcript_context(
                     # Save mapped transcript back to file
                     with open(words_json_path, 'w', encoding='utf-8') as f:
                         json.dump(mapped_words, f, ensure_ascii=False, indent=2)
+                    write_pack_sidecar(Path(words_json_path), mapped_words)
                     
                     logging.info("[assemble] ✅ Speaker labels mapped to real names")
                 else:
@@ -945,6 +956,7 @@ def prepare_transcript_context(
     intern_intent = str((intents.get("intern") if isinstance(intents, dict) else "") or "").lower()
     sfx_intent = str((intents.get("sfx") if isinstance(intents, dict) else "") or "").lower()
     censor_intent = str((intents.get("censor") if isinstance(intents, dict) else "") or "").lower()
+    render_backend = str((intents.get("render_backend") if isinstance(intents, dict) else "") or "").lower() or None
     logging.info(
         "[assemble] intents: flubber=%s intern=%s sfx=%s censor=%s",
         flubber_intent or "unset",
@@ -1011,6 +1023,7 @@ def prepare_transcript_context(
                 flubber_cuts_ms=cuts_ms,
                 output_name=engine_output,
                 disable_intern_insertion=should_disable_old_intern,  # Disable old path when user-reviewed overrides exist
+                render_backend=render_backend,
             )
         cleaned_path = None
         try:
@@ -1131,6 +1144,7 @@ def prepare_transcript_context(
                     out_path = tr_dir / f"{Path(filename).stem}.json"
                     with open(out_path, "w", encoding="utf-8") as fh:
                         json.dump(words_list, fh)
+                    write_pack_sidecar(out_path, words_list)
                     legacy = tr_dir / f"{Path(filename).stem}.words.json"
                     if not legacy.exists():
                         shutil.copyfile(out_path, legacy)
@@ -2,7 +2,8 @@
 
 This service runs as a separate Cloud Run deployment that:
 1. Receives task requests via HTTP (from Cloud Tasks)
-2. Executes them synchronously in the request handler
+2. Executes them on a bounded executor (off the event loop), rejecting with
+   503 + Retry-After when saturated so Cloud Tasks backs off
 3. Returns only after task completion
 4. Has extended timeout configured (60 minutes vs 5 minutes for API)
 
@@ -62,6 +63,10 @@ from worker.tasks.assembly.chunk_worker import (
     run_chunk_processing,
     validate_process_chunk_payload,
 )
+from worker.admission import BoundedTaskExecutor, WorkerSaturated
+
+# Register SQLAlchemy listeners (RSS feed cache invalidation) for rows the worker writes
+import api.db_listeners  # noqa: F401
 
 # Track active tasks for monitoring
 import psutil
@@ -71,6 +76,30 @@ from datetime import datetime
 _active_tasks = {}
 _task_lock = threading.Lock()
 
+# Assembly/chunk work runs here, never on the event loop (see worker/admission.py)
+_task_executor = BoundedTaskExecutor()
+log.info("event=worker.init.executor %s", _task_executor.snapshot())
+
+
+def _admit_or_503(kind: str, episode_id: str) -> None:
+    """Reserve an executor slot or tell Cloud Tasks to back off."""
+    try:
+        _task_executor.try_admit()
+    except WorkerSaturated as sat:
+        log.warning(
+            "event=worker.%s.saturated episode_id=%s in_flight=%s queued=%s retry_after=%s",
+            kind,
+            episode_id,
+            sat.in_flight,
+            sat.queued,
+            sat.retry_after_s,
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="worker saturated, retry later",
+            headers={"Retry-After": str(sat.retry_after_s)},
+        )
+
 # -------------------- Health Check --------------------
 
 @app.get("/")
@@ -115,6 +144,7 @@ async def worker_status():
             "pid": os.getpid(),
             "active_tasks": active_count,
             "tasks": tasks_snapshot,
+            "executor": _task_executor.snapshot(),
             "worker_process": {
                 "cpu_percent": round(cpu_percent, 1),
                 "memory_mb": round(memory_info.rss / 1024 / 1024, 1),
@@ -194,10 +224,11 @@ async def assemble_episode_worker(
     x_tasks_auth: str | None = Header(default=None),
     x_cloudtasks_taskretrycount: int | None = Header(default=None)
 ):
-    """Execute episode assembly synchronously in this worker process.
+    """Execute episode assembly in this worker process and respond when it finishes.
     
-    This runs DIRECTLY in the HTTP request handler - no background threads/processes.
-    Cloud Run's 60-minute timeout gives us plenty of time to complete.
+    The assembly runs on the bounded task executor so the event loop keeps
+    serving /health and /status. Cloud Run's 60-minute timeout gives us plenty
+    of time to complete.
     
     Security:
       - In dev, allow default secret
@@ -205,6 +236,7 @@ async def assemble_episode_worker(
     
     Returns:
       - 200 OK with result on success
+      - 503 with Retry-After when every executor slot is taken
       - 500 with error details on failure
     """
     # Authenticate
@@ -239,7 +271,9 @@ async def assemble_episode_worker(
         log.error("event=worker.assemble.invalid_payload error=%s", str(ve))
         raise HTTPException(status_code=400, detail=f"invalid payload: {ve}")
 
-    # Execute assembly SYNCHRONOUSLY in this request
+    _admit_or_503("assemble", payload.episode_id)
+
+    # Execute assembly within this request, off the event loop
     log.info("event=worker.assemble.start episode_id=%s pid=%s", payload.episode_id, os.getpid())
 
     # Track task for monitoring
@@ -254,7 +288,8 @@ async def assemble_episode_worker(
     try:
         # Import here to avoid loading heavy dependencies on startup
         
-        result = create_podcast_episode(
+        result = await _task_executor.run_admitted(
+            create_podcast_episode,
             episode_id=payload.episode_id,
             template_id=payload.template_id,
             main_content_filename=payload.main_content_filename,
@@ -304,6 +339,7 @@ async def assemble_episode_worker(
             detail=f"Assembly failed: {str(exc)}"
         )
     finally:
+        # The executor frees the slot itself once the call actually finishes.
         # Remove from active tasks
         with _task_lock:
             _active_tasks.pop(task_id, None)
@@ -313,7 +349,7 @@ async def assemble_episode_worker(
 
 @app.post("/api/tasks/process-chunk")
 async def process_chunk_worker(request: Request, x_tasks_auth: str | None = Header(default=None)):
-    """Process a single chunk synchronously within the worker service."""
+    """Process a single chunk on the bounded executor within the worker service."""
 
     if not _IS_DEV:
         if not x_tasks_auth or x_tasks_auth != _TASKS_AUTH:
@@ -344,6 +380,8 @@ async def process_chunk_worker(request: Request, x_tasks_auth: str | None = Head
         log.error("event=worker.chunk.invalid_payload error=%s", ve)
         raise HTTPException(status_code=400, detail=f"invalid payload: {ve}")
 
+    _admit_or_503("chunk", payload.episode_id)
+
     log.info(
         "event=worker.chunk.start episode_id=%s chunk_id=%s pid=%s",
         payload.episode_id,
@@ -362,7 +400,7 @@ async def process_chunk_worker(request: Request, x_tasks_auth: str | None = Head
         }
 
     try:
-        run_chunk_processing(payload)
+        await _task_executor.run_admitted(run_chunk_processing, payload)
     except Exception as exc:
         log.exception(
             "event=worker.chunk.error episode_id=%s chunk_id=%s",
@@ -370,17 +408,18 @@ async def process_chunk_worker(request: Request, x_tasks_auth: str | None = Head
             payload.chunk_id,
         )
         raise HTTPException(status_code=500, detail=f"Chunk processing failed: {exc}")
+    finally:
+        # The executor frees the slot itself once the call actually finishes.
+        # Remove from active tasks
+        with _task_lock:
+            _active_tasks.pop(task_id, None)
 
     log.info(
         "event=worker.chunk.done episode_id=%s chunk_id=%s",
         payload.episode_id,
         payload.chunk_id,
     )
-    
-    # Remove from active tasks
-    with _task_lock:
-        _active_tasks.pop(task_id, None)
-    
+
     return {
         "ok": True,
         "status": "completed",
@@ -401,6 +440,11 @@ async def startup_event():
     log.info("event=worker.ready service=healthy")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    _task_executor.shutdown(wait=False)
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8080"))
@@ -32,7 +32,9 @@ export default function RssImporter({ onBack, token }) {
             if (result && result.status && result.status >= 400) throw new Error(result.detail || 'Failed to import from RSS feed.');
             const parts = [
               `Imported "${result.podcast_name}" with ${result.episodes_imported} episodes.`,
-              (typeof result.mirrored_count === 'number' ? `${result.mirrored_count} mirrored` : null),
+              (result.import_job?.import
+                ? `${result.import_job.import.total} episode audio files mirroring in the background`
+                : (typeof result.mirrored_count === 'number' && result.mirrored_count ? `${result.mirrored_count} mirrored` : null)),
               (typeof result.auto_publish_started === 'number' && autoPublish ? `${result.auto_publish_started} publish jobs started` : null),
             ].filter(Boolean);
             const extra = [];
@@ -9,9 +9,12 @@ Write-Host "================================================" -ForegroundColor C
 Write-Host "  Cloud Scheduler Setup for Podcast Plus Plus" -ForegroundColor Cyan
 Write-Host "================================================" -ForegroundColor Cyan
 Write-Host ""
-Write-Host "This script will create 2 Cloud Scheduler jobs:" -ForegroundColor Yellow
+Write-Host "This script will create 5 Cloud Scheduler jobs:" -ForegroundColor Yellow
 Write-Host "  1. purge-expired-uploads (daily at 2:00 AM PT)" -ForegroundColor Yellow
 Write-Host "  2. purge-episode-mirrors (daily at 2:00 AM PT)" -ForegroundColor Yellow
+Write-Host "  3. refresh-stripe-metrics (every 10 minutes)" -ForegroundColor Yellow
+Write-Host "  4. resume-rss-imports (every 15 minutes)" -ForegroundColor Yellow
+Write-Host "  5. resume-transcriptions (every 10 minutes)" -ForegroundColor Yellow
 Write-Host ""
 Write-Host "IMPORTANT: Update SERVICE_URL in this script first!" -ForegroundColor Red
 Write-Host "Current value: $SERVICE_URL" -ForegroundColor Red
@@ -24,7 +27,7 @@ if ($continue -ne "y") {
 }
 
 Write-Host ""
-Write-Host "[1/2] Creating purge-expired-uploads job..." -ForegroundColor Green
+Write-Host "[1/5] Creating purge-expired-uploads job..." -ForegroundColor Green
 
 gcloud scheduler jobs create http purge-expired-uploads `
     --location=$LOCATION `
@@ -46,7 +49,7 @@ if ($LASTEXITCODE -eq 0) {
 }
 
 Write-Host ""
-Write-Host "[2/2] Creating purge-episode-mirrors job..." -ForegroundColor Green
+Write-Host "[2/5] Creating purge-episode-mirrors job..." -ForegroundColor Green
 
 gcloud scheduler jobs create http purge-episode-mirrors `
     --location=$LOCATION `
@@ -68,6 +71,72 @@ if ($LASTEXITCODE -eq 0) {
     Write-Host "✗ Failed to create purge-episode-mirrors job" -ForegroundColor Red
 }
 
+Write-Host ""
+Write-Host "[3/5] Creating refresh-stripe-metrics job..." -ForegroundColor Green
+
+gcloud scheduler jobs create http refresh-stripe-metrics `
+    --location=$LOCATION `
+    --schedule="*/10 * * * *" `
+    --time-zone="America/Los_Angeles" `
+    --uri="${SERVICE_URL}/api/tasks/maintenance/refresh-stripe-metrics" `
+    --http-method=POST `
+    --oidc-service-account-email="podcast-api@${PROJECT_ID}.iam.gserviceaccount.com" `
+    --oidc-token-audience="${SERVICE_URL}" `
+    --max-retry-attempts=1 `
+    --min-backoff="30s" `
+    --max-backoff="300s" `
+    --description="Recompute the admin dashboard Stripe revenue snapshot (every 10 minutes)"
+
+if ($LASTEXITCODE -eq 0) {
+    Write-Host "✓ refresh-stripe-metrics job created" -ForegroundColor Green
+} else {
+    Write-Host "✗ Failed to create refresh-stripe-metrics job" -ForegroundColor Red
+}
+
+Write-Host ""
+Write-Host "[4/5] Creating resume-rss-imports job..." -ForegroundColor Green
+
+gcloud scheduler jobs create http resume-rss-imports `
+    --location=$LOCATION `
+    --schedule="*/15 * * * *" `
+    --time-zone="America/Los_Angeles" `
+    --uri="${SERVICE_URL}/api/tasks/maintenance/resume-rss-imports" `
+    --http-method=POST `
+    --oidc-service-account-email="podcast-api@${PROJECT_ID}.iam.gserviceaccount.com" `
+    --oidc-token-audience="${SERVICE_URL}" `
+    --max-retry-attempts=1 `
+    --min-backoff="30s" `
+    --max-backoff="300s" `
+    --description="Re-enqueue RSS back-catalog imports whose worker died or never started (every 15 minutes)"
+
+if ($LASTEXITCODE -eq 0) {
+    Write-Host "✓ resume-rss-imports job created" -ForegroundColor Green
+} else {
+    Write-Host "✗ Failed to create resume-rss-imports job" -ForegroundColor Red
+}
+
+Write-Host ""
+Write-Host "[5/5] Creating resume-transcriptions job..." -ForegroundColor Green
+
+gcloud scheduler jobs create http resume-transcriptions `
+    --location=$LOCATION `
+    --schedule="*/10 * * * *" `
+    --time-zone="America/Los_Angeles" `
+    --uri="${SERVICE_URL}/api/tasks/maintenance/resume-transcriptions" `
+    --http-method=POST `
+    --oidc-service-account-email="podcast-api@${PROJECT_ID}.iam.gserviceaccount.com" `
+    --oidc-token-audience="${SERVICE_URL}" `
+    --max-retry-attempts=1 `
+    --min-backoff="30s" `
+    --max-backoff="300s" `
+    --description="Finish AssemblyAI transcripts whose submitting instance went away (every 10 minutes)"
+
+if ($LASTEXITCODE -eq 0) {
+    Write-Host "✓ resume-transcriptions job created" -ForegroundColor Green
+} else {
+    Write-Host "✗ Failed to create resume-transcriptions job" -ForegroundColor Red
+}
+
 Write-Host ""
 Write-Host "================================================" -ForegroundColor Cyan
 Write-Host "  Cloud Scheduler Setup Complete" -ForegroundColor Cyan
@@ -82,5 +151,5 @@ Write-Host ""
 Write-Host "To view job execution history:" -ForegroundColor Yellow
 Write-Host "  gcloud scheduler jobs describe purge-expired-uploads --location=$LOCATION" -ForegroundColor White
 Write-Host ""
-Write-Host "Cost: $0/month (first 3 jobs are free)" -ForegroundColor Green
+Write-Host "Cost: ~`$0.20/month (first 3 jobs are free, `$0.10 per additional job)" -ForegroundColor Green
 Write-Host ""
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from api.services import stripe_metrics
+
+
+class _Listing:
+    def __init__(self, items):
+        self._items = items
+
+    def auto_paging_iter(self):
+        return iter(self._items)
+
+
+def _fake_stripe(charges, subscriptions=()):
+    calls = []
+
+    def charge_list(**kwargs):
+        calls.append(("charges", kwargs))
+        return _Listing(charges)
+
+    def sub_list(**kwargs):
+        calls.append(("subscriptions", kwargs))
+        return _Listing(subscriptions)
+
+    fake = SimpleNamespace(
+        api_key="sk_test",
+        Charge=SimpleNamespace(list=charge_list),
+        Subscription=SimpleNamespace(list=sub_list),
+    )
+    return fake, calls
+
+
+@pytest.fixture(autouse=True)
+def _local_only(monkeypatch):
+    monkeypatch.setattr(stripe_metrics, "redis_get", lambda key: None)
+    monkeypatch.setattr(stripe_metrics, "redis_setex", lambda key, ttl, value: False)
+    monkeypatch.setattr(stripe_metrics, "get_redis_client", lambda: None)
+    stripe_metrics.clear_local_cache()
+    yield
+    stripe_metrics.clear_local_cache()
+
+
+def test_snapshot_buckets_one_charge_listing(monkeypatch):
+    now = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+    ts = lambda dt: int(dt.timestamp())  # noqa: E731
+    charges = [
+        SimpleNamespace(status="succeeded", amount=1000, amount_refunded=0, created=ts(now - timedelta(days=1))),
+        SimpleNamespace(status="succeeded", amount=500, amount_refunded=200, created=ts(datetime(2025, 2, 20, tzinfo=timezone.utc))),
+        SimpleNamespace(status="succeeded", amount=700, amount_refunded=0, created=ts(datetime(2025, 2, 2, tzinfo=timezone.utc))),
+        SimpleNamespace(status="failed", amount=9999, amount_refunded=0, created=ts(now)),
+    ]
+    price = SimpleNamespace(unit_amount=1200, recurring=SimpleNamespace(interval="year"))
+    subs = [SimpleNamespace(items={"data": [SimpleNamespace(price=price, quantity=2)]})]
+    fake, calls = _fake_stripe(charges, subs)
+    monkeypatch.setattr(stripe_metrics, "stripe_lib", fake)
+
+    snapshot = stripe_metrics.compute_snapshot(now)
+
+    assert [c[0] for c in calls].count("charges") == 1
+    assert snapshot["mrr_cents"] == 200
+    assert snapshot["arr_cents"] == 2400
+    assert snapshot["revenue_30d_cents"] == 1300
+    assert snapshot["revenue_this_month_cents"] == 1000
+    assert snapshot["revenue_last_month_cents"] == 1000
+    assert snapshot["computed_at"] == now.isoformat()
+
+
+def test_get_snapshot_never_calls_stripe_inline(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(stripe_metrics, "request_refresh", lambda: scheduled.append(1))
+
+    empty = stripe_metrics.get_snapshot()
+    assert empty["mrr_cents"] is None and empty["stale"] is True
+    assert len(scheduled) == 1
+
+    fresh = {"mrr_cents": 100, "arr_cents": 1200, "computed_at": datetime.now(timezone.utc).isoformat()}
+    stripe_metrics._store(fresh)
+    served = stripe_metrics.get_snapshot()
+    assert served["mrr_cents"] == 100 and served["stale"] is False
+    assert len(scheduled) == 1
+
+    old = dict(fresh, computed_at=(datetime.now(timezone.utc) - timedelta(hours=2)).isoformat())
+    stripe_metrics._store(old)
+    served = stripe_metrics.get_snapshot()
+    assert served["mrr_cents"] == 100 and served["stale"] is True
+    assert len(scheduled) == 2
+
+
+def test_refresh_stores_snapshot(monkeypatch):
+    fake, _calls = _fake_stripe([])
+    monkeypatch.setattr(stripe_metrics, "stripe_lib", fake)
+
+    assert stripe_metrics.refresh_snapshot()["mrr_cents"] == 0
+    assert stripe_metrics.get_snapshot()["computed_at"] is not None
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def test_refresh_releases_its_lease(monkeypatch):
+    fake, _calls = _fake_stripe([])
+    monkeypatch.setattr(stripe_metrics, "stripe_lib", fake)
+    redis = _FakeRedis()
+    monkeypatch.setattr(stripe_metrics, "get_redis_client", lambda: redis)
+
+    assert stripe_metrics.refresh_snapshot() is not None
+    assert stripe_metrics._LEASE_KEY not in redis.data
+    # A second refresh right away is not blocked by a leftover lease.
+    assert stripe_metrics.refresh_snapshot() is not None
+
+    redis.data[stripe_metrics._LEASE_KEY] = "other-instance"
+    assert stripe_metrics.refresh_snapshot() is None
+    assert redis.data[stripe_metrics._LEASE_KEY] == "other-instance"
+
+
+def test_stale_snapshot_enqueues_one_refresh_task(monkeypatch):
+    import infrastructure.tasks_client as tasks_client
+
+    fake, calls = _fake_stripe([])
+    monkeypatch.setattr(stripe_metrics, "stripe_lib", fake)
+    enqueued = []
+    monkeypatch.setattr(tasks_client, "should_use_cloud_tasks", lambda: True)
+    monkeypatch.setattr(tasks_client, "enqueue_http_task", lambda path, body: enqueued.append(path) or {"name": "t"})
+
+    assert stripe_metrics.get_snapshot()["stale"] is True
+    assert stripe_metrics.get_snapshot()["stale"] is True
+
+    assert enqueued == [stripe_metrics.REFRESH_TASK_PATH]
+    assert calls == []  # Stripe is only queried by the task itself
+
+
+def test_daily_series_are_grouped_in_sql(monkeypatch):
+    from uuid import uuid4
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from api.models.podcast import Episode
+    from api.models.user import User
+    from api.routers.admin import metrics as metrics_router
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Episode.__table__])
+    monkeypatch.setattr(stripe_metrics, "request_refresh", lambda: None)
+    today = datetime.now(timezone.utc).replace(tzinfo=None, hour=12, minute=0, second=0, microsecond=0)
+
+    with Session(engine) as session:
+        users = [User(email=f"{i}@example.com", hashed_password="x", created_at=today) for i in range(3)]
+        users.append(User(email="old@example.com", hashed_password="x", created_at=today - timedelta(days=40)))
+        session.add_all(users)
+        for user in users[:2]:
+            for _ in range(2):
+                session.add(Episode(title="E", user_id=user.id, podcast_id=uuid4(), processed_at=today))
+        session.commit()
+
+        result = metrics_router.admin_metrics(session=session, admin_user=None)
+
+    assert len(result["daily_signups_30d"]) == 30
+    assert result["daily_signups_30d"][-1] == {"date": today.date().isoformat(), "count": 3}
+    assert sum(d["count"] for d in result["daily_signups_30d"]) == 3
+    assert result["daily_active_users_30d"][-1]["count"] == 2
+    assert result["mrr_cents"] is None and result["stripe_snapshot_stale"] is True
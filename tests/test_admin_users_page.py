@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, SQLModel, create_engine
+
+from api.models.podcast import Episode
+from api.models.user import User
+from api.models.verification import EmailVerification
+from api.routers.admin.users_pkg import services
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine, tables=[User.__table__, Episode.__table__, EmailVerification.__table__]
+    )
+    with Session(engine) as s:
+        yield s
+
+
+def _seed(session):
+    users = []
+    for i in range(7):
+        user = User(
+            email=f"user{i}@example.com",
+            hashed_password="x",
+            tier="creator" if i % 2 else "free",
+            created_at=NOW - timedelta(days=100 - i),
+        )
+        users.append(user)
+    # Same created_at as user 5: the id breaks the tie.
+    users.append(User(email="twin@example.com", hashed_password="x", tier="pro", created_at=users[5].created_at))
+    session.add_all(users)
+    session.add(Episode(title="old", user_id=users[1].id, podcast_id=uuid4(), processed_at=NOW - timedelta(days=60)))
+    for _ in range(3):
+        session.add(Episode(title="new", user_id=users[2].id, podcast_id=uuid4(), processed_at=NOW - timedelta(days=2)))
+    session.add(EmailVerification(user_id=users[3].id, code="1", expires_at=NOW, verified_at=NOW))
+    session.commit()
+    return users
+
+
+def test_keyset_pages_cover_every_user_once(session):
+    users = _seed(session)
+    seen = []
+    cursor = None
+    while True:
+        page = services.get_users_page(session, limit=3, cursor=cursor)
+        seen.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == len(users) == len(set(seen))
+    expected = sorted(users, key=lambda u: (u.created_at, u.id), reverse=True)
+    assert seen == [str(u.id) for u in expected]
+
+
+def test_page_stats_and_filters(session):
+    users = _seed(session)
+
+    page = services.get_users_page(session, tier="creator", sort="email", order="asc")
+    assert [item.email for item in page.items] == ["user1@example.com", "user3@example.com", "user5@example.com"]
+    assert page.items[0].episode_count == 1
+    assert page.items[1].email_verified is True
+
+    active = services.get_users_page(session, active_within_days=30)
+    assert [item.id for item in active.items] == [str(users[2].id)]
+    assert active.items[0].episode_count == 3
+
+    verified = services.get_users_page(session, verified=True)
+    assert [item.id for item in verified.items] == [str(users[3].id)]
+
+    assert [i.email for i in services.get_users_page(session, q="TWIN").items] == ["twin@example.com"]
+
+    with pytest.raises(HTTPException):
+        services.get_users_page(session, cursor="not-a-cursor")
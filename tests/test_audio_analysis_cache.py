@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.audio import analysis_cache
+
+
+FFMPEG_STDERR = """\
+Input #0, wav, from 'in.wav':
+  Duration: 00:01:00.50, bitrate: 705 kb/s
+  Stream #0:0: Audio: pcm_s16le ([1][0][0][0] / 0x0001), 44100 Hz, mono, s16, 705 kb/s
+[silencedetect @ 0x1] silence_start: 10.25
+[silencedetect @ 0x1] silence_end: 12.5 | silence_duration: 2.25
+[silencedetect @ 0x1] silence_start: 58
+[Parsed_ebur128_0 @ 0x2] Summary:
+
+  Integrated loudness:
+    I:         -20.1 LUFS
+    Threshold: -30.5 LUFS
+
+  Loudness range:
+    LRA:         5.2 LU
+    Threshold: -40.4 LUFS
+
+  True peak:
+    Peak:       -1.2 dBFS
+[Parsed_volumedetect_1 @ 0x3] mean_volume: -25.0 dB
+[Parsed_volumedetect_1 @ 0x3] max_volume: -5.0 dB
+[Parsed_loudnorm_3 @ 0x4]
+{
+\t"input_i" : "-20.12",
+\t"input_tp" : "-1.20",
+\t"input_lra" : "5.20",
+\t"input_thresh" : "-30.50",
+\t"output_i" : "-16.01",
+\t"output_tp" : "-1.00",
+\t"output_lra" : "4.90",
+\t"output_thresh" : "-26.40",
+\t"normalization_type" : "dynamic",
+\t"target_offset" : "0.01"
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def _local_only_cache(monkeypatch):
+    # No Redis in tests: exercise the in-process tier.
+    monkeypatch.setattr(analysis_cache, "redis_get", lambda key: None)
+    monkeypatch.setattr(analysis_cache, "redis_setex", lambda key, ttl, value: False)
+    monkeypatch.delenv("AUDIO_ANALYSIS_CACHE_TTL_S", raising=False)
+    analysis_cache.clear_local_cache()
+    yield
+    analysis_cache.clear_local_cache()
+
+
+@pytest.fixture
+def ffmpeg_calls(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **_kwargs):
+        calls.append(cmd)
+        return SimpleNamespace(returncode=0, stdout="", stderr=FFMPEG_STDERR)
+
+    monkeypatch.setattr(analysis_cache.subprocess, "run", fake_run)
+    return calls
+
+
+def test_parse_combined_pass():
+    result = analysis_cache.parse_analysis(FFMPEG_STDERR)
+
+    assert result["duration_seconds"] == pytest.approx(60.5)
+    assert result["integrated_lufs"] == -20.1
+    assert result["loudness_range_lu"] == 5.2
+    assert result["true_peak_dbfs"] == -1.2
+    assert result["mean_volume_db"] == -25.0
+    assert result["max_volume_db"] == -5.0
+    assert result["silences"] == [[10.25, 12.5], [58.0, 60.5]]
+    assert result["loudnorm"]["input_i"] == -20.12
+    assert result["loudnorm"]["target_offset"] == 0.01
+
+
+def test_same_bytes_are_analyzed_once(tmp_path, ffmpeg_calls):
+    first = tmp_path / "upload.wav"
+    retry = tmp_path / "upload-retry.wav"
+    first.write_bytes(b"RIFF same bytes")
+    retry.write_bytes(b"RIFF same bytes")
+
+    a = analysis_cache.get_analysis(first)
+    b = analysis_cache.get_analysis(retry)
+
+    assert len(ffmpeg_calls) == 1
+    assert a == b
+    assert a["sha256"] == analysis_cache.sha256_file(first)
+
+
+def test_loudness_target_is_part_of_the_key(tmp_path, ffmpeg_calls):
+    path = tmp_path / "upload.wav"
+    path.write_bytes(b"RIFF")
+
+    analysis_cache.get_analysis(path, target_lufs=-16.0)
+    analysis_cache.get_analysis(path, target_lufs=-14.0)
+    analysis_cache.get_analysis(path, target_lufs=-14.0)
+
+    assert len(ffmpeg_calls) == 2
+
+
+def test_failures_are_not_cached(tmp_path, monkeypatch):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"not audio")
+    calls = []
+
+    def failing_run(cmd, **_kwargs):
+        calls.append(cmd)
+        return SimpleNamespace(returncode=1, stdout="", stderr="Invalid data found")
+
+    monkeypatch.setattr(analysis_cache.subprocess, "run", failing_run)
+
+    assert analysis_cache.get_analysis(path) is None
+    assert analysis_cache.get_analysis(path) is None
+    assert len(calls) == 2
@@ -0,0 +1,110 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.audio import snippets
+
+
+@pytest.fixture(autouse=True)
+def _local_only_cache(monkeypatch):
+    monkeypatch.setattr(snippets, "redis_get", lambda key: None)
+    monkeypatch.setattr(snippets, "redis_setex", lambda key, ttl, value: False)
+    snippets.clear_local_cache()
+    yield
+    snippets.clear_local_cache()
+
+
+@pytest.fixture
+def ffmpeg(monkeypatch):
+    """Fake ffmpeg/ffprobe: records commands and writes each ``.part`` output."""
+    calls = []
+
+    def fake_run(cmd, **_kwargs):
+        calls.append(cmd)
+        if "-show_entries" in cmd:
+            return SimpleNamespace(returncode=0, stdout="7200.0\n", stderr="")
+        for arg in cmd:
+            if arg.endswith(".part"):
+                Path(arg).write_bytes(b"mp3")
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr(snippets.subprocess, "run", fake_run)
+    return calls
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    done = []
+
+    def fake_upload(path, bucket, key, **_kwargs):
+        done.append(key)
+        return f"https://signed/{key}"
+
+    monkeypatch.setattr(snippets, "upload_snippet", fake_upload)
+    monkeypatch.setattr(snippets, "_signed_url", lambda bucket, key: f"https://signed/{key}")
+    return done
+
+
+def _source(tmp_path):
+    src = tmp_path / "episode.mp3"
+    src.write_bytes(b"x" * 4096)
+    return src
+
+
+def test_all_windows_cut_in_one_seeking_invocation(tmp_path, ffmpeg):
+    src = _source(tmp_path)
+    windows = [(0.0, 10.0), (600.5, 625.5), (7190.0, 7200.0)]
+
+    out = snippets.extract_snippets(src, windows, tmp_path / "out", prefix="flubber")
+
+    assert len(ffmpeg) == 1
+    cmd = ffmpeg[0]
+    assert cmd.count("-i") == 3
+    # Input seeking: -ss/-t precede each -i.
+    first = cmd.index("-i")
+    assert cmd[first - 4:first] == ["-ss", "0.000", "-t", "10.000"]
+    assert "600.500" in cmd and "25.000" in cmd
+    assert [s.start_s for s in out] == [0.0, 600.5, 7190.0]
+    assert all(s.path.is_file() and not Path(str(s.path) + ".part").exists() for s in out)
+
+    # Already on disk: no second ffmpeg run.
+    snippets.extract_snippets(src, windows, tmp_path / "out", prefix="flubber")
+    assert len(ffmpeg) == 1
+
+
+def test_prepare_skips_cut_and_upload_for_cached_windows(tmp_path, ffmpeg, uploads):
+    src = _source(tmp_path)
+    windows = [(5.0, 30.0), (100.0, 125.0)]
+
+    first = snippets.prepare_snippets(src, windows, tmp_path / "out", prefix="flubber", key_prefix="flubber_snippets")
+    digest = snippets.source_digest(src)[:16]
+    assert sorted(uploads) == [
+        f"flubber_snippets/flubber_{digest}_100000_125000.mp3",
+        f"flubber_snippets/flubber_{digest}_5000_30000.mp3",
+    ]
+    assert all(s.url.startswith("https://signed/") and not s.path.exists() for s in first)
+
+    again = snippets.prepare_snippets(src, windows, tmp_path / "out", prefix="flubber", key_prefix="flubber_snippets")
+    assert len(ffmpeg) == 1 and len(uploads) == 2
+    assert [s.url for s in again] == [s.url for s in first]
+
+
+def test_flubber_contexts_use_probed_duration(tmp_path, monkeypatch, ffmpeg, uploads):
+    from api.services import flubber_helper
+
+    monkeypatch.setattr(flubber_helper, "FLUBBER_CONTEXT_DIR", tmp_path / "ctx")
+    src = _source(tmp_path)
+    words = [
+        {"word": "hello", "start": 1.0, "end": 1.4},
+        {"word": "flubber", "start": 7195.0, "end": 7195.5},
+    ]
+
+    contexts = flubber_helper.extract_flubber_contexts(str(src), words)
+
+    assert len(contexts) == 1
+    ctx = contexts[0]
+    assert (ctx["snippet_start_s"], ctx["snippet_end_s"]) == (7180.0, 7200.0)
+    assert ctx["relative_flubber_ms"] == 15000
+    assert ctx["audio_url"].startswith("https://signed/flubber_snippets/flubber_")
+    assert len(ffmpeg) == 2  # one ffprobe, one ffmpeg
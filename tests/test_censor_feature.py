@@ -2,6 +2,7 @@ import os
 import sys
 import types
 import importlib
+import random
 import unittest
 from types import SimpleNamespace
 
@@ -84,6 +85,7 @@ censor = importlib.import_module('api.services.clean_engine.feature_modules.cens
 _apply_censor_beep = censor.apply_censor_beep
 _normalize_token = censor._normalize_token
 _matches_token = censor._matches_token
+CensorMatcher = censor.CensorMatcher
 
 
 class TestCensorNormalization(unittest.TestCase):
@@ -127,6 +129,27 @@ class TestCensorNormalization(unittest.TestCase):
         _, spans = _apply_censor_beep(audio, words, cfg, mutate_words=False)
         self.assertEqual(spans, [(100, 300)])
 
+    def test_precompiled_matcher_agrees_with_reference(self):
+        rng = random.Random(7)
+        letters = 'shitfuckdamnery'
+
+        def _word():
+            return ''.join(rng.choice(letters) for _ in range(rng.randint(0, 9)))
+
+        for _ in range(150):
+            terms = [_normalize_token(_word()) for _ in range(rng.randint(1, 10))]
+            fuzzy = rng.random() < 0.7
+            threshold = rng.choice([0.0, 0.6, 0.8, 0.85, 1.0])
+            matcher = CensorMatcher(terms, fuzzy, threshold)
+            for _ in range(60):
+                tok = _normalize_token(_word())
+                for term in terms:
+                    self.assertEqual(
+                        matcher.matches(tok, term),
+                        _matches_token(tok, term, fuzzy=fuzzy, threshold=threshold),
+                        (tok, term, fuzzy, threshold),
+                    )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from api.services import cover_palette, podcast_websites
+
+
+@pytest.fixture(autouse=True)
+def _local_only_cache(monkeypatch):
+    monkeypatch.setattr(cover_palette, "redis_get", lambda key: None)
+    monkeypatch.setattr(cover_palette, "redis_setex", lambda key, ttl, value: False)
+    monkeypatch.delenv("COVER_PALETTE_CACHE_TTL_S", raising=False)
+    cover_palette.clear_local_cache()
+    yield
+    cover_palette.clear_local_cache()
+
+
+def _cover():
+    # White border (outside the analysed centre), a teal field and an orange block.
+    arr = np.full((400, 400, 3), 255, dtype=np.uint8)
+    arr[100:300, 100:300] = (20, 120, 130)
+    arr[100:160, 100:300] = (230, 110, 30)
+    arr[290:300, 100:300] = (21, 121, 131)  # same 5-bit bin as the teal
+    buf = io.BytesIO()
+    Image.fromarray(arr).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_dominant_colors_of_the_centre_are_binned_and_ranked():
+    colors = cover_palette.dominant_colors(_cover())
+
+    (teal, teal_n), (orange, orange_n) = colors
+    assert (teal_n, orange_n) == (140 * 200, 60 * 200)
+    assert orange == (230, 110, 30)
+    # The bin's colour is the mean of its pixels.
+    assert teal == (20, 120, 130)
+
+    tiny = np.zeros((8, 8, 3), dtype=np.uint8)
+    tiny[:, :4] = (200, 0, 0)
+    assert cover_palette.compute_dominant_colors(tiny) == [((0, 0, 0), 32), ((200, 0, 0), 32)]
+
+
+def test_palette_is_cached_per_image_and_feeds_the_site_theme(monkeypatch):
+    image = _cover()
+    decodes = []
+    real_decode = cover_palette._decode
+    monkeypatch.setattr(cover_palette, "_decode", lambda data: decodes.append(1) or real_decode(data))
+
+    theme = podcast_websites._extract_theme_colors(image)
+    assert podcast_websites._extract_theme_colors(image) == theme
+    assert len(decodes) == 1
+
+    assert theme["primary_color"] == "#147882"
+    assert theme["accent_color"] == "#E66E1E"
+    assert podcast_websites._extract_theme_colors(b"not an image") == {}
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.services.episodes import playback_proxy
+
+AUDIO = bytes(range(256)) * 16
+
+
+class _Body(httpx.AsyncByteStream):
+    """Unread network-style body (``content=`` responses arrive pre-read)."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def __aiter__(self):
+        for i in range(0, len(self._data), 1000):
+            yield self._data[i:i + 1000]
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/missing.mp3"):
+        return httpx.Response(404, text="NoSuchKey")
+    rng = request.headers.get("range")
+    if rng:
+        start, end = (int(x) for x in rng.split("=", 1)[1].split("-"))
+        body = AUDIO[start:end + 1]
+        return httpx.Response(
+            206,
+            stream=_Body(body),
+            headers={
+                "content-type": "audio/mpeg",
+                "content-range": f"bytes {start}-{end}/{len(AUDIO)}",
+                "content-length": str(len(body)),
+            },
+        )
+    return httpx.Response(200, stream=_Body(AUDIO), headers={"content-type": "audio/mpeg"})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    clients = []
+
+    def pooled_client():
+        if not clients:
+            clients.append(httpx.AsyncClient(transport=httpx.MockTransport(_upstream)))
+        return clients[0]
+
+    monkeypatch.setattr(playback_proxy, "get_client", pooled_client)
+    monkeypatch.delenv("EPISODE_PLAYBACK_MODE", raising=False)
+    playback_proxy.clear_url_cache()
+
+    app = FastAPI()
+
+    @app.api_route("/play/{name}", methods=["GET", "HEAD"])
+    async def play(name: str, request: Request):
+        url = f"https://storage.example/{name}"
+        if playback_proxy.wants_redirect(request):
+            return playback_proxy.redirect(url)
+        return await playback_proxy.proxy(url, request, request.method)
+
+    with TestClient(app) as tc:
+        yield tc, clients
+
+
+def test_range_request_is_relayed_on_one_pooled_client(client):
+    tc, clients = client
+
+    partial = tc.get("/play/ep.mp3", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == AUDIO[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(AUDIO)}"
+    assert partial.headers["accept-ranges"] == "bytes"
+
+    full = tc.get("/play/ep.mp3")
+    assert full.status_code == 200 and full.content == AUDIO
+    assert len(clients) == 1
+
+    head = tc.head("/play/ep.mp3")
+    assert head.status_code == 200 and head.content == b""
+
+    missing = tc.get("/play/missing.mp3")
+    assert missing.status_code == 502
+    assert "NoSuchKey" in missing.json()["detail"]
+
+
+def test_redirect_mode_skips_the_proxy(client, monkeypatch):
+    tc, clients = client
+
+    resp = tc.get("/play/ep.mp3?redirect=1", follow_redirects=False)
+    assert resp.status_code == 302
+    assert resp.headers["location"] == "https://storage.example/ep.mp3"
+    assert resp.headers["cache-control"] == "private, no-store"
+
+    monkeypatch.setenv("EPISODE_PLAYBACK_MODE", "redirect")
+    assert tc.get("/play/ep.mp3", follow_redirects=False).status_code == 302
+    assert tc.get("/play/ep.mp3?redirect=0").status_code == 200
+    assert len(clients) == 1
+
+
+def test_playback_url_is_memoized_per_episode(monkeypatch):
+    playback_proxy.clear_url_cache()
+    calls = []
+
+    def resolve(ep):
+        calls.append(ep.id)
+        return f"https://signed/{ep.gcs_audio_path}?sig={len(calls)}"
+
+    ep = SimpleNamespace(id=uuid4(), gcs_audio_path="r2://b/a.mp3", spreaker_episode_id=None)
+    first = playback_proxy.playback_url(ep, resolve)
+    assert playback_proxy.playback_url(ep, resolve) == first
+    assert len(calls) == 1
+
+    # A re-published file changes the storage path and misses the cache.
+    ep.gcs_audio_path = "r2://b/b.mp3"
+    assert playback_proxy.playback_url(ep, resolve).startswith("https://signed/r2://b/b.mp3")
+    assert len(calls) == 2
+
+    monkeypatch.setenv("EPISODE_PLAYBACK_URL_TTL_S", "0")
+    playback_proxy.playback_url(ep, resolve)
+    assert len(calls) == 3
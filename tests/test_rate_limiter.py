@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from jose import jwt
+
+from api.core import rate_limiter
+from api.core.config import settings
+from api.core.rate_limiter import RateLimit, RateLimiter, RateLimitingMiddleware
+
+
+class _FakeRedis:
+    """Evaluates the GCRA script with the Python twin of its arithmetic."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.tats = {}
+        self.calls = 0
+
+    def register_script(self, _lua):
+        async def run(keys, args):
+            self.calls += 1
+            emission, burst, batch = float(args[0]), float(args[1]), int(args[2])
+            rule = RateLimit(int(round(burst / emission)), int(burst / 1000))
+            granted, retry_ms, remaining, new_tat = rate_limiter.gcra_take(
+                self.tats.get(keys[0], 0.0), self.clock[0] * 1000.0, rule, batch
+            )
+            if granted:
+                self.tats[keys[0]] = new_tat
+            return [granted, retry_ms, remaining]
+
+        return run
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+    return now
+
+
+def test_gcra_bounds_burst_then_holds_the_rate():
+    rule = RateLimit(limit=5, window=60)
+    tat, admitted = 0.0, 0
+    for _ in range(10):
+        granted, retry_ms, _remaining, tat = rate_limiter.gcra_take(tat, 0.0, rule)
+        admitted += granted
+    assert admitted == 5
+    assert retry_ms == 12_000
+
+    # Just after a fixed-window boundary only the refilled share is available.
+    granted, _, _, tat = rate_limiter.gcra_take(tat, 12_000.0, rule)
+    assert granted == 1
+    assert rate_limiter.gcra_take(tat, 12_001.0, rule)[0] == 0
+
+
+def test_local_batches_skip_redis_until_headroom_runs_out(monkeypatch, clock):
+    fake = _FakeRedis(clock)
+    monkeypatch.setattr(rate_limiter, "get_async_redis_client", lambda: fake)
+    limiter = RateLimiter(local_batch=10)
+    rule = RateLimit(limit=100, window=60)
+
+    async def burst(n):
+        return [await limiter.check("k", rule) for _ in range(n)]
+
+    decisions = asyncio.run(burst(100))
+    assert all(d.allowed for d in decisions)
+    assert fake.calls < 40
+
+    denied = asyncio.run(limiter.check("k", rule))
+    assert not denied.allowed and denied.retry_after_s == 1
+    calls = fake.calls
+    # The denial is cached: no round trip until the retry time.
+    assert not asyncio.run(limiter.check("k", rule)).allowed
+    assert fake.calls == calls
+
+    clock[0] += 0.6
+    assert asyncio.run(limiter.check("k", rule)).allowed
+
+
+def test_middleware_route_and_user_limits_without_redis(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "get_async_redis_client", lambda: None)
+    app = FastAPI()
+
+    @app.get("/api/ai/title")
+    async def ai():
+        return {"ok": True}
+
+    @app.get("/api/other")
+    async def other():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitingMiddleware,
+        limit=3,
+        window=60,
+        user_limit=5,
+        routes=rate_limiter.parse_route_limits("/api/ai/=2/60; broken; /api/=x/1"),
+        limiter=RateLimiter(local_batch=1),
+    )
+    tc = TestClient(app)
+
+    codes = [tc.get("/api/ai/title").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    blocked = tc.get("/api/ai/title")
+    assert blocked.json() == {"detail": "Rate limit exceeded"}
+    assert blocked.headers["retry-after"] == "30"
+
+    ok = tc.get("/api/other")
+    assert ok.headers["x-ratelimit-limit"] == "3"
+    assert ok.headers["x-ratelimit-remaining"] == "2"
+
+    token = jwt.encode({"sub": "user@example.com"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    auth = {"Authorization": f"Bearer {token}"}
+    assert [tc.get("/api/other", headers=auth).status_code for _ in range(6)] == [200] * 5 + [429]
+    assert tc.options("/api/other").status_code != 429
+
+
+def test_unverified_bearer_tokens_share_the_ip_bucket(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "get_async_redis_client", lambda: None)
+    app = FastAPI()
+
+    @app.get("/api/other")
+    async def other():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitingMiddleware,
+        limit=3,
+        window=60,
+        user_limit=50,
+        limiter=RateLimiter(local_batch=1),
+    )
+    tc = TestClient(app)
+
+    forged = jwt.encode({"sub": "victim@example.com"}, "not-our-key", algorithm=settings.ALGORITHM)
+    headers = [{"Authorization": f"Bearer junk-{i}"} for i in range(3)]
+    headers.append({"Authorization": f"Bearer {forged}"})
+    codes = [tc.get("/api/other", headers=h).status_code for h in headers]
+    assert codes == [200, 200, 200, 429]
+    assert tc.get("/api/other").status_code == 429
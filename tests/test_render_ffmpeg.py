@@ -0,0 +1,74 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+try:  # the timeline logic does not need a real decoder
+    import pydub  # noqa: F401
+except ImportError:
+    _pydub_stub = types.ModuleType("pydub")
+    _pydub_stub.AudioSegment = type("AudioSegment", (), {})  # type: ignore[attr-defined]
+    sys.modules["pydub"] = _pydub_stub
+
+render_ffmpeg = importlib.import_module("api.services.clean_engine.render_ffmpeg")
+EditTimeline = render_ffmpeg.EditTimeline
+SourceInfo = render_ffmpeg.SourceInfo
+SOURCE = render_ffmpeg.SOURCE
+
+
+class _Clip:
+    def __init__(self, duration_ms):
+        self.duration_ms = duration_ms
+
+    def __len__(self):
+        return self.duration_ms
+
+
+def _timeline(duration_ms=10_000, rate=1000):
+    info = SourceInfo(path="in.wav", frame_rate=rate, channels=1, samples=duration_ms * rate // 1000)
+    return EditTimeline(info, [(SOURCE, 0, info.duration_ms)])
+
+
+def test_slicing_follows_pydub_rules():
+    tl = _timeline()
+    assert len(tl[2000:3000]) == 1000
+    assert len(tl[9000:20000]) == 1000
+    assert len(tl[-500:]) == 500
+    assert len(tl[3000:2000]) == 0
+
+
+def test_cut_and_splice_build_expected_pieces():
+    beep = _Clip(250)
+    tl = _timeline().cut([(1000, 2000), (1500, 2500), (8000, 9000)])
+    assert tl.pieces == [(SOURCE, 0, 1000), (SOURCE, 2500, 8000), (SOURCE, 9000, 10000)]
+
+    # Positions are on the edited timeline: 1200-1400 maps to source 2700-2900.
+    tl = tl.splice([(1200, 1400, beep), (3000, 3100, None)])
+    assert tl.pieces == [
+        (SOURCE, 0, 1000),
+        (SOURCE, 2500, 2700),
+        (0, 0, 250),
+        (SOURCE, 2900, 4500),
+        (SOURCE, 4600, 8000),
+        (SOURCE, 9000, 10000),
+    ]
+    assert len(tl) == 10000 - 2500 - 200 + 250 - 100
+
+
+def test_filtergraph_splits_source_once_and_concats_in_order():
+    beep = _Clip(250)
+    tl = _timeline().cut([(1000, 2000)]).splice([(500, 600, beep)])
+    graph = render_ffmpeg.build_filtergraph(tl, [(0, 250)], 1000, 1000, 1)
+
+    assert graph.count("[0:a]") == 1
+    assert "asegment=samples=500|600|1000|2000" in graph
+    assert "atrim=start_sample=0:end_sample=250" in graph
+    assert graph.rstrip().endswith("concat=n=4:v=0:a=1[out]")
+
+
+def test_out_of_order_source_spans_are_rejected():
+    tl = _timeline()
+    backwards = tl[5000:6000] + tl[1000:2000]
+    with pytest.raises(render_ffmpeg.FilterGraphUnsupported):
+        render_ffmpeg.build_filtergraph(backwards, [], 1000, 1000, 1)
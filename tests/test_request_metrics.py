@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middleware import metrics as metrics_mod
+from api.middleware.metrics import MetricsMiddleware, RequestMetrics
+
+
+@pytest.fixture
+def app_and_registry():
+    registry = RequestMetrics()
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404, detail="nope")
+        return {"id": item_id}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def body():
+            for _ in range(3):
+                yield b"x" * 1000
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return TestClient(app), registry
+
+
+def test_records_route_templates_statuses_and_sizes(app_and_registry):
+    tc, registry = app_and_registry
+    for i in (1, 2, 3, 0):
+        resp = tc.get(f"/api/items/{i}")
+        assert "x-response-time" in resp.headers
+    assert tc.get("/api/stream").content == b"x" * 3000
+    tc.get("/wp-login.php")
+
+    latency, sizes, in_flight = registry.snapshot()
+    assert in_flight == 0
+    assert latency[("GET", "/api/items/{item_id}", "200")].count == 3
+    assert latency[("GET", "/api/items/{item_id}", "404")].count == 1
+    assert latency[("GET", "<unmatched>", "404")].count == 1
+    assert sizes[("GET", "/api/stream")].sum == 3000
+
+    text = metrics_mod.render_prometheus(registry)
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/items/{item_id}",status="200"} 3' in text
+    assert 'le="+Inf"} 3' in text
+    assert "http_requests_in_flight 0" in text
+
+    summary = metrics_mod.latency_summary(registry=registry)
+    top = summary["routes"][0]
+    assert (top["route"], top["count"], top["errors_5xx"]) == ("/api/items/{item_id}", 4, 0)
+    assert top["p50_ms"] <= top["p95_ms"] <= top["p99_ms"]
+
+
+def test_quantiles_interpolate_within_buckets():
+    hist = metrics_mod._Histogram((0.1, 0.5, 1.0))
+    for value in [0.05] * 50 + [0.3] * 45 + [0.8] * 5:
+        hist.observe(value)
+    assert hist.quantile(0.5) == pytest.approx(0.1)
+    assert hist.quantile(0.95) == pytest.approx(0.5)
+    assert hist.quantile(0.99) == pytest.approx(0.9)
+    assert metrics_mod._Histogram((1.0,)).quantile(0.5) is None
+
+
+def test_metrics_endpoint_honours_token(monkeypatch):
+    from api.routers import health
+
+    app = FastAPI()
+    app.include_router(health.router)
+    tc = TestClient(app)
+
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    resp = tc.get("/metrics")
+    assert resp.status_code == 200
+    assert "http_requests_in_flight" in resp.text
+
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    assert tc.get("/metrics").status_code == 401
+    assert tc.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
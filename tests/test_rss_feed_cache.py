@@ -0,0 +1,141 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from api.services import rss_feed_cache
+
+
+@pytest.fixture(autouse=True)
+def _local_only_cache(monkeypatch):
+    # No Redis in tests: exercise the in-process tier and local versioning.
+    monkeypatch.setattr(rss_feed_cache, "get_redis_client", lambda: None)
+    monkeypatch.delenv("RSS_FEED_CACHE_TTL_S", raising=False)
+    rss_feed_cache.clear_local_cache()
+    yield
+    rss_feed_cache.clear_local_cache()
+
+
+def _counting_builder(xml="<rss/>"):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return f"{xml}<!-- {len(calls)} -->"
+
+    return build, calls
+
+
+def test_second_request_is_served_from_cache():
+    podcast_id = uuid.uuid4()
+    build, calls = _counting_builder()
+
+    first = rss_feed_cache.get_or_build_feed(podcast_id, "https://x/rss/a/feed.xml", build)
+    second = rss_feed_cache.get_or_build_feed(podcast_id, "https://x/rss/a/feed.xml", build)
+
+    assert len(calls) == 1
+    assert second is first
+    assert first.etag.startswith('"') and first.etag.endswith('"')
+
+
+def test_feed_url_is_part_of_the_key():
+    podcast_id = uuid.uuid4()
+    build, calls = _counting_builder()
+
+    rss_feed_cache.get_or_build_feed(podcast_id, "https://x/rss/slug/feed.xml", build)
+    rss_feed_cache.get_or_build_feed(podcast_id, f"https://x/rss/{podcast_id}/feed.xml", build)
+
+    assert len(calls) == 2
+
+
+def test_query_string_does_not_create_entries():
+    podcast_id = uuid.uuid4()
+    build, calls = _counting_builder()
+
+    first = rss_feed_cache.get_or_build_feed(podcast_id, "https://x/rss/a/feed.xml", build)
+    for n in range(5):
+        hit = rss_feed_cache.get_or_build_feed(podcast_id, f"https://x/rss/a/feed.xml?x={n}", build)
+        assert hit is first
+
+    assert len(calls) == 1
+
+
+def test_invalidate_forces_rebuild_only_for_that_podcast():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    build, calls = _counting_builder()
+    rss_feed_cache.get_or_build_feed(a, "u", build)
+    rss_feed_cache.get_or_build_feed(b, "u", build)
+
+    rss_feed_cache.invalidate_feed(a)
+    rebuilt = rss_feed_cache.get_or_build_feed(a, "u", build)
+    rss_feed_cache.get_or_build_feed(b, "u", build)
+
+    assert len(calls) == 3
+    assert rebuilt.xml.endswith("<!-- 3 -->")
+
+
+def test_ttl_zero_disables_cache(monkeypatch):
+    monkeypatch.setenv("RSS_FEED_CACHE_TTL_S", "0")
+    build, calls = _counting_builder()
+    rss_feed_cache.get_or_build_feed("p", "u", build)
+    rss_feed_cache.get_or_build_feed("p", "u", build)
+    assert len(calls) == 2
+
+
+def test_lru_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setenv("RSS_FEED_CACHE_MAX_ENTRIES", "2")
+    build, calls = _counting_builder()
+    rss_feed_cache.get_or_build_feed("p1", "u", build)
+    rss_feed_cache.get_or_build_feed("p2", "u", build)
+    rss_feed_cache.get_or_build_feed("p1", "u", build)  # touch p1
+    rss_feed_cache.get_or_build_feed("p3", "u", build)  # evicts p2
+    assert len(calls) == 3
+    rss_feed_cache.get_or_build_feed("p1", "u", build)
+    assert len(calls) == 3
+    rss_feed_cache.get_or_build_feed("p2", "u", build)
+    assert len(calls) == 4
+
+
+def test_redis_entry_round_trips():
+    entry = rss_feed_cache.CachedFeed.build("<rss>ü</rss>")
+    restored = rss_feed_cache.CachedFeed.from_json(entry.to_json())
+    assert restored == entry
+
+
+def test_conditional_headers():
+    entry = rss_feed_cache.CachedFeed.build("<rss/>")
+    not_modified = rss_feed_cache.is_not_modified
+
+    assert not_modified(entry, entry.etag, None)
+    assert not_modified(entry, f'"other", W/{entry.etag}', None)
+    assert not_modified(entry, "*", None)
+    assert not not_modified(entry, '"other"', None)
+    # If-None-Match takes precedence over If-Modified-Since
+    assert not not_modified(entry, '"other"', entry.last_modified_header)
+
+    assert not_modified(entry, None, entry.last_modified_header)
+    assert not not_modified(entry, None, "Mon, 01 Jan 2001 00:00:00 GMT")
+    assert not not_modified(entry, None, "not a date")
+    assert not not_modified(entry, None, None)
+
+
+def test_invalidation_waits_for_commit(monkeypatch):
+    from api import db_listeners
+
+    seen = []
+    monkeypatch.setattr(db_listeners, "invalidate_feed", seen.append)
+    session = SimpleNamespace(info={})
+    monkeypatch.setattr(db_listeners, "object_session", lambda target: session)
+
+    podcast_id = uuid.uuid4()
+    db_listeners.episode_changed(None, None, SimpleNamespace(podcast_id=podcast_id))
+    db_listeners.podcast_changed(None, None, SimpleNamespace(id=podcast_id))
+    assert seen == []
+
+    db_listeners.flush_feed_invalidations(session)
+    assert seen == [str(podcast_id)]
+
+    db_listeners.website_changed(None, None, SimpleNamespace(podcast_id=podcast_id))
+    db_listeners.discard_feed_invalidations(session)
+    db_listeners.flush_feed_invalidations(session)
+    assert seen == [str(podcast_id)]
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.models.podcast import Episode, PodcastImportItem, PodcastImportJob
+from api.services.podcasts import rss_import
+
+AUDIO = bytes(range(256)) * 40  # 10 KB
+
+
+class _Body(httpx.AsyncByteStream):
+    """Unread network-style body (``content=`` responses arrive pre-read)."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def __aiter__(self):
+        for i in range(0, len(self._data), 1000):
+            await asyncio.sleep(0)
+            yield self._data[i:i + 1000]
+
+
+@pytest.fixture
+def db(tmp_path):
+    # Only the import tables: the full metadata has PostgreSQL-only types.
+    # A file database so the recording threads get their own connections.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'import.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[Episode.__table__, PodcastImportJob.__table__, PodcastImportItem.__table__],
+    )
+
+    @contextmanager
+    def session_factory():
+        with Session(engine) as s:
+            yield s
+
+    return session_factory
+
+
+class _Upstream:
+    def __init__(self, body=AUDIO):
+        self.body = body
+        self.fetched = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.fetched.append(request.url.path)
+        if request.url.path.endswith("/missing.mp3"):
+            return httpx.Response(404, text="gone")
+        return httpx.Response(200, stream=_Body(self.body), headers={"content-type": "audio/mpeg"})
+
+
+class _Store:
+    def __init__(self, upstream):
+        self.objects = {}
+        self.upstream = upstream
+
+    def upload(self, key, fileobj, content_type):
+        with self.upstream.lock:
+            self.upstream.in_flight += 1
+            self.upstream.peak = max(self.upstream.peak, self.upstream.in_flight)
+        try:
+            fileobj.seek(0)
+            self.objects[key] = fileobj.read()
+        finally:
+            with self.upstream.lock:
+                self.upstream.in_flight -= 1
+        return f"gs://bucket/{key}"
+
+
+class _ChunkedStore(_Store):
+    """Reads fixed-size pieces like the GCS resumable and s3transfer uploaders,
+    which take a short read as the end of the stream."""
+
+    def __init__(self, upstream, piece):
+        super().__init__(upstream)
+        self.piece = piece
+        self.reads = []
+
+    def upload(self, key, fileobj, content_type):
+        parts = []
+        while True:
+            data = fileobj.read(self.piece)
+            self.reads.append(len(data))
+            parts.append(data)
+            if len(data) < self.piece:
+                break
+        self.objects[key] = b"".join(parts)
+        return f"gs://bucket/{key}"
+
+
+def _make_job(db, urls):
+    user_id, podcast_id = uuid4(), uuid4()
+    with db() as s:
+        episodes = [
+            Episode(user_id=user_id, podcast_id=podcast_id, title=f"ep {i}", source_media_url=url)
+            for i, url in enumerate(urls)
+        ]
+        s.add_all(episodes)
+        s.commit()
+        for ep in episodes:
+            s.refresh(ep)
+        job = rss_import.create_import_job(s, podcast_id=podcast_id, user_id=user_id, episodes=episodes)
+        return job.id, user_id, [ep.id for ep in episodes]
+
+
+def _run(db, job_id, upstream, store):
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler)) as client:
+            return await rss_import.run_import_job(
+                job_id, client=client, upload=store.upload, session_factory=db
+            )
+
+    return asyncio.run(go())
+
+
+def test_mirrors_enclosures_concurrently_and_records_progress(db, monkeypatch):
+    monkeypatch.setenv("RSS_IMPORT_CONCURRENCY", "4")
+    urls = [f"https://cdn.example.com/show/{i}.mp3" for i in range(8)] + ["https://cdn.example.com/missing.mp3"]
+    job_id, user_id, episode_ids = _make_job(db, urls)
+    upstream = _Upstream()
+    store = _Store(upstream)
+
+    summary = _run(db, job_id, upstream, store)
+
+    assert summary["claimed"] and not summary["requeue"]
+    assert (summary["status"], summary["completed"], summary["failed"]) == ("completed", 8, 1)
+    assert summary["bytes_mirrored"] == 8 * len(AUDIO)
+    assert set(store.objects.values()) == {AUDIO}
+    assert f"{user_id}/imported/{episode_ids[0].hex}.mp3" in store.objects
+    assert upstream.peak > 1
+
+    with db() as s:
+        ep = s.get(Episode, episode_ids[0])
+        assert ep.gcs_audio_path == f"gs://bucket/{user_id}/imported/{episode_ids[0].hex}.mp3"
+        assert json.loads(ep.meta_json)["source_enclosure_url"] == urls[0]
+        missing = s.exec(select(PodcastImportItem).where(PodcastImportItem.episode_id == episode_ids[-1])).one()
+        assert missing.status == "failed" and "404" in missing.error
+
+        status = rss_import.import_job_status(s, str(job_id))
+    assert status["status"] == "processed"
+    assert (status["import"]["completed"], status["import"]["failed"], status["import"]["pending"]) == (8, 1, 0)
+
+
+def test_resume_skips_finished_items_and_respects_lease(db):
+    urls = [f"https://cdn.example.com/show/{i}.mp3" for i in range(3)]
+    job_id, _user_id, episode_ids = _make_job(db, urls)
+
+    # A previous run finished the first item, then died holding the lease.
+    with db() as s:
+        item = s.exec(select(PodcastImportItem).where(PodcastImportItem.episode_id == episode_ids[0])).one()
+        item.status, item.bytes = "done", 5
+        job = s.get(PodcastImportJob, job_id)
+        job.status, job.completed = "running", 1
+        job.lease_until = datetime.utcnow() + timedelta(minutes=5)
+        s.add(item)
+        s.add(job)
+        s.commit()
+
+    upstream = _Upstream()
+    store = _Store(upstream)
+    assert _run(db, job_id, upstream, store) == {"job_id": str(job_id), "claimed": False, "status": "running"}
+    assert upstream.fetched == []
+
+    with db() as s:
+        job = s.get(PodcastImportJob, job_id)
+        job.lease_until = datetime.utcnow() - timedelta(seconds=1)
+        s.add(job)
+        s.commit()
+
+    summary = _run(db, job_id, upstream, store)
+    assert sorted(upstream.fetched) == ["/show/1.mp3", "/show/2.mp3"]
+    assert (summary["status"], summary["completed"], summary["bytes_mirrored"]) == ("completed", 3, 5 + 2 * len(AUDIO))
+    assert _run(db, job_id, upstream, store)["claimed"] is False
+
+
+def test_fixed_size_reads_get_the_whole_enclosure(db):
+    MB = rss_import.MB
+    body = bytes(range(251)) * (11 * MB // 251) + b"tail"
+    job_id, user_id, episode_ids = _make_job(db, ["https://cdn.example.com/show/long.mp3"])
+    upstream = _Upstream(body)
+    store = _ChunkedStore(upstream, 5 * MB)
+
+    summary = _run(db, job_id, upstream, store)
+
+    assert (summary["status"], summary["completed"], summary["bytes_mirrored"]) == ("completed", 1, len(body))
+    # Every read short of the end returns the full piece; only the last is short.
+    assert store.reads[:-1] == [5 * MB, 5 * MB] and store.reads[-1] == len(body) - 10 * MB
+    assert store.objects[f"{user_id}/imported/{episode_ids[0].hex}.mp3"] == body
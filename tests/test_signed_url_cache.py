@@ -0,0 +1,129 @@
+import datetime as _dt
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from infrastructure import gcs, r2, storage
+from infrastructure.signed_url_cache import (
+    SignedUrlCache,
+    signed_url_cache,
+    signing_window,
+    window_start,
+)
+
+FOURTEEN_DAYS = 14 * 24 * 3600
+
+
+@pytest.fixture(autouse=True)
+def _r2_env(monkeypatch):
+    monkeypatch.setenv("R2_ACCOUNT_ID", "acct")
+    monkeypatch.setenv("R2_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("R2_SECRET_ACCESS_KEY", "secret/with+chars")
+    monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+    monkeypatch.delenv("SIGNED_URL_MAX_WINDOW_S", raising=False)
+    signed_url_cache.clear()
+    yield
+    signed_url_cache.clear()
+
+
+def _botocore_presign(bucket, key, expiration, signed_at):
+    boto3 = pytest.importorskip("boto3")
+    from botocore.client import Config
+
+    client = boto3.client(
+        "s3",
+        endpoint_url="https://acct.r2.cloudflarestorage.com",
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="secret/with+chars",
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        region_name="auto",
+    )
+    frozen = _dt.datetime.utcfromtimestamp(signed_at)
+    with mock.patch("botocore.auth.datetime") as fake_dt:
+        fake_dt.datetime.utcnow.return_value = frozen
+        return client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=expiration,
+        )
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "episodes/123/audio.mp3",
+        "covers/My Show (final) ü+x~y@z=1&.jpg",
+        "a//b/%20already-encoded?.mp3",
+    ],
+)
+def test_local_presign_matches_botocore(key):
+    signed_at = 1_760_000_000
+    ours = r2._presign_get_urls(
+        "ppp-media", [key], FOURTEEN_DAYS, signed_at, r2._r2_credentials()
+    )[key]
+    assert ours == _botocore_presign("ppp-media", key, FOURTEEN_DAYS, signed_at)
+
+
+def test_batch_signs_once_and_memoizes():
+    keys = [f"episodes/{i}.mp3" for i in range(50)]
+    with mock.patch.object(r2, "_presign_get_urls", wraps=r2._presign_get_urls) as presign:
+        first = r2.generate_signed_urls("ppp-media", keys, expiration=FOURTEEN_DAYS)
+        again = [r2.generate_signed_url("ppp-media", k, expiration=FOURTEEN_DAYS) for k in keys]
+
+    assert presign.call_count == 1
+    assert len(presign.call_args.args[1]) == 50
+    assert [first[k] for k in keys] == again
+
+
+def test_prime_public_audio_urls_feeds_single_lookups():
+    paths = ["r2://ppp-media/a.mp3", "ppp-media/b.mp3", "gs://legacy/c.mp3", None]
+    with mock.patch.object(r2, "_presign_get_urls", wraps=r2._presign_get_urls) as presign:
+        assert storage.prime_public_audio_urls(paths, expiration_days=14) == 2
+        url = r2.get_public_audio_url("r2://ppp-media/a.mp3", 14)
+
+    assert presign.call_count == 1
+    assert url.startswith("https://acct.r2.cloudflarestorage.com/ppp-media/a.mp3?")
+
+
+def test_url_is_stable_within_window_and_rotates_after():
+    window = signing_window(FOURTEEN_DAYS)
+    assert window == 6 * 3600
+    start = window_start(FOURTEEN_DAYS, now=1_760_000_000)
+    assert window_start(FOURTEEN_DAYS, now=start + window - 1) == start
+    assert window_start(FOURTEEN_DAYS, now=start + window) == start + window
+
+    with mock.patch("infrastructure.signed_url_cache.time.time", return_value=start + 10):
+        a = r2.generate_signed_url("ppp-media", "x.mp3", expiration=FOURTEEN_DAYS)
+        signed_url_cache.clear()
+        b = r2.generate_signed_url("ppp-media", "x.mp3", expiration=FOURTEEN_DAYS)
+    with mock.patch("infrastructure.signed_url_cache.time.time", return_value=start + window + 10):
+        c = r2.generate_signed_url("ppp-media", "x.mp3", expiration=FOURTEEN_DAYS)
+
+    # Signed at the window start: same URL even without the memo, new one next window.
+    assert a == b
+    assert a != c
+
+
+def test_cache_evicts_expired_entries_before_live_ones():
+    cache = SignedUrlCache(max_entries=2)
+    old = cache.key_for("r2", "b", "old", "GET", 400, now=1_000)
+    live = cache.key_for("r2", "b", "live", "GET", FOURTEEN_DAYS)
+    cache.put(live, "live-url")
+    cache.put(old, "old-url")  # window long gone
+    cache.put(cache.key_for("r2", "b", "new", "GET", FOURTEEN_DAYS), "new-url")
+
+    assert cache.get(live) == "live-url"
+    assert len(cache) == 2
+
+
+def test_gcs_get_urls_are_memoized_but_uploads_are_not():
+    with mock.patch.object(gcs, "_sign_url", return_value="https://signed") as sign:
+        for _ in range(3):
+            gcs._generate_signed_url("bucket", "k.mp3", expires=timedelta(days=7))
+        for _ in range(2):
+            gcs._generate_signed_url(
+                "bucket", "k.mp3", expires=timedelta(hours=1), method="PUT", content_type="audio/mpeg"
+            )
+
+    assert sign.call_count == 3
@@ -0,0 +1,83 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.episodes import transcript_index
+from api.services.episodes.transcripts import transcript_endpoints_for_episode
+
+
+WORDS = [
+    {"word": "Um,", "start": 0.0, "end": 0.2},
+    {"word": "um", "start": 0.3, "end": 0.5},
+    {"word": "Flubber", "start": 0.6, "end": 1.0},
+    {"word": "intern", "start": 1.2, "end": 1.5},
+    {"word": "hello", "start": 1.6, "end": 2.25},
+    {"word": "", "start": 2.3, "end": 2.4},
+]
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_index, "TRANSCRIPTS_DIR", tmp_path)
+    transcript_index.clear_file_memo()
+    yield
+    transcript_index.clear_file_memo()
+
+
+def test_build_index_counts_keywords_and_fillers():
+    index = transcript_index.build_transcript_index(WORDS, sfx_phrases=["hello", "air horn"])
+
+    assert index["word_count"] == 5
+    assert index["duration_s"] == 2.4
+    assert index["keywords"] == {"flubber": 1, "intern": 1}
+    # Exact token match, as the listing always did: "Um," is not "um".
+    assert index["fillers"]["um"] == 1
+    assert index["filler_count"] == 1
+    assert index["sfx"] == {"hello": 1}
+
+
+def test_stored_index_is_used_without_touching_disk(monkeypatch):
+    index = transcript_index.build_transcript_index(WORDS)
+    episode = SimpleNamespace(
+        id="ep-1",
+        working_audio_name="raw.wav",
+        final_audio_path=None,
+        source_media_url=None,
+        original_guid=None,
+        meta_json=json.dumps({"transcript_index": index}),
+    )
+
+    def _no_disk(_path):
+        raise AssertionError("transcript file should not be read")
+
+    monkeypatch.setattr(transcript_index, "index_transcript_file", _no_disk)
+
+    assert transcript_index.has_keyword(transcript_index.index_for_episode(episode), "flubber")
+    assert transcript_endpoints_for_episode(episode)["available"] is True
+
+
+def test_legacy_episode_falls_back_to_file_once(tmp_path, monkeypatch):
+    (tmp_path / "raw.json").write_text(json.dumps(WORDS), encoding="utf-8")
+    episode = SimpleNamespace(
+        working_audio_name="raw.wav",
+        final_audio_path=None,
+        source_media_url=None,
+        original_guid=None,
+        meta_json="{}",
+    )
+    builds = []
+    real_build = transcript_index.build_transcript_index
+
+    def _counting_build(words, **kwargs):
+        builds.append(1)
+        return real_build(words, **kwargs)
+
+    monkeypatch.setattr(transcript_index, "build_transcript_index", _counting_build)
+
+    first = transcript_index.index_for_episode(episode)
+    second = transcript_index.index_for_episode(episode)
+
+    assert transcript_index.has_keyword(first, "flubber")
+    assert second is first
+    assert len(builds) == 1
@@ -0,0 +1,106 @@
+import json
+import os
+
+from api.services.audio import transcript_pack
+from api.services.audio.transcript_io import (
+    load_transcript_json,
+    open_transcript_pack,
+    write_working_json,
+)
+from api.services.audio.transcript_pack import TranscriptPack
+
+
+def _words(n=2000):
+    out = []
+    for i in range(n):
+        item = {
+            "word": ["hello,", "world", "um", "podcast"][i % 4],
+            "start": i * 0.25,
+            "end": i * 0.25 + 0.2,
+            "confidence": 0.5 + (i % 500) / 1000,
+            "speaker": "A" if i % 10 < 6 else "B",
+        }
+        out.append(item)
+    out[3]["speaker"] = None
+    out[7]["flubber"] = True
+    del out[11]["confidence"]
+    return out
+
+
+def test_pack_round_trips_and_is_compact():
+    words = _words()
+    packed = transcript_pack.encode(words, compress=True)
+    pack = TranscriptPack.from_bytes(packed)
+
+    assert len(pack) == len(words)
+    assert pack.to_json_list() == words
+    assert len(packed) * 10 < len(json.dumps(words, indent=2).encode())
+
+    # Times that are not exact milliseconds fall back to float64 columns.
+    odd = [{"word": "x", "start": 0.0001, "end": 1 / 3}]
+    assert transcript_pack.decode(transcript_pack.encode(odd)) == odd
+    assert transcript_pack.encode([{"word": "x", "start": None, "end": 1}]) is None
+
+
+def test_slice_materializes_only_the_time_range():
+    words = _words()
+    pack = TranscriptPack.from_bytes(transcript_pack.encode(words))
+
+    got = pack.slice(100.0, 101.0)
+    assert got == [w for w in words if w["start"] < 101.0 and w["end"] > 100.0]
+    assert pack.slice(-5, 0) == []
+    assert pack.text(0.0, 1.0) == "hello, world um podcast"
+
+    shuffled = list(reversed(words))
+    unsorted = TranscriptPack.from_bytes(transcript_pack.encode(shuffled))
+    assert sorted(w["start"] for w in unsorted.slice(10.0, 11.0)) == [10.0, 10.25, 10.5, 10.75]
+
+
+def test_sidecar_is_used_only_while_fresh(tmp_path):
+    words = _words(50)
+    path = write_working_json(words, "ep", tmp_path, [])
+    assert path.with_suffix(".wpack").exists()
+
+    with open_transcript_pack(path) as pack:
+        assert pack.slice(0.0, 0.3) == words[:2]
+    assert load_transcript_json(path) == words
+
+    # A JSON rewritten behind the sidecar's back wins.
+    path.write_text(json.dumps(words[:3]), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert open_transcript_pack(path) is None
+    assert load_transcript_json(path) == words[:3]
+
+
+
+def test_gcs_lookup_prefers_user_scoped_json_over_shared_pack(monkeypatch):
+    from types import SimpleNamespace
+    from uuid import uuid4
+
+    import api.infrastructure.gcs as gcs
+    from api.routers import transcripts
+
+    episode = SimpleNamespace(
+        user_id="u1", working_audio_name="show.wav", final_audio_path=None, meta_json="{}"
+    )
+    monkeypatch.setattr(transcripts._ep_repo, "get_episode_by_id", lambda session, ep_id: episode)
+    monkeypatch.setenv("TRANSCRIPTS_BUCKET", "bucket")
+    words = _words(16)
+    blobs = {
+        "transcripts/u1/show.json": b'[{"word": "mine"}]',
+        "transcripts/show" + transcript_pack.PACK_SUFFIX: transcript_pack.encode(words, compress=True),
+    }
+
+    def download_bytes(bucket, key):
+        if key not in blobs:
+            raise FileNotFoundError(key)
+        return blobs[key]
+
+    monkeypatch.setattr(gcs, "download_bytes", download_bytes)
+
+    ep_id = str(uuid4())
+    assert transcripts._resolve_from_gcs(None, ep_id) == ("show.json", b'[{"word": "mine"}]')
+
+    del blobs["transcripts/u1/show.json"]
+    name, data = transcripts._resolve_from_gcs(None, ep_id)
+    assert name == "show.json" and [w["word"] for w in json.loads(data)] == [w["word"] for w in words]
@@ -0,0 +1,151 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+import api.services.transcription as transcription
+from api.models.transcription import PendingTranscription
+from api.services.transcription import assemblyai_client, pending
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pending.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine, tables=[PendingTranscription.__table__])
+
+    @contextmanager
+    def session_scope():
+        with Session(engine, expire_on_commit=False) as s:
+            yield s
+
+    monkeypatch.setattr(pending, "session_scope", session_scope)
+    return session_scope
+
+
+def _record(transcript_id, **overrides):
+    fields = dict(
+        filename="gs://bucket/u1/media_uploads/show.mp3",
+        user_id="u1",
+        local_name="show_with_intros.wav",
+        context={"intro_duration_s": 2.5, "podcast_context_id": None, "episode_guest_intros": [{"name": "Sam"}]},
+    )
+    fields.update(overrides)
+    pending.record_submitted(transcript_id, **fields)
+
+
+def _set(db, transcript_id, **values):
+    with db() as s:
+        row = s.get(PendingTranscription, transcript_id)
+        for key, value in values.items():
+            setattr(row, key, value)
+        s.add(row)
+        s.commit()
+
+
+def test_claim_is_exclusive_until_the_lease_lapses(db):
+    _record("t1")
+    assert pending.claim("t1")
+    assert not pending.claim("t1")
+
+    _set(db, "t1", lease_until=datetime.utcnow() - timedelta(seconds=1))
+    assert pending.claim("t1")
+
+    pending.mark_finished("t1", "completed")
+    assert not pending.claim("t1")
+    # Nothing recorded (e.g. the insert failed): the tracker is the only owner.
+    assert pending.claim("unknown")
+
+
+def test_webhook_on_another_instance_finishes_the_transcript(db, monkeypatch):
+    _record("t1")
+    enqueued = []
+    monkeypatch.setattr(pending, "enqueue_finish", enqueued.append)
+    assert pending.notify_webhook({"id": "t1", "status": "completed"})
+    assert not pending.notify_webhook({"id": "other", "status": "completed"})
+    assert enqueued == ["t1"]
+
+    monkeypatch.setattr(assemblyai_client, "get_transcription", lambda tid, **kw: {
+        "status": "completed",
+        "words": [{"text": "hi", "start": 0, "end": 500, "speaker": "A"}],
+    })
+    runs = []
+
+    def finish(run, words):
+        runs.append(run)
+        return words
+
+    monkeypatch.setattr(transcription, "_finish_assemblyai_transcription", finish)
+
+    summary = transcription.finish_pending_transcription("t1")
+    assert summary["status"] == "completed" and summary["words"] == 1
+    (run,) = runs
+    assert run.local_name == "show_with_intros.wav"
+    assert run.intro_duration_s == 2.5 and run.episode_guest_intros == [{"name": "Sam"}]
+    assert pending.load("t1").status == "completed"
+
+    # A duplicate task (or the submitting instance) finds nothing left to do.
+    assert transcription.finish_pending_transcription("t1") == {"status": "skipped"}
+    assert len(runs) == 1
+
+
+def test_finish_waits_for_assemblyai_then_times_out(db, monkeypatch):
+    _record("t1")
+    monkeypatch.setattr(assemblyai_client, "get_transcription", lambda tid, **kw: {"status": "processing"})
+    failed = []
+    monkeypatch.setattr(transcription, "_fail_transcription", lambda filename, exc: failed.append(filename))
+
+    assert transcription.finish_pending_transcription("t1")["status"] == "pending"
+    assert pending.load("t1").status == "submitted"
+
+    _set(db, "t1", created_at=datetime.utcnow() - timedelta(seconds=pending.timeout_s() + 1))
+    summary = transcription.finish_pending_transcription("t1")
+    assert summary["status"] == "failed" and "timed out" in summary["error"]
+    assert failed == ["gs://bucket/u1/media_uploads/show.mp3"]
+    assert pending.load("t1").status == "failed"
+
+
+def test_sweep_enqueues_only_idle_open_rows(db, monkeypatch):
+    idle = datetime.utcnow() - timedelta(seconds=pending.resume_after_s() + 60)
+    for tid in ("idle", "fresh", "done", "leased", "lapsed"):
+        _record(tid)
+    _set(db, "idle", updated_at=idle)
+    _set(db, "done", updated_at=idle, status="completed")
+    _set(db, "leased", updated_at=idle, status="finishing", lease_until=datetime.utcnow() + timedelta(minutes=5))
+    _set(db, "lapsed", updated_at=idle, status="finishing", lease_until=datetime.utcnow() - timedelta(minutes=5))
+
+    enqueued = []
+    monkeypatch.setattr(pending, "enqueue_finish", enqueued.append)
+    with db() as s:
+        resumed = pending.resume_stale(s)
+    assert sorted(resumed) == ["idle", "lapsed"] == sorted(enqueued)
+
+
+def test_local_continuation_skips_a_transcript_finished_elsewhere(db, monkeypatch):
+    from api.services import transcription_assemblyai
+
+    callbacks = {}
+
+    def start(local_name, *, on_complete, on_error, on_submitted):
+        on_submitted("t1")
+        callbacks["complete"] = on_complete
+        return "t1"
+
+    monkeypatch.setattr(transcription_assemblyai, "start_assemblyai_transcription", start)
+    finished = []
+    monkeypatch.setattr(transcription, "_finish_assemblyai_transcription", lambda run, words: finished.append(run) or words)
+
+    run = transcription._AssemblyAIRun(
+        filename="show.mp3", user_id="u1", local_name="show.mp3", delete_after=False,
+        intro_duration_s=0.0, podcast_context_id=None, podcast_speaker_intros=None,
+        episode_guest_intros=[], charge=lambda *a, **k: None,
+    )
+    completed = []
+    transcription._start_assemblyai_transcription(run, completed.append, None)
+    assert pending.load("t1").status == "submitted"
+
+    assert pending.claim("t1")  # the finish task on another instance got there first
+    callbacks["complete"]([{"word": "hi"}])
+    assert finished == [] and completed == []
@@ -0,0 +1,133 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.services import ai_enhancer
+from api.services.audio import mp3_frames, tts_cache
+from api.services.audio.tts_pipeline import stitch_tts_chunks, synthesize_chunks
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo, no CRC: 417-byte frames.
+HEADER = b"\xff\xfb\x90\x64"
+FRAME_LEN = 417
+
+
+def _mp3(frames, fill, *, tagged=False):
+    out = b""
+    if tagged:
+        out += b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+        xing = HEADER + bytes(32) + b"Xing"
+        out += xing + bytes(FRAME_LEN - len(xing))
+    out += (HEADER + bytes([fill]) * (FRAME_LEN - 4)) * frames
+    if tagged:
+        out += b"TAG" + bytes(125)
+    return out
+
+
+def test_speech_is_synthesized_once_per_normalized_script(tmp_path, monkeypatch):
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "cache"))
+    calls = []
+
+    def fake_request(text, *, voice_id, api_key):
+        calls.append((text, voice_id))
+        time.sleep(0.05)
+        return _mp3(3, len(calls))
+
+    monkeypatch.setattr(ai_enhancer, "_request_elevenlabs", fake_request)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = list(pool.map(
+            lambda _i: ai_enhancer.synthesize_speech_bytes("Welcome  to\nthe show.", voice_id="v1", api_key="k"),
+            range(4),
+        ))
+    assert len(calls) == 1 and len(set(first)) == 1
+    assert ai_enhancer.synthesize_speech_bytes("Welcome to the show.", voice_id="v1", api_key="other") == first[0]
+    assert len(calls) == 1
+
+    ai_enhancer.synthesize_speech_bytes("Welcome to the show.", voice_id="v2", api_key="k")
+    assert [voice for _text, voice in calls] == ["v1", "v2"]
+    assert tts_cache.cache_key(provider="elevenlabs", model="m", voice="v", text="a  b") == tts_cache.cache_key(
+        provider="elevenlabs", model="m", voice="v", text=" a b"
+    )
+
+
+class _Provider:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.failures = 1
+
+    def synthesize_speech_bytes(self, text, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            fail = text == "chunk 3" and self.failures > 0
+            if fail:
+                self.failures -= 1
+        try:
+            time.sleep(0.02)
+            if fail:
+                raise RuntimeError("429 Too Many Requests")
+            return _mp3(int(text.split()[-1]), int(text.split()[-1]), tagged=True)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_chunks_synthesize_in_parallel_and_stitch_without_decoding(tmp_path):
+    provider = _Provider()
+    chunks = [{"id": f"chunk-{i:03d}", "text": f"chunk {i}"} for i in range(1, 9)]
+    log = []
+    cfg = {"temp_dir": str(tmp_path), "concurrency": 3, "backoff_seconds": 0.01, "pause_ms": 250, "crossfade_ms": 40}
+
+    paths = synthesize_chunks(chunks, provider, cfg, log)
+
+    assert [p.name for p in paths] == [f"tts_chunk_{i:03d}.mp3" for i in range(1, 9)]
+    assert 1 < provider.peak <= 3
+    assert any("retry 1/2" in line for line in log)
+
+    out = tmp_path / "out.mp3"
+    metrics = stitch_tts_chunks(paths, out, cfg, log)
+
+    stream = mp3_frames.parse(out.read_bytes())
+    gap_frames = round(0.210 * 44100 / 1152)
+    assert stream.frame_count == sum(range(1, 9)) + 7 * gap_frames
+    assert metrics == {"chunks": 8, "duration_ms": stream.duration_ms}
+    # Tags and the Xing frame are dropped; gaps are all-zero silent frames.
+    data = out.read_bytes()
+    assert data[:4] == HEADER and b"Xing" not in data and b"TAG" not in data
+    assert data[FRAME_LEN + 4:2 * FRAME_LEN] == bytes(FRAME_LEN - 4)
+    assert "frames=copied" in log[-1]
+
+
+def _granule_gains(data):
+    # Joint-stereo MPEG-1 frames: global_gain follows 20 lead bits and 21 bits of each 59-bit granule/channel block.
+    gains = []
+    for start in range(0, len(data), FRAME_LEN):
+        frame = int.from_bytes(data[start + 4:start + 36], "big")
+        for block in range(4):
+            bit = 20 + block * 59 + 21
+            gains.append((frame >> (256 - bit - 8)) & 0xFF)
+    return gains
+
+
+def test_bytes_chunks_keep_the_tail_fade(tmp_path):
+    class Provider:
+        def synthesize_speech_bytes(self, text, **kwargs):
+            return _mp3(int(text.split()[-1]), 0xFF, tagged=True)
+
+    cfg = {"temp_dir": str(tmp_path), "concurrency": 1}
+    long_chunk, short_chunk = synthesize_chunks(
+        [{"text": "chunk 20"}, {"text": "chunk 4"}], Provider(), cfg, []
+    )
+
+    stream = mp3_frames.parse(long_chunk.read_bytes())
+    assert stream.frame_count == 20
+    gains = _granule_gains(stream.data)
+    # 60 ms at 44.1 kHz spans five granules (two channels each): a falling ramp ending at the minimum gain.
+    faded = gains[-10:]
+    assert gains[:-10] == [255] * 70
+    assert faded[0::2] == faded[1::2]
+    assert faded[0] < 255 and all(a > b for a, b in zip(faded[0::2], faded[2::2])) and faded[-1] == 0
+    # Chunks too short to fade are left untouched.
+    assert short_chunk.read_bytes() == _mp3(4, 0xFF, tagged=True)
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.models.usage import ProcessingMinutesLedger, UsageLedgerSummary, LedgerDirection
+from api.services.billing import usage as usage_svc
+
+
+@pytest.fixture
+def session():
+    # Only the ledger tables: the full metadata has PostgreSQL-only types.
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[ProcessingMinutesLedger.__table__, UsageLedgerSummary.__table__],
+    )
+    with Session(engine) as s:
+        yield s
+
+
+def _month_start(now: datetime) -> datetime:
+    return datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+
+
+def test_summary_tracks_debits_credits_and_duplicates(session):
+    user_id = uuid4()
+    episode_id = uuid4()
+
+    usage_svc.post_debit(session, user_id, 5, episode_id, correlation_id="job:1")
+    assert usage_svc.post_debit(session, user_id, 5, episode_id, correlation_id="job:1") is None
+    usage_svc.post_debit(session, user_id, 3, episode_id, correlation_id="job:2")
+    usage_svc.post_credit(session, user_id, 2, episode_id, reason="REFUND_ERROR")
+
+    rows = session.exec(select(UsageLedgerSummary).where(UsageLedgerSummary.user_id == user_id)).all()
+    assert len(rows) == 1
+    assert (rows[0].debit_minutes, rows[0].credit_minutes, rows[0].entry_count) == (8, 2, 3)
+
+    now = datetime.now(timezone.utc)
+    assert usage_svc.balance_minutes(session, user_id) == -6
+    assert usage_svc.month_minutes_used(session, user_id, _month_start(now), now) == 6
+    assert usage_svc.balance_minutes(session, uuid4()) == 0
+
+
+def test_bounded_window_uses_ledger_created_at(session):
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    old = ProcessingMinutesLedger(
+        user_id=user_id,
+        minutes=10,
+        credits=10.0,
+        direction=LedgerDirection.DEBIT,
+        created_at=(now - timedelta(days=70)).replace(tzinfo=None),
+    )
+    session.add(old)
+    session.flush()
+    usage_svc.apply_to_summary(session, old)
+    session.commit()
+    before_debit = datetime.now(timezone.utc)
+    usage_svc.post_debit(session, user_id, 4, None)
+    now = datetime.now(timezone.utc)
+
+    # Summary path: current month only.
+    assert usage_svc.month_minutes_used(session, user_id, _month_start(now), now) == 4
+    # Entries posted after period_end are excluded on the summary path too.
+    assert usage_svc.month_minutes_used(session, user_id, _month_start(now), before_debit) == 0
+    # Aggregate path: arbitrary windows.
+    assert usage_svc.month_minutes_used(session, user_id, now - timedelta(days=90), now + timedelta(seconds=1)) == 14
+    assert usage_svc.month_minutes_used(session, user_id, now - timedelta(days=90), now - timedelta(days=30)) == 10
+    assert usage_svc.balance_minutes(session, user_id) == -14
+
+    breakdown = usage_svc.month_credits_breakdown(session, user_id, now - timedelta(days=90), now + timedelta(seconds=1))
+    assert breakdown["total"] == pytest.approx(14.0)
+
+
+def test_deleting_ledger_rows_takes_them_out_of_the_summary(session):
+    user_id = uuid4()
+    episode_id = uuid4()
+    usage_svc.post_debit(session, user_id, 5, episode_id, correlation_id="job:1")
+    usage_svc.post_debit(session, user_id, 3, uuid4(), correlation_id="job:2")
+    usage_svc.post_credit(session, user_id, 1, episode_id, reason="REFUND_ERROR")
+
+    for rec in session.exec(
+        select(ProcessingMinutesLedger).where(ProcessingMinutesLedger.episode_id == episode_id)
+    ).all():
+        usage_svc.remove_from_summary(session, rec)
+        session.delete(rec)
+    session.commit()
+
+    now = datetime.now(timezone.utc)
+    assert usage_svc.balance_minutes(session, user_id) == -3
+    assert usage_svc.month_minutes_used(session, user_id, _month_start(now), now) == 3
+    row = session.exec(select(UsageLedgerSummary).where(UsageLedgerSummary.user_id == user_id)).one()
+    assert (row.debit_minutes, row.credit_minutes, row.entry_count) == (3, 0, 1)
+
+
+def test_rebuild_repairs_entries_posted_without_the_summary(session):
+    user_id, other = uuid4(), uuid4()
+    now = datetime.now(timezone.utc)
+    usage_svc.post_debit(session, user_id, 4, None)
+    usage_svc.post_debit(session, other, 2, None)
+    # Rows written by a revision that predates the summary.
+    session.add(ProcessingMinutesLedger(user_id=user_id, minutes=6, credits=6.0, direction=LedgerDirection.DEBIT))
+    session.add(ProcessingMinutesLedger(
+        user_id=user_id,
+        minutes=10,
+        direction=LedgerDirection.CREDIT,
+        created_at=(now - timedelta(days=70)).replace(tzinfo=None),
+    ))
+    session.commit()
+    assert usage_svc.balance_minutes(session, user_id) == -4
+
+    assert usage_svc.rebuild_usage_summary(session, user_id) == 2
+    assert usage_svc.balance_minutes(session, user_id) == 0
+    assert usage_svc.month_minutes_used(session, user_id, _month_start(now), datetime.now(timezone.utc)) == 10
+    assert usage_svc.balance_minutes(session, other) == -2
+
+    # Idempotent, and the unscoped form covers every user.
+    assert usage_svc.rebuild_usage_summary(session) == 3
+    assert usage_svc.rebuild_usage_summary(session) == 3
+    assert usage_svc.balance_minutes(session, user_id) == 0
+    assert usage_svc.balance_minutes(session, other) == -2
+    months = session.exec(select(UsageLedgerSummary).where(UsageLedgerSummary.user_id == user_id)).all()
+    assert sum(r.entry_count for r in months) == 3
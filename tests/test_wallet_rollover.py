@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.models.usage import ProcessingMinutesLedger
+from api.models.user import User
+from api.models.wallet import CreditWallet, WalletPeriodProcessed
+from api.services.billing import wallet as wallet_svc
+
+NOW = datetime(2025, 3, 2, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__,
+            CreditWallet.__table__,
+            WalletPeriodProcessed.__table__,
+            ProcessingMinutesLedger.__table__,
+        ],
+    )
+    with Session(engine) as s:
+        yield s
+
+
+def _user(session, tier, unused=None, current=None):
+    user = User(email=f"{uuid4()}@example.com", hashed_password="x", tier=tier)
+    session.add(user)
+    if unused is not None:
+        session.add(CreditWallet(
+            user_id=user.id, period="2025-02",
+            monthly_credits=28_800, used_monthly_rollover=28_800 - unused,
+        ))
+    if current is not None:
+        session.add(CreditWallet(
+            user_id=user.id, period="2025-03", monthly_credits=1, rollover_credits=5,
+            purchased_credits=current, used_monthly_rollover=3,
+        ))
+    session.commit()
+    return user.id
+
+
+def _wallet(session, user_id):
+    return session.exec(
+        select(CreditWallet).where(CreditWallet.user_id == user_id, CreditWallet.period == "2025-03")
+    ).first()
+
+
+def test_batched_rollover_matches_per_user_rules(session):
+    rolled = _user(session, "hobby", unused=1_005)
+    capped = _user(session, "Hobby", unused=28_800, current=50.0)
+    nothing_left = _user(session, "creator", unused=0)
+    free = _user(session, "free", unused=5_000)
+    unlimited = _user(session, "unlimited")
+
+    dry = wallet_svc.process_monthly_rollover(session, now=NOW, dry_run=True, chunk_size=2)
+    assert dry["status"] == "dry_run"
+    assert (dry["processed_count"], dry["rollover_total"], dry["wallets"]) == (2, 100.0 + 2_880.0, 3)
+    assert session.exec(select(WalletPeriodProcessed)).first() is None
+    assert _wallet(session, rolled) is None
+
+    result = wallet_svc.process_monthly_rollover(session, now=NOW, chunk_size=2)
+    assert result["status"] == "completed"
+    assert (result["processed_count"], result["rollover_total"]) == (2, 2_980.0)
+
+    session.expire_all()
+    assert _wallet(session, rolled).rollover_credits == 100.0
+    assert _wallet(session, rolled).monthly_credits == 28_800
+    existing = _wallet(session, capped)
+    assert (existing.rollover_credits, existing.used_monthly_rollover, existing.purchased_credits) == (2_880.0, 0.0, 50.0)
+    assert _wallet(session, nothing_left).monthly_credits == 72_000
+    assert _wallet(session, nothing_left).rollover_credits == 0.0
+    assert _wallet(session, free) is None
+    assert _wallet(session, unlimited) is None
+
+    again = wallet_svc.process_monthly_rollover(session, now=NOW)
+    assert again["status"] == "already_processed"
+
+
+def test_interrupted_rollover_resumes_from_cursor(session, monkeypatch):
+    users = sorted(_user(session, "pro", unused=10_000) for _ in range(5))
+    real_chunk = wallet_svc._rollover_chunk
+    calls = []
+
+    def flaky_chunk(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("connection dropped")
+        return real_chunk(*args, **kwargs)
+
+    monkeypatch.setattr(wallet_svc, "_rollover_chunk", flaky_chunk)
+    partial = wallet_svc.process_monthly_rollover(session, now=NOW, chunk_size=2)
+    assert partial["status"] == "partial"
+    assert partial["resume_after"] == str(users[1])
+
+    monkeypatch.setattr(wallet_svc, "_rollover_chunk", real_chunk)
+    done = wallet_svc.process_monthly_rollover(session, now=NOW, chunk_size=2)
+    assert done["status"] == "completed"
+    assert done["wallets"] == 3
+    assert (done["processed_count"], done["rollover_total"]) == (5, 5_000.0)
+    assert len(session.exec(select(CreditWallet).where(CreditWallet.period == "2025-03")).all()) == 5
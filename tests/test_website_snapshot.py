@@ -0,0 +1,111 @@
+import dataclasses
+import json
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from api.services import website_snapshot
+from api.services.website_snapshot import RenderedSite, SiteUnavailable
+
+
+@pytest.fixture(autouse=True)
+def _local_only_cache(monkeypatch):
+    # No Redis in tests: exercise the in-process tier and local versioning.
+    monkeypatch.setattr(website_snapshot, "get_redis_client", lambda: None)
+    for name in ("SITE_SNAPSHOT_TTL_S", "SITE_SNAPSHOT_STALE_S", "SITE_SNAPSHOT_STORAGE"):
+        monkeypatch.delenv(name, raising=False)
+
+    @contextmanager
+    def session_scope():
+        yield "background-session"
+
+    monkeypatch.setattr(website_snapshot, "_session_scope", session_scope)
+    website_snapshot.clear_local_cache()
+    yield
+    website_snapshot.clear_local_cache()
+
+
+class _Site:
+    def __init__(self):
+        self.renders = []
+        self.published = True
+
+    def render(self, session):
+        if not self.published:
+            raise SiteUnavailable("Website is not published yet")
+        version = website_snapshot.current_version("pod", "web")
+        self.renders.append(session)
+        return RenderedSite("pod", "web", version, json.dumps({"render": len(self.renders)}))
+
+
+def _wait_for(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_snapshot_is_served_until_invalidated_then_revalidated_in_background():
+    site = _Site()
+    first = website_snapshot.get_snapshot("show", site.render, "request-session")
+    assert website_snapshot.get_snapshot("show", site.render, "request-session") is first
+    assert site.renders == ["request-session"]
+
+    website_snapshot.invalidate_site(podcast_id="pod")
+    stale = website_snapshot.get_snapshot("show", site.render, "request-session")
+    assert stale is first  # served while the new render runs
+    _wait_for(lambda: website_snapshot.get_snapshot("show", site.render, "x") is not first)
+
+    fresh = website_snapshot.get_snapshot("show", site.render, "request-session")
+    assert site.renders == ["request-session", "background-session"]
+    assert json.loads(fresh.body) == {"render": 2} and fresh.etag != first.etag
+
+    # A page edit invalidates by website id; unpublishing drops the snapshot.
+    website_snapshot.invalidate_site(website_id="web")
+    site.published = False
+
+    def gone():
+        try:
+            website_snapshot.get_snapshot("show", site.render, "request-session")
+        except SiteUnavailable:
+            return True
+        return False
+
+    _wait_for(gone)
+    assert website_snapshot._local_get("show") is None
+
+
+def test_long_stale_snapshot_renders_inline(monkeypatch):
+    site = _Site()
+    first = website_snapshot.get_snapshot("show", site.render, "s1")
+    monkeypatch.setenv("SITE_SNAPSHOT_TTL_S", "60")
+    monkeypatch.setenv("SITE_SNAPSHOT_STALE_S", "60")
+    website_snapshot._local_put(dataclasses.replace(first, built_at=first.built_at - 121))
+
+    again = website_snapshot.get_snapshot("show", site.render, "s2")
+    assert site.renders == ["s1", "s2"] and again is not first
+
+
+def test_endpoint_serves_snapshot_with_etag(monkeypatch):
+    from api.routers import sites
+
+    site = _Site()
+    monkeypatch.setattr(sites, "_render_public_website", lambda session, subdomain: site.render(session))
+
+    def request(headers=None):
+        return SimpleNamespace(headers=headers or {})
+
+    resp = sites.get_public_website("show", request(), "db")
+    assert resp.status_code == 200 and json.loads(resp.body) == {"render": 1}
+    assert "stale-while-revalidate=600" in resp.headers["cache-control"]
+
+    cached = sites.get_public_website("show", request({"if-none-match": resp.headers["etag"]}), "db")
+    assert cached.status_code == 304 and site.renders == ["db"]
+
+    site.published = False
+    website_snapshot.clear_local_cache()
+    with pytest.raises(sites.HTTPException) as exc:
+        sites.get_public_website("show", request(), "db")
+    assert exc.value.status_code == 404
@@ -0,0 +1,65 @@
+import importlib
+import random
+
+import pytest
+
+words_mod = importlib.import_module("api.services.clean_engine.words")
+Word = importlib.import_module("api.services.clean_engine.models").Word
+
+
+def _random_case(rng):
+    words = []
+    for _ in range(rng.randint(0, 60)):
+        start = round(rng.uniform(-0.5, 20), rng.choice([1, 2, 3, 4]))
+        end = start + round(rng.uniform(-0.05, 1.5), rng.choice([2, 3, 4]))
+        words.append(Word(rng.choice(["um", "Uh,", "hello", "like", "x"]), start, end))
+    cuts = []
+    for _ in range(rng.randint(0, 80)):
+        s = rng.randint(-500, 21000)
+        cuts.append((s, s + rng.randint(-50, 1500)))
+    return words, cuts
+
+
+@pytest.mark.parametrize("ratio", [0.0, 0.5, 1.0])
+def test_vectorized_remap_matches_reference_loop(ratio):
+    rng = random.Random(1234)
+    for _ in range(400):
+        words, cuts = _random_case(rng)
+        expected = words_mod._remap_words_after_cuts_loop(words, cuts, ratio)
+        assert words_mod.remap_words_after_cuts(words, cuts, ratio) == expected
+
+
+def test_remap_shifts_and_trims_words():
+    words = [
+        Word("hello", 0.0, 0.5),
+        Word("um", 0.5, 0.7),      # fully cut -> dropped
+        Word("world", 0.9, 1.5),   # left 100ms cut -> keeps right side
+        Word("again", 3.0, 3.4),
+    ]
+    out = words_mod.remap_words_after_cuts(words, [(500, 1000), (2000, 2500)])
+    assert out == [
+        Word("hello", 0.0, 0.5),
+        Word("world", 0.5, 1.0),
+        Word("again", 2.0, 2.4),
+    ]
+
+
+def test_merge_ranges_vector_path_matches_loop():
+    rng = random.Random(99)
+    for _ in range(200):
+        ranges = [(rng.randint(0, 5000), rng.randint(0, 5000)) for _ in range(rng.randint(64, 300))]
+        gap = rng.randint(0, 30)
+        merged = words_mod.merge_ranges(ranges, gap_ms=gap)
+        assert merged == words_mod._merge_ranges_loop(ranges, gap_ms=gap)
+        assert all(type(v) is int for span in merged for v in span)
+
+
+def test_word_columns_intern_tokens_and_match_fillers():
+    cols = words_mod.WordColumns.from_words(
+        [Word("Um,", 0.1, 0.2), Word("hello", 0.2, 0.4), Word("um", 0.5, 0.6), Word("hello", 0.7, 0.9)]
+    )
+    assert cols.vocab == ["Um,", "hello", "um"]
+    assert cols.token_ids.tolist() == [0, 1, 2, 1]
+    assert cols.match_mask({"um"}).tolist() == [True, False, True, False]
+    assert cols.start_ms.tolist() == [100, 200, 500, 700]
+    assert cols.to_words()[0] == Word("Um,", 0.1, 0.2)
@@ -0,0 +1,132 @@
+"""Unit tests for worker/admission.py (bounded executor + admission control)."""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+PKG_ROOT = ROOT / "backend"
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+from worker.admission import BoundedTaskExecutor, WorkerSaturated, default_max_concurrency
+
+
+class TestBoundedTaskExecutor:
+    def test_blocking_work_does_not_block_event_loop(self):
+        executor = BoundedTaskExecutor(max_concurrency=1, queue_depth=0, mode="thread")
+        release = threading.Event()
+
+        async def scenario():
+            task = asyncio.create_task(executor.run(release.wait, 5))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert executor.snapshot()["in_flight"] == 1
+            release.set()
+            assert await task is True
+            return ticks
+
+        try:
+            assert asyncio.run(scenario()) == 5
+        finally:
+            executor.shutdown()
+
+    def test_rejects_when_slots_and_queue_are_full(self):
+        executor = BoundedTaskExecutor(max_concurrency=1, queue_depth=1, mode="thread", retry_after_s=17)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.create_task(executor.run(release.wait, 5))
+            queued = asyncio.create_task(executor.run(lambda: "second"))
+            await asyncio.sleep(0.05)
+            snap = executor.snapshot()
+            assert (snap["in_flight"], snap["queued"]) == (1, 1)
+
+            with pytest.raises(WorkerSaturated) as exc_info:
+                await executor.run(lambda: "third")
+            assert exc_info.value.retry_after_s == 17
+
+            release.set()
+            assert await running is True
+            assert await queued == "second"
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+
+        snap = executor.snapshot()
+        assert snap["rejected_total"] == 1
+        assert snap["completed_total"] == 2
+        assert (snap["in_flight"], snap["queued"]) == (0, 0)
+
+    def test_slot_released_when_task_raises(self):
+        executor = BoundedTaskExecutor(max_concurrency=1, queue_depth=0, mode="thread")
+
+        def boom():
+            raise ValueError("nope")
+
+        async def scenario():
+            with pytest.raises(ValueError):
+                await executor.run(boom)
+            assert await executor.run(time.monotonic) > 0
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert executor.snapshot()["rejected_total"] == 0
+
+    def test_cancelled_request_keeps_slot_until_work_finishes(self):
+        executor = BoundedTaskExecutor(max_concurrency=1, queue_depth=0, mode="thread")
+        started = threading.Event()
+        release = threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        async def scenario():
+            task = asyncio.create_task(executor.run(work))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # The thread is still running, so the bound must still hold.
+            assert executor.snapshot()["in_flight"] == 1
+            with pytest.raises(WorkerSaturated):
+                executor.try_admit()
+
+            release.set()
+            for _ in range(100):
+                if executor.snapshot()["completed_total"] == 1:
+                    break
+                await asyncio.sleep(0.01)
+            assert await executor.run(lambda: "next") == "next"
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        snap = executor.snapshot()
+        assert (snap["in_flight"], snap["queued"], snap["completed_total"]) == (0, 0, 2)
+
+
+class TestDefaultMaxConcurrency:
+    def test_explicit_env_wins(self, monkeypatch):
+        monkeypatch.setenv("WORKER_MAX_CONCURRENCY", "3")
+        assert default_max_concurrency() == 3
+
+    def test_memory_budget_caps_concurrency(self, monkeypatch):
+        monkeypatch.delenv("WORKER_MAX_CONCURRENCY", raising=False)
+        monkeypatch.setenv("WORKER_TASK_MEMORY_MB", str(10 ** 9))
+        assert default_max_concurrency() == 1
@@ -3,6 +3,7 @@
 Tests for should_use_chunking() branches and GCS failure handling.
 """
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -203,8 +204,8 @@ class TestSplitAudioIntoChunks:
         with patch('infrastructure.gcs._get_gcs_client') as mock_get_client:
             mock_get_client.return_value = mock_client
             
-            # Mock upload_bytes to raise exception on first chunk
-            with patch('infrastructure.gcs.upload_bytes') as mock_upload:
+            # Mock the streaming upload to raise exception on first chunk
+            with patch('infrastructure.gcs.upload_fileobj') as mock_upload:
                 mock_upload.side_effect = RuntimeError("Upload failed: network error")
                 
                 with pytest.raises(RuntimeError) as exc_info:
@@ -220,3 +221,260 @@ class TestSplitAudioIntoChunks:
                 # Verify that no chunks were created with None URIs
                 # (The function should raise before creating any chunks)
 
+
+
+def _write_wav(path: Path, segments):
+    """Write 8kHz mono 16-bit PCM from (duration_ms, loud) segments."""
+    import wave
+
+    loud = b"\x00\x40\x00\xc0"  # alternating +/-16384 (two frames)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(8000)
+        for duration_ms, is_loud in segments:
+            frames = int(8000 * duration_ms / 1000)
+            wf.writeframes(loud * (frames // 2) if is_loud else b"\x00\x00" * frames)
+
+
+class TestSplitPoints:
+    """Silence-aligned split point detection."""
+
+    def test_wav_split_lands_in_silence_near_boundary(self, tmp_path):
+        audio_path = tmp_path / "speech.wav"
+        # 20 min of "speech" with a 2s pause at 9:50 -> split should be mid-pause (591000ms)
+        _write_wav(audio_path, [(590_000, True), (2_000, False), (608_000, True)])
+
+        points = chunked_processor.find_split_points_in_wav(audio_path)
+
+        assert points[-1] == 1_200_000
+        assert len(points) == 2
+        assert abs(points[0] - 591_000) <= 10
+
+    def test_short_audio_is_single_chunk(self, tmp_path):
+        audio_path = tmp_path / "short.wav"
+        _write_wav(audio_path, [(5_000, True)])
+
+        assert chunked_processor.find_split_points_in_wav(audio_path) == [5_000]
+
+    def test_split_audio_writes_one_wav_per_chunk(self, tmp_path, monkeypatch):
+        import wave
+        from uuid import uuid4
+
+        audio_path = tmp_path / "long_audio.wav"
+        make_tiny_wav(audio_path, ms=25 * 60 * 1000)
+        uploaded = []
+
+        def _fake_upload(bucket, key, fileobj, **kwargs):
+            uploaded.append((key, len(fileobj.read())))
+            return f"gs://{bucket}/{key}"
+
+        with patch('infrastructure.gcs._get_gcs_client', return_value=MagicMock()), \
+                patch('infrastructure.gcs.upload_fileobj', side_effect=_fake_upload):
+            chunks = chunked_processor.split_audio_into_chunks(
+                audio_path=audio_path,
+                user_id=uuid4(),
+                episode_id=uuid4(),
+                output_dir=tmp_path / "chunks",
+            )
+
+        assert len(chunks) == 3
+        assert [key.rsplit("/", 1)[-1] for key, _ in uploaded] == [Path(c.audio_path).name for c in chunks]
+        assert all(size == Path(c.audio_path).stat().st_size for (_, size), c in zip(uploaded, chunks))
+        assert chunks[0].start_ms == 0
+        assert chunks[-1].end_ms == 25 * 60 * 1000
+        for prev, nxt in zip(chunks, chunks[1:]):
+            assert prev.end_ms == nxt.start_ms
+        total_frames = 0
+        for chunk in chunks:
+            with wave.open(chunk.audio_path, "rb") as wf:
+                total_frames += wf.getnframes()
+                assert abs(wf.getnframes() / wf.getframerate() * 1000 - chunk.duration_ms) <= 1
+        with wave.open(str(audio_path), "rb") as wf:
+            assert abs(total_frames - wf.getnframes()) <= len(chunks)
+
+
+    def test_non_wav_input_is_decoded_to_disk_before_cutting(self, tmp_path, monkeypatch):
+        from uuid import uuid4
+
+        src = tmp_path / "episode.mp3"
+        src.write_bytes(b"not really mp3")
+        decoded = []
+
+        def _fake_transcode(audio_path, dest):
+            decoded.append(Path(audio_path))
+            make_tiny_wav(dest, ms=12 * 60 * 1000)
+            return dest
+
+        monkeypatch.setattr(chunked_processor, "_transcode_to_wav", _fake_transcode)
+        with patch('infrastructure.gcs._get_gcs_client', return_value=MagicMock()), \
+                patch('infrastructure.gcs.upload_fileobj', side_effect=lambda b, k, f, **kw: f"gs://{b}/{k}"):
+            chunks = chunked_processor.split_audio_into_chunks(
+                audio_path=src,
+                user_id=uuid4(),
+                episode_id=uuid4(),
+                output_dir=tmp_path / "chunks",
+            )
+
+        assert decoded == [src]
+        assert len(chunks) == 2
+        # the intermediate full-length WAV is removed once chunks are cut
+        assert sorted(p.name for p in (tmp_path / "chunks").iterdir()) == sorted(
+            Path(c.audio_path).name for c in chunks
+        )
+
+
+class TestProcessChunks:
+    """Local fan-out and manifest-driven resume."""
+
+    def _chunks(self, tmp_path, n=3):
+        chunks = []
+        for i in range(n):
+            audio = tmp_path / f"ep_chunk_{i:03d}.wav"
+            audio.write_bytes(b"")
+            chunks.append(chunked_processor.ChunkMetadata(
+                chunk_id=f"ep_chunk_{i:03d}",
+                index=i,
+                start_ms=i * 1000,
+                end_ms=(i + 1) * 1000,
+                duration_ms=1000,
+                audio_path=str(audio),
+            ))
+        return chunks
+
+    def test_local_processing_marks_chunks_and_resumes(self, tmp_path, monkeypatch):
+        calls = []
+        fail = {1}
+
+        def _fake_clean(index, audio_path, transcript_path, opts, is_last, output_path):
+            calls.append((index, is_last))
+            if index in fail:
+                raise RuntimeError("boom")
+            Path(output_path).write_bytes(b"mp3")
+            return index, output_path
+
+        monkeypatch.setattr(chunked_processor, "_clean_chunk_local", _fake_clean)
+        chunks = self._chunks(tmp_path)
+        manifest = tmp_path / "manifest.json"
+
+        with pytest.raises(RuntimeError, match=r"Chunks \[1\] failed"):
+            chunked_processor.process_chunks(
+                chunks, "user", "ep", mode="local", manifest_path=manifest, max_workers=1
+            )
+        assert sorted(calls) == [(0, False), (1, False), (2, True)]
+
+        reloaded = chunked_processor.load_chunk_manifest(manifest)
+        assert [c.status for c in reloaded] == ["completed", "failed", "completed"]
+
+        calls.clear()
+        fail.clear()
+        chunked_processor.process_chunks(
+            reloaded, "user", "ep", mode="local", manifest_path=manifest, max_workers=1
+        )
+        assert calls == [(1, False)]
+        assert all(c.status == "completed" for c in chunked_processor.load_chunk_manifest(manifest))
+
+    def test_tasks_mode_dispatches_and_joins_from_gcs(self, tmp_path, monkeypatch):
+        chunks = self._chunks(tmp_path, n=2)
+        for c in chunks:
+            c.gcs_audio_uri = f"gs://ppp-media-us-west1/u/chunks/ep/{c.chunk_id}.wav"
+        enqueued = []
+
+        with patch('infrastructure.tasks_client.enqueue_http_task',
+                   side_effect=lambda path, body: enqueued.append((path, body)) or {"name": "t"}), \
+                patch('infrastructure.gcs.blob_exists', return_value=True) as exists, \
+                patch('infrastructure.gcs.download_gcs_bytes', return_value=b"mp3"):
+            chunked_processor.process_chunks(
+                chunks, "user", "ep", mode="tasks", manifest_path=tmp_path / "manifest.json"
+            )
+
+        assert [body["chunk_index"] for _, body in enqueued] == [0, 1]
+        assert all(path == "/api/tasks/process-chunk" for path, _ in enqueued)
+        assert all(body["total_chunks"] == 2 for _, body in enqueued)
+        exists.assert_any_call("ppp-media-us-west1", "u/chunks/ep/ep_chunk_000_cleaned.mp3")
+        assert all(c.status == "completed" and Path(c.cleaned_path).read_bytes() == b"mp3" for c in chunks)
+
+
+class TestOrchestratorChunkedClean:
+    """run_episode_pipeline routes long episodes through run_chunked_clean."""
+
+    class _Audio:
+        def __init__(self, ms):
+            self.ms = ms
+
+        def __len__(self):
+            return self.ms
+
+    def _run(self, tmp_path, monkeypatch, duration_ms, ai_cmds=()):
+        from api.services.audio import orchestrator
+        from api.services.audio.orchestrator_steps_lib import cleanup as cleanup_lib
+
+        monkeypatch.delenv("DISABLE_CHUNKING", raising=False)
+        monkeypatch.setenv("STORAGE_BACKEND", "gcs")
+        content = tmp_path / "episode.mp3"
+        content.write_bytes(b"mp3")
+        words = [
+            {"word": "hello", "start": 0.0, "end": 0.5},
+            {"word": "um", "start": 0.5, "end": 0.8},
+            {"word": "world", "start": 0.8, "end": 1.2},
+        ]
+        calls = {"chunked": [], "serial": [], "export": {}}
+
+        def _fake_chunked_clean(audio_path, transcript_path, user_id, episode_id, output_path, **kwargs):
+            calls["chunked"].append((Path(audio_path), user_id, episode_id, kwargs["cleanup_options"]))
+            assert len(json.loads(Path(transcript_path).read_text())) == 3
+            return output_path
+
+        def _serial(name):
+            def _step(paths, cfg, log, **kwargs):
+                calls["serial"].append(name)
+                return {"cleaned_audio": self._Audio(1), "mutable_words": kwargs["mutable_words"]}
+            return _step
+
+        def _fake_export(paths, cfg, log, **kwargs):
+            calls["export"] = kwargs
+            return {"final_path": tmp_path / "final.mp3"}
+
+        monkeypatch.setattr(orchestrator, "do_transcript_io", lambda paths, cfg, log: {
+            "content_path": content,
+            "main_content_audio": self._Audio(duration_ms),
+            "words": words,
+            "sanitized_output_filename": "episode",
+        })
+        monkeypatch.setattr(orchestrator, "do_intern_sfx", lambda paths, cfg, log, words: {
+            "mutable_words": [dict(w) for w in words],
+            "ai_cmds": list(ai_cmds),
+        })
+        monkeypatch.setattr(orchestrator, "do_fillers", _serial("fillers"))
+        monkeypatch.setattr(orchestrator, "do_silence", _serial("silence"))
+        monkeypatch.setattr(orchestrator, "do_tts", lambda paths, cfg, log, **kwargs: {})
+        monkeypatch.setattr(orchestrator, "do_export", _fake_export)
+        monkeypatch.setattr(chunked_processor, "run_chunked_clean", _fake_chunked_clean)
+        fake_segment = Mock(from_file=lambda p: self._Audio(42))
+        monkeypatch.setattr(orchestrator, "AudioSegment", fake_segment)
+        monkeypatch.setattr(cleanup_lib, "AudioSegment", fake_segment)
+
+        cleanup_options = {"fillerWords": ["um"], "removePauses": False}
+        orchestrator.run_episode_pipeline(
+            {"audio_in": str(content), "output_name": "episode"},
+            {"cleanup_options": cleanup_options, "episode_id": "ep-1", "user_id": "user-1"},
+            [],
+        )
+        return calls
+
+    def test_long_episode_cleans_in_chunks(self, tmp_path, monkeypatch):
+        calls = self._run(tmp_path, monkeypatch, duration_ms=11 * 60 * 1000)
+
+        assert calls["serial"] == []
+        assert [(p.name, u, e) for p, u, e, _ in calls["chunked"]] == [("episode.mp3", "user-1", "ep-1")]
+        assert len(calls["export"]["cleaned_audio"]) == 42
+        assert [w["word"] for w in calls["export"]["mutable_words"]] == ["hello", "", "world"]
+
+    def test_short_episode_and_intern_commands_stay_serial(self, tmp_path, monkeypatch):
+        calls = self._run(tmp_path, monkeypatch, duration_ms=5 * 60 * 1000)
+        assert calls["chunked"] == []
+        assert calls["serial"] == ["fillers", "silence"]
+
+        calls = self._run(tmp_path, monkeypatch, duration_ms=11 * 60 * 1000, ai_cmds=[{"command": "intern"}])
+        assert calls["chunked"] == []
+        assert calls["serial"] == ["fillers", "silence"]